@@ -3,6 +3,20 @@ pysbf2 Performance benchmarking utility
 
 Usage (kwargs optional): python3 benchmark.py cycles=10000
 
+By default, the benchmark uses a fixed list of ~40 sample frames. To use
+a synthetic corpus generated by SBFCorpus instead, specify a profile
+(see CORPUS_PROFILES) and corpus size in bytes, e.g.
+
+python3 benchmark.py cycles=10 profile=mosaic-X5-20Hz size=1000000
+
+For the full benchmark suite - per block type, reader mode, data source
+and parallel backend, with JSON output and baseline comparison - use
+command line options as for the sbfbenchmark utility (see
+pysbf2.sbfbenchmark), e.g.
+
+python3 benchmark.py --size 1000000 --output results.json
+python3 benchmark.py --baseline results.json --tolerance 0.1
+
 Created on 19 May 2025
 
 :author: semuadmin (Steve Smith)
@@ -16,6 +30,8 @@ from io import BytesIO
 from sys import argv
 from time import process_time_ns
 from platform import version as osver, python_version
+from pysbf2.sbfbenchmark import main as suite
+from pysbf2.sbfcorpus import SBFCorpus
 from pysbf2.sbfreader import SBFReader
 from pysbf2._version import __version__ as sbfver
 
@@ -100,13 +116,21 @@ def benchmark(**kwargs) -> float:
     pyrtcm Performance benchmark test.
 
     :param int cycles: (kwarg) number of test cycles (10,000)
+    :param str profile: (kwarg) synthetic corpus profile (None = sample frames)
+    :param int size: (kwarg) synthetic corpus size in bytes (1,000,000)
     :returns: benchmark as transactions/second
     :rtype: float
     :raises: SBFStreamError
     """
 
     cyc = int(kwargs.get("cycles", 5000))
-    txnc = len(SBFMESSAGES)
+    profile = kwargs.get("profile", None)
+    if profile is None:
+        sbfbytes = SBFBYTES
+        txnc = len(SBFMESSAGES)
+    else:
+        sbfbytes = SBFCorpus(profile).generate(int(kwargs.get("size", 1000000)))
+        txnc = sum(1 for _ in SBFReader(BytesIO(sbfbytes), parsing=False))
     txnt = txnc * cyc
 
     print(
@@ -114,6 +138,7 @@ def benchmark(**kwargs) -> float:
         f"\nPython version: {python_version()}",
         f"\npysbf2 version: {sbfver}",
         f"\nTest cycles: {cyc:,}",
+        f"\nCorpus profile: {profile or 'sample frames'}",
         f"\nTxn per cycle: {txnc:,}",
     )
 
@@ -121,14 +146,14 @@ def benchmark(**kwargs) -> float:
     print(f"\nBenchmark test started at {start}")
     for i in range(cyc):
         progbar(i, cyc)
-        stream = BytesIO(SBFBYTES)
+        stream = BytesIO(sbfbytes)
         sbr = SBFReader(stream, parsing=True)
         for _, _ in sbr:
             pass
     end = process_time_ns()
     print(f"Benchmark test ended at {end}.")
     duration = end - start
-    msglen = len(SBFBYTES) * cyc
+    msglen = len(sbfbytes) * cyc
     txs = round(txnt * 1e9 / duration, 2)
     kbs = round(msglen * 1e9 / duration / 2**10, 2)
 
@@ -143,9 +168,11 @@ def main():
     """
     CLI Entry point.
 
-    args as benchmark() method
+    args as benchmark() method, or as sbfbenchmark utility
     """
 
+    if any(arg.startswith("--") for arg in argv[1:]):
+        raise SystemExit(suite(argv[1:]))
     benchmark(**dict(arg.split("=") for arg in argv[1:]))
 
 
@@ -0,0 +1,147 @@
+"""
+pysbf2 corruption recovery benchmarking utility
+
+Measures how well SBFReader recovers from injected corruption: the
+proportion of good SBF blocks recovered, the number of good blocks lost
+as collateral damage, and how far the reader has to read past the end
+of each recovered block (which, on a live socket, manifests as latency).
+
+Usage (kwargs optional):
+
+python3 benchmark_corruption.py cycles=200 rate=0.05 seed=1
+
+Created on 19 Oct 2026
+
+:author: semuadmin (Steve Smith)
+:copyright: semuadmin © 2021
+:license: BSD 3-Clause
+"""
+
+from io import BytesIO
+from random import Random
+from sys import argv
+from time import perf_counter_ns
+
+from benchmark import SBFMESSAGES
+
+from pysbf2 import ERR_IGNORE, SBF_PROTOCOL, SBFReader
+
+
+class CountingStream(BytesIO):
+    """
+    BytesIO stream which records the number of bytes read.
+    """
+
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self.bytesread = 0
+
+    def read(self, size: int = -1) -> bytes:
+        data = super().read(size)
+        self.bytesread += len(data)
+        return data
+
+
+def corrupt(frame: bytes, rnd: Random) -> bytes:
+    """
+    Corrupt a frame in one of three ways - bad length field,
+    flipped payload bit, or truncated frame.
+
+    :param bytes frame: good SBF frame
+    :param Random rnd: random number generator
+    :return: corrupted frame
+    :rtype: bytes
+    """
+
+    mode = rnd.randrange(3)
+    if mode == 0:  # implausible length field
+        return frame[0:6] + rnd.randrange(65536).to_bytes(2, "little") + frame[8:]
+    if mode == 1:  # flipped payload bit
+        pos = rnd.randrange(8, len(frame))
+        return (
+            frame[:pos]
+            + bytes([frame[pos] ^ (1 << rnd.randrange(8))])
+            + frame[pos + 1 :]
+        )
+    return frame[: rnd.randrange(8, len(frame))]  # truncated frame
+
+
+def benchmark(**kwargs) -> dict:
+    """
+    Corruption recovery benchmark test.
+
+    :param int cycles: (kwarg) number of copies of the test frames (200)
+    :param float rate: (kwarg) proportion of frames corrupted (0.05)
+    :param int seed: (kwarg) random seed (1)
+    :returns: dict of results
+    :rtype: dict
+    """
+
+    cyc = int(kwargs.get("cycles", 200))
+    rate = float(kwargs.get("rate", 0.05))
+    rnd = Random(int(kwargs.get("seed", 1)))
+
+    data = b""
+    good = []  # (frame, end offset) of each uncorrupted frame
+    ncorrupt = 0
+    for _ in range(cyc):
+        for frame in SBFMESSAGES:
+            if rnd.random() < rate:
+                data += corrupt(frame, rnd)
+                ncorrupt += 1
+            else:
+                data += frame
+                good.append((frame, len(data)))
+
+    stream = CountingStream(data)
+    sbr = SBFReader(stream, protfilter=SBF_PROTOCOL, quitonerror=ERR_IGNORE)
+    recovered = 0
+    overread = []
+    idx = 0
+    start = perf_counter_ns()
+    for raw, _ in sbr:
+        # match returned frame to next expected good frame
+        while idx < len(good) and good[idx][0] != raw:
+            idx += 1
+        if idx == len(good):
+            break
+        recovered += 1
+        overread.append(stream.bytesread - good[idx][1])
+        idx += 1
+    duration = perf_counter_ns() - start
+
+    results = {
+        "frames": len(good) + ncorrupt,
+        "corrupted": ncorrupt,
+        "good": len(good),
+        "recovered": recovered,
+        "recovery_rate": recovered / len(good),
+        "collateral_lost": len(good) - recovered,
+        "mean_overread_bytes": sum(overread) / max(len(overread), 1),
+        "max_overread_bytes": max(overread, default=0),
+        "frames_per_second": recovered * 1e9 / duration,
+    }
+    print(
+        f"\n{results['frames']:,} frames, {ncorrupt:,} corrupted, "
+        f"{recovered:,} of {len(good):,} good frames recovered "
+        f"({results['recovery_rate']:.2%}), "
+        f"{results['collateral_lost']:,} lost as collateral damage.",
+        f"\nRead past end of recovered frame: mean {results['mean_overread_bytes']:,.1f} "
+        f"bytes, max {results['max_overread_bytes']:,} bytes.",
+        f"\n{results['frames_per_second']:,.2f} recovered frames/second.\n",
+    )
+    return results
+
+
+def main():
+    """
+    CLI Entry point.
+
+    args as benchmark() method
+    """
+
+    benchmark(**dict(arg.split("=") for arg in argv[1:]))
+
+
+if __name__ == "__main__":
+    main()
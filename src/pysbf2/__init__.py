@@ -6,20 +6,7 @@ Created on 19 May 2025
 :license: BSD 3-Clause
 """
 
-from pynmeagps import (
-    SocketWrapper,
-    area,
-    bearing,
-    ecef2llh,
-    haversine,
-    latlon2dmm,
-    latlon2dms,
-    llh2ecef,
-    llh2iso6709,
-    planar,
-    utc2wnotow,
-    wnotow2utc,
-)
+from importlib import import_module
 
 from pysbf2._version import __version__
 from pysbf2.exceptions import (
@@ -30,11 +17,218 @@ from pysbf2.exceptions import (
     SBFStreamError,
     SBFTypeError,
 )
+from pysbf2.sbfbroadcast import SBFBroadcaster, SBFSubscriber
+from pysbf2.sbfcompress import (
+    CHUNK_MAGIC,
+    CHUNK_SIZE,
+    CODEC_ZLIB,
+    CODEC_ZSTD,
+    GZIP_MAGIC,
+    ZSTD_MAGIC,
+    SBFChunkReader,
+    SBFChunkWriter,
+    SBFDecompressor,
+    compress_sbf,
+    open_sbf,
+)
+from pysbf2.sbfdecimate import WEEK_MS, SBFDecimator, frame_time
+from pysbf2.sbfdedup import DEDUP_MAXKEYS, DEDUP_WINDOW, SBFDeduplicator
+from pysbf2.sbffollow import FOLLOW_POLL, SBFFollower, SBFFollowStream
+from pysbf2.sbfframer import SBFFramer
 from pysbf2.sbfhelpers import *
+from pysbf2.sbfindex import (
+    INDEX_EXT,
+    SBFIndex,
+    SBFScanner,
+    bisect_time,
+    index_path,
+)
+from pysbf2.sbfinventory import INVENTORY_BUFSIZE, INVENTORY_GAP, sbf_inventory
+from pysbf2.sbflatency import SBFLatencyHistogram, SBFLatencyReader
+from pysbf2.sbflazy import LazyNMEAMessage, LazyRTCMMessage
+from pysbf2.sbfmerge import SBFMerger
 from pysbf2.sbfmessage import SBFMessage
+from pysbf2.sbfoverload import (
+    DECODE,
+    LOWPRIORITY_BLOCKS,
+    OVERLOAD_DECIMATE,
+    OVERLOAD_PASSTHROUGH,
+    PRIORITY_BLOCKS,
+    SHED_DROP,
+    SHED_UNDECODED,
+    SBFOverloadPolicy,
+)
 from pysbf2.sbfreader import SBFReader
-from pysbf2.sbftypes_blocks import *
+from pysbf2.sbfrelay import (
+    DROP_CLIENT,
+    DROP_NEWEST,
+    DROP_OLDEST,
+    SBFRelay,
+    SBFRelayClient,
+)
 from pysbf2.sbftypes_core import *
 from pysbf2.sbftypes_decodes import *
+from pysbf2.sbfview import SBFView, compile_fields
+from pysbf2.sbfwriter import (
+    FSYNC_CLOSE,
+    FSYNC_FLUSH,
+    FSYNC_NONE,
+    HOUR_MS,
+    WRITE_BUFSIZE,
+    SBFWriter,
+)
 
 version = __version__  # pylint: disable=invalid-name
+
+# names which are only imported from their source module when first accessed
+_LAZY_IMPORTS = {
+    **dict.fromkeys(
+        (
+            "SocketWrapper",
+            "area",
+            "bearing",
+            "ecef2llh",
+            "haversine",
+            "latlon2dmm",
+            "latlon2dms",
+            "llh2ecef",
+            "llh2iso6709",
+            "planar",
+            "utc2wnotow",
+            "wnotow2utc",
+        ),
+        "pynmeagps",
+    ),
+    **dict.fromkeys(
+        (
+            "SBF_BLOCKS",
+            "SBF_MEASUREMENT_BLOCKS",
+            "SBF_NAVIGATION_PAGE_BLOCKS",
+            "SBF_GPS_DECODED_MESSAGE_BLOCKS",
+            "SBF_GLONASS_DECODED_MESSAGE_BLOCKS",
+            "SBF_GALILEO_DECODED_MESSAGE_BLOCKS",
+            "SBF_BEIDOU_DECODED_MESSAGE_BLOCKS",
+            "SBF_NAVIC_DECODED_MESSAGE_BLOCKS",
+            "SBF_QZSS_DECODED_MESSAGE_BLOCKS",
+            "SBF_SBAS_L1_DECODED_MESSAGE_BLOCKS",
+            "SBF_GNSS_POSITION_VELOCITY_TIME_BLOCKS",
+            "SBF_GNSS_ATTITUDE_BLOCKS",
+            "SBF_RECEIVER_TIME_BLOCKS",
+            "SBF_EXTERNAL_EVENT_BLOCKS",
+            "SBF_DIFFERENTIAL_CORRECTION_BLOCKS",
+            "SBF_LBAND_DEMODULATOR_BLOCKS",
+            "SBF_STATUS_BLOCKS",
+            "SBF_MISCELLANEOUS_BLOCKS",
+        ),
+        "pysbf2.sbftypes_blocks",
+    ),
+    **dict.fromkeys(
+        (
+            "BACKEND_INLINE",
+            "BACKEND_PROCESS",
+            "BACKEND_THREAD",
+            "BENCH_BACKENDS",
+            "BENCH_MODES",
+            "BENCH_SIZE",
+            "BENCH_SOURCES",
+            "BENCH_TOLERANCE",
+            "MEMORY_BLOCKS",
+            "MEMORY_DURATION",
+            "MEMORY_FRAMES",
+            "MEMORY_SAMPLE",
+            "SOURCE_FILE",
+            "SOURCE_MEMORY",
+            "SOURCE_MMAP",
+            "SOURCE_SOCKET",
+            "compare_baseline",
+            "sbf_benchmark",
+            "sbf_memory_benchmark",
+        ),
+        "pysbf2.sbfbenchmark",
+    ),
+    **dict.fromkeys(
+        (
+            "CORPUS_ALL",
+            "CORPUS_MAXGROUP",
+            "CORPUS_PROFILES",
+            "CORPUS_VARIANTS",
+            "SBFCorpus",
+        ),
+        "pysbf2.sbfcorpus",
+    ),
+    **dict.fromkeys(
+        (
+            "HARNESS_ASYNC",
+            "HARNESS_SYNC",
+            "REPLAY_MAXSPEED",
+            "SBFReplayServer",
+            "replay_harness",
+        ),
+        "pysbf2.sbfreplay",
+    ),
+    **dict.fromkeys(
+        (
+            "CLASS_BULK",
+            "CLASS_CRITICAL",
+            "CLASS_NAMES",
+            "CLASS_NORMAL",
+            "DEFAULT_CLASSES",
+            "POOL_PROCESS",
+            "POOL_THREAD",
+            "SBFDecodeScheduler",
+        ),
+        "pysbf2.sbfscheduler",
+    ),
+    **dict.fromkeys(
+        (
+            "SBFIngestServer",
+            "SBFReceiverStats",
+        ),
+        "pysbf2.sbfserver",
+    ),
+    **dict.fromkeys(
+        (
+            "SBFRingBuffer",
+            "SBFRingReader",
+            "get_frames",
+            "put_frames",
+        ),
+        "pysbf2.sbftransport",
+    ),
+}
+
+# public names for 'from pysbf2 import *', including those imported on first access
+__all__ = sorted(
+    ({name for name in globals() if name[0] != "_"} - {"import_module"})
+    | set(_LAZY_IMPORTS)
+)
+
+
+def __getattr__(name: str) -> object:
+    """
+    Import pynmeagps helpers, SBF block definitions and the benchmark,
+    corpus, replay, scheduler, server and transport modules on first
+    access, so that 'import pysbf2' does not incur their import cost.
+
+    :param str name: attribute name
+    :return: attribute value
+    :rtype: object
+    :raises: AttributeError
+    """
+
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_LAZY_IMPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    """
+    Module attributes, including those imported on first access.
+
+    :return: list of attribute names
+    :rtype: list
+    """
+
+    return sorted({*globals(), *_LAZY_IMPORTS})
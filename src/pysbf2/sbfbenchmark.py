@@ -0,0 +1,836 @@
+"""
+sbfbenchmark.py
+
+Throughput benchmark suite, with machine-readable results and
+comparison against a stored baseline.
+
+sbf_benchmark() measures reading throughput (frames/s and MB/s) of a
+synthetic corpus (see SBFCorpus) or recorded SBF data:
+
+- per SBF block type, for each combination of parsing, parsebitfield and
+  validate (in memory);
+- per data source - in memory, file, memory-mapped file and TCP socket
+  (see SBFReplayServer) - with parsing on and off;
+- per parallel decoding backend - inline, and SBFDecodeScheduler thread
+  and process pools.
+
+Each result is identified by a name such as
+"block/MeasEpoch/parsing=1/parsebitfield=1/validate=1", and is the best of
+a number of repeats. compare_baseline() compares results with those of
+a previous run, flagging any whose frame rate has fallen by more than a
+given tolerance, e.g. to check whether an upgrade has slowed down the
+block types which matter to an application.
+
+sbf_memory_benchmark() reports memory allocated, and objects created, per
+decoded frame for each block type, and samples the process resident set
+size (RSS) while reading a long synthetic stream, e.g. to size container
+memory limits.
+
+Also available from the command line, e.g.::
+
+    sbfbenchmark --profile mosaic-X5-20Hz --output results.json
+    sbfbenchmark --baseline results.json --tolerance 0.1
+    sbfbenchmark --memory --duration 3600
+
+Created on 19 Oct 2026
+
+:author: semuadmin (Steve Smith)
+:copyright: semuadmin © 2020
+:license: BSD 3-Clause
+"""
+
+# pylint: disable=too-many-positional-arguments
+
+import gc
+import json
+import os
+import socket
+import sys
+import tempfile
+import tracemalloc
+from argparse import ArgumentParser
+from datetime import datetime, timezone
+from io import BytesIO
+from mmap import ACCESS_READ, mmap
+from platform import platform, python_version
+from time import perf_counter
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None
+
+from pysbf2._version import __version__
+from pysbf2.exceptions import ParameterError
+from pysbf2.sbfcorpus import SBFCorpus
+from pysbf2.sbfreader import SBFReader
+from pysbf2.sbfreplay import REPLAY_MAXSPEED, SBFReplayServer
+from pysbf2.sbfscheduler import (
+    CLASS_BULK,
+    POOL_PROCESS,
+    POOL_THREAD,
+    SBFDecodeScheduler,
+)
+from pysbf2.sbftypes_core import SBF_HDR, SBF_MSGIDS, VALCKSUM, VALNONE
+
+BENCH_SIZE = 1000000
+"""Default corpus size in bytes"""
+BENCH_TOLERANCE = 0.1
+"""Default fractional fall in frame rate regarded as a regression"""
+BENCH_MODES = (
+    (False, True, VALNONE),
+    (False, True, VALCKSUM),
+    (True, False, VALNONE),
+    (True, False, VALCKSUM),
+    (True, True, VALNONE),
+    (True, True, VALCKSUM),
+)
+"""Reader modes as (parsing, parsebitfield, validate)"""
+SOURCE_MEMORY = "memory"
+"""Data source - in-memory buffer"""
+SOURCE_FILE = "file"
+"""Data source - file"""
+SOURCE_MMAP = "mmap"
+"""Data source - memory-mapped file"""
+SOURCE_SOCKET = "socket"
+"""Data source - loopback TCP socket"""
+BENCH_SOURCES = (SOURCE_MEMORY, SOURCE_FILE, SOURCE_MMAP, SOURCE_SOCKET)
+"""Default data sources"""
+BACKEND_INLINE = "inline"
+"""Decoding backend - SBFReader"""
+BACKEND_THREAD = "thread"
+"""Decoding backend - SBFDecodeScheduler thread pool"""
+BACKEND_PROCESS = "process"
+"""Decoding backend - SBFDecodeScheduler process pool"""
+BENCH_BACKENDS = (BACKEND_INLINE, BACKEND_THREAD, BACKEND_PROCESS)
+"""Default decoding backends"""
+MEMORY_BLOCKS = ("MeasEpoch", "PVTGeodetic", "ChannelStatus")
+"""Default block types for memory benchmark"""
+MEMORY_FRAMES = 50
+"""Default number of frames decoded per block type for memory benchmark"""
+MEMORY_DURATION = 3600
+"""Default memory benchmark stream duration in seconds"""
+MEMORY_SAMPLE = 100000000
+"""Default memory benchmark stream bytes between RSS samples"""
+
+
+def sbf_benchmark(
+    data: bytes = None,
+    profile: object = "mosaic-X5-20Hz",
+    size: int = BENCH_SIZE,
+    seed: int = 0,
+    blocks: tuple = None,
+    modes: tuple = BENCH_MODES,
+    sources: tuple = BENCH_SOURCES,
+    backends: tuple = BENCH_BACKENDS,
+    workers: int = None,
+    repeat: int = 3,
+) -> dict:
+    """
+    Run benchmark suite.
+
+    :param bytes data: SBF data to benchmark (None = generate synthetic corpus)
+    :param object profile: synthetic corpus profile (see SBFCorpus)
+        ("mosaic-X5-20Hz")
+    :param int size: synthetic corpus size in bytes (1000000)
+    :param int seed: synthetic corpus random number seed (0)
+    :param tuple blocks: SBF block names to benchmark individually
+        (None = all block types in data, () = none)
+    :param tuple modes: reader modes as (parsing, parsebitfield, validate)
+        to benchmark for each block type (BENCH_MODES)
+    :param tuple sources: data sources to benchmark (BENCH_SOURCES)
+    :param tuple backends: decoding backends to benchmark (BENCH_BACKENDS)
+    :param int workers: number of pool workers (None = executor default)
+    :param int repeat: number of times each benchmark is run, of which the
+        fastest is reported (3)
+    :return: dict of {"meta": {...}, "results": {name: {"frames", "bytes",
+        "seconds", "framerate", "byterate"}}}
+    :rtype: dict
+    :raises: ParameterError (if a source or backend is invalid)
+    """
+    # pylint: disable=too-many-arguments, too-many-locals, too-many-branches
+
+    for source in sources:
+        if source not in BENCH_SOURCES:
+            raise ParameterError(f"Invalid benchmark source {source}")
+    for backend in backends:
+        if backend not in BENCH_BACKENDS:
+            raise ParameterError(f"Invalid benchmark backend {backend}")
+    if data is None:
+        data = SBFCorpus(profile, seed).generate(size)
+    else:
+        profile = None
+    results = {}
+
+    def run(name: str, func: object, *args):
+        best = {"seconds": float("inf")}
+        for _ in range(repeat):
+            start = perf_counter()
+            frames, nbytes = func(*args)
+            seconds = max(perf_counter() - start, 1e-9)
+            if seconds < best["seconds"]:
+                best = {
+                    "frames": frames,
+                    "bytes": nbytes,
+                    "seconds": seconds,
+                    "framerate": frames / seconds,
+                    "byterate": nbytes / seconds,
+                }
+        results[name] = best
+
+    byblock = _split(data)
+    for block in byblock if blocks is None else blocks:
+        bdata = byblock.get(block, b"")
+        for parsing, parsebf, validate in modes:
+            run(
+                f"block/{block}/parsing={int(parsing)}"
+                f"/parsebitfield={int(parsebf)}/validate={validate}",
+                _read_memory,
+                bdata,
+                {"parsing": parsing, "parsebitfield": parsebf, "validate": validate},
+            )
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "benchmark.sbf")
+        with open(path, "wb") as stream:
+            stream.write(data)
+        for source in sources:
+            for parsing in (False, True):
+                run(
+                    f"source/{source}/parsing={int(parsing)}",
+                    _SOURCES[source],
+                    path if source in (SOURCE_FILE, SOURCE_MMAP) else data,
+                    {"parsing": parsing},
+                )
+    for backend in backends:
+        if backend == BACKEND_INLINE:
+            run(f"backend/{backend}", _read_memory, data, {"parsing": True})
+        else:
+            run(f"backend/{backend}", _read_pool, data, backend, workers)
+
+    return {
+        "meta": _meta(profile, bytes=len(data), repeat=repeat),
+        "results": results,
+    }
+
+
+def _meta(profile: object, **kwargs) -> dict:
+    """
+    Describe benchmark environment.
+
+    :param object profile: corpus profile (None = recorded data)
+    :param kwargs: any other items to include
+    :return: dict of environment and benchmark details
+    :rtype: dict
+    """
+
+    return {
+        "pysbf2": __version__,
+        "python": python_version(),
+        "platform": platform(),
+        "time": datetime.now(timezone.utc).isoformat(),
+        "profile": profile if isinstance(profile, str) or profile is None else "custom",
+        **kwargs,
+    }
+
+
+def _split(data: bytes) -> dict:
+    """
+    Split SBF data by block type.
+
+    :param bytes data: SBF data
+    :return: dict of {block name: data}
+    :rtype: dict
+    """
+
+    byblock = {}
+    for raw, _ in SBFReader(BytesIO(data), parsing=False):
+        if raw[0:2] == SBF_HDR:
+            num = int.from_bytes(raw[4:6], "little") & 0x1FFF
+            name = SBF_MSGIDS.get(num, (str(num),))[0]
+            byblock.setdefault(name, bytearray()).extend(raw)
+    return {name: bytes(bdata) for name, bdata in sorted(byblock.items())}
+
+
+def _count(reader: object) -> tuple:
+    """
+    Read to end of stream.
+
+    :param object reader: SBFReader or other iterable of (raw, parsed)
+    :return: tuple of (frames, bytes)
+    :rtype: tuple
+    """
+
+    frames = nbytes = 0
+    for raw, _ in reader:
+        frames += 1
+        nbytes += len(raw)
+    return frames, nbytes
+
+
+def _read_memory(data: bytes, kwargs: dict) -> tuple:
+    """
+    Read from in-memory buffer.
+
+    :param bytes data: SBF data
+    :param dict kwargs: SBFReader keyword arguments
+    :return: tuple of (frames, bytes)
+    :rtype: tuple
+    """
+
+    return _count(SBFReader(BytesIO(data), **kwargs))
+
+
+def _read_file(path: str, kwargs: dict) -> tuple:
+    """
+    Read from file.
+
+    :param str path: file path
+    :param dict kwargs: SBFReader keyword arguments
+    :return: tuple of (frames, bytes)
+    :rtype: tuple
+    """
+
+    with open(path, "rb") as stream:
+        return _count(SBFReader(stream, **kwargs))
+
+
+def _read_mmap(path: str, kwargs: dict) -> tuple:
+    """
+    Read from memory-mapped file.
+
+    :param str path: file path
+    :param dict kwargs: SBFReader keyword arguments
+    :return: tuple of (frames, bytes)
+    :rtype: tuple
+    """
+
+    with open(path, "rb") as stream:
+        with mmap(stream.fileno(), 0, access=ACCESS_READ) as mapped:
+            return _count(SBFReader(mapped, **kwargs))
+
+
+def _read_socket(data: bytes, kwargs: dict) -> tuple:
+    """
+    Read from loopback TCP socket, served by SBFReplayServer at
+    maximum speed.
+
+    :param bytes data: SBF data
+    :param dict kwargs: SBFReader keyword arguments
+    :return: tuple of (frames, bytes)
+    :rtype: tuple
+    """
+
+    with SBFReplayServer(data, speed=REPLAY_MAXSPEED, maxclients=1) as server:
+        server.start()
+        with socket.create_connection(server.address) as sock:
+            return _count(SBFReader(sock, bufsize=65536, **kwargs))
+
+
+_SOURCES = {
+    SOURCE_MEMORY: _read_memory,
+    SOURCE_FILE: _read_file,
+    SOURCE_MMAP: _read_mmap,
+    SOURCE_SOCKET: _read_socket,
+}
+
+
+def _read_pool(data: bytes, backend: str, workers: int) -> tuple:
+    """
+    Read from in-memory buffer, decoding all frames in
+    SBFDecodeScheduler worker pool.
+
+    :param bytes data: SBF data
+    :param str backend: BACKEND_THREAD or BACKEND_PROCESS
+    :param int workers: number of pool workers
+    :return: tuple of (frames, bytes)
+    :rtype: tuple
+    """
+
+    with SBFDecodeScheduler(
+        SBFReader(BytesIO(data), parsing=False),
+        classes={},
+        default=CLASS_BULK,
+        backend=POOL_THREAD if backend == BACKEND_THREAD else POOL_PROCESS,
+        workers=workers,
+    ) as scheduler:
+        return _count(scheduler)
+
+
+def compare_baseline(
+    results: dict, baseline: dict, tolerance: float = BENCH_TOLERANCE
+) -> dict:
+    """
+    Compare benchmark results with baseline results.
+
+    :param dict results: results from sbf_benchmark()
+    :param dict baseline: baseline results from sbf_benchmark()
+    :param float tolerance: fractional fall in frame rate regarded as
+        a regression (0.1)
+    :return: dict of {name: {"baseline", "current", "change", "regression"}}
+        for each result in both, where baseline and current are frame rates
+        and change is fractional change in frame rate
+    :rtype: dict
+    """
+
+    comparison = {}
+    base = baseline["results"]
+    for name, res in results["results"].items():
+        if name not in base or not base[name]["framerate"]:
+            continue
+        before, after = base[name]["framerate"], res["framerate"]
+        change = after / before - 1
+        comparison[name] = {
+            "baseline": before,
+            "current": after,
+            "change": change,
+            "regression": change < -tolerance,
+        }
+    return comparison
+
+
+def sbf_memory_benchmark(
+    profile: object = "mosaic-X5-20Hz",
+    seed: int = 0,
+    blocks: tuple = MEMORY_BLOCKS,
+    frames: int = MEMORY_FRAMES,
+    duration: float = MEMORY_DURATION,
+    size: int = None,
+    parsing: bool = True,
+    parsebitfield: bool = True,
+    validate: int = VALCKSUM,
+    sample: int = MEMORY_SAMPLE,
+) -> dict:
+    """
+    Run memory and allocation benchmark.
+
+    For each block type, a number of synthetic frames are decoded by
+    SBFReader.parse() under tracemalloc and gc counters, reporting per frame:
+
+    - "size" - raw frame size in bytes;
+    - "retained" - bytes held by the decoded SBFMessage;
+    - "allocated" - peak bytes allocated while decoding the frame;
+    - "objects" - memory blocks (i.e. objects) held by the decoded SBFMessage;
+    - "tracked" - gc tracked objects held by the decoded SBFMessage;
+    - "collections" - gc collections triggered while decoding.
+
+    A synthetic stream of the given duration (or size) is then read through
+    SBFReader without being held in memory, sampling the process resident
+    set size (RSS) every `sample` bytes, to show whether RSS stays flat.
+
+    :param object profile: synthetic corpus profile (see SBFCorpus)
+        ("mosaic-X5-20Hz")
+    :param int seed: synthetic corpus random number seed (0)
+    :param tuple blocks: SBF block names to benchmark (MEMORY_BLOCKS,
+        None = all block types in profile)
+    :param int frames: number of frames decoded per block type (50)
+    :param float duration: stream duration in seconds (3600, 0 = no stream)
+    :param int size: stream size in bytes, overriding duration (None)
+    :param bool parsing: parse stream (True) or just frame it (False)
+    :param bool parsebitfield: parse bitfields (True)
+    :param int validate: VALCKSUM (1) = validate checksum,
+        VALNONE (0) = ignore invalid checksum (1)
+    :param int sample: stream bytes between RSS samples (100000000)
+    :return: dict of {"meta": {...}, "blocks": {name: {...}},
+        "stream": {"frames", "bytes", "duration", "seconds", "samples",
+        "rss", "peakrss", "growth"}}
+    :rtype: dict
+    :raises: ParameterError (if a block type is not in profile)
+    """
+    # pylint: disable=too-many-arguments, too-many-locals
+
+    corpus = SBFCorpus(profile, seed)
+    results = {}
+    for block in corpus.templates if blocks is None else blocks:
+        if block not in corpus.templates:
+            raise ParameterError(f"Invalid block type {block} for profile")
+        templates = corpus.templates[block]
+        raws = [bytes(templates[i % len(templates)]) for i in range(frames)]
+        results[block] = _allocations(raws, validate, parsebitfield)
+    stream = None
+    if duration or size is not None:
+        stream = _memory_stream(
+            corpus, duration, size, parsing, parsebitfield, validate, sample
+        )
+    return {
+        "meta": _meta(
+            profile,
+            parsing=parsing,
+            parsebitfield=parsebitfield,
+            validate=validate,
+        ),
+        "blocks": results,
+        "stream": stream,
+    }
+
+
+def _allocations(raws: list, validate: int, parsebitfield: bool) -> dict:
+    """
+    Measure memory allocated decoding raw frames.
+
+    :param list raws: raw frames
+    :param int validate: validate checksum
+    :param bool parsebitfield: parse bitfields
+    :return: dict of per frame "size", "retained", "allocated", "objects",
+        "tracked" and "collections"
+    :rtype: dict
+    """
+
+    count = len(raws)
+    for raw in set(raws):  # warm up any lazily loaded definitions
+        SBFReader.parse(raw, validate, parsebitfield)
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    gc.collect()
+    tracked = len(gc.get_objects())
+    objects = sys.getallocatedblocks()
+    collections = _collections()
+    base = tracemalloc.get_traced_memory()[0]
+    held = [SBFReader.parse(raw, validate, parsebitfield) for raw in raws]
+    retained = tracemalloc.get_traced_memory()[0] - base
+    objects = sys.getallocatedblocks() - objects - 1  # excluding held list
+    tracked = len(gc.get_objects()) - tracked - 1
+    del held
+    allocated = 0
+    for raw in raws:
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        SBFReader.parse(raw, validate, parsebitfield)
+        allocated += tracemalloc.get_traced_memory()[1] - before
+    collections = _collections() - collections
+    if not tracing:
+        tracemalloc.stop()
+    return {
+        "frames": count,
+        "size": sum(len(raw) for raw in raws) / count,
+        "retained": retained / count,
+        "allocated": allocated / count,
+        "objects": objects / count,
+        "tracked": tracked / count,
+        "collections": collections / (count * 2),
+    }
+
+
+def _collections() -> int:
+    """
+    Get number of gc collections to date, in all generations.
+
+    :return: number of collections
+    :rtype: int
+    """
+
+    return sum(stat["collections"] for stat in gc.get_stats())
+
+
+def _memory_stream(
+    corpus: SBFCorpus,
+    duration: float,
+    size: int,
+    parsing: bool,
+    parsebitfield: bool,
+    validate: int,
+    sample: int,
+) -> dict:
+    """
+    Read synthetic stream, sampling RSS.
+
+    :param SBFCorpus corpus: synthetic corpus
+    :param float duration: stream duration in seconds
+    :param int size: stream size in bytes, overriding duration
+    :param bool parsing: parse stream
+    :param bool parsebitfield: parse bitfields
+    :param int validate: validate checksum
+    :param int sample: stream bytes between RSS samples
+    :return: dict of stream results
+    :rtype: dict
+    """
+    # pylint: disable=too-many-arguments, too-many-locals
+
+    count = None if size is not None else int(duration * 1000 // corpus.interval)
+    stream = _CorpusStream(corpus.epochs(count), size)
+    reader = SBFReader(
+        stream, parsing=parsing, parsebitfield=parsebitfield, validate=validate
+    )
+    frames = nbytes = 0
+    samples = []
+    due = sample
+    start = perf_counter()
+    for raw, _ in reader:
+        frames += 1
+        nbytes += len(raw)
+        if nbytes >= due:
+            samples.append([nbytes, _rss()])
+            due += sample
+    seconds = perf_counter() - start
+    samples.append([nbytes, _rss()])
+    return {
+        "frames": frames,
+        "bytes": nbytes,
+        "duration": stream.epochs * corpus.interval / 1000,
+        "seconds": seconds,
+        "samples": samples,
+        "rss": samples[-1][1],
+        "peakrss": _peakrss(),
+        "growth": samples[-1][1] - samples[0][1],
+    }
+
+
+class _CorpusStream:  # pylint: disable=too-few-public-methods
+    """
+    Read-only stream of synthetic corpus epochs, generated as they are read.
+    """
+
+    def __init__(self, epochs: object, size: int = None):
+        """
+        Constructor.
+
+        :param object epochs: generator of epochs (see SBFCorpus.epochs())
+        :param int size: minimum stream size in bytes (None = all epochs)
+        """
+
+        self._epochs = epochs
+        self._size = size
+        self._buf = bytearray()
+        self.bytes = 0
+        """Bytes generated"""
+        self.epochs = 0
+        """Epochs generated"""
+
+    def read(self, size: int) -> bytes:
+        """
+        Read bytes from stream.
+
+        :param int size: number of bytes to read
+        :return: bytes (fewer than size at end of stream)
+        :rtype: bytes
+        """
+
+        while len(self._buf) < size and (self._size is None or self.bytes < self._size):
+            frames = next(self._epochs, None)
+            if frames is None:
+                break
+            for raw in frames:
+                self._buf += raw
+                self.bytes += len(raw)
+            self.epochs += 1
+        data = bytes(self._buf[:size])
+        del self._buf[:size]
+        return data
+
+
+def _rss() -> int:
+    """
+    Get current resident set size of this process.
+
+    :return: RSS in bytes (peak RSS if current RSS not available)
+    :rtype: int
+    """
+
+    try:
+        with open("/proc/self/statm", "rb") as stream:
+            return int(stream.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:  # pragma: no cover
+        return _peakrss()
+
+
+def _peakrss() -> int:
+    """
+    Get peak resident set size of this process.
+
+    :return: peak RSS in bytes (0 if not available)
+    :rtype: int
+    """
+
+    if resource is None:  # pragma: no cover
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _report(results: dict, comparison: dict = None) -> str:
+    """
+    Format benchmark results (and comparison) as text.
+
+    :param dict results: results from sbf_benchmark()
+    :param dict comparison: comparison from compare_baseline() (None)
+    :return: report
+    :rtype: str
+    """
+
+    meta = results["meta"]
+    lines = [
+        f"pysbf2 {meta['pysbf2']}, Python {meta['python']}, {meta['platform']}",
+        f"{meta['bytes']:,} bytes, profile {meta['profile']}, best of {meta['repeat']}",
+        "",
+        f"{'benchmark':<60} {'frames/s':>12} {'MB/s':>8}"
+        + (f" {'change':>8}" if comparison is not None else ""),
+    ]
+    for name, res in results["results"].items():
+        line = f"{name:<60} {res['framerate']:>12,.1f} {res['byterate'] / 1e6:>8.3f}"
+        if comparison is not None and name in comparison:
+            cmp = comparison[name]
+            line += f" {cmp['change']:>+8.1%}" + (
+                " REGRESSION" if cmp["regression"] else ""
+            )
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def _memory_report(results: dict) -> str:
+    """
+    Format memory benchmark results as text.
+
+    :param dict results: results from sbf_memory_benchmark()
+    :return: report
+    :rtype: str
+    """
+
+    meta = results["meta"]
+    lines = [
+        f"pysbf2 {meta['pysbf2']}, Python {meta['python']}, {meta['platform']}",
+        f"profile {meta['profile']}",
+        "",
+        f"{'block':<24} {'size':>8} {'retained':>10} {'allocated':>10}"
+        f" {'objects':>8} {'tracked':>8} {'gc':>8}",
+    ]
+    for name, res in results["blocks"].items():
+        lines.append(
+            f"{name:<24} {res['size']:>8.0f} {res['retained']:>10.0f}"
+            f" {res['allocated']:>10.0f} {res['objects']:>8.1f}"
+            f" {res['tracked']:>8.1f} {res['collections']:>8.4f}"
+        )
+    stream = results["stream"]
+    if stream is not None:
+        lines += [
+            "",
+            f"stream {stream['duration']:,.0f} s, {stream['frames']:,} frames,"
+            f" {stream['bytes']:,} bytes in {stream['seconds']:,.1f} s",
+            f"RSS {stream['rss'] / 2**20:,.1f} MB, peak {stream['peakrss'] / 2**20:,.1f}"
+            f" MB, growth {stream['growth'] / 2**20:+,.1f} MB",
+        ]
+        for nbytes, rss in stream["samples"]:
+            lines.append(f"{nbytes:>16,} bytes {rss / 2**20:>10,.1f} MB")
+    return "\n".join(lines)
+
+
+def main(args: list = None) -> int:
+    """
+    CLI Entry point.
+
+    :param list args: command line arguments (None = sys.argv)
+    :return: exit status - 0 = OK, 1 = regression against baseline
+    :rtype: int
+    """
+
+    parser = ArgumentParser(description="Benchmark pysbf2 throughput.")
+    parser.add_argument(
+        "--input", help="SBF file to benchmark (default synthetic corpus)"
+    )
+    parser.add_argument("--profile", default="mosaic-X5-20Hz", help="corpus profile")
+    parser.add_argument(
+        "--size", type=int, default=BENCH_SIZE, help="corpus size in bytes"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="corpus random number seed")
+    parser.add_argument("--blocks", nargs="*", help="block types to benchmark")
+    parser.add_argument(
+        "--sources", nargs="*", default=BENCH_SOURCES, choices=BENCH_SOURCES
+    )
+    parser.add_argument(
+        "--backends", nargs="*", default=BENCH_BACKENDS, choices=BENCH_BACKENDS
+    )
+    parser.add_argument("--workers", type=int, help="pool workers")
+    parser.add_argument("--repeat", type=int, default=3, help="repeats of each run")
+    parser.add_argument("--output", help="JSON results file")
+    parser.add_argument("--baseline", help="JSON baseline results file")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=BENCH_TOLERANCE,
+        help="fractional fall in frame rate regarded as regression",
+    )
+    parser.add_argument(
+        "--format", choices=("text", "json"), default="text", help="output format"
+    )
+    parser.add_argument(
+        "--memory",
+        action="store_true",
+        help="run memory and allocation benchmark of synthetic corpus instead",
+    )
+    parser.add_argument(
+        "--frames", type=int, default=MEMORY_FRAMES, help="memory frames per block"
+    )
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=MEMORY_DURATION,
+        help="memory stream duration in seconds",
+    )
+    parser.add_argument(
+        "--streamsize",
+        type=int,
+        help="memory stream size in bytes (overrides duration)",
+    )
+    parser.add_argument(
+        "--sample",
+        type=int,
+        default=MEMORY_SAMPLE,
+        help="memory stream bytes between RSS samples",
+    )
+    parser.add_argument(
+        "--noparse", action="store_true", help="frame memory stream without parsing"
+    )
+    kwargs = parser.parse_args(args)
+
+    if kwargs.memory:
+        results = sbf_memory_benchmark(
+            kwargs.profile,
+            kwargs.seed,
+            MEMORY_BLOCKS if kwargs.blocks is None else tuple(kwargs.blocks) or None,
+            kwargs.frames,
+            kwargs.duration,
+            kwargs.streamsize,
+            not kwargs.noparse,
+            sample=kwargs.sample,
+        )
+        if kwargs.output is not None:
+            with open(kwargs.output, "w", encoding="utf-8") as stream:
+                json.dump(results, stream, indent=2)
+        if kwargs.format == "json":
+            print(json.dumps(results, indent=2))
+        else:
+            print(_memory_report(results))
+        return 0
+
+    data = None
+    if kwargs.input is not None:
+        with open(kwargs.input, "rb") as stream:
+            data = stream.read()
+    results = sbf_benchmark(
+        data,
+        kwargs.profile,
+        kwargs.size,
+        kwargs.seed,
+        None if kwargs.blocks is None else tuple(kwargs.blocks),
+        sources=tuple(kwargs.sources),
+        backends=tuple(kwargs.backends),
+        workers=kwargs.workers,
+        repeat=kwargs.repeat,
+    )
+    comparison = None
+    if kwargs.baseline is not None:
+        with open(kwargs.baseline, "r", encoding="utf-8") as stream:
+            comparison = compare_baseline(results, json.load(stream), kwargs.tolerance)
+    if kwargs.output is not None:
+        with open(kwargs.output, "w", encoding="utf-8") as stream:
+            json.dump(results, stream, indent=2)
+    if kwargs.format == "json":
+        print(json.dumps({**results, "comparison": comparison}, indent=2))
+    else:
+        print(_report(results, comparison))
+    if comparison is not None and any(c["regression"] for c in comparison.values()):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,334 @@
+"""
+sbfbroadcast.py
+
+In-process broadcast hub, which reads frames from a single SBFReader
+and delivers them to any number of subscribers (e.g. a logger, a PVT
+monitor and a QC engine), each with its own bounded queue and optional
+SBF block type filter.
+
+Raw frames and parsed messages are shared between subscribers rather
+than copied (both are immutable). Each frame is parsed at most once,
+and only if at least one subscriber which wants it requires parsed
+output.
+
+Created on 19 Oct 2026
+
+:author: semuadmin (Steve Smith)
+:copyright: semuadmin © 2020
+:license: BSD 3-Clause
+"""
+
+from logging import getLogger
+from queue import Empty, Full, Queue
+from threading import Event, Lock, Thread
+from time import monotonic
+
+from pysbf2.exceptions import ParameterError
+from pysbf2.sbfhelpers import msgids2nums
+from pysbf2.sbfreader import SBFReader
+from pysbf2.sbftypes_core import ERR_LOG, SBF_HDR, VALCKSUM
+
+EOFPOLL = 0.1
+"""Interval at which waiting subscribers check for end of stream,
+and a hub blocked on a full queue checks for stop(), in seconds"""
+
+
+class SBFSubscriber:
+    """
+    Broadcast hub subscriber, created by SBFBroadcaster.subscribe().
+    """
+
+    def __init__(
+        self,
+        msgfilter: object = None,
+        parsing: bool = False,
+        maxsize: int = 1000,
+        block: bool = False,
+    ):
+        """
+        Constructor.
+
+        :param object msgfilter: collection of SBF block names (e.g. "PVTGeodetic")
+            or numbers to be delivered; other frames (including NMEA and
+            RTCM3) are not delivered (None = deliver all frames)
+        :param bool parsing: True = deliver parsed data, False = raw frames only (False)
+        :param int maxsize: maximum number of undelivered frames queued (1000)
+        :param bool block: True = hub waits for space in a full queue,
+            False = newest frames are dropped when queue is full (False)
+        :raises: ParameterError (if msgfilter is invalid)
+        """
+
+        self._filter = None if msgfilter is None else msgids2nums(msgfilter)
+        self._parsing = parsing
+        self._block = block
+        self._queue = Queue(maxsize)
+        self._eof = Event()
+        self.delivered = 0
+        """Number of frames queued for this subscriber"""
+        self.dropped = 0
+        """Number of frames dropped because queue was full"""
+
+    def __iter__(self):
+        """Iterator."""
+
+        return self
+
+    def __next__(self) -> tuple:
+        """
+        Return next item in iteration, waiting until a frame is
+        available or the broadcast has ended.
+
+        :return: tuple of (raw_data as bytes, parsed_data)
+        :rtype: tuple
+        :raises: StopIteration (at end of broadcast)
+        """
+
+        raw_data, parsed_data = self.get()
+        if raw_data is None:
+            raise StopIteration
+        return (raw_data, parsed_data)
+
+    def wants(self, blocknum: int) -> bool:
+        """
+        Check if this subscriber wants a frame.
+
+        :param int blocknum: SBF block number, or None if frame is not SBF
+        :return: True if frame passes msgfilter
+        :rtype: bool
+        """
+
+        return self._filter is None or blocknum in self._filter
+
+    def put(self, raw: bytes, parsed: object, stop: Event = None):
+        """
+        Queue frame for this subscriber, according to the block policy.
+
+        :param bytes raw: raw frame
+        :param object parsed: parsed message, or None
+        :param Event stop: event which, when set, abandons waiting for
+            space in a full queue and drops the frame (None)
+        """
+
+        timeout = None if stop is None else EOFPOLL
+        while True:
+            try:
+                self._queue.put((raw, parsed), block=self._block, timeout=timeout)
+                self.delivered += 1
+                return
+            except Full:
+                if not self._block or stop.is_set():
+                    self.dropped += 1
+                    return
+
+    def get(self, timeout: float = None) -> tuple:
+        """
+        Get next frame.
+
+        :param float timeout: time to wait for a frame, in seconds
+            (None = wait until a frame is available or the broadcast ends)
+        :return: tuple of (raw_data as bytes, parsed_data), or
+            (None, None) if no frame available
+        :rtype: tuple
+        """
+
+        deadline = None if timeout is None else monotonic() + timeout
+        while True:
+            wait = EOFPOLL if deadline is None else min(EOFPOLL, deadline - monotonic())
+            try:
+                return self._queue.get(timeout=max(wait, 0))
+            except Empty:
+                if self._eof.is_set() and self._queue.empty():
+                    return (None, None)
+                if deadline is not None and monotonic() >= deadline:
+                    return (None, None)
+
+    def close(self):
+        """
+        Signal end of broadcast. Any frames already queued can
+        still be retrieved.
+        """
+
+        self._eof.set()
+
+    @property
+    def parsing(self) -> bool:
+        """
+        Getter for parsing flag.
+
+        :return: True if subscriber wants parsed data
+        :rtype: bool
+        """
+
+        return self._parsing
+
+    @property
+    def qsize(self) -> int:
+        """
+        Getter for number of frames queued but not yet retrieved.
+
+        :return: queue size
+        :rtype: int
+        """
+
+        return self._queue.qsize()
+
+
+class SBFBroadcaster:
+    """
+    In-process broadcast hub.
+    """
+
+    def __init__(
+        self,
+        reader: SBFReader,
+        validate: int = VALCKSUM,
+        parsebitfield: bool = True,
+        quitonerror: int = ERR_LOG,
+        errorhandler: object = None,
+    ):
+        """
+        Constructor.
+
+        :param SBFReader reader: source of frames, which must be created
+            with parsing=False (parsing is done by the hub as required)
+        :param int validate: VALCKSUM (1) = Validate checksum,
+            VALNONE (0) = ignore invalid checksum (1)
+        :param bool parsebitfield: 1 = parse bitfields, 0 = leave as bytes (1)
+        :param int quitonerror: ERR_IGNORE (0) = ignore errors,  ERR_LOG (1) = log continue,
+            ERR_RAISE (2) = (re)raise (1)
+        :param object errorhandler: error handling object or function (None)
+        :raises: ParameterError (if reader is parsing)
+        """
+
+        if reader.parsing:
+            raise ParameterError(
+                "Broadcast hub requires an SBFReader created with parsing=False"
+            )
+        self._reader = reader
+        self._validate = validate
+        self._parsebf = parsebitfield
+        self._quitonerror = quitonerror
+        self._errorhandler = errorhandler
+        self._logger = getLogger(__name__)
+        self._subscribers = ()
+        self._lock = Lock()
+        self._stop = Event()
+        self._thread = None
+        self.frames = 0
+        """Number of frames read"""
+        self.parsed = 0
+        """Number of frames parsed"""
+
+    def subscribe(self, **kwargs) -> SBFSubscriber:
+        """
+        Add subscriber.
+
+        :param kwargs: SBFSubscriber keyword arguments
+        :return: new subscriber
+        :rtype: SBFSubscriber
+        """
+
+        sub = SBFSubscriber(**kwargs)
+        with self._lock:
+            self._subscribers += (sub,)
+        return sub
+
+    def unsubscribe(self, sub: SBFSubscriber):
+        """
+        Remove subscriber.
+
+        :param SBFSubscriber sub: subscriber
+        """
+
+        with self._lock:
+            self._subscribers = tuple(s for s in self._subscribers if s is not sub)
+
+    def publish(self, raw: bytes):
+        """
+        Deliver frame to all subscribers which want it, parsing
+        it once if any of them require parsed data.
+
+        :param bytes raw: raw frame
+        """
+
+        self.frames += 1
+        blocknum = None
+        if raw[0:2] == SBF_HDR:
+            blocknum = int.from_bytes(raw[4:6], "little") & 0x1FFF
+        subs = [s for s in self._subscribers if s.wants(blocknum)]
+        parsed = None
+        if any(s.parsing for s in subs):
+            try:
+                parsed = SBFReader.parse_frame(raw, self._validate, self._parsebf)
+                self.parsed += 1
+            except SBFReader.parse_errors() as err:
+                self._do_error(err)
+        for sub in subs:
+            sub.put(raw, parsed if sub.parsing else None, self._stop)
+
+    def run(self, limit: int = 0) -> int:
+        """
+        Read and deliver frames until the stream is exhausted, the
+        limit is reached or stop() is called. Subscribers are then
+        notified that the broadcast has ended.
+
+        :param int limit: maximum number of frames to read (0 = no limit)
+        :return: number of frames read
+        :rtype: int
+        """
+
+        count = 0
+        self._stop.clear()
+        try:
+            for raw, _ in self._reader:
+                self.publish(raw)
+                count += 1
+                if count == limit or self._stop.is_set():
+                    break
+        finally:
+            for sub in self._subscribers:
+                sub.close()
+        return count
+
+    def start(self):
+        """
+        Run broadcast in background thread.
+        """
+
+        self._thread = Thread(target=self.run, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = None):
+        """
+        Stop background broadcast thread. A hub waiting for space in a
+        blocking subscriber's full queue drops the frame and stops.
+
+        :param float timeout: time to wait for thread to stop, in seconds
+            (None = wait indefinitely)
+        """
+
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _do_error(self, err: Exception):
+        """
+        Handle parsing error.
+
+        :param Exception err: error
+        :raises: Exception if quitonerror = ERR_RAISE (2)
+        """
+
+        SBFReader.handle_error(err, self._quitonerror, self._errorhandler, self._logger)
+
+    @property
+    def subscribers(self) -> tuple:
+        """
+        Getter for current subscribers.
+
+        :return: tuple of subscribers
+        :rtype: tuple
+        """
+
+        return self._subscribers
@@ -0,0 +1,651 @@
+"""
+sbfcompress.py
+
+Compressed SBF log support.
+
+open_sbf() opens an SBF log for reading by SBFReader, detecting its
+compression from its content:
+
+- gzip ('.sbf.gz') and zstandard ('.sbf.zst') logs are decompressed
+  in a background thread into a bounded buffer of decompressed chunks,
+  so that decompression and decoding run in parallel. zstandard support
+  requires Python 3.14+ or the 'zstandard' package.
+- chunked ('.sbfz') logs consist of independently compressed chunks
+  plus a chunk index, so the decompressed stream is seekable, and a
+  time window can be found by SBFReader.seek_time() by decompressing
+  only a few chunks. The next chunk is decompressed in the background
+  while the current one is read. Chunked logs are written by
+  SBFChunkWriter, or converted from any other log by compress_sbf().
+- anything else is opened as an uncompressed file.
+
+Created on 19 Oct 2026
+
+:author: semuadmin (Steve Smith)
+:copyright: semuadmin © 2020
+:license: BSD 3-Clause
+"""
+
+import struct
+import zlib
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from importlib import import_module
+from queue import Empty, Full, Queue
+from threading import Event, Thread
+
+from pysbf2.exceptions import ParameterError, SBFStreamError
+
+GZIP_MAGIC = b"\x1f\x8b"
+"""gzip file signature"""
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+"""zstandard frame signature"""
+CHUNK_MAGIC = b"SBFZ"
+"""Chunked compressed SBF file signature"""
+CODEC_ZLIB = 0
+"""Chunk compression codec - zlib"""
+CODEC_ZSTD = 1
+"""Chunk compression codec - zstandard"""
+CHUNK_SIZE = 1048576
+"""Default uncompressed chunk size in bytes"""
+
+_HEADER = struct.Struct("<4sBB2x")  # magic, version, codec
+_ENTRY = struct.Struct("<QQI")  # uncompressed offset, compressed offset, length
+_TRAILER = struct.Struct("<QQI4s")  # uncompressed size, index offset, chunks, magic
+_POLL = 0.1  # interval at which blocked threads check for close, in seconds
+
+
+def _zstd() -> object:
+    """
+    Import zstandard module, which is only required for zstandard logs.
+
+    :return: compression.zstd (Python 3.14+) or zstandard module
+    :rtype: object
+    :raises: SBFStreamError (if neither is available)
+    """
+
+    for name in ("compression.zstd", "zstandard"):
+        try:
+            return import_module(name)
+        except ImportError:
+            pass
+    raise SBFStreamError(
+        "zstandard compression requires Python 3.14+ or the zstandard package "
+        "(pip install pysbf2[zstd])"
+    )
+
+
+def _decompressor(codec: int) -> object:
+    """
+    Create incremental decompressor.
+
+    :param int codec: CODEC_ZLIB (0) or CODEC_ZSTD (1)
+    :return: decompressor with decompress() method and eof attribute
+    :rtype: object
+    """
+
+    if codec == CODEC_ZSTD:
+        zstd = _zstd()
+        if zstd.__name__ == "zstandard":
+            return zstd.ZstdDecompressor().decompressobj()
+        return zstd.ZstdDecompressor()
+    return zlib.decompressobj(wbits=47)  # zlib or gzip header
+
+
+def _compress(data: bytes, codec: int) -> bytes:
+    """
+    Compress chunk.
+
+    :param bytes data: data
+    :param int codec: CODEC_ZLIB (0) or CODEC_ZSTD (1)
+    :return: compressed data
+    :rtype: bytes
+    """
+
+    if codec == CODEC_ZSTD:
+        return _zstd().compress(data)
+    return zlib.compress(data)
+
+
+def _decompress(data: bytes, codec: int) -> bytes:
+    """
+    Decompress chunk.
+
+    :param bytes data: compressed data
+    :param int codec: CODEC_ZLIB (0) or CODEC_ZSTD (1)
+    :return: data
+    :rtype: bytes
+    """
+
+    if codec == CODEC_ZSTD:
+        return _zstd().decompress(data)
+    return zlib.decompress(data)
+
+
+class SBFDecompressor:
+    """
+    Stream decompressor, which decompresses a gzip or zstandard stream
+    in a background thread.
+    """
+
+    def __init__(
+        self,
+        stream,
+        codec: int = CODEC_ZLIB,
+        bufsize: int = 262144,
+        maxchunks: int = 16,
+    ):
+        """
+        Constructor.
+
+        :param stream: compressed input stream supporting read(n)
+        :param int codec: CODEC_ZLIB (0) for gzip or zlib, or CODEC_ZSTD (1)
+        :param int bufsize: compressed bytes read at a time (262144)
+        :param int maxchunks: maximum number of decompressed chunks buffered (16)
+        :raises: SBFStreamError (if zstandard is required but unavailable)
+        """
+
+        self._stream = stream
+        self._codec = codec
+        self._bufsize = bufsize
+        self._decomp = _decompressor(codec)
+        self._queue = Queue(maxchunks)
+        self._buf = bytearray()
+        self._eof = False
+        self._stop = Event()
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        """
+        Context manager enter routine.
+        """
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        """
+        Context manager exit routine.
+        """
+
+        self.close()
+
+    def _run(self):
+        """
+        Decompress stream into queue of chunks, ending with b"" at
+        end of stream, or the exception which ended decompression.
+        """
+
+        decomp = self._decomp
+        try:
+            while not self._stop.is_set():
+                data = self._stream.read(self._bufsize)
+                if not data:
+                    break
+                while data:
+                    chunk = decomp.decompress(data)
+                    if chunk:
+                        self._put(chunk)
+                    data = b""
+                    if decomp.eof:  # concatenated gzip member or zstd frame
+                        data = decomp.unused_data
+                        decomp = _decompressor(self._codec)
+            self._put(b"")
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            self._put(SBFStreamError(f"Decompression failed - {err}"))
+
+    def _put(self, item: object):
+        """
+        Queue item, waiting for space unless closed.
+
+        :param object item: decompressed chunk or exception
+        """
+
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=_POLL)
+                return
+            except Full:
+                pass
+
+    def read(self, size: int = -1) -> bytes:
+        """
+        Read decompressed data.
+
+        :param int size: number of bytes to read (-1 = all remaining)
+        :return: data (fewer than size bytes at end of stream)
+        :rtype: bytes
+        :raises: SBFStreamError (if stream could not be decompressed)
+        """
+
+        while not self._eof and (size < 0 or len(self._buf) < size):
+            self._fill()
+        return self._take(size)
+
+    def readline(self, size: int = -1) -> bytes:
+        """
+        Read decompressed data up to and including LF (0x0a) terminator.
+
+        :param int size: maximum number of bytes to read (-1 = no limit)
+        :return: data
+        :rtype: bytes
+        :raises: SBFStreamError (if stream could not be decompressed)
+        """
+
+        while True:
+            end = self._buf.find(b"\x0a", 0, None if size < 0 else size)
+            if end >= 0:
+                return self._take(end + 1)
+            if self._eof or 0 <= size <= len(self._buf):
+                return self._take(size)
+            self._fill()
+
+    def _fill(self):
+        """
+        Add next decompressed chunk to buffer, waiting until it is available.
+
+        :raises: SBFStreamError (if stream could not be decompressed)
+        """
+
+        chunk = self._queue.get()
+        if isinstance(chunk, Exception):
+            self._eof = True
+            raise chunk
+        if not chunk:
+            self._eof = True
+        self._buf += chunk
+
+    def _take(self, size: int) -> bytes:
+        """
+        Remove data from start of buffer.
+
+        :param int size: number of bytes (-1 = all)
+        :return: data
+        :rtype: bytes
+        """
+
+        if size < 0:
+            size = len(self._buf)
+        data = bytes(self._buf[:size])
+        del self._buf[:size]
+        return data
+
+    def readable(self) -> bool:
+        """
+        Check if stream is readable.
+
+        :return: True
+        :rtype: bool
+        """
+
+        return True
+
+    def seekable(self) -> bool:
+        """
+        Check if stream is seekable.
+
+        :return: False
+        :rtype: bool
+        """
+
+        return False
+
+    def close(self):
+        """
+        Stop background decompression and close underlying stream.
+        """
+
+        self._stop.set()
+        try:
+            while True:  # unblock background thread
+                self._queue.get_nowait()
+        except Empty:
+            pass
+        self._thread.join()
+        self._stream.close()
+
+
+class SBFChunkWriter:
+    """
+    Writer of chunked compressed SBF files, consisting of independently
+    compressed chunks followed by a chunk index.
+    """
+
+    def __init__(
+        self,
+        stream,
+        chunksize: int = CHUNK_SIZE,
+        codec: int = CODEC_ZLIB,
+    ):
+        """
+        Constructor.
+
+        :param stream: output stream, or file path
+        :param int chunksize: uncompressed chunk size in bytes (1048576)
+        :param int codec: CODEC_ZLIB (0) or CODEC_ZSTD (1)
+        :raises: ParameterError (if codec is invalid)
+        """
+
+        if codec not in (CODEC_ZLIB, CODEC_ZSTD):
+            raise ParameterError(f"Invalid compression codec {codec}")
+        self._owner = isinstance(stream, str)
+        # pylint: disable=consider-using-with
+        self._stream = open(stream, "wb") if self._owner else stream
+        self._chunksize = chunksize
+        self._codec = codec
+        self._buf = bytearray()
+        self._index = []
+        self._size = 0  # uncompressed bytes written
+        self._offset = _HEADER.size  # compressed bytes written
+        self._stream.write(_HEADER.pack(CHUNK_MAGIC, 1, codec))
+
+    def __enter__(self):
+        """
+        Context manager enter routine.
+        """
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        """
+        Context manager exit routine.
+        """
+
+        self.close()
+
+    def write(self, data: bytes) -> int:
+        """
+        Write data.
+
+        :param bytes data: data e.g. raw SBF frames
+        :return: number of bytes written
+        :rtype: int
+        """
+
+        self._buf += data
+        while len(self._buf) >= self._chunksize:
+            self._flush_chunk(self._chunksize)
+        return len(data)
+
+    def _flush_chunk(self, size: int):
+        """
+        Compress and write chunk from buffer.
+
+        :param int size: uncompressed chunk size
+        """
+
+        comp = _compress(bytes(self._buf[:size]), self._codec)
+        del self._buf[:size]
+        self._stream.write(comp)
+        self._index.append((self._size, self._offset, len(comp)))
+        self._size += size
+        self._offset += len(comp)
+
+    def close(self):
+        """
+        Write any remaining data and chunk index, and close stream
+        if it was opened by this writer.
+        """
+
+        if self._buf:
+            self._flush_chunk(len(self._buf))
+        self._stream.write(b"".join(_ENTRY.pack(*entry) for entry in self._index))
+        self._stream.write(
+            _TRAILER.pack(self._size, self._offset, len(self._index), CHUNK_MAGIC)
+        )
+        if self._owner:
+            self._stream.close()
+
+
+class SBFChunkReader:
+    """
+    Seekable reader of chunked compressed SBF files, which decompresses
+    only the chunks which are read, prefetching the next chunk in a
+    background thread.
+    """
+
+    def __init__(self, stream):
+        """
+        Constructor.
+
+        :param stream: seekable chunked compressed input stream
+        :raises: SBFStreamError (if stream is not a valid chunked file)
+        """
+
+        self._stream = stream
+        self.name = getattr(stream, "name", None)
+        stream.seek(0)
+        magic, _, self._codec = _HEADER.unpack(stream.read(_HEADER.size))
+        end = stream.seek(0, 2)
+        stream.seek(max(end - _TRAILER.size, 0))
+        trailer = stream.read(_TRAILER.size)
+        if magic != CHUNK_MAGIC or len(trailer) != _TRAILER.size:
+            raise SBFStreamError("Invalid chunked SBF file")
+        self._size, indexoffset, chunks, magic = _TRAILER.unpack(trailer)
+        if magic != CHUNK_MAGIC:
+            raise SBFStreamError("Invalid chunked SBF file")
+        stream.seek(indexoffset)
+        self._index = list(_ENTRY.iter_unpack(stream.read(chunks * _ENTRY.size)))
+        self._starts = [entry[0] for entry in self._index]
+        self._pool = ThreadPoolExecutor(1)
+        self._prefetch = None  # (chunk number, Future)
+        self._chunk = -1  # current chunk number
+        self._data = b""  # current chunk data
+        self._pos = 0  # uncompressed position
+        self.decompressed = 0
+        """Number of chunks decompressed"""
+
+    def __enter__(self):
+        """
+        Context manager enter routine.
+        """
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        """
+        Context manager exit routine.
+        """
+
+        self.close()
+
+    def _load(self, chunk: int) -> bytes:
+        """
+        Read and decompress chunk.
+
+        :param int chunk: chunk number
+        :return: chunk data
+        :rtype: bytes
+        """
+
+        _, offset, length = self._index[chunk]
+        self._stream.seek(offset)
+        self.decompressed += 1
+        return _decompress(self._stream.read(length), self._codec)
+
+    def _select(self, chunk: int):
+        """
+        Make chunk current, using prefetched data if available, and
+        prefetch the following chunk.
+
+        :param int chunk: chunk number
+        """
+
+        if self._prefetch is not None and self._prefetch[0] == chunk:
+            self._data = self._prefetch[1].result()
+        else:
+            if self._prefetch is not None:
+                self._prefetch[1].result()  # stream is shared with prefetch
+            self._data = self._load(chunk)
+        self._chunk = chunk
+        self._prefetch = None
+        if chunk + 1 < len(self._index):
+            self._prefetch = (chunk + 1, self._pool.submit(self._load, chunk + 1))
+
+    def read(self, size: int = -1) -> bytes:
+        """
+        Read decompressed data.
+
+        :param int size: number of bytes to read (-1 = all remaining)
+        :return: data (fewer than size bytes at end of stream)
+        :rtype: bytes
+        """
+
+        return self._read(size, False)
+
+    def readline(self, size: int = -1) -> bytes:
+        """
+        Read decompressed data up to and including LF (0x0a) terminator.
+
+        :param int size: maximum number of bytes to read (-1 = no limit)
+        :return: data
+        :rtype: bytes
+        """
+
+        return self._read(size, True)
+
+    def _read(self, size: int, line: bool) -> bytes:
+        """
+        Read decompressed data from as many chunks as necessary.
+
+        :param int size: maximum number of bytes to read (-1 = all remaining)
+        :param bool line: True = stop after LF (0x0a) terminator
+        :return: data
+        :rtype: bytes
+        """
+
+        if size < 0:
+            size = self._size - self._pos
+        parts = []
+        while size > 0 and self._pos < self._size:
+            chunk = bisect_right(self._starts, self._pos) - 1
+            if chunk != self._chunk:
+                self._select(chunk)
+            start = self._pos - self._starts[chunk]
+            end = start + size
+            if line:
+                lf = self._data.find(b"\x0a", start, end)
+                if lf >= 0:
+                    end = lf + 1
+                    size = end - start  # last part
+            part = self._data[start:end]
+            parts.append(part)
+            self._pos += len(part)
+            size -= len(part)
+        return b"".join(parts)
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        """
+        Seek to uncompressed position.
+
+        :param int offset: offset
+        :param int whence: 0 = from start, 1 = from current position, 2 = from end
+        :return: new position
+        :rtype: int
+        """
+
+        base = (0, self._pos, self._size)[whence]
+        self._pos = min(max(base + offset, 0), self._size)
+        return self._pos
+
+    def tell(self) -> int:
+        """
+        Get uncompressed position.
+
+        :return: position
+        :rtype: int
+        """
+
+        return self._pos
+
+    def readable(self) -> bool:
+        """
+        Check if stream is readable.
+
+        :return: True
+        :rtype: bool
+        """
+
+        return True
+
+    def seekable(self) -> bool:
+        """
+        Check if stream is seekable.
+
+        :return: True
+        :rtype: bool
+        """
+
+        return True
+
+    def close(self):
+        """
+        Stop prefetching and close underlying stream.
+        """
+
+        self._pool.shutdown()
+        self._stream.close()
+
+    @property
+    def chunks(self) -> int:
+        """
+        Getter for number of chunks.
+
+        :return: number of chunks
+        :rtype: int
+        """
+
+        return len(self._index)
+
+
+def open_sbf(path: str, **kwargs) -> object:
+    """
+    Open SBF log for reading, detecting and decompressing gzip,
+    zstandard or chunked compressed logs.
+
+    :param str path: file path
+    :param kwargs: optional SBFDecompressor keyword arguments
+    :return: stream supporting read(n) - SBFDecompressor,
+        SBFChunkReader or uncompressed file
+    :rtype: object
+    :raises: SBFStreamError (if zstandard is required but unavailable)
+    """
+
+    stream = open(path, "rb")  # pylint: disable=consider-using-with
+    magic = stream.read(4)
+    stream.seek(0)
+    try:
+        if magic.startswith(GZIP_MAGIC):
+            return SBFDecompressor(stream, CODEC_ZLIB, **kwargs)
+        if magic == ZSTD_MAGIC:
+            return SBFDecompressor(stream, CODEC_ZSTD, **kwargs)
+        if magic == CHUNK_MAGIC:
+            return SBFChunkReader(stream)
+    except Exception:
+        stream.close()
+        raise
+    return stream
+
+
+def compress_sbf(
+    src: str, dest: str, chunksize: int = CHUNK_SIZE, codec: int = CODEC_ZLIB
+) -> int:
+    """
+    Convert SBF log (which may itself be compressed) to a chunked
+    compressed log.
+
+    :param str src: source file path
+    :param str dest: destination file path e.g. "SBFdata.sbfz"
+    :param int chunksize: uncompressed chunk size in bytes (1048576)
+    :param int codec: CODEC_ZLIB (0) or CODEC_ZSTD (1)
+    :return: number of uncompressed bytes written
+    :rtype: int
+    """
+
+    size = 0
+    with open_sbf(src) as instream, SBFChunkWriter(dest, chunksize, codec) as out:
+        while True:
+            data = instream.read(chunksize)
+            if not data:
+                break
+            size += out.write(data)
+    return size
@@ -0,0 +1,426 @@
+"""
+sbfcorpus.py
+
+Deterministic synthetic SBF corpus generator, for repeatable throughput,
+memory and parallel scaling tests.
+
+SBFCorpus builds a number of template frames ('variants') for each block
+type in a profile, by walking the block's definition in SBF_BLOCKS.
+Repeating groups are given random sizes, conditional ('optionmode')
+groups cycle through each of their branches, sub-block lengths match
+the sub-block layout, variable length attributes are given random
+lengths, and all other attributes random values. Each variant is given
+a revision number from a configurable list.
+
+Frames are then generated epoch by epoch at each block type's rate,
+from a randomly chosen variant stamped with the epoch time (WNc, TOW)
+and a recalculated CRC, so arbitrarily large valid streams can be
+generated quickly, as in-memory buffers or files. The same profile and
+seed always generate the same stream.
+
+Also available from the command line, e.g.::
+
+    sbfcorpus corpus.sbf --size 1000000000 --profile mosaic-X5-20Hz
+
+Created on 19 Oct 2026
+
+:author: semuadmin (Steve Smith)
+:copyright: semuadmin © 2020
+:license: BSD 3-Clause
+"""
+
+# pylint: disable=too-many-positional-arguments
+
+from argparse import ArgumentParser
+from math import gcd
+from random import Random
+from struct import pack
+
+from pysbf2.exceptions import ParameterError
+from pysbf2.sbfdecimate import WEEK_MS
+from pysbf2.sbfhelpers import attsiz, atttyp, crc2bytes, msgid2bytes, val2bytes
+from pysbf2.sbftypes_core import PAD, SBF_HDR, SBF_MAXLEN
+
+CORPUS_MAXGROUP = 16
+"""Default maximum size of repeating groups"""
+CORPUS_VARIANTS = 8
+"""Default number of template frames per block type"""
+CORPUS_MAXVAR = 64
+"""Maximum number of elements in variable length attributes"""
+CORPUS_ALL = "all"
+"""Profile of every defined block type at 1 Hz"""
+CORPUS_PROFILES = {
+    "mosaic-X5-20Hz": {
+        "MeasEpoch": (20, {"N1": (30, 60), "N2": (0, 3)}),
+        "MeasExtra": (20, {"N": (60, 120)}),
+        "PVTGeodetic": (20, {}),
+        "PosCovGeodetic": (20, {}),
+        "VelCovGeodetic": (20, {}),
+        "DOP": (1, {}),
+        "ReceiverTime": (1, {}),
+        "ChannelStatus": (1, {"N": (30, 60), "N2": (1, 3)}),
+        "ReceiverStatus": (1, {"N": (1, 4)}),
+        "QualityInd": (1, {"N": (1, 10)}),
+        "SatVisibility": (1, {"N": (30, 60)}),
+        "GPSNav": (0.1, {}),
+        "GALNav": (0.1, {}),
+    },
+    "pvt-10Hz": {
+        "PVTGeodetic": (10, {}),
+        "PosCovGeodetic": (10, {}),
+        "DOP": (1, {}),
+    },
+}
+"""
+Named profiles of {block name: (rate in Hz, {group size attribute:
+(minimum, maximum)})}
+"""
+
+
+class SBFCorpus:
+    """
+    Deterministic synthetic SBF corpus generator.
+    """
+
+    def __init__(
+        self,
+        profile: object = "mosaic-X5-20Hz",
+        seed: int = 0,
+        variants: int = CORPUS_VARIANTS,
+        revisions: tuple = (0,),
+        maxgroup: int = CORPUS_MAXGROUP,
+        start: tuple = (2300, 0),
+    ):
+        """
+        Constructor.
+
+        :param object profile: profile name (see CORPUS_PROFILES, or
+            CORPUS_ALL), or dict of {block name: (rate in Hz, {group size
+            attribute: (minimum, maximum)})} ("mosaic-X5-20Hz")
+        :param int seed: random number seed (0)
+        :param int variants: number of template frames per block type (8)
+        :param tuple revisions: revision numbers, assigned to template
+            frames in turn ((0,))
+        :param int maxgroup: maximum size of repeating groups not given
+            a range in profile (16)
+        :param tuple start: (WNc, TOW in ms) of first epoch ((2300, 0))
+        :raises: ParameterError (if profile or rates are invalid)
+        """
+        # pylint: disable=too-many-arguments, too-many-locals
+
+        # pylint: disable=import-outside-toplevel
+        from pysbf2.sbftypes_blocks import SBF_BLOCKS
+
+        if isinstance(profile, str):
+            if profile == CORPUS_ALL:
+                profile = {name: (1, {}) for name, pdict in SBF_BLOCKS.items() if pdict}
+            elif profile in CORPUS_PROFILES:
+                profile = CORPUS_PROFILES[profile]
+            else:
+                raise ParameterError(f"Unknown corpus profile {profile}")
+        if variants < 1:
+            raise ParameterError(f"Invalid number of variants {variants}")
+        self._seed = seed
+        self._start = start[0] * WEEK_MS + start[1]
+        self._periods = {}  # {block name: period in ms}
+        self.templates = {}
+        """Dict of {block name: [template frame, ...]}"""
+        rng = Random(seed)
+        for name, (rate, groups) in profile.items():
+            pdict = SBF_BLOCKS.get(name, {})
+            if not pdict:
+                raise ParameterError(f"Undefined block type {name}")
+            period = 1000 / rate if rate > 0 else 0
+            if period < 1 or period != int(period):
+                raise ParameterError(f"Invalid rate {rate} for {name}")
+            self._periods[name] = int(period)
+            builder = _FrameBuilder(name, pdict, groups, maxgroup)
+            self.templates[name] = [
+                builder.build(rng, i, revisions[i % len(revisions)])
+                for i in range(variants)
+            ]
+        if not self._periods:
+            raise ParameterError("Empty corpus profile")
+        interval = 0
+        for period in self._periods.values():
+            interval = gcd(interval, period)
+        self.interval = interval
+        """Epoch interval in ms"""
+
+    def epochs(self, count: int = None):
+        """
+        Generator of epochs.
+
+        :param int count: number of epochs (None = unlimited)
+        :return: generator of lists of raw frames (as bytearray) in each epoch
+        :rtype: generator
+        """
+
+        rng = Random(self._seed)
+        periods = list(self._periods.items())
+        msec = self._start
+        epoch = 0
+        while count is None or epoch < count:
+            wnc, tow = divmod(msec, WEEK_MS)
+            stamp = pack("<IH", tow, wnc)
+            frames = []
+            for name, period in periods:
+                if msec % period:
+                    continue
+                templates = self.templates[name]
+                raw = bytearray(templates[rng.randrange(len(templates))])
+                raw[8:14] = stamp
+                raw[2:4] = crc2bytes(raw[4:])
+                frames.append(raw)
+            yield frames
+            msec += self.interval
+            epoch += 1
+
+    def frames(self, count: int = None):
+        """
+        Generator of frames.
+
+        :param int count: number of frames (None = unlimited)
+        :return: generator of raw frames as bytearray
+        :rtype: generator
+        """
+
+        n = 0
+        for frames in self.epochs():
+            for raw in frames:
+                if count is not None and n >= count:
+                    return
+                yield raw
+                n += 1
+
+    def generate(self, size: int) -> bytes:
+        """
+        Generate in-memory corpus of whole epochs.
+
+        :param int size: minimum size in bytes
+        :return: corpus
+        :rtype: bytes
+        """
+
+        buf = bytearray()
+        for frames in self.epochs():
+            buf += b"".join(frames)
+            if len(buf) >= size:
+                break
+        return bytes(buf)
+
+    def write(self, path: str, size: int, bufsize: int = 4194304) -> int:
+        """
+        Write corpus of whole epochs to file.
+
+        :param str path: file path
+        :param int size: minimum size in bytes
+        :param int bufsize: bytes written at a time (4194304)
+        :return: number of bytes written
+        :rtype: int
+        """
+
+        written = 0
+        buf = bytearray()
+        with open(path, "wb") as stream:
+            for frames in self.epochs():
+                buf += b"".join(frames)
+                if written + len(buf) >= size:
+                    break
+                if len(buf) >= bufsize:
+                    written += stream.write(buf)
+                    buf.clear()
+            written += stream.write(buf)
+        return written
+
+
+class _FrameBuilder:  # pylint: disable=too-few-public-methods
+    """
+    Builds random template frames from an SBF block definition.
+    """
+
+    def __init__(self, name: str, pdict: dict, groups: dict, maxgroup: int):
+        """
+        Constructor.
+
+        :param str name: block name
+        :param dict pdict: block payload definition
+        :param dict groups: dict of {group size attribute: (minimum, maximum)}
+        :param int maxgroup: maximum size of other repeating groups
+        """
+
+        self._name = name
+        self._pdict = pdict
+        self._groups = groups
+        self._maxgroup = maxgroup
+        self._counts = set()  # group size attributes
+        self._modes = {}  # {conditional group attribute: [conditions]}
+        self._sblens = {}  # {sub-block length attribute: sub-block length}
+        self._scan(pdict)
+
+    def _scan(self, pdict: dict):
+        """
+        Recursive routine to find group size, condition and sub-block
+        length attributes in payload definition.
+
+        :param dict pdict: payload definition dictionary
+        """
+
+        size = 0
+        for anam, adef in pdict.items():
+            if anam == PAD:
+                self._sblens[adef] = size  # no sub-block padding
+                continue
+            if isinstance(adef, list):  # scaled attribute
+                adef = adef[0]
+            if isinstance(adef, tuple):
+                numr, gdict = adef
+                if isinstance(numr, tuple):  # conditional group
+                    self._modes.setdefault(numr[0], []).append(numr[1])
+                    self._scan(gdict)
+                elif isinstance(numr, str) and atttyp(numr) == "X":  # bitfield
+                    size += attsiz(numr)
+                else:
+                    if isinstance(numr, str):
+                        self._counts.add(numr.split("+")[0])
+                    self._scan(gdict)
+            else:
+                size += attsiz(adef)
+
+    def build(self, rng: Random, variant: int, revno: int) -> bytes:
+        """
+        Build random template frame, with zero time stamp.
+
+        :param Random rng: random number generator
+        :param int variant: variant number, which selects conditional group branch
+        :param int revno: revision number
+        :return: raw frame
+        :rtype: bytes
+        """
+
+        scale = 1
+        while True:
+            payload = bytearray()
+            self._build(self._pdict, rng, variant, scale, {}, [], payload)
+            payload += b"\x00" * (-len(payload) % 4)
+            if len(payload) + 8 <= SBF_MAXLEN:
+                break
+            scale /= 2  # too long, reduce group sizes
+        msgid = msgid2bytes(self._name, revno)
+        body = msgid + (len(payload) + 8).to_bytes(2, "little") + payload
+        return SBF_HDR + crc2bytes(body) + body
+
+    def _build(
+        self,
+        pdict: dict,
+        rng: Random,
+        variant: int,
+        scale: float,
+        values: dict,
+        index: list,
+        payload: bytearray,
+    ):
+        """
+        Recursive routine to append random attribute values to payload.
+
+        :param dict pdict: payload definition dictionary
+        :param Random rng: random number generator
+        :param int variant: variant number
+        :param float scale: group size scaling factor
+        :param dict values: dict of {indexed attribute name: value} for
+            group size and condition attributes
+        :param list index: repeating group index array
+        :param bytearray payload: payload
+        """
+        # pylint: disable=too-many-arguments, too-many-locals, too-many-branches, too-many-statements
+
+        for anam, adef in pdict.items():
+            if anam == PAD:
+                continue
+            if isinstance(adef, list):  # scaled attribute
+                adef = adef[0]
+            if isinstance(adef, tuple):
+                numr, gdict = adef
+                if isinstance(numr, tuple):  # conditional group
+                    cnam, con = numr
+                    val = values[cnam]
+                    if val == con or (isinstance(con, list) and val in con):
+                        self._build(gdict, rng, variant, scale, values, index, payload)
+                    continue
+                if isinstance(numr, str) and atttyp(numr) == "X":  # bitfield
+                    payload += rng.randbytes(attsiz(numr))
+                    continue
+                if isinstance(numr, int):  # fixed number of repeats
+                    size = numr
+                else:
+                    cnam = numr.split("+")[0]
+                    nest = int(numr.split("+")[1]) if "+" in numr else 0
+                    size = values[cnam + "".join(f"_{i:02d}" for i in index[0:nest])]
+                    if cnam == "RLMLength":  # special case for GALSARRLM
+                        size = 5 if size == 160 else 3
+                for i in range(size):
+                    index.append(i + 1)
+                    self._build(gdict, rng, variant, scale, values, index, payload)
+                    index.pop()
+                continue
+            typ, size = atttyp(adef), attsiz(adef)
+            key = anam + "".join(f"_{i:02d}" for i in index)
+            if anam in self._counts:
+                if anam == "RLMLength":
+                    val = rng.choice((80, 160))
+                else:
+                    lo, hi = self._groups.get(anam, (0, self._maxgroup))
+                    hi = int(hi * scale)
+                    val = rng.randint(min(lo, hi), hi)
+                values[key] = val
+                payload += val2bytes(val, adef)
+            elif anam in self._modes:
+                con = self._modes[anam][variant % len(self._modes[anam])]
+                val = rng.choice(con) if isinstance(con, list) else con
+                values[anam] = val
+                payload += val2bytes(val, adef)
+            elif anam in self._sblens:
+                payload += val2bytes(self._sblens[anam], adef)
+            elif typ == "V":  # variable by size, fills rest of payload
+                payload += rng.randbytes(rng.randint(0, CORPUS_MAXVAR) * size)
+            elif typ == "F":
+                payload += pack("<f" if size == 4 else "<d", rng.uniform(-1e6, 1e6))
+            else:
+                payload += rng.randbytes(size)
+
+
+def main(args: list = None):
+    """
+    CLI Entry point.
+
+    :param list args: command line arguments (None = sys.argv)
+    """
+
+    parser = ArgumentParser(description="Generate synthetic SBF corpus.")
+    parser.add_argument("path", help="output file path")
+    parser.add_argument(
+        "--size", type=int, default=100000000, help="minimum size in bytes"
+    )
+    parser.add_argument(
+        "--profile",
+        default="mosaic-X5-20Hz",
+        choices=(*CORPUS_PROFILES, CORPUS_ALL),
+        help="block type profile",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="random number seed")
+    parser.add_argument(
+        "--revisions",
+        type=int,
+        nargs="+",
+        default=[0],
+        help="block revision numbers",
+    )
+    kwargs = parser.parse_args(args)
+
+    corpus = SBFCorpus(kwargs.profile, kwargs.seed, revisions=kwargs.revisions)
+    written = corpus.write(kwargs.path, kwargs.size)
+    print(f"{written:,} bytes written to {kwargs.path}")
+
+
+if __name__ == "__main__":
+    main()
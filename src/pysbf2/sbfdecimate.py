@@ -0,0 +1,125 @@
+"""
+sbfdecimate.py
+
+Time-based decimation of SBF blocks, e.g. to keep one PVTGeodetic per
+second from a 100 Hz stream, or one ChannelStatus per minute.
+
+Every SBF block begins with its time stamp - TOW (U4, milliseconds) and
+WNc (U2, weeks) - immediately after the 8 byte header. SBFDecimator
+reads these 6 bytes directly from the raw frame, so frames which are
+dropped are never parsed.
+
+Created on 19 Oct 2026
+
+:author: semuadmin (Steve Smith)
+:copyright: semuadmin © 2020
+:license: BSD 3-Clause
+"""
+
+from pysbf2.exceptions import ParameterError
+from pysbf2.sbfhelpers import msgids2nums
+from pysbf2.sbftypes_core import SBF_HDR
+
+TOW_DNU = 4294967295
+"""Block TOW do-not-use value"""
+WNC_DNU = 65535
+"""Block WNc do-not-use value"""
+WEEK_MS = 604800000
+"""Milliseconds per GPS week"""
+
+
+def frame_time(raw: bytes) -> int:
+    """
+    Get time stamp of raw SBF frame from its header, without parsing it.
+
+    :param bytes raw: raw SBF frame
+    :return: milliseconds since start of GPS week 0 (WNc * WEEK_MS + TOW),
+        or None if frame is not SBF or time stamp is do-not-use
+    :rtype: int
+    """
+
+    if raw[0:2] != SBF_HDR or len(raw) < 14:
+        return None
+    tow = int.from_bytes(raw[8:12], "little")
+    wnc = int.from_bytes(raw[12:14], "little")
+    if tow == TOW_DNU or wnc == WNC_DNU:
+        return None
+    return wnc * WEEK_MS + tow
+
+
+class SBFDecimator:
+    """
+    Time-based SBF block decimation filter.
+    """
+
+    def __init__(self, intervals: dict, align: bool = True):
+        """
+        Constructor.
+
+        :param dict intervals: dict of {SBF block name or number: interval in
+            seconds}, e.g. {"PVTGeodetic": 1, "ChannelStatus": 60}; block types
+            not listed (and NMEA and RTCM3 messages) are always kept
+        :param bool align: True = keep first frame in each interval aligned
+            to whole multiples of the interval since GPS week 0 (i.e. frames
+            on whole seconds), False = keep frames at least one interval
+            after last frame kept (True)
+        :raises: ParameterError (if an interval is invalid, or intervals
+            contains an unknown block name)
+        """
+
+        self._intervals = {}
+        for msgid, interval in intervals.items():
+            msec = round(interval * 1000)
+            if msec < 1:
+                raise ParameterError(f"Invalid decimation interval {interval}")
+            for num in msgids2nums([msgid]):
+                self._intervals[num] = msec
+        self._align = align
+        self._last = {}  # {block number: (time last kept, time last seen)}
+        self.kept = {}
+        """dict of {block number: frames kept}"""
+        self.dropped = {}
+        """dict of {block number: frames dropped}"""
+
+    def keep(self, raw: bytes) -> bool:
+        """
+        Check if frame should be kept. Frames with a do-not-use time stamp
+        are kept. If time goes backwards (e.g. a new file or replay), the
+        block type's decimation restarts.
+
+        :param bytes raw: raw frame
+        :return: True if frame is to be kept
+        :rtype: bool
+        """
+
+        if raw[0:2] != SBF_HDR:
+            return True
+        num = int.from_bytes(raw[4:6], "little") & 0x1FFF
+        interval = self._intervals.get(num)
+        if interval is None:
+            return True
+        msec = frame_time(raw)
+        last, seen = self._last.get(num, (None, None))
+        if msec is None:
+            keep = True
+        elif last is None or msec < seen:
+            keep = True
+            last = msec
+        elif self._align:
+            keep = msec // interval > last // interval
+        else:
+            keep = msec - last >= interval
+        if msec is not None:
+            self._last[num] = (msec if keep else last, msec)
+        counts = self.kept if keep else self.dropped
+        counts[num] = counts.get(num, 0) + 1
+        return keep
+
+    def reset(self):
+        """
+        Restart decimation of all block types, and reset counts.
+        """
+
+        self._last = {}
+        self.kept = {}
+        self.dropped = {}
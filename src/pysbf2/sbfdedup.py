@@ -0,0 +1,109 @@
+"""
+sbfdedup.py
+
+Streaming duplicate SBF frame elimination, e.g. for archives which
+overlap because a receiver's output was both logged internally and
+captured over TCP.
+
+Each SBF block is keyed on its block number, time stamp (WNc, TOW) and
+CRC, taken directly from the block header without parsing it. Keys are
+held in a hash set for a sliding time window behind the latest block
+seen, so memory use is bounded however long the stream.
+
+Created on 19 Oct 2026
+
+:author: semuadmin (Steve Smith)
+:copyright: semuadmin © 2020
+:license: BSD 3-Clause
+"""
+
+from collections import deque
+
+from pysbf2.exceptions import ParameterError
+from pysbf2.sbfdecimate import frame_time
+
+DEDUP_WINDOW = 60
+"""Default duplicate detection time window in seconds"""
+DEDUP_MAXKEYS = 1000000
+"""Default maximum number of keys held, whatever the time window"""
+
+
+class SBFDeduplicator:
+    """
+    Time-windowed duplicate SBF frame filter.
+    """
+
+    def __init__(self, window: float = DEDUP_WINDOW, maxkeys: int = DEDUP_MAXKEYS):
+        """
+        Constructor.
+
+        :param float window: time window in seconds behind the latest block
+            seen within which duplicates are detected (60)
+        :param int maxkeys: maximum number of keys held; the oldest keys
+            are discarded beyond this (1000000)
+        :raises: ParameterError (if window or maxkeys is invalid)
+        """
+
+        if window <= 0:
+            raise ParameterError(f"Invalid deduplication window {window}")
+        if maxkeys < 1:
+            raise ParameterError(f"Invalid deduplication maxkeys {maxkeys}")
+        self._window = round(window * 1000)
+        self._maxkeys = maxkeys
+        self._seen = set()
+        self._keys = deque()  # (time, key) in order of arrival
+        self._latest = -1
+        self.unique = 0
+        """Number of unique SBF blocks passed"""
+        self.duplicates = {}
+        """dict of {source id: duplicate SBF blocks discarded}"""
+
+    def __len__(self) -> int:
+        """
+        Number of keys currently held.
+
+        :return: number of keys
+        :rtype: int
+        """
+
+        return len(self._seen)
+
+    def keep(self, raw: bytes, source: object = None) -> bool:
+        """
+        Check if frame should be kept, i.e. is not a duplicate of a frame
+        seen within the time window. NMEA and RTCM3 frames, and SBF blocks
+        with a do-not-use time stamp, are always kept.
+
+        :param bytes raw: raw frame
+        :param object source: source identifier, used for duplicate counts (None)
+        :return: True = keep, False = discard
+        :rtype: bool
+        """
+
+        msec = frame_time(raw)
+        if msec is None:
+            return True
+        key = bytes(raw[2:14])  # CRC, ID, Length, TOW, WNc
+        if key in self._seen:
+            self.duplicates[source] = self.duplicates.get(source, 0) + 1
+            return False
+        self.unique += 1
+        self._seen.add(key)
+        keys = self._keys
+        keys.append((msec, key))
+        self._latest = max(self._latest, msec)
+        limit = self._latest - self._window
+        while keys and (keys[0][0] < limit or len(keys) > self._maxkeys):
+            self._seen.discard(keys.popleft()[1])
+        return True
+
+    def reset(self):
+        """
+        Reset keys and counts.
+        """
+
+        self._seen.clear()
+        self._keys.clear()
+        self._latest = -1
+        self.unique = 0
+        self.duplicates = {}
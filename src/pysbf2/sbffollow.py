@@ -0,0 +1,409 @@
+"""
+sbffollow.py
+
+Resumable tail-follow reading of growing (and rotating) SBF log files.
+
+SBFFollowStream is a file stream whose reads wait at end of file for
+more data to be written, rather than returning short, so a frame which
+is only partly written is never reported as truncated. At end of file it
+polls the file's size and identity at a fixed interval (without busy
+spinning or rereading), detecting rotation (the path now refers to a new
+file - the rest of the old file is read first) and truncation (the file
+is now shorter than the read position), and continuing from the start
+of the new or truncated file.
+
+SBFFollower reads frames from an SBFFollowStream with an SBFReader, and
+tracks the byte offset following the last whole frame read. This offset
+can be committed to a state file, from which a restarted follower
+resumes at exactly the next frame.
+
+Created on 19 Oct 2026
+
+:author: semuadmin (Steve Smith)
+:copyright: semuadmin © 2020
+:license: BSD 3-Clause
+"""
+
+import json
+import os
+from threading import Event
+from time import monotonic
+
+from pysbf2.sbfreader import SBFReader
+
+FOLLOW_POLL = 0.1
+"""Default interval in seconds between checks for more data at end of file"""
+
+
+class SBFFollowStream:
+    """
+    File stream which waits for more data at end of file.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        offset: int = 0,
+        poll: float = FOLLOW_POLL,
+        timeout: float = None,
+    ):
+        """
+        Constructor.
+
+        :param str path: file path
+        :param int offset: byte offset at which to start reading (0)
+        :param float poll: interval in seconds between checks for more
+            data at end of file (0.1)
+        :param float timeout: reads return b"" after this many seconds
+            without new data (None = wait indefinitely)
+        """
+
+        self._path = path
+        self._poll = poll
+        self._timeout = timeout
+        self._stop = Event()
+        self._file = open(path, "rb")  # pylint: disable=consider-using-with
+        self._file.seek(offset)
+        self.offset = offset
+        """Byte offset in current file of next byte to be read"""
+        self.rotations = 0
+        """Number of file rotations detected"""
+        self.truncations = 0
+        """Number of file truncations detected"""
+
+    def __enter__(self):
+        """
+        Context manager enter routine.
+        """
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        """
+        Context manager exit routine.
+        """
+
+        self.close()
+
+    @property
+    def inode(self) -> tuple:
+        """
+        Getter for identity of current file.
+
+        :return: tuple of (device, inode)
+        :rtype: tuple
+        """
+
+        stat = os.fstat(self._file.fileno())
+        return (stat.st_dev, stat.st_ino)
+
+    @property
+    def generation(self) -> int:
+        """
+        Getter for number of times reading has restarted from the
+        start of a new or truncated file.
+
+        :return: rotations + truncations
+        :rtype: int
+        """
+
+        return self.rotations + self.truncations
+
+    def read(self, size: int = -1) -> bytes:
+        """
+        Read bytes, waiting at end of file until size bytes are available.
+
+        :param int size: number of bytes to read (-1 = all available)
+        :return: bytes (fewer than size only if file was rotated or truncated
+            during read), or b"" if stopped or timed out (in which case the
+            read position is unchanged)
+        :rtype: bytes
+        """
+
+        data = b""
+        since = monotonic()
+        generation = self.generation
+        while True:
+            chunk = self._file.read(size - len(data) if size >= 0 else -1)
+            if chunk:
+                data += chunk
+                self.offset += len(chunk)
+                if size < 0 or len(data) == size:
+                    return data
+                since = monotonic()
+            elif not self._wait(since):
+                return self._unread(data, generation)
+            elif data and self.generation != generation:
+                return data  # old file ended mid read
+
+    def readline(self, limit: int = -1) -> bytes:
+        """
+        Read line, waiting at end of file until LF terminator or limit
+        bytes are available.
+
+        :param int limit: maximum number of bytes to read (-1 = no limit)
+        :return: bytes (unterminated only if limit reached, or if file was
+            rotated or truncated during read), or b"" if stopped or timed out
+            (in which case the read position is unchanged)
+        :rtype: bytes
+        """
+
+        data = b""
+        since = monotonic()
+        generation = self.generation
+        while True:
+            chunk = self._file.readline(limit - len(data) if limit >= 0 else -1)
+            if chunk:
+                data += chunk
+                self.offset += len(chunk)
+                if data[-1:] == b"\x0a" or len(data) == limit:
+                    return data
+                since = monotonic()
+            elif not self._wait(since):
+                return self._unread(data, generation)
+            elif data and self.generation != generation:
+                return data  # old file ended mid line
+
+    def _unread(self, data: bytes, generation: int) -> bytes:
+        """
+        Restore read position after incomplete read, unless file has
+        been rotated or truncated since.
+
+        :param bytes data: bytes read
+        :param int generation: generation at start of read
+        :return: b""
+        :rtype: bytes
+        """
+
+        if data and generation == self.generation:
+            self.seek(self.offset - len(data))
+        return b""
+
+    def _wait(self, since: float) -> bool:
+        """
+        Check for rotation or truncation at end of file, otherwise wait
+        for poll interval.
+
+        :param float since: monotonic time at which data was last read
+        :return: True = read again, False = stopped or timed out
+        :rtype: bool
+        """
+
+        try:
+            stat = os.stat(self._path)
+        except FileNotFoundError:  # rotated, new file not yet created
+            stat = None
+        if stat is not None:
+            if (stat.st_dev, stat.st_ino) != self.inode:
+                # rest of old file to be read first
+                if self._file.read(1):  # pragma: no cover
+                    self._file.seek(-1, 1)
+                    return True
+                self._file.close()
+                # pylint: disable=consider-using-with
+                self._file = open(self._path, "rb")
+                self.offset = 0
+                self.rotations += 1
+                return True
+            if stat.st_size < self.offset:
+                self._file.seek(0)
+                self.offset = 0
+                self.truncations += 1
+                return True
+        if self._timeout is not None and monotonic() - since >= self._timeout:
+            return False
+        return not self._stop.wait(self._poll)
+
+    def seek(self, offset: int) -> int:
+        """
+        Move read position within current file.
+
+        :param int offset: byte offset
+        :return: byte offset
+        :rtype: int
+        """
+
+        self.offset = self._file.seek(offset)
+        return self.offset
+
+    def stop(self):
+        """
+        Stop waiting for more data; any read in progress (e.g. in another
+        thread) returns b"".
+        """
+
+        self._stop.set()
+
+    def close(self):
+        """
+        Close stream.
+        """
+
+        self._stop.set()
+        self._file.close()
+
+
+class SBFFollower:
+    """
+    Resumable tail-follow reader of growing SBF log file.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        statefile: str = None,
+        fromend: bool = False,
+        poll: float = FOLLOW_POLL,
+        timeout: float = None,
+        **kwargs,
+    ):
+        """
+        Constructor.
+
+        If a state file is given and records a committed offset in the
+        file currently at path, reading resumes from that offset.
+        Otherwise reading starts at the start (or end) of the file.
+
+        :param str path: file path
+        :param str statefile: path of file in which committed offset is
+            persisted (None = offset is not persisted)
+        :param bool fromend: if there is no committed offset, start
+            reading at end (True) or start (False) of file (False)
+        :param float poll: interval in seconds between checks for more
+            data at end of file (0.1)
+        :param float timeout: iteration ends after this many seconds
+            without new data (None = wait indefinitely)
+        :param kwargs: optional SBFReader keyword arguments
+        """
+
+        self._path = path
+        self._statefile = statefile
+        offset = None
+        state = self._load()
+        size = os.path.getsize(path)
+        stream = SBFFollowStream(path, 0, poll, timeout)
+        if state is not None and tuple(state["inode"]) == stream.inode:
+            if state["offset"] <= size:  # else truncated since commit
+                offset = state["offset"]
+        if offset is None:
+            offset = size if fromend else 0
+        stream.seek(offset)
+        self._stream = stream
+        self._reader = SBFReader(stream, **kwargs)
+        self._generation = stream.generation
+        self.offset = offset
+        """Byte offset following last whole frame read"""
+        self.committed = None if state is None else state["offset"]
+        """Last committed byte offset"""
+
+    def __enter__(self):
+        """
+        Context manager enter routine.
+        """
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        """
+        Context manager exit routine.
+        """
+
+        self.close()
+
+    def __iter__(self):
+        """Iterator."""
+
+        return self
+
+    def __next__(self) -> tuple:
+        """
+        Return next item in iteration.
+
+        :return: tuple of (raw_data as bytes, parsed_data)
+        :rtype: tuple
+        :raises: StopIteration
+        """
+
+        raw_data, parsed_data = self.read()
+        if raw_data is None:
+            raise StopIteration
+        return (raw_data, parsed_data)
+
+    def read(self) -> tuple:
+        """
+        Read next frame, waiting for it to be written if necessary.
+
+        :return: tuple of (raw_data as bytes, parsed_data), or (None, None)
+            if timed out or stopped
+        :rtype: tuple
+        """
+
+        raw_data, parsed_data = self._reader.read()
+        stream = self._stream
+        if stream.generation != self._generation:  # new or truncated file
+            self._generation = stream.generation
+            self.offset = 0
+        if raw_data is None:
+            # rewind any partial frame, to be read again if reading resumes
+            stream.seek(self.offset)
+            self._reader.reset()
+        else:
+            self.offset = max(stream.offset - self._reader.buffered, 0)
+        return (raw_data, parsed_data)
+
+    def _load(self) -> dict:
+        """
+        Load committed state from state file.
+
+        :return: dict of {"path", "inode", "offset"}, or None if no state
+        :rtype: dict
+        """
+
+        if self._statefile is None or not os.path.exists(self._statefile):
+            return None
+        with open(self._statefile, "r", encoding="utf-8") as stream:
+            return json.load(stream)
+
+    def commit(self):
+        """
+        Commit offset following last whole frame read, persisting it
+        to state file (if there is one) by atomic replacement.
+        """
+
+        self.committed = self.offset
+        if self._statefile is None:
+            return
+        state = {
+            "path": self._path,
+            "inode": self._stream.inode,
+            "offset": self.offset,
+        }
+        tmp = f"{self._statefile}.tmp"
+        with open(tmp, "w", encoding="utf-8") as stream:
+            json.dump(state, stream)
+        os.replace(tmp, self._statefile)
+
+    @property
+    def stream(self) -> SBFFollowStream:
+        """
+        Getter for underlying follow stream.
+
+        :return: stream
+        :rtype: SBFFollowStream
+        """
+
+        return self._stream
+
+    def stop(self):
+        """
+        Stop waiting for more data; iteration (e.g. in another thread) ends.
+        """
+
+        self._stream.stop()
+
+    def close(self):
+        """
+        Close file.
+        """
+
+        self._stream.close()
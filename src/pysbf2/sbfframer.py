@@ -0,0 +1,210 @@
+"""
+sbfframer.py
+
+Incremental (push-based) SBF, NMEA and RTCM3 framer.
+
+SBFReader pulls data from a blocking stream. SBFFramer is instead fed
+with whatever data is available (e.g. from a non-blocking socket or an
+asyncio StreamReader) and returns any complete frames, retaining any
+partial frame until more data arrives. Framing follows the same rules
+as SBFReader - SBF block lengths are sanity-checked against the
+plausible length of each block type, NMEA sentences are bounded by
+'nmealimit', and scanning resumes at the byte following any rejected
+header. In addition, SBF and RTCM3 checksums are verified before a
+frame is returned (if 'validate' is set), so only whole, intact frames
+are ever returned.
+
+Created on 19 Oct 2026
+
+:author: semuadmin (Steve Smith)
+:copyright: semuadmin © 2020
+:license: BSD 3-Clause
+"""
+
+import re
+
+from pysbf2.sbfhelpers import crc2bytes
+from pysbf2.sbfreader import SBFReader
+from pysbf2.sbftypes_core import (
+    NMEA_MAXLEN,
+    NMEA_PROTOCOL,
+    RTCM3_PROTOCOL,
+    SBF_MAXLEN,
+    SBF_MINLEN,
+    SBF_PROTOCOL,
+    VALCKSUM,
+)
+
+SYNC = re.compile(b"[\x24\xd3]")
+"""Candidate start of SBF, NMEA or RTCM3 frame"""
+
+
+class SBFFramer:
+    """
+    Incremental SBF, NMEA and RTCM3 framer.
+    """
+
+    def __init__(
+        self,
+        protfilter: int = NMEA_PROTOCOL | SBF_PROTOCOL | RTCM3_PROTOCOL,
+        validate: int = VALCKSUM,
+        nmealimit: int = NMEA_MAXLEN,
+    ):
+        """
+        Constructor.
+
+        :param int protfilter: NMEA_PROTOCOL (1), SBF_PROTOCOL (2),
+            RTCM3_PROTOCOL (4), Can be OR'd (7)
+        :param int validate: VALCKSUM (1) = Validate SBF and RTCM3 checksums,
+            VALNONE (0) = ignore invalid checksum (1)
+        :param int nmealimit: maximum NMEA sentence length including header
+            and CRLF terminator (82)
+        """
+
+        self._protfilter = protfilter
+        self._validate = validate
+        self._nmealimit = nmealimit
+        self._buf = bytearray()
+        self.frames = 0
+        """Number of frames returned"""
+        self.garbage = 0
+        """Number of bytes discarded (including frames excluded by protfilter)"""
+        self.errors = 0
+        """Number of frame headers rejected (invalid length or checksum)"""
+
+    def feed(self, data: bytes) -> list:
+        """
+        Add data to buffer and return any complete frames.
+
+        :param bytes data: data
+        :return: list of raw frames as bytes
+        :rtype: list
+        """
+
+        self._buf += data
+        buf = self._buf
+        frames = []
+        pos = 0
+        while True:
+            sync = SYNC.search(buf, pos)
+            if sync is None:
+                self.garbage += len(buf) - pos
+                pos = len(buf)
+                break
+            self.garbage += sync.start() - pos
+            pos = sync.start()
+            if buf[pos] == 0x24:
+                if len(buf) - pos < 2:
+                    break
+                if buf[pos + 1] == 0x40:
+                    length, protocol = self._sbf_length(buf, pos), SBF_PROTOCOL
+                else:
+                    length, protocol = self._nmea_length(buf, pos), NMEA_PROTOCOL
+            else:
+                length, protocol = self._rtcm_length(buf, pos), RTCM3_PROTOCOL
+            if length is None:  # need more data
+                break
+            if length == 0:  # invalid header, rescan from next byte
+                self.garbage += 1
+                pos += 1
+                continue
+            if self._protfilter & protocol:
+                frames.append(bytes(buf[pos : pos + length]))
+            else:
+                self.garbage += length
+            pos += length
+        del buf[:pos]
+        self.frames += len(frames)
+        return frames
+
+    def _sbf_length(self, buf: bytearray, pos: int) -> int:
+        """
+        Get length of SBF frame at position.
+
+        :param bytearray buf: buffer
+        :param int pos: start of frame
+        :return: frame length, 0 if invalid, None if more data required
+        :rtype: int
+        """
+
+        if len(buf) - pos < 8:
+            return None
+        length = int.from_bytes(buf[pos + 6 : pos + 8], "little")
+        if length % 4 or not SBF_MINLEN <= length <= SBF_MAXLEN:
+            self.errors += 1
+            return 0
+        if len(buf) - pos < length:
+            return None
+        if self._validate & VALCKSUM and crc2bytes(
+            buf[pos + 4 : pos + length]
+        ) != bytes(buf[pos + 2 : pos + 4]):
+            self.errors += 1
+            return 0
+        return length
+
+    def _nmea_length(self, buf: bytearray, pos: int) -> int:
+        """
+        Get length of NMEA sentence at position.
+
+        :param bytearray buf: buffer
+        :param int pos: start of sentence
+        :return: sentence length, 0 if invalid, None if more data required
+        :rtype: int
+        """
+
+        if bytes(buf[pos : pos + 2]) not in SBFReader.subparser("pynmeagps").NMEA_HDR:
+            return 0
+        end = buf.find(b"\x0a", pos, pos + self._nmealimit)
+        if end == -1:
+            return None if len(buf) - pos < self._nmealimit else 0
+        if not buf[pos : end + 1].isascii():
+            return 0
+        return end + 1 - pos
+
+    def _rtcm_length(self, buf: bytearray, pos: int) -> int:
+        """
+        Get length of RTCM3 frame at position.
+
+        :param bytearray buf: buffer
+        :param int pos: start of frame
+        :return: frame length, 0 if invalid, None if more data required
+        :rtype: int
+        """
+
+        if len(buf) - pos < 3:
+            return None
+        if buf[pos + 1] & ~0x03:
+            return 0
+        length = (((buf[pos + 1] & 0x03) << 8) | buf[pos + 2]) + 6
+        if len(buf) - pos < length:
+            return None
+        if self._validate & VALCKSUM and SBFReader.subparser("pyrtcm").calc_crc24q(
+            buf[pos : pos + length]
+        ):
+            self.errors += 1
+            return 0
+        return length
+
+    def flush(self) -> int:
+        """
+        Discard any buffered partial frame (e.g. on reconnection).
+
+        :return: number of bytes discarded
+        :rtype: int
+        """
+
+        discarded = len(self._buf)
+        self.garbage += discarded
+        self._buf.clear()
+        return discarded
+
+    @property
+    def buffered(self) -> int:
+        """
+        Getter for number of bytes buffered awaiting a complete frame.
+
+        :return: buffered bytes
+        :rtype: int
+        """
+
+        return len(self._buf)
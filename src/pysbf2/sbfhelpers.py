@@ -12,9 +12,10 @@ Created on 19 May 2025
 """
 
 import struct
+from binascii import crc_hqx
 from datetime import datetime, timedelta
 
-from pysbf2.exceptions import SBFMessageError, SBFTypeError
+from pysbf2.exceptions import ParameterError, SBFMessageError, SBFTypeError
 from pysbf2.sbftypes_core import ATTTYPE, SBF_MSGIDS
 
 EPOCH0 = datetime(1980, 1, 6)  # EPOCH start date
@@ -62,18 +63,8 @@ def calc_crc(message: bytes) -> int:
 
     """
 
-    poly = 0x1021
-    crc = 0
-    for byte in message:
-        crc ^= byte << 8
-        for _ in range(8):
-            if crc & 0x8000:
-                crc = (crc << 1) ^ poly
-            else:
-                crc <<= 1
-
-            crc &= 0xFFFF
-    return crc
+    # CRC-CCITT (polynomial 0x1021, initial value 0), as implemented in C by binascii
+    return crc_hqx(message, 0)
 
 
 def crc2bytes(message: bytes) -> bytes:
@@ -101,11 +92,12 @@ def escapeall(val: bytes) -> str:
     return "b'{}'".format("".join(f"\\x{b:02x}" for b in val))
 
 
-def msgid2bytes(msgid: str) -> int:
+def msgid2bytes(msgid: str, revno: int = 0) -> int:
     """
     Convert integer SBF message str to bytes.
 
     :param str msgid: message id e.g. "PVTCartesian"
+    :param int revno: revision number, encoded in top 3 bits of ID (0)
     :return: message id as bytes e.g. b'\xa6\x0f' (4006)
     :rtype: bytes
     :raises: SBFMessageError
@@ -115,10 +107,28 @@ def msgid2bytes(msgid: str) -> int:
     key = None
     for key, (mid, _) in SBF_MSGIDS.items():
         if msgid == mid:
-            return int.to_bytes(key, 2, "little")
+            return int.to_bytes(key | (revno << 13), 2, "little")
     raise SBFMessageError(f"No SBF ID found for message {msgid}")
 
 
+def msgids2nums(msgids: object) -> set:
+    """
+    Convert collection of SBF block names and/or numbers to set of
+    block numbers, e.g. for filtering frames on their header.
+
+    :param object msgids: collection of block names (e.g. "PVTGeodetic") or numbers
+    :return: set of block numbers e.g. {4007}
+    :rtype: set
+    :raises: ParameterError
+    """
+
+    nums = {mid: key for key, (mid, _) in SBF_MSGIDS.items()}
+    try:
+        return {m if isinstance(m, int) else nums[m] for m in msgids}
+    except KeyError as err:
+        raise ParameterError(f"Unknown SBF block {err}") from err
+
+
 def atttyp(att: str) -> str:
     """
     Helper function to return attribute type as string.
@@ -0,0 +1,330 @@
+"""
+sbfindex.py
+
+SBF file scanning and time indexing.
+
+SBFScanner scans a seekable stream for valid SBF blocks, returning each
+block with its byte offset, without parsing it.
+
+SBFIndex is a time index of an SBF file, recording the byte offset of
+the first block of each epoch (i.e. each change of block time stamp).
+It is saved as a sidecar file alongside the SBF file ('<file>.idx'),
+and allows SBFReader.seek_time() to find a given time by bisecting the
+index rather than the file.
+
+Created on 19 Oct 2026
+
+:author: semuadmin (Steve Smith)
+:copyright: semuadmin © 2020
+:license: BSD 3-Clause
+"""
+
+import struct
+from bisect import bisect_left
+
+from pysbf2.exceptions import SBFStreamError
+from pysbf2.sbfdecimate import frame_time
+from pysbf2.sbfhelpers import crc2bytes
+from pysbf2.sbftypes_core import SBF_HDR, SBF_MAXLEN, SBF_MINLEN, VALCKSUM
+
+INDEX_EXT = ".idx"
+"""Index sidecar file extension"""
+INDEX_MAGIC = b"SBFIDX01"
+"""Index sidecar file signature"""
+INDEX_RECORD = struct.Struct("<QQ")
+"""Index record - time (milliseconds since GPS week 0), byte offset"""
+SEEK_LINEAR = 65536
+"""File bisection ends, and a linear scan begins, below this range in bytes"""
+SEEK_BUFSIZE = 4096
+"""Bytes read at a time during file bisection"""
+
+
+class SBFScanner:
+    """
+    Scanner for valid SBF blocks in a stream.
+    """
+
+    def __init__(
+        self,
+        stream,
+        offset: int = None,
+        validate: int = VALCKSUM,
+        bufsize: int = 65536,
+    ):
+        """
+        Constructor.
+
+        :param stream: input stream supporting read(n) (and seek(), if
+            offset is given)
+        :param int offset: byte offset from which to start scanning
+            (None = current position, block offsets are relative to it)
+        :param int validate: VALCKSUM (1) = Validate checksum,
+            VALNONE (0) = ignore invalid checksum (1)
+        :param int bufsize: bytes read at a time (65536)
+        """
+
+        self._stream = stream
+        self._validate = validate
+        self._bufsize = bufsize
+        if offset is None:
+            offset = 0
+        else:
+            stream.seek(offset)
+        self._base = offset  # offset of start of buffer
+        self._buf = bytearray()
+        self._eof = False
+        self.garbage = 0
+        """Number of bytes not in valid SBF blocks (including NMEA and RTCM3)"""
+        self.errors = 0
+        """Number of SBF headers rejected because of implausible length"""
+        self.crcerrors = 0
+        """Number of SBF blocks rejected because of invalid checksum"""
+        self._frames = self._scan()  # generator, after counters it updates
+
+    def __iter__(self):
+        """Iterator."""
+
+        return self._frames  # avoids __next__ call overhead per block
+
+    def __next__(self) -> tuple:
+        """
+        Return next item in iteration.
+
+        :return: tuple of (byte offset, raw SBF block as bytes)
+        :rtype: tuple
+        :raises: StopIteration
+        """
+
+        return next(self._frames)
+
+    def _scan(self):
+        """
+        Generator of valid SBF blocks.
+
+        :return: generator of (byte offset, raw SBF block) tuples
+        :rtype: generator
+        """
+
+        buf = self._buf
+        pos = 0
+        while True:
+            i = buf.find(SBF_HDR, pos)
+            if i == -1 or len(buf) - i < 8:
+                end = len(buf) if i == -1 else i
+                if i == -1 and end > pos and buf[-1] == SBF_HDR[0]:
+                    end -= 1  # sync word may straddle read
+                self.garbage += end - pos
+                pos = end
+                if not self._fill(pos):
+                    break
+                buf, pos = self._buf, 0
+                continue
+            self.garbage += i - pos
+            pos = i
+            length = int.from_bytes(buf[i + 6 : i + 8], "little")
+            if length % 4 or not SBF_MINLEN <= length <= SBF_MAXLEN:
+                self.errors += 1
+            elif len(buf) - i < length:
+                if self._fill(pos):
+                    buf, pos = self._buf, 0
+                    continue
+                self.errors += 1  # truncated at end of stream
+            elif self._validate & VALCKSUM and crc2bytes(
+                buf[i + 4 : i + length]
+            ) != bytes(buf[i + 2 : i + 4]):
+                self.crcerrors += 1
+            else:
+                yield (self._base + i, bytes(buf[i : i + length]))
+                pos = i + length
+                continue
+            # rejected header - rescan from byte following sync word
+            self.garbage += 1
+            pos += 1
+        self.garbage += len(buf) - pos
+
+    def _fill(self, pos: int) -> bool:
+        """
+        Discard buffer up to position and read more data.
+
+        :param int pos: buffer position of first byte to be retained
+        :return: True if more data was read, False at end of stream
+        :rtype: bool
+        """
+
+        if self._eof:
+            return False
+        data = self._stream.read(self._bufsize)
+        if not data:
+            self._eof = True
+            return False
+        del self._buf[:pos]
+        self._base += pos
+        self._buf += data
+        return True
+
+    def next_timed(self) -> tuple:
+        """
+        Get next SBF block with a valid time stamp.
+
+        :return: tuple of (byte offset, raw block, time in milliseconds
+            since GPS week 0), or None at end of stream
+        :rtype: tuple
+        """
+
+        for offset, raw in self:
+            msec = frame_time(raw)
+            if msec is not None:
+                return (offset, raw, msec)
+        return None
+
+
+class SBFIndex:
+    """
+    Time index of SBF file.
+    """
+
+    def __init__(self):
+        """
+        Constructor.
+        """
+
+        self.times = []
+        """Time of each indexed epoch, in milliseconds since GPS week 0"""
+        self.offsets = []
+        """Byte offset of first block of each indexed epoch"""
+
+    def __len__(self) -> int:
+        """
+        Number of indexed epochs.
+
+        :return: number of epochs
+        :rtype: int
+        """
+
+        return len(self.times)
+
+    def add(self, msec: int, offset: int):
+        """
+        Add block to index, if it is the first of a new epoch.
+
+        :param int msec: block time in milliseconds since GPS week 0
+            (None = do-not-use time stamp, block is ignored)
+        :param int offset: byte offset of block
+        """
+
+        if msec is not None and (not self.times or msec != self.times[-1]):
+            self.times.append(msec)
+            self.offsets.append(offset)
+
+    def find(self, msec: int) -> int:
+        """
+        Find byte offset of first epoch at or after given time.
+        Assumes block times are monotonically increasing.
+
+        :param int msec: time in milliseconds since GPS week 0
+        :return: byte offset, or None if time is after last indexed epoch
+        :rtype: int
+        """
+
+        i = bisect_left(self.times, msec)
+        return self.offsets[i] if i < len(self.offsets) else None
+
+    def save(self, path: str):
+        """
+        Save index to sidecar file.
+
+        :param str path: index file path e.g. "SBFdata.sbf.idx"
+        """
+
+        with open(path, "wb") as stream:
+            stream.write(INDEX_MAGIC)
+            stream.write(
+                b"".join(
+                    INDEX_RECORD.pack(t, o) for t, o in zip(self.times, self.offsets)
+                )
+            )
+
+    @classmethod
+    def load(cls, path: str) -> "SBFIndex":
+        """
+        Load index from sidecar file.
+
+        :param str path: index file path e.g. "SBFdata.sbf.idx"
+        :return: index
+        :rtype: SBFIndex
+        :raises: SBFStreamError (if file is not a valid index)
+        """
+
+        with open(path, "rb") as stream:
+            data = stream.read()
+        if data[0 : len(INDEX_MAGIC)] != INDEX_MAGIC or (
+            (len(data) - len(INDEX_MAGIC)) % INDEX_RECORD.size
+        ):
+            raise SBFStreamError(f"Invalid SBF index file {path}")
+        index = cls()
+        for msec, offset in INDEX_RECORD.iter_unpack(data[len(INDEX_MAGIC) :]):
+            index.times.append(msec)
+            index.offsets.append(offset)
+        return index
+
+    @classmethod
+    def build(cls, stream, validate: int = VALCKSUM) -> "SBFIndex":
+        """
+        Build index by scanning SBF stream.
+
+        :param stream: input stream
+        :param int validate: VALCKSUM (1) = Validate checksum,
+            VALNONE (0) = ignore invalid checksum (1)
+        :return: index
+        :rtype: SBFIndex
+        """
+
+        index = cls()
+        for offset, raw in SBFScanner(stream, 0, validate):
+            index.add(frame_time(raw), offset)
+        return index
+
+
+def index_path(path: str) -> str:
+    """
+    Get path of index sidecar file for SBF file.
+
+    :param str path: SBF file path e.g. "SBFdata.sbf"
+    :return: index file path e.g. "SBFdata.sbf.idx"
+    :rtype: str
+    """
+
+    return f"{path}{INDEX_EXT}"
+
+
+def bisect_time(stream, msec: int, validate: int = VALCKSUM) -> int:
+    """
+    Find byte offset of first SBF block at or after given time, by
+    bisecting a seekable stream on byte offset and resynchronising on
+    the next valid SBF block at each step. Assumes block times are
+    monotonically increasing.
+
+    :param stream: seekable input stream
+    :param int msec: time in milliseconds since GPS week 0
+    :param int validate: VALCKSUM (1) = Validate checksum,
+        VALNONE (0) = ignore invalid checksum (1)
+    :return: byte offset (end of stream if time is after last block)
+    :rtype: int
+    """
+
+    size = stream.seek(0, 2)
+    low, high = 0, size
+    while high - low > SEEK_LINEAR:
+        mid = (low + high) // 2
+        found = SBFScanner(stream, mid, validate, SEEK_BUFSIZE).next_timed()
+        if found is None or found[2] >= msec:
+            high = mid
+        else:
+            low = found[0]
+    scanner = SBFScanner(stream, low, validate, SEEK_BUFSIZE)
+    while True:
+        found = scanner.next_timed()
+        if found is None:
+            return size
+        if found[2] >= msec:
+            return found[0]
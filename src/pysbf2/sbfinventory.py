@@ -0,0 +1,231 @@
+"""
+sbfinventory.py
+
+Fast inventory of SBF files, e.g. for quality checks on ingest.
+
+sbf_inventory() scans a file (which may be compressed) for valid SBF
+blocks using SBFScanner, reading only each block's header and time stamp
+(WNc, TOW) rather than parsing it, and reports per-block counts, time
+span, nominal output rate, data gaps, CRC failures and garbage bytes.
+
+Also available from the command line, e.g.::
+
+    sbfinventory SBFdata.sbf --gap 2
+    python -m pysbf2.sbfinventory SBFdata.sbf.gz --format json
+
+Created on 19 Oct 2026
+
+:author: semuadmin (Steve Smith)
+:copyright: semuadmin © 2020
+:license: BSD 3-Clause
+"""
+
+import json
+import struct
+from argparse import ArgumentParser
+from collections import Counter
+
+from pysbf2.sbfcompress import open_sbf
+from pysbf2.sbfdecimate import TOW_DNU, WEEK_MS, WNC_DNU
+from pysbf2.sbfindex import SBFScanner
+from pysbf2.sbftypes_core import SBF_MSGIDS, VALCKSUM, VALNONE
+
+INVENTORY_GAP = 1
+"""Default data gap threshold in seconds"""
+INVENTORY_BUFSIZE = 1048576
+"""Bytes read at a time during inventory scan"""
+_HEADER = struct.Struct("<HHIH")  # ID, Length, TOW, WNc
+
+
+def _epoch(msec: int) -> tuple:
+    """
+    Convert time in milliseconds since GPS week 0 to (WNc, TOW).
+
+    :param int msec: milliseconds since GPS week 0, or None
+    :return: tuple of (WNc, TOW in milliseconds), or None
+    :rtype: tuple
+    """
+
+    return None if msec is None else divmod(msec, WEEK_MS)
+
+
+def _rate(intervals: Counter) -> float:
+    """
+    Get nominal output rate from most common interval between epochs.
+
+    :param Counter intervals: counts of intervals in milliseconds
+    :return: nominal rate in Hz, or None if fewer than two epochs
+    :rtype: float
+    """
+
+    if not intervals:
+        return None
+    return round(1000 / intervals.most_common(1)[0][0], 3)
+
+
+def sbf_inventory(
+    path: str,
+    gap: float = INVENTORY_GAP,
+    validate: int = VALCKSUM,
+    bufsize: int = INVENTORY_BUFSIZE,
+) -> dict:
+    """
+    Scan SBF file and summarise its contents, without parsing any blocks.
+
+    Times are given as (WNc, TOW in milliseconds) tuples. The nominal rate
+    of each block type (and of epochs of any block type) is derived from
+    the most common interval between consecutive time stamps. Garbage is
+    any data not in a valid SBF block, including any NMEA or RTCM3 data.
+
+    :param str path: SBF file path (may be compressed, see open_sbf())
+    :param float gap: report data gaps (between consecutive epochs of any
+        block type) longer than this in seconds (1)
+    :param int validate: VALCKSUM (1) = Validate checksum,
+        VALNONE (0) = ignore invalid checksum (1)
+    :param int bufsize: bytes read at a time (1048576)
+    :return: dict of {"path", "bytes", "frames", "first", "last",
+        "duration", "rate", "blocks": {name: {"number", "count", "first",
+        "last", "rate"}}, "gaps": [{"start", "end", "duration"}],
+        "crcerrors", "errors", "garbage"}
+    :rtype: dict
+    """
+    # pylint: disable=too-many-locals
+
+    limit = round(gap * 1000)
+    blocks = {}  # {block number: [count, first, last, Counter of intervals]}
+    epochs = Counter()  # intervals between epochs
+    gaps = []
+    first = last = None
+    frames = sbfbytes = 0
+    unpack = _HEADER.unpack_from
+    with open_sbf(path) as stream:
+        scanner = SBFScanner(stream, validate=validate, bufsize=bufsize)
+        for _, raw in scanner:
+            frames += 1
+            sbfbytes += len(raw)
+            num, _, tow, wnc = unpack(raw, 4)
+            num &= 0x1FFF
+            stats = blocks.get(num)
+            if stats is None:
+                stats = blocks[num] = [0, None, None, Counter()]
+            stats[0] += 1
+            if tow == TOW_DNU or wnc == WNC_DNU:
+                continue
+            msec = wnc * WEEK_MS + tow
+            if stats[1] is None:
+                stats[1] = stats[2] = msec
+            elif msec > stats[2]:
+                stats[3][msec - stats[2]] += 1
+                stats[2] = msec
+            if first is None:
+                first = last = msec
+            elif msec > last:
+                if msec - last > limit:
+                    gaps.append((last, msec))
+                epochs[msec - last] += 1
+                last = msec
+
+    return {
+        "path": path,
+        "bytes": sbfbytes + scanner.garbage,
+        "frames": frames,
+        "first": _epoch(first),
+        "last": _epoch(last),
+        "duration": None if first is None else (last - first) / 1000,
+        "rate": _rate(epochs),
+        "blocks": {
+            SBF_MSGIDS.get(num, (str(num),))[0]: {
+                "number": num,
+                "count": count,
+                "first": _epoch(bfirst),
+                "last": _epoch(blast),
+                "rate": _rate(intervals),
+            }
+            for num, (count, bfirst, blast, intervals) in sorted(blocks.items())
+        },
+        "gaps": [
+            {
+                "start": _epoch(start),
+                "end": _epoch(end),
+                "duration": (end - start) / 1000,
+            }
+            for start, end in gaps
+        ],
+        "crcerrors": scanner.crcerrors,
+        "errors": scanner.errors,
+        "garbage": scanner.garbage,
+    }
+
+
+def _report(inv: dict) -> str:
+    """
+    Format inventory as human readable text.
+
+    :param dict inv: inventory from sbf_inventory()
+    :return: report
+    :rtype: str
+    """
+
+    def epoch(wt: tuple) -> str:
+        return "-" if wt is None else f"{wt[0]}:{wt[1] / 1000:.3f}"
+
+    def rate(hz: float) -> str:
+        return "-" if hz is None else f"{hz:g} Hz"
+
+    lines = [
+        f"{inv['path']}: {inv['bytes']:,} bytes, {inv['frames']:,} SBF blocks",
+        f"  time {epoch(inv['first'])} to {epoch(inv['last'])}"
+        f" ({inv['duration'] or 0:,.3f} s), epoch rate {rate(inv['rate'])}",
+    ]
+    for name, blk in inv["blocks"].items():
+        lines.append(
+            f"  {name} ({blk['number']}): {blk['count']:,}, "
+            f"{epoch(blk['first'])} to {epoch(blk['last'])}, {rate(blk['rate'])}"
+        )
+    lines.append(f"  gaps: {len(inv['gaps'])}")
+    for gap in inv["gaps"]:
+        lines.append(
+            f"    {epoch(gap['start'])} to {epoch(gap['end'])} ({gap['duration']:,.3f} s)"
+        )
+    lines.append(
+        f"  CRC failures: {inv['crcerrors']:,}, length errors: {inv['errors']:,}, "
+        f"garbage: {inv['garbage']:,} bytes"
+    )
+    return "\n".join(lines)
+
+
+def main(args: list = None):
+    """
+    CLI Entry point.
+
+    :param list args: command line arguments (None = sys.argv)
+    """
+
+    parser = ArgumentParser(
+        description="Fast inventory of SBF files, reading block headers only."
+    )
+    parser.add_argument("paths", nargs="+", help="SBF file path(s)")
+    parser.add_argument(
+        "--gap",
+        type=float,
+        default=INVENTORY_GAP,
+        help="report data gaps longer than this in seconds",
+    )
+    parser.add_argument(
+        "--format", choices=("text", "json"), default="text", help="output format"
+    )
+    parser.add_argument(
+        "--novalidate", action="store_true", help="do not validate checksums"
+    )
+    kwargs = parser.parse_args(args)
+
+    validate = VALNONE if kwargs.novalidate else VALCKSUM
+    invs = [sbf_inventory(path, kwargs.gap, validate) for path in kwargs.paths]
+    if kwargs.format == "json":
+        print(json.dumps(invs, indent=2))
+    else:
+        print("\n".join(_report(inv) for inv in invs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,443 @@
+"""
+sbflatency.py
+
+Low-latency reading mode, for applications (e.g. machine control) which
+need each frame as soon as its last byte arrives.
+
+SBFLatencyReader reads whatever data is currently available from the
+stream (rather than waiting for a fixed number of bytes), frames it
+incrementally with SBFFramer, and hands each complete frame to a callback
+(or the caller) immediately. Each frame is stamped with the monotonic
+time at which the read containing its last byte returned.
+
+Latency histograms are kept per block type, both for the time from
+arrival to dispatch and for the receiver's own reported latency (the
+'Latency' field of PVT blocks such as PVTGeodetic and PVTCartesian),
+so that end-to-end latency budgets can be verified.
+
+Created on 19 Oct 2026
+
+:author: semuadmin (Steve Smith)
+:copyright: semuadmin © 2020
+:license: BSD 3-Clause
+"""
+
+# pylint: disable=too-many-positional-arguments
+
+from bisect import bisect_left
+from collections import deque
+from logging import getLogger
+from socket import socket
+from threading import Event
+from time import monotonic
+
+from pysbf2.sbfframer import SBFFramer
+from pysbf2.sbfhelpers import msgids2nums
+from pysbf2.sbfreader import SBFReader
+from pysbf2.sbftypes_core import (
+    ERR_LOG,
+    NMEA_PROTOCOL,
+    RTCM3_PROTOCOL,
+    SBF_HDR,
+    SBF_MSGIDS,
+    SBF_PROTOCOL,
+    VALCKSUM,
+)
+
+LATENCY_BOUNDS = (
+    0.00001,
+    0.00002,
+    0.00005,
+    0.0001,
+    0.0002,
+    0.0005,
+    0.001,
+    0.002,
+    0.005,
+    0.01,
+    0.02,
+    0.05,
+    0.1,
+    0.2,
+    0.5,
+    1.0,
+)
+"""Default latency histogram bin upper bounds, in seconds"""
+RXLATENCY_SCALE = 0.0001
+"""Scaling of receiver 'Latency' field, in seconds"""
+RXLATENCY_DNU = 65535
+"""Receiver 'Latency' field do-not-use value"""
+
+
+class SBFLatencyHistogram:
+    """
+    Latency histogram with fixed bins.
+    """
+
+    def __init__(self, bounds: tuple = LATENCY_BOUNDS):
+        """
+        Constructor.
+
+        :param tuple bounds: ascending bin upper bounds, in seconds;
+            a final bin holds any larger values
+        """
+
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def __repr__(self) -> str:
+        """
+        Machine readable representation.
+
+        :return: machine readable representation
+        :rtype: str
+        """
+
+        return f"SBFLatencyHistogram({self.summary()})"
+
+    def add(self, value: float):
+        """
+        Add latency to histogram.
+
+        :param float value: latency in seconds
+        """
+
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, pct: float) -> float:
+        """
+        Get upper bound of bin containing given percentile.
+
+        :param float pct: percentile (0-100)
+        :return: latency in seconds (maximum latency if percentile
+            falls in final bin, None if histogram is empty)
+        :rtype: float
+        """
+
+        if not self.count:
+            return None
+        target = self.count * pct / 100
+        cumulative = 0
+        for i, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= target and count:
+                break
+        return self.bounds[i] if i < len(self.bounds) else self.max
+
+    def summary(self) -> dict:
+        """
+        Summarise histogram.
+
+        :return: dict of count, mean, min, max, p50 and p99 latency in seconds
+        :rtype: dict
+        """
+
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p99": self.percentile(99),
+        }
+
+    @property
+    def mean(self) -> float:
+        """
+        Getter for mean latency.
+
+        :return: mean latency in seconds, or None if histogram is empty
+        :rtype: float
+        """
+
+        return self.total / self.count if self.count else None
+
+    @property
+    def bins(self) -> list:
+        """
+        Getter for histogram bins.
+
+        :return: list of (upper bound in seconds, count), final bin
+            having an upper bound of None
+        :rtype: list
+        """
+
+        return list(zip(self.bounds + (None,), self.counts))
+
+
+class SBFLatencyReader:
+    """
+    Low-latency frame reader and dispatcher.
+    """
+
+    def __init__(
+        self,
+        datastream,
+        callbacks: dict = None,
+        default: object = None,
+        parsing: bool = True,
+        validate: int = VALCKSUM,
+        protfilter: int = NMEA_PROTOCOL | SBF_PROTOCOL | RTCM3_PROTOCOL,
+        parsebitfield: bool = True,
+        bufsize: int = 65536,
+        bounds: tuple = LATENCY_BOUNDS,
+        quitonerror: int = ERR_LOG,
+        errorhandler: object = None,
+    ):
+        """
+        Constructor.
+
+        :param datastream: input data stream - socket, serial port
+            (any object with an in_waiting attribute) or any other stream
+            supporting read1() or read()
+        :param dict callbacks: dict of {SBF block name or number: callback},
+            where callback(raw_data, parsed_data, arrival) is invoked by run()
+            for each frame of that block type (None)
+        :param object default: callback invoked by run() for any other frame,
+            including NMEA and RTCM3 (None = frames without a callback are
+            skipped without being parsed)
+        :param bool parsing: True = parse data, False = raw frames only (True)
+        :param int validate: VALCKSUM (1) = Validate checksum,
+            VALNONE (0) = ignore invalid checksum (1)
+        :param int protfilter: NMEA_PROTOCOL (1), SBF_PROTOCOL (2),
+            RTCM3_PROTOCOL (4), Can be OR'd (7)
+        :param bool parsebitfield: 1 = parse bitfields, 0 = leave as bytes (1)
+        :param int bufsize: maximum bytes read at a time (65536)
+        :param tuple bounds: latency histogram bin upper bounds, in seconds
+        :param int quitonerror: ERR_IGNORE (0) = ignore errors,  ERR_LOG (1) = log continue,
+            ERR_RAISE (2) = (re)raise (1)
+        :param object errorhandler: error handling object or function (None)
+        :raises: ParameterError (if callbacks contains an unknown block name)
+        """
+        # pylint: disable=too-many-arguments
+
+        self._stream = datastream
+        self._callbacks = {}
+        for msgid, callback in (callbacks or {}).items():
+            for num in msgids2nums([msgid]):
+                self._callbacks[num] = callback
+        self._default = default
+        self._parsing = parsing
+        self._validate = validate
+        self._parsebf = parsebitfield
+        self._bufsize = bufsize
+        self._bounds = bounds
+        self._quitonerror = quitonerror
+        self._errorhandler = errorhandler
+        self._logger = getLogger(__name__)
+        self._framer = SBFFramer(protfilter=protfilter, validate=validate)
+        self._pending = deque()
+        self._stop = Event()
+        if isinstance(datastream, socket):
+            self._read = self._read_socket
+        elif hasattr(datastream, "in_waiting"):
+            self._read = self._read_serial
+        else:
+            self._read = getattr(datastream, "read1", datastream.read)
+        self.latency = {}
+        """dict of {block type: SBFLatencyHistogram} of arrival to dispatch latency"""
+        self.rxlatency = {}
+        """dict of {block type: SBFLatencyHistogram} of receiver reported latency"""
+
+    def __iter__(self):
+        """Iterator."""
+
+        return self
+
+    def __next__(self) -> tuple:
+        """
+        Return next item in iteration.
+
+        :return: tuple of (raw_data as bytes, parsed_data, arrival time)
+        :rtype: tuple
+        :raises: StopIteration
+        """
+
+        raw_data, parsed_data, arrival = self.read()
+        if raw_data is None:
+            raise StopIteration
+        return (raw_data, parsed_data, arrival)
+
+    def read(self) -> tuple:
+        """
+        Read next frame, as soon as its last byte has arrived.
+
+        :return: tuple of (raw_data as bytes, parsed_data, arrival time
+            as time.monotonic() seconds), or (None, None, None) at end of stream
+        :rtype: tuple
+        """
+
+        frame = self._next_frame()
+        if frame is None:
+            return (None, None, None)
+        raw, arrival = frame
+        parsed = self._parse(raw) if self._parsing else None
+        self._record(raw, parsed, arrival)
+        return (raw, parsed, arrival)
+
+    def run(self, limit: int = 0) -> int:
+        """
+        Dispatch each frame to its callback as soon as its last byte has
+        arrived, until the stream is exhausted, the limit is reached or
+        stop() is called.
+
+        :param int limit: maximum number of frames to dispatch (0 = no limit)
+        :return: number of frames dispatched
+        :rtype: int
+        """
+
+        count = 0
+        self._stop.clear()
+        while not self._stop.is_set():
+            frame = self._next_frame()
+            if frame is None:
+                break
+            raw, arrival = frame
+            callback = self._callbacks.get(_blocknum(raw), self._default)
+            if callback is None:
+                continue
+            parsed = self._parse(raw) if self._parsing else None
+            self._record(raw, parsed, arrival)
+            callback(raw, parsed, arrival)
+            count += 1
+            if count == limit:
+                break
+        return count
+
+    def stop(self):
+        """
+        Stop run() after the current frame, or when a timed out
+        read returns.
+        """
+
+        self._stop.set()
+
+    def summary(self) -> dict:
+        """
+        Summarise latency histograms.
+
+        :return: dict of {block type: {"dispatch": summary, "receiver": summary}}
+        :rtype: dict
+        """
+
+        return {
+            key: {
+                "dispatch": hist.summary(),
+                "receiver": (
+                    self.rxlatency[key].summary() if key in self.rxlatency else None
+                ),
+            }
+            for key, hist in self.latency.items()
+        }
+
+    def _next_frame(self) -> tuple:
+        """
+        Get next frame, reading whatever data is available until
+        a frame is complete.
+
+        :return: tuple of (raw frame, arrival time), or None at end of stream
+        :rtype: tuple
+        """
+
+        while not self._pending:
+            data = self._read(self._bufsize)
+            arrival = monotonic()
+            if data is None:  # timed out
+                if self._stop.is_set():
+                    return None
+                continue
+            if not data:
+                return None
+            for raw in self._framer.feed(data):
+                self._pending.append((raw, arrival))
+        return self._pending.popleft()
+
+    def _read_socket(self, size: int) -> bytes:
+        """
+        Read whatever data is available from socket.
+
+        :param int size: maximum bytes to read
+        :return: data, or None if socket timed out
+        :rtype: bytes
+        """
+
+        try:
+            return self._stream.recv(size)
+        except TimeoutError:
+            return None
+
+    def _read_serial(self, size: int) -> bytes:
+        """
+        Read whatever data is available from serial port, waiting
+        (up to the port's timeout) for at least one byte.
+
+        :param int size: maximum bytes to read
+        :return: data, or None if port timed out
+        :rtype: bytes
+        """
+
+        data = self._stream.read(max(1, min(self._stream.in_waiting, size)))
+        return data or None
+
+    def _parse(self, raw: bytes) -> object:
+        """
+        Parse frame, handling any error.
+
+        :param bytes raw: raw frame
+        :return: parsed message, or None if frame could not be parsed
+        :rtype: object
+        """
+
+        try:
+            return SBFReader.parse_frame(raw, self._validate, self._parsebf)
+        except SBFReader.parse_errors() as err:
+            SBFReader.handle_error(
+                err, self._quitonerror, self._errorhandler, self._logger
+            )
+            return None
+
+    def _record(self, raw: bytes, parsed: object, arrival: float):
+        """
+        Record arrival to dispatch latency, and any receiver reported latency.
+
+        :param bytes raw: raw frame
+        :param object parsed: parsed message, or None
+        :param float arrival: arrival time
+        """
+
+        latency = monotonic() - arrival
+        num = _blocknum(raw)
+        if num is None:
+            key = "NMEA" if raw[0:1] == b"$" else "RTCM3"
+        else:
+            key = SBF_MSGIDS.get(num, (str(num),))[0]
+        if key not in self.latency:
+            self.latency[key] = SBFLatencyHistogram(self._bounds)
+        self.latency[key].add(latency)
+        rxlatency = getattr(parsed, "Latency", None)
+        if isinstance(rxlatency, int) and rxlatency != RXLATENCY_DNU:
+            if key not in self.rxlatency:
+                self.rxlatency[key] = SBFLatencyHistogram(self._bounds)
+            self.rxlatency[key].add(rxlatency * RXLATENCY_SCALE)
+
+
+def _blocknum(raw: bytes) -> int:
+    """
+    Get SBF block number from frame header.
+
+    :param bytes raw: raw frame
+    :return: block number, or None if frame is not SBF
+    :rtype: int
+    """
+
+    if raw[0:2] == SBF_HDR:
+        return int.from_bytes(raw[4:6], "little") & 0x1FFF
+    return None
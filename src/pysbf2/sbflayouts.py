@@ -0,0 +1,247 @@
+"""
+sbflayouts.py
+
+Layout information derived from the SBF block definitions in
+sbftypes_blocks, used by SBFView to unpack the fixed-layout
+attributes of each block type.
+
+Compiled layouts are cached on disk, keyed on library version,
+so that processes which only view SBF data need not import the
+(large) block definitions at all. The cache directory defaults to
+$XDG_CACHE_HOME/pysbf2 (or ~/.cache/pysbf2) and can be overridden
+via the PYSBF2_CACHE_DIR environment variable; set this to an
+empty string to disable the cache.
+
+Created on 19 Oct 2026
+
+:author: semuadmin (Steve Smith)
+:copyright: semuadmin © 2020
+:license: BSD 3-Clause
+"""
+
+import json
+import os
+from logging import getLogger
+
+from pysbf2._version import __version__
+from pysbf2.sbfhelpers import attsiz, atttyp
+from pysbf2.sbftypes_core import PAD
+
+CACHE_ENV = "PYSBF2_CACHE_DIR"
+"""Environment variable overriding layout cache directory"""
+
+_LAYOUTS = {}
+_FORMATS = {
+    "U001": "B",
+    "U002": "H",
+    "U004": "I",
+    "U008": "Q",
+    "I001": "b",
+    "I002": "h",
+    "I004": "i",
+    "I008": "q",
+    "F004": "f",
+    "F008": "d",
+}
+
+
+def _compile_fields(pdict: dict, parsebitfield: bool) -> tuple:
+    """
+    Compile the fixed-layout leading attributes of an SBF block payload
+    definition (all attributes up to the first repeating or conditional
+    group or variable length attribute), for use by SBFView.
+
+    :param dict pdict: payload definition dictionary
+    :param bool parsebitfield: 1 = bitfields as individual flags,
+        0 = bitfields as bytes
+    :return: tuple of (attribute names, struct format of payload,
+        decoding steps, payload end offset of each decoding step)
+    :rtype: tuple
+    """
+    # pylint: disable=too-many-locals, too-many-branches
+
+    fmt = "<"
+    names = []
+    steps = []  # one (kind, arg) decoding step per struct item
+    ends = []
+    offset = 0
+    for anam, adef in pdict.items():
+        scale = None
+        if isinstance(adef, list):  # scaled attribute
+            adef, scale = adef
+        if isinstance(adef, tuple):
+            numr, bdict = adef
+            if not (isinstance(numr, str) and atttyp(numr) == "X"):
+                break  # repeating or conditional group
+            siz = attsiz(numr)
+            if parsebitfield:
+                fmt += _FORMATS.get(f"U{siz:03d}", f"{siz}s")
+                bits = []
+                bfoffset = 0
+                for flag, flagt in bdict.items():
+                    if flag[0:8] != "reserved":  # as SBFMessage
+                        names.append(flag)
+                        bits.append((bfoffset, (1 << attsiz(flagt)) - 1))
+                    bfoffset += attsiz(flagt)
+                steps.append(("bits", tuple(bits)))
+            else:
+                fmt += f"{siz}s"
+                names.append(anam)
+                steps.append((None, None))
+        elif anam == PAD or atttyp(adef) == "V":
+            break  # variable length
+        else:
+            siz = attsiz(adef)
+            if adef in _FORMATS:
+                fmt += _FORMATS[adef]
+                steps.append(("scale", scale) if scale else (None, None))
+            else:
+                fmt += f"{siz}s"
+                if atttyp(adef) in ("I", "U"):
+                    steps.append(("int", atttyp(adef) == "I"))
+                else:
+                    steps.append((None, None))
+            names.append(anam)
+        offset += siz
+        ends.append(offset)
+    return tuple(names), fmt, tuple(steps), tuple(ends)
+
+
+def _tuples(obj: object) -> object:
+    """
+    Recursively convert lists (e.g. from JSON) to tuples.
+
+    :param object obj: object
+    :return: object with all lists converted to tuples
+    :rtype: object
+    """
+
+    if isinstance(obj, list):
+        return tuple(_tuples(item) for item in obj)
+    return obj
+
+
+def compile_layouts() -> dict:
+    """
+    Compile layout information from the block definitions in SBF_BLOCKS.
+
+    :return: dict of {"fields": {block name: (field layout without
+        bitfields parsed, field layout with bitfields parsed)}}
+    :rtype: dict
+    """
+
+    # pylint: disable=import-outside-toplevel
+    from pysbf2.sbftypes_blocks import SBF_BLOCKS
+
+    fields = {
+        msgid: (_compile_fields(pdict, False), _compile_fields(pdict, True))
+        for msgid, pdict in SBF_BLOCKS.items()
+    }
+    return {"fields": fields}
+
+
+def cache_path() -> str:
+    """
+    Get path of layout cache file for this library version. The
+    modification time of the block definitions (and of this module) is
+    included in the key, so that edits to an unreleased version are
+    picked up.
+
+    :return: fully qualified path of cache file, or "" if cache disabled
+    :rtype: str
+    """
+
+    cachedir = os.environ.get(CACHE_ENV)
+    if cachedir is None:
+        cachedir = os.path.join(
+            os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")),
+            "pysbf2",
+        )
+    if cachedir == "":
+        return ""
+    try:
+        srcpath = os.path.join(os.path.dirname(__file__), "sbftypes_blocks.py")
+        mtime = int(max(os.stat(srcpath).st_mtime, os.stat(__file__).st_mtime))
+    except OSError:  # pragma: no cover
+        mtime = 0
+    return os.path.join(cachedir, f"layouts-{__version__}-{mtime}.json")
+
+
+def _load_cache(path: str) -> dict:
+    """
+    Load compiled layouts from cache file.
+
+    :param str path: cache file path
+    :return: dict of compiled layouts
+    :rtype: dict
+    :raises: OSError, ValueError if cache is absent or invalid
+    """
+
+    with open(path, "r", encoding="utf-8") as cache:
+        layouts = json.load(cache)
+    return {
+        "fields": {key: _tuples(val) for key, val in layouts["fields"].items()},
+    }
+
+
+def _save_cache(path: str, layouts: dict):
+    """
+    Save compiled layouts to cache file. The file is written
+    atomically, so concurrent processes never see a partial cache.
+
+    :param str path: cache file path
+    :param dict layouts: dict of compiled layouts
+    :raises: OSError if cache cannot be written
+    """
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}"
+    with open(tmp, "w", encoding="utf-8") as cache:
+        json.dump(layouts, cache)
+    os.replace(tmp, path)
+
+
+def load_layouts() -> dict:
+    """
+    Get compiled layouts, from the on-disk cache if available,
+    otherwise compiling (and caching) them from SBF_BLOCKS.
+
+    The result is memoized.
+
+    :return: dict of compiled layouts
+    :rtype: dict
+    """
+
+    if not _LAYOUTS:
+        path = cache_path()
+        try:
+            if path == "":
+                raise OSError("cache disabled")
+            _LAYOUTS.update(_load_cache(path))
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            _LAYOUTS.update(compile_layouts())
+            if path != "":
+                try:
+                    _save_cache(path, _LAYOUTS)
+                except OSError as err:  # pragma: no cover
+                    getLogger(__name__).debug("Unable to cache SBF layouts %s", err)
+    return _LAYOUTS
+
+
+def block_fields(msgid: str, parsebitfield: bool = True) -> tuple:
+    """
+    Get compiled layout of the fixed-layout leading attributes of an
+    SBF block type (see SBFView).
+
+    :param str msgid: block name e.g. "PVTGeodetic"
+    :param bool parsebitfield: 1 = bitfields as individual flags,
+        0 = bitfields as bytes (1)
+    :return: tuple of (attribute names, struct format of payload,
+        decoding steps, payload end offset of each decoding step)
+    :rtype: tuple
+    """
+
+    fields = load_layouts()["fields"].get(msgid)
+    if fields is None:
+        return (), "<", (), ()
+    return fields[int(bool(parsebitfield))]
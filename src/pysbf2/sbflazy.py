@@ -0,0 +1,315 @@
+"""
+sbflazy.py
+
+Lazily-parsed NMEA and RTCM3 message wrappers.
+
+Used by SBFReader when 'lazyparse' is set. The message checksum is
+validated when the wrapper is created, and basic message identity
+attributes are derived directly from the raw message header; the full
+(relatively expensive) pynmeagps or pyrtcm parse is deferred until any
+other attribute is accessed, and is then performed once only.
+
+Created on 19 Oct 2026
+
+:author: semuadmin (Steve Smith)
+:copyright: semuadmin © 2020
+:license: BSD 3-Clause
+"""
+
+from pysbf2.sbftypes_core import VALCKSUM, VALNONE
+
+RTCM_STNID_TYPES = {
+    *range(1001, 1014),
+    *range(1029, 1034),
+    1230,
+    *range(1071, 1078),
+    *range(1081, 1088),
+    *range(1091, 1098),
+    *range(1101, 1108),
+    *range(1111, 1118),
+    *range(1121, 1128),
+    *range(1131, 1138),
+}
+"""RTCM3 message types with reference station ID (DF003) following message type"""
+
+
+class LazyNMEAMessage:
+    """
+    Lazily-parsed NMEA message.
+    """
+
+    def __init__(self, message: bytes, validate: int = VALCKSUM):
+        """
+        Constructor.
+
+        :param bytes message: raw NMEA message
+        :param int validate: VALCKSUM (1) = Validate checksum,
+            VALNONE (0) = ignore invalid checksum (1)
+        :raises: NMEAParseError (if checksum is invalid)
+        """
+
+        if validate & VALCKSUM:
+            # pylint: disable=import-outside-toplevel
+            from pynmeagps import NMEAParseError, calc_checksum, get_parts
+
+            content, talker, msgid, _, checksum = get_parts(message)
+            ccksum = calc_checksum(content)
+            if checksum.upper() != ccksum:
+                raise NMEAParseError(
+                    f"Message {talker}{msgid} invalid checksum {checksum}"
+                    f" - should be {ccksum}."
+                )
+        self._raw = message
+        self._validate = validate
+        self._parsed = None
+        end = message.find(b",")
+        hdr = message[1 : end if end > 0 else message.find(b"*")]
+        split = 1 if hdr[:1] == b"P" else 2  # proprietary or standard talker
+        self._talker = hdr[:split].decode("ascii", "replace")
+        self._msgid = hdr[split:].decode("ascii", "replace")
+
+    def __getattr__(self, name: str) -> object:
+        """
+        Delegate any attribute not derived from the header to the
+        fully parsed NMEAMessage, parsing it if necessary.
+
+        :param str name: attribute name
+        :return: attribute value
+        :rtype: object
+        :raises: AttributeError
+        """
+
+        if name[0] == "_":
+            raise AttributeError(name)
+        return getattr(self.parsed, name)
+
+    def __str__(self) -> str:
+        """
+        Human readable representation (requires full parse).
+
+        :return: human readable representation
+        :rtype: str
+        """
+
+        return str(self.parsed)
+
+    def __repr__(self) -> str:
+        """
+        Machine readable representation (requires full parse).
+
+        :return: machine readable representation
+        :rtype: str
+        """
+
+        return repr(self.parsed)
+
+    def serialize(self) -> bytes:
+        """
+        Serialize message.
+
+        :return: raw message
+        :rtype: bytes
+        """
+
+        return self._raw
+
+    @property
+    def parsed(self) -> object:
+        """
+        Getter for fully parsed message, parsing it on first access.
+
+        :return: parsed message
+        :rtype: NMEAMessage
+        :raises: NMEAParseError
+        """
+
+        if self._parsed is None:
+            from pynmeagps import (  # pylint: disable=import-outside-toplevel
+                NMEAReader,
+            )
+
+            self._parsed = NMEAReader.parse(
+                self._raw, validate=self._validate & ~VALCKSUM  # already validated
+            )
+        return self._parsed
+
+    @property
+    def talker(self) -> str:
+        """
+        Talker getter.
+
+        :return: talker e.g. 'GN' (or 'P' for proprietary)
+        :rtype: str
+        """
+
+        return self._talker
+
+    @property
+    def msgID(self) -> str:  # pylint: disable=invalid-name
+        """
+        Message id getter.
+
+        :return: message id e.g. 'GGA'
+        :rtype: str
+        """
+
+        return self._msgid
+
+    @property
+    def identity(self) -> str:
+        """
+        Message identity getter. The identity of some proprietary
+        messages depends on their content and requires a full parse.
+
+        :return: message identity e.g. 'GNGGA'
+        :rtype: str
+        """
+
+        if self._talker == "P":
+            return self.parsed.identity
+        return self._talker + self._msgid
+
+
+class LazyRTCMMessage:
+    """
+    Lazily-parsed RTCM3 message.
+    """
+
+    def __init__(self, message: bytes, validate: int = VALCKSUM, labelmsm: int = 1):
+        """
+        Constructor.
+
+        :param bytes message: raw RTCM3 message, including 3 byte header and CRC
+        :param int validate: VALCKSUM (1) = Validate checksum,
+            VALNONE (0) = ignore invalid checksum (1)
+        :param int labelmsm: MSM NSAT and NCELL attribute label (1 = RINEX, 2 = freq)
+        :raises: RTCMParseError (if CRC is invalid)
+        """
+
+        if validate & VALCKSUM:
+            # pylint: disable=import-outside-toplevel
+            from pyrtcm import RTCMParseError, calc_crc24q
+
+            if calc_crc24q(message):
+                raise RTCMParseError(
+                    f"RTCM3 message invalid - failed CRC: {message[-3:]}"
+                )
+        self._raw = message
+        self._labelmsm = labelmsm
+        self._parsed = None
+        self._length = ((message[1] & 0x03) << 8) | message[2]
+        self._msgtype = (message[3] << 4) | (message[4] >> 4)
+
+    def __getattr__(self, name: str) -> object:
+        """
+        Delegate any attribute not derived from the header to the
+        fully parsed RTCMMessage, parsing it if necessary.
+
+        :param str name: attribute name
+        :return: attribute value
+        :rtype: object
+        :raises: AttributeError
+        """
+
+        if name[0] == "_":
+            raise AttributeError(name)
+        return getattr(self.parsed, name)
+
+    def __str__(self) -> str:
+        """
+        Human readable representation (requires full parse).
+
+        :return: human readable representation
+        :rtype: str
+        """
+
+        return str(self.parsed)
+
+    def __repr__(self) -> str:
+        """
+        Machine readable representation (requires full parse).
+
+        :return: machine readable representation
+        :rtype: str
+        """
+
+        return repr(self.parsed)
+
+    def serialize(self) -> bytes:
+        """
+        Serialize message.
+
+        :return: raw message
+        :rtype: bytes
+        """
+
+        return self._raw
+
+    @property
+    def parsed(self) -> object:
+        """
+        Getter for fully parsed message, parsing it on first access.
+
+        :return: parsed message
+        :rtype: RTCMMessage
+        :raises: RTCMParseError
+        """
+
+        if self._parsed is None:
+            from pyrtcm import RTCMReader  # pylint: disable=import-outside-toplevel
+
+            self._parsed = RTCMReader.parse(
+                self._raw,
+                validate=VALNONE,
+                labelmsm=self._labelmsm,  # already validated
+            )
+        return self._parsed
+
+    @property
+    def msgtype(self) -> int:
+        """
+        Message type getter.
+
+        :return: message type e.g. 1077
+        :rtype: int
+        """
+
+        return self._msgtype
+
+    @property
+    def identity(self) -> str:
+        """
+        Message identity getter.
+
+        :return: message identity e.g. '1077' or '4076_021'
+        :rtype: str
+        """
+
+        if self._msgtype == 4076:  # proprietary IGS SSR message type
+            subtype = (self._raw[4] & 0x1) << 7 | self._raw[5] >> 1
+            return f"{self._msgtype}_{subtype:03d}"
+        return str(self._msgtype)
+
+    @property
+    def length(self) -> int:
+        """
+        Payload length getter.
+
+        :return: payload length in bytes
+        :rtype: int
+        """
+
+        return self._length
+
+    @property
+    def stationid(self) -> object:
+        """
+        Reference station ID (DF003) getter.
+
+        :return: station ID, or None if message type has no station ID
+        :rtype: int or None
+        """
+
+        if self._msgtype in RTCM_STNID_TYPES:
+            return ((self._raw[4] & 0x0F) << 8) | self._raw[5]
+        return None
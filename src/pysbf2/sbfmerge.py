@@ -0,0 +1,222 @@
+"""
+sbfmerge.py
+
+Streaming k-way time merge of several SBF sources (e.g. logs from
+different receivers, or consecutive hourly logs which overlap).
+
+SBFMerger reads one frame ahead from each source, and uses a heap keyed
+on each lookahead frame's header time stamp (WNc, TOW) to yield frames
+from all sources in time order, each tagged with its source. Memory use
+is bounded by one lookahead frame per source, however large the sources.
+
+Frames without a time stamp (NMEA and RTCM3 messages, or SBF blocks with
+a do-not-use time stamp) take the time of the preceding SBF block from
+the same source, so they stay with the epoch in which they were logged.
+Frames with equal times are yielded in source order. Where sources
+overlap, duplicate frames can be discarded with an SBFDeduplicator.
+
+Created on 19 Oct 2026
+
+:author: semuadmin (Steve Smith)
+:copyright: semuadmin © 2020
+:license: BSD 3-Clause
+"""
+
+# pylint: disable=too-many-positional-arguments
+
+from heapq import heappop, heappush, heapreplace
+from logging import getLogger
+
+from pysbf2.sbfcompress import open_sbf
+from pysbf2.sbfdecimate import frame_time
+from pysbf2.sbfreader import SBFReader
+from pysbf2.sbftypes_core import (
+    ERR_LOG,
+    NMEA_PROTOCOL,
+    RTCM3_PROTOCOL,
+    SBF_PROTOCOL,
+    VALCKSUM,
+)
+
+
+class SBFMerger:
+    """
+    Streaming k-way time merge of SBF sources.
+    """
+
+    def __init__(
+        self,
+        sources: object,
+        parsing: bool = False,
+        protfilter: int = NMEA_PROTOCOL | SBF_PROTOCOL | RTCM3_PROTOCOL,
+        validate: int = VALCKSUM,
+        parsebitfield: bool = True,
+        quitonerror: int = ERR_LOG,
+        errorhandler: object = None,
+        dedup: object = None,
+    ):
+        """
+        Constructor.
+
+        :param object sources: dict of {source id: source}, or list of sources
+            (identified by list index), where each source is a file path
+            (opened with open_sbf(), so may be compressed), a stream or an
+            SBFReader
+        :param bool parsing: True = parse frames, False = raw frames only (False)
+        :param int protfilter: NMEA_PROTOCOL (1), SBF_PROTOCOL (2),
+            RTCM3_PROTOCOL (4), Can be OR'd (7)
+        :param int validate: VALCKSUM (1) = Validate checksum,
+            VALNONE (0) = ignore invalid checksum (1)
+        :param bool parsebitfield: 1 = parse bitfields, 0 = leave as bytes (1)
+        :param int quitonerror: ERR_IGNORE (0) = ignore errors,  ERR_LOG (1) = log continue,
+            ERR_RAISE (2) = (re)raise (1)
+        :param object errorhandler: error handling object or function (None)
+        :param object dedup: SBFDeduplicator duplicate frame filter, applied
+            to frames in time order before they are parsed (None)
+        """
+        # pylint: disable=too-many-arguments
+
+        if not isinstance(sources, dict):
+            sources = dict(enumerate(sources))
+        self._parsing = parsing
+        self._validate = validate
+        self._parsebf = parsebitfield
+        self._quitonerror = quitonerror
+        self._errorhandler = errorhandler
+        self._dedup = dedup
+        self._logger = getLogger(__name__)
+        self._ids = list(sources)
+        self._readers = []
+        self._owned = []  # streams opened by merger
+        for source in sources.values():
+            if isinstance(source, str):
+                source = open_sbf(source)
+                self._owned.append(source)
+            if not isinstance(source, SBFReader):
+                source = SBFReader(
+                    source,
+                    protfilter=protfilter,
+                    validate=validate,
+                    parsing=False,
+                    quitonerror=quitonerror,
+                    errorhandler=errorhandler,
+                )
+            self._readers.append(source)
+        self._last = [-1] * len(self._readers)  # last time from each source
+        self._seq = 0
+        self._heap = None
+        self.counts = dict.fromkeys(self._ids, 0)
+        """dict of {source id: frames yielded (excluding duplicates)}"""
+
+    def __enter__(self):
+        """
+        Context manager enter routine.
+        """
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        """
+        Context manager exit routine.
+        """
+
+        self.close()
+
+    def __iter__(self):
+        """Iterator."""
+
+        return self
+
+    def __next__(self) -> tuple:
+        """
+        Return next item in iteration.
+
+        :return: tuple of (source id, raw_data as bytes, parsed_data)
+        :rtype: tuple
+        :raises: StopIteration
+        """
+
+        source, raw_data, parsed_data = self.read()
+        if raw_data is None:
+            raise StopIteration
+        return (source, raw_data, parsed_data)
+
+    def read(self) -> tuple:
+        """
+        Read next frame in time order from any source.
+
+        :return: tuple of (source id, raw_data as bytes, parsed_data), or
+            (None, None, None) when all sources are exhausted
+        :rtype: tuple
+        """
+
+        if self._heap is None:  # prime heap with first frame from each source
+            self._heap = []
+            for idx in range(len(self._readers)):
+                entry = self._peek(idx)
+                if entry is not None:
+                    heappush(self._heap, entry)
+        while True:
+            if not self._heap:
+                return (None, None, None)
+            _, idx, _, raw = self._heap[0]
+            entry = self._peek(idx)
+            if entry is None:
+                heappop(self._heap)
+            else:
+                heapreplace(self._heap, entry)
+            source = self._ids[idx]
+            # discard duplicates before they are parsed
+            if self._dedup is None or self._dedup.keep(raw, source):
+                break
+        self.counts[source] += 1
+        parsed = None
+        if self._parsing:
+            parsed = self._parse(raw)
+        return (source, raw, parsed)
+
+    def _peek(self, idx: int) -> tuple:
+        """
+        Read lookahead frame from source.
+
+        :param int idx: source index
+        :return: heap entry (time, source index, sequence, raw frame),
+            or None if source is exhausted
+        :rtype: tuple
+        """
+
+        raw, _ = self._readers[idx].read()
+        if raw is None:
+            return None
+        msec = frame_time(raw)
+        if msec is None:
+            msec = self._last[idx]
+        self._last[idx] = msec
+        self._seq += 1
+        return (msec, idx, self._seq, raw)
+
+    def _parse(self, raw: bytes) -> object:
+        """
+        Parse frame, handling any error.
+
+        :param bytes raw: raw frame
+        :return: parsed message, or None if frame could not be parsed
+        :rtype: object
+        """
+
+        try:
+            return SBFReader.parse_frame(raw, self._validate, self._parsebf)
+        except SBFReader.parse_errors() as err:
+            SBFReader.handle_error(
+                err, self._quitonerror, self._errorhandler, self._logger
+            )
+            return None
+
+    def close(self):
+        """
+        Close any sources opened by the merger from file paths.
+        """
+
+        for stream in self._owned:
+            stream.close()
+        self._owned = []
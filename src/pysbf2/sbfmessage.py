@@ -28,13 +28,9 @@ from pysbf2.sbfhelpers import (
     nomval,
     val2bytes,
 )
-from pysbf2.sbftypes_blocks import SBF_BLOCKS
 from pysbf2.sbftypes_core import (
     CHSTR,
     PAD,
-    PD,
-    PD1,
-    PD2,
     SBF_HDR,
     SBF_MSGIDS,
     SCALROUND,
@@ -92,8 +88,9 @@ class SBFMessage:
             msgid = bytes2val(msgid, U2)
         if isinstance(msgid, int):
             try:
+                # revision number may be encoded in top 3 bits of block ID
+                revno = (msgid & 0b1110000000000000) >> 13 or revno
                 msgid = msgid & 0b0001111111111111
-                revno = (msgid & 0b1110000000000000) >> 13
                 msgid = SBF_MSGIDS[msgid][0]
             except KeyError as err:
                 raise SBFMessageError(f"Unknown SBF Message ID {msgid}") from err
@@ -239,13 +236,17 @@ class SBFMessage:
             for key1 in gdict:
                 if key1 == PAD:  # sub block padding marker
                     # get sub block length from preceding SBLength attribute
-                    # and derive length of sub block padding bytes
-                    if gdict[PAD] in (PD, PD1, PD2):
-                        sblen = getattr(self, gdict[PAD])
-                        gdict[PAD] = f"P{(sblen - sbcum):03d}"
-                offset, index = self._set_attribute(
-                    key1, gdict, offset, index, **kwargs
-                )
+                    # and derive length of sub block padding bytes (the block
+                    # definition is shared, so must not be updated in place)
+                    sblen = getattr(self, gdict[PAD])
+                    padding = f"P{max(sblen - sbcum, 0):03d}"
+                    offset = self._set_attribute_single(
+                        PAD, padding, offset, index, **kwargs
+                    )
+                else:
+                    offset, index = self._set_attribute(
+                        key1, gdict, offset, index, **kwargs
+                    )
                 # calculate cumulative sub block length
                 sbcum = offset - sboff
 
@@ -438,7 +439,7 @@ class SBFMessage:
         """
         Calculate and format payload length and checksum as bytes."""
 
-        msgidb = msgid2bytes(self._msgid)
+        msgidb = msgid2bytes(self._msgid, self._revno)
         payload = b"" if self._payload is None else self._payload
         self._length = len(payload) + 8  # add 8-byte header
         lenb = val2bytes(self._length, U2)
@@ -456,6 +457,10 @@ class SBFMessage:
 
         """
 
+        # block definitions are only imported when first needed
+        # pylint: disable=import-outside-toplevel
+        from pysbf2.sbftypes_blocks import SBF_BLOCKS
+
         try:
             pdict = SBF_BLOCKS[self._msgid]
             return pdict
@@ -521,6 +526,38 @@ class SBFMessage:
 
         super().__setattr__(name, value)
 
+    def __getstate__(self) -> tuple:
+        """
+        Get compact pickle state. Only the raw message content is
+        pickled; the (many) decoded attributes are reconstituted from the
+        payload on unpickling, which is considerably cheaper than
+        pickling the entire attribute dictionary.
+
+        :return: tuple of (msgid, revno, crc, length, payload, parsebitfield)
+        :rtype: tuple
+
+        """
+
+        return (
+            self._msgid,
+            self._revno,
+            self._crc,
+            self._length,
+            self._payload,
+            self._parsebf,
+        )
+
+    def __reduce__(self) -> tuple:
+        """
+        Pickle support - see __getstate__().
+
+        :return: tuple of (reconstructor, state)
+        :rtype: tuple
+
+        """
+
+        return (_unpickle, self.__getstate__())
+
     def serialize(self) -> bytes:
         """
         Serialize message.
@@ -533,7 +570,7 @@ class SBFMessage:
         return (
             SBF_HDR
             + self._crc
-            + msgid2bytes(self._msgid)
+            + msgid2bytes(self._msgid, self._revno)
             + val2bytes(self._length, U2)
             + (b"" if self._payload is None else self._payload)
         )
@@ -561,3 +598,29 @@ class SBFMessage:
         """
 
         return self._payload
+
+
+def _unpickle(
+    msgid: str,
+    revno: int,
+    crc: bytes,
+    length: int,
+    payload: bytes,
+    parsebitfield: bool,
+) -> SBFMessage:
+    """
+    Reconstitute pickled SBFMessage by decoding its payload.
+
+    :param str msgid: message ID e.g. 'PVTCartesian'
+    :param int revno: revision number
+    :param bytes crc: CRC as 2 bytes
+    :param int length: length
+    :param bytes payload: raw payload, or None if empty
+    :param bool parsebitfield: parse bitfields Y/N
+    :return: SBFMessage
+    :rtype: SBFMessage
+
+    """
+
+    kwargs = {} if payload is None else {"payload": payload}
+    return SBFMessage(msgid, revno, crc, length, parsebitfield, **kwargs)
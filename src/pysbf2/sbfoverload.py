@@ -0,0 +1,177 @@
+"""
+sbfoverload.py
+
+Load-shedding policy for SBFReader, for use when downstream processing
+cannot keep up with the incoming data rate (e.g. a slow database sink),
+so that the reader sheds decoding work rather than allowing the input
+buffer (e.g. a serial port's) to overflow.
+
+The policy monitors a backlog - by default the number of bytes waiting
+in a serial input stream, or any other measure such as the size of a
+sink's queue or the bytes queued on a socket. While the backlog exceeds
+the high watermark (and until it falls back below the low watermark),
+the reader either:
+
+- OVERLOAD_PASSTHROUGH: returns all but the priority block types
+  undecoded (parsed_data = None), or
+- OVERLOAD_DECIMATE: returns only one in every 'decimation' blocks of
+  each low priority block type, discarding the rest.
+
+Priority block types are always decoded.
+
+Created on 19 Oct 2026
+
+:author: semuadmin (Steve Smith)
+:copyright: semuadmin © 2020
+:license: BSD 3-Clause
+"""
+
+# pylint: disable=too-many-positional-arguments
+
+from pysbf2.exceptions import ParameterError
+from pysbf2.sbfhelpers import msgids2nums
+from pysbf2.sbftypes_core import SBF_MSGIDS
+
+OVERLOAD_PASSTHROUGH = 0
+"""Return non-priority frames undecoded while overloaded"""
+OVERLOAD_DECIMATE = 1
+"""Decimate low priority block types while overloaded"""
+
+DECODE = 0
+"""Overload action - decode frame"""
+SHED_UNDECODED = 1
+"""Overload action - return frame undecoded"""
+SHED_DROP = 2
+"""Overload action - discard frame"""
+
+PRIORITY_BLOCKS = frozenset(
+    num
+    for num, (name, _) in SBF_MSGIDS.items()
+    if name.startswith(("PVT", "ExtEvent")) or name == "AttEuler"
+)
+"""Default priority block types (PVT*, AttEuler, ExtEvent*)"""
+LOWPRIORITY_BLOCKS = frozenset(
+    num
+    for num, (name, _) in SBF_MSGIDS.items()
+    if "Raw" in name or name in ("ChannelStatus", "SatVisibility")
+)
+"""Default low priority block types (ChannelStatus, SatVisibility, raw navigation data)"""
+
+
+class SBFOverloadPolicy:
+    """
+    Load-shedding policy for SBFReader.
+    """
+
+    def __init__(
+        self,
+        highwater: int,
+        lowwater: int = None,
+        mode: int = OVERLOAD_PASSTHROUGH,
+        priority: object = None,
+        lowpriority: object = None,
+        decimation: int = 10,
+        backlog: object = None,
+    ):
+        """
+        Constructor.
+
+        :param int highwater: backlog above which load is shed
+        :param int lowwater: backlog below which load is no longer shed
+            (None = half of highwater)
+        :param int mode: OVERLOAD_PASSTHROUGH (0) or OVERLOAD_DECIMATE (1) (0)
+        :param object priority: collection of block names or numbers which
+            are always decoded (None = PRIORITY_BLOCKS)
+        :param object lowpriority: collection of block names or numbers which
+            are decimated in OVERLOAD_DECIMATE mode (None = LOWPRIORITY_BLOCKS)
+        :param int decimation: in OVERLOAD_DECIMATE mode, return one in
+            every 'decimation' low priority blocks of each type (10)
+        :param object backlog: function returning current backlog (None =
+            bytes waiting in reader's serial input stream; required for sockets)
+        :raises: ParameterError
+        """
+        # pylint: disable=too-many-arguments
+
+        if mode not in (OVERLOAD_PASSTHROUGH, OVERLOAD_DECIMATE):
+            raise ParameterError(f"Invalid overload mode {mode}")
+        if decimation < 1:
+            raise ParameterError(f"Invalid decimation {decimation}")
+        self._highwater = highwater
+        self._lowwater = highwater // 2 if lowwater is None else lowwater
+        self._mode = mode
+        self._priority = (
+            PRIORITY_BLOCKS if priority is None else frozenset(msgids2nums(priority))
+        )
+        self._lowpriority = (
+            LOWPRIORITY_BLOCKS
+            if lowpriority is None
+            else frozenset(msgids2nums(lowpriority))
+        )
+        self._decimation = decimation
+        self._backlog = backlog
+        self._counts = {}
+        self.overloaded = False
+        """True while load is being shed"""
+        self.overloads = 0
+        """Number of times high watermark has been exceeded"""
+        self.undecoded = 0
+        """Number of frames returned undecoded"""
+        self.dropped = 0
+        """Number of frames discarded"""
+        self.shed = {}
+        """dict of {block number (None for NMEA/RTCM3): frames shed}"""
+
+    def bind(self, stream: object):
+        """
+        Bind policy to reader's input stream, if no backlog function was given.
+
+        :param object stream: input stream
+        :raises: ParameterError (if backlog of stream cannot be determined)
+        """
+
+        if self._backlog is not None:
+            return
+        waiting = getattr(stream, "in_waiting", None)
+        if waiting is None:
+            raise ParameterError(
+                "Overload policy requires a backlog function for stream "
+                f"{type(stream).__name__} (no in_waiting attribute)"
+            )
+        if callable(waiting):  # SocketWrapper, which only counts its own buffer
+            raise ParameterError(
+                "Overload policy requires a backlog function for socket streams "
+                "(e.g. bytes queued on socket, from ioctl FIONREAD)"
+            )
+        self._backlog = lambda: stream.in_waiting  # e.g. serial.Serial
+
+    def action(self, blocknum: int) -> int:
+        """
+        Determine action for a frame, according to current backlog.
+
+        :param int blocknum: SBF block number, or None for NMEA and RTCM3
+        :return: DECODE (0), SHED_UNDECODED (1) or SHED_DROP (2)
+        :rtype: int
+        """
+
+        backlog = self._backlog()
+        if self.overloaded:
+            self.overloaded = backlog > self._lowwater
+        elif backlog > self._highwater:
+            self.overloaded = True
+            self.overloads += 1
+        if not self.overloaded or blocknum in self._priority:
+            return DECODE
+        if self._mode == OVERLOAD_PASSTHROUGH:
+            self.undecoded += 1
+            action = SHED_UNDECODED
+        elif blocknum in self._lowpriority:
+            count = self._counts.get(blocknum, 0)
+            self._counts[blocknum] = count + 1
+            if not count % self._decimation:
+                return DECODE
+            self.dropped += 1
+            action = SHED_DROP
+        else:
+            return DECODE
+        self.shed[blocknum] = self.shed.get(blocknum, 0) + 1
+        return action
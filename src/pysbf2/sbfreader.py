@@ -22,6 +22,20 @@ Returns both the raw binary data (as bytes) and the parsed data
 - 'protfilter' governs which protocols (NMEA, SBF, RTCM) are processed
 - 'quitonerror' governs how errors are handled
 
+SBF headers are sanity-checked against the plausible length limits for each
+block type before the payload is read. If a header is implausible, or the
+block fails CRC validation, the reader rescans from the byte following the
+bad sync word, so that genuine blocks embedded in corrupted data are
+recovered. Likewise, a spurious NMEA header found in binary data costs at
+most 'nmealimit' bytes before the scan resumes.
+
+If 'lazyparse' is set, NMEA and RTCM3 messages are returned as lazily-parsed
+wrappers which expose identity attributes derived from the message header and
+defer the full pynmeagps or pyrtcm parse until any other attribute is accessed.
+
+The pynmeagps and pyrtcm sub-parsers are only imported when the first NMEA
+or RTCM3 message is encountered.
+
 Created on 19 May 2025
 
 :author: semuadmin (Steve Smith)
@@ -31,25 +45,12 @@ Created on 19 May 2025
 
 # pylint: disable=too-many-positional-arguments
 
+from importlib import import_module
+from io import BytesIO
 from logging import getLogger
+from os import path
 from socket import socket
-
-from pynmeagps import (
-    NMEA_HDR,
-    NMEAMessageError,
-    NMEAParseError,
-    NMEAReader,
-    NMEAStreamError,
-    NMEATypeError,
-    SocketWrapper,
-)
-from pyrtcm import (
-    RTCMMessageError,
-    RTCMParseError,
-    RTCMReader,
-    RTCMStreamError,
-    RTCMTypeError,
-)
+from types import ModuleType
 
 from pysbf2.exceptions import (
     SBFMessageError,
@@ -57,17 +58,42 @@ from pysbf2.exceptions import (
     SBFStreamError,
     SBFTypeError,
 )
-from pysbf2.sbfhelpers import bytes2id, crc2bytes, escapeall
+from pysbf2.sbfdecimate import WEEK_MS, frame_time
+from pysbf2.sbfhelpers import bytes2id, crc2bytes, escapeall, msgids2nums
+from pysbf2.sbfindex import SBFIndex, bisect_time, index_path
+from pysbf2.sbflazy import LazyNMEAMessage, LazyRTCMMessage
 from pysbf2.sbfmessage import SBFMessage
+from pysbf2.sbfoverload import DECODE, SHED_DROP
 from pysbf2.sbftypes_core import (
     ERR_LOG,
     ERR_RAISE,
+    NMEA_MAXLEN,
     NMEA_PROTOCOL,
     RTCM3_PROTOCOL,
     SBF_HDR,
+    SBF_MAXLEN,
+    SBF_MINLEN,
     SBF_PROTOCOL,
     VALCKSUM,
+    VALNONE,
 )
+from pysbf2.sbfview import SBFView
+
+SUBPARSER_ERRORS = {
+    "pynmeagps": (
+        "NMEAMessageError",
+        "NMEATypeError",
+        "NMEAParseError",
+        "NMEAStreamError",
+    ),
+    "pyrtcm": (
+        "RTCMMessageError",
+        "RTCMTypeError",
+        "RTCMParseError",
+        "RTCMStreamError",
+    ),
+}
+"""Exception types handled by read() for each sub-parser"""
 
 
 class SBFReader:
@@ -75,6 +101,9 @@ class SBFReader:
     SBFReader class.
     """
 
+    _subparsers = {}  # sub-parser modules, imported on first use
+    _errors = (SBFMessageError, SBFTypeError, SBFParseError, SBFStreamError)
+
     def __init__(
         self,
         datastream,
@@ -85,6 +114,10 @@ class SBFReader:
         bufsize: int = 4096,
         parsing: bool = True,
         errorhandler: object = None,
+        nmealimit: int = NMEA_MAXLEN,
+        lazyparse: bool = False,
+        overload: object = None,
+        decimate: object = None,
     ):
         """Constructor.
 
@@ -99,12 +132,23 @@ class SBFReader:
         :param int bufsize: socket recv buffer size (4096)
         :param bool parsing: True = parse data, False = don't parse data (output raw only) (True)
         :param object errorhandler: error handling object or function (None)
+        :param int nmealimit: maximum NMEA sentence length including header
+            and CRLF terminator (82)
+        :param bool lazyparse: True = defer full parse of NMEA and RTCM3 messages
+            until attributes other than identity are accessed (False)
+        :param object overload: SBFOverloadPolicy load-shedding policy,
+            applied while downstream processing is falling behind (None)
+        :param object decimate: SBFDecimator time-based decimation filter,
+            applied to SBF blocks before they are parsed (None)
         :raises: SBFStreamError (if mode is invalid)
+        :raises: ParameterError (if overload policy cannot monitor stream)
         """
         # pylint: disable=too-many-arguments
 
         if isinstance(datastream, socket):
-            self._stream = SocketWrapper(datastream, bufsize=bufsize)
+            self._stream = self.subparser("pynmeagps").SocketWrapper(
+                datastream, bufsize=bufsize
+            )
         else:
             self._stream = datastream
         self._quitonerror = quitonerror
@@ -114,6 +158,14 @@ class SBFReader:
         self._validate = validate
         self._parsing = parsing
         self._logger = getLogger(__name__)
+        self._pushback = b""  # bytes to be rescanned after sync loss
+        self._nmealimit = nmealimit
+        self._lazyparse = lazyparse
+        self._overload = overload
+        self._decimate = decimate
+        self._until = None  # end of time window set by seek_time()
+        if overload is not None:
+            overload.bind(self._stream)
 
     def __iter__(self):
         """Iterator."""
@@ -164,6 +216,8 @@ class SBFReader:
                 # if it's a SBF message (b'\x24\x40')
                 if bytehdr == SBF_HDR:
                     raw_data, parsed_data = self._parse_sbf(bytehdr)
+                    if raw_data is None:  # discarded by overload or decimation
+                        continue
                     # if protocol filter passes SBF, return message,
                     # otherwise discard and continue
                     if self._protfilter & SBF_PROTOCOL:
@@ -171,7 +225,9 @@ class SBFReader:
                     else:
                         continue
                 # if it's an NMEA message (b'\x24\x..)
-                elif bytehdr in NMEA_HDR:
+                elif (
+                    byte1 == b"\x24" and bytehdr in self.subparser("pynmeagps").NMEA_HDR
+                ):
                     raw_data, parsed_data = self._parse_nmea(bytehdr)
                     # if protocol filter passes NMEA, return message,
                     # otherwise discard and continue
@@ -195,26 +251,116 @@ class SBFReader:
 
             except EOFError:
                 return (None, None)
-            except (
-                SBFMessageError,
-                SBFTypeError,
-                SBFParseError,
-                SBFStreamError,
-                NMEAMessageError,
-                NMEATypeError,
-                NMEAParseError,
-                NMEAStreamError,
-                RTCMMessageError,
-                RTCMTypeError,
-                RTCMParseError,
-                RTCMStreamError,
-            ) as err:
+            except self._errors as err:
                 if self._quitonerror:
                     self._do_error(err)
                 continue
 
         return (raw_data, parsed_data)
 
+    def dispatch(self, handlers: dict, limit: int = 0) -> int:
+        """
+        Read SBF blocks and pass each to the handler for its block type,
+        until the stream is exhausted or the limit is reached.
+
+        Rather than a new SBFMessage, each handler receives an SBFView -
+        a flyweight view over the raw frame which decodes the block's
+        fixed-layout attributes in a single struct unpack on first access.
+        The same view object is reused for every block of that type, so
+        handlers must copy any values they wish to retain. Blocks for
+        which there is no handler (and all NMEA and RTCM3 messages) are
+        skipped once their header has been read, without being validated
+        or parsed.
+
+        :param dict handlers: dict of {SBF block name or number: handler},
+            where handler(view) is called for each block of that type
+        :param int limit: maximum number of blocks to dispatch (0 = no limit)
+        :return: number of blocks dispatched
+        :rtype: int
+        :raises: ParameterError (if handlers contains an unknown block name)
+        """
+
+        views = {}
+        for msgid, handler in handlers.items():
+            for num in msgids2nums([msgid]):
+                views[num] = (SBFView(num, self._parsebf), handler)
+        count = 0
+        parsing = self._parsing
+        self._parsing = False  # frames are parsed on demand by view
+        try:
+            while True:
+                raw_data, _ = self.read()
+                if raw_data is None:
+                    break
+                if raw_data[0:2] != SBF_HDR:
+                    continue
+                entry = views.get(int.from_bytes(raw_data[4:6], "little") & 0x1FFF)
+                if entry is None:
+                    continue
+                if self._validate & VALCKSUM:
+                    try:
+                        self._check_crc(raw_data)
+                    except SBFMessageError as err:
+                        self._do_error(err)
+                        continue
+                view, handler = entry
+                view.bind(raw_data)
+                handler(view)
+                count += 1
+                if count == limit:
+                    break
+        finally:
+            self._parsing = parsing
+        return count
+
+    def seek_time(
+        self, wn: int, tow: int, end: tuple = None, index: object = None
+    ) -> int:
+        """
+        Position a seekable (file) stream at the first SBF block at or
+        after the given time, optionally ending the stream after a given
+        end time, so that a time window can be read without scanning the
+        whole file. Block times are assumed to increase monotonically.
+
+        If an index is given, or the stream is a file with an index
+        sidecar ('<file>.idx'), the index is bisected. Otherwise the file
+        itself is bisected on byte offset, resynchronising on the next
+        valid SBF block at each step.
+
+        :param int wn: week number (WNc) of start of window
+        :param int tow: time of week (TOW) of start of window in milliseconds
+        :param tuple end: (WNc, TOW) of end of window, after which read()
+            returns end of stream (None = read to end of file)
+        :param object index: SBFIndex, or path of index sidecar file
+            (None = use sidecar file if present)
+        :return: byte offset of first block in window (end of file if none)
+        :rtype: int
+        :raises: SBFStreamError (if stream is not seekable or index is invalid)
+        """
+
+        stream = self._stream
+        if not (hasattr(stream, "seekable") and stream.seekable()):
+            raise SBFStreamError(
+                f"seek_time requires a seekable stream, not {type(stream).__name__}"
+            )
+        if index is None:
+            name = getattr(stream, "name", None)
+            if isinstance(name, str) and path.exists(index_path(name)):
+                index = index_path(name)
+        if isinstance(index, str):
+            index = SBFIndex.load(index)
+        msec = wn * WEEK_MS + tow
+        if index is None:
+            offset = bisect_time(stream, msec, self._validate)
+        else:
+            offset = index.find(msec)
+            if offset is None:
+                offset = stream.seek(0, 2)
+        stream.seek(offset)
+        self.reset()
+        self._until = None if end is None else end[0] * WEEK_MS + end[1]
+        return offset
+
     def _parse_sbf(self, hdr: bytes) -> tuple:
         """
         Parse remainder of SBF message.
@@ -223,6 +369,7 @@ class SBFReader:
         :return: tuple of (raw_data as bytes, parsed_data as SBFMessage or None)
         :rtype: tuple
         """
+        # pylint: disable=too-many-branches
 
         # read the rest of the SBF message from the buffer
         byten = self._read_bytes(6)
@@ -230,20 +377,73 @@ class SBFReader:
         msgid = byten[2:4]
         lenb = byten[4:6]
         # lenb includes 8 byte header
-        leni = int.from_bytes(lenb, "little", signed=False) - 8
-        plb = self._read_bytes(leni)
+        length = int.from_bytes(lenb, "little", signed=False)
+        msgnum = int.from_bytes(msgid, "little", signed=False) & 0x1FFF
+        if length % 4 or not SBF_MINLEN <= length <= SBF_MAXLEN:
+            # implausible header - rescan from byte following sync word
+            self._pushback = byten + self._pushback
+            raise SBFParseError(
+                f"Invalid length {length} for SBF block {msgnum} - "
+                f"should be multiple of 4 in range {SBF_MINLEN} to {SBF_MAXLEN}"
+            )
+        try:
+            plb = self._read_bytes(length - 8)
+        except SBFStreamError:  # rescan from byte following sync word
+            self._pushback = byten + self._pushback
+            raise
         raw_data = hdr + crc + msgid + lenb + plb
-        # only parse if we need to (filter passes SBF)
-        if (self._protfilter & SBF_PROTOCOL) and self._parsing:
+        # CRC is validated at most once, before block contents are first used
+        check = self._validate & VALCKSUM
+        # end stream after time window set by seek_time()
+        if self._until is not None:
+            msec = frame_time(raw_data)
+            if msec is not None and msec > self._until:
+                if check:
+                    self._check_crc(raw_data)
+                self._pushback = raw_data + self._pushback
+                raise EOFError()
+        # discard decimated blocks before they are parsed
+        if self._decimate is not None:
+            if check:
+                self._check_crc(raw_data)
+                check = False
+            if not self._decimate.keep(raw_data):
+                return (None, None)
+        # only parse if we need to (filter passes SBF) and load is not being shed
+        parse = self._protfilter & SBF_PROTOCOL and self._parsing
+        if parse and self._overload is not None:
+            action = self._overload.action(msgnum)
+            if action == SHED_DROP:
+                return (None, None)
+            parse = action == DECODE
+        if parse:
+            if check:
+                self._check_crc(raw_data)
             parsed_data = self.parse(
                 raw_data,
-                validate=self._validate,
+                validate=VALNONE,  # already validated
                 parsebitfield=self._parsebf,
             )
         else:
             parsed_data = None
         return (raw_data, parsed_data)
 
+    def _check_crc(self, raw_data: bytes):
+        """
+        Validate CRC of SBF block.
+
+        :param bytes raw_data: raw SBF block
+        :raises: SBFMessageError (if CRC is invalid)
+        """
+
+        crccheck = crc2bytes(raw_data[4:])
+        if crccheck != raw_data[2:4]:
+            # corrupt block - rescan from byte following sync word
+            self._pushback = raw_data[2:] + self._pushback
+            raise SBFMessageError(
+                f"Invalid CRC {escapeall(raw_data[2:4])} - should be {escapeall(crccheck)}"
+            )
+
     def _parse_nmea(self, hdr: bytes) -> tuple:
         """
         Parse remainder of NMEA message (using pynmeagps library).
@@ -256,13 +456,15 @@ class SBFReader:
         # read the rest of the NMEA message from the buffer
         byten = self._read_line()  # NMEA protocol is CRLF-terminated
         raw_data = hdr + byten
-        # only parse if we need to (filter passes NMEA)
-        if (self._protfilter & NMEA_PROTOCOL) and self._parsing:
-            # invoke pynmeagps parser
-            parsed_data = NMEAReader.parse(
-                raw_data,
-                validate=self._validate,
-            )
+        # only parse if we need to (filter passes NMEA) and load is not being shed
+        if self._decode(NMEA_PROTOCOL):
+            if self._lazyparse:
+                parsed_data = LazyNMEAMessage(raw_data, validate=self._validate)
+            else:  # invoke pynmeagps parser
+                parsed_data = self.subparser("pynmeagps").NMEAReader.parse(
+                    raw_data,
+                    validate=self._validate,
+                )
         else:
             parsed_data = None
         return (raw_data, parsed_data)
@@ -281,18 +483,36 @@ class SBFReader:
         payload = self._read_bytes(size)
         crc = self._read_bytes(3)
         raw_data = hdr + hdr3 + payload + crc
-        # only parse if we need to (filter passes RTCM)
-        if (self._protfilter & RTCM3_PROTOCOL) and self._parsing:
-            # invoke pyrtcm parser
-            parsed_data = RTCMReader.parse(
-                raw_data,
-                validate=self._validate,
-                labelmsm=1,
-            )
+        # only parse if we need to (filter passes RTCM) and load is not being shed
+        if self._decode(RTCM3_PROTOCOL):
+            if self._lazyparse:
+                self.subparser("pyrtcm")  # register errors raised by CRC check
+                parsed_data = LazyRTCMMessage(
+                    raw_data, validate=self._validate, labelmsm=1
+                )
+            else:  # invoke pyrtcm parser
+                parsed_data = self.subparser("pyrtcm").RTCMReader.parse(
+                    raw_data,
+                    validate=self._validate,
+                    labelmsm=1,
+                )
         else:
             parsed_data = None
         return (raw_data, parsed_data)
 
+    def _decode(self, protocol: int) -> bool:
+        """
+        Check if NMEA or RTCM3 message should be parsed.
+
+        :param int protocol: NMEA_PROTOCOL or RTCM3_PROTOCOL
+        :return: True if protocol filter passes message and load is not being shed
+        :rtype: bool
+        """
+
+        if not (self._protfilter & protocol and self._parsing):
+            return False
+        return self._overload is None or self._overload.action(None) == DECODE
+
     def _read_bytes(self, size: int) -> bytes:
         """
         Read a specified number of bytes from stream.
@@ -303,10 +523,17 @@ class SBFReader:
         :raises: SBFStreamError if stream ends prematurely
         """
 
-        data = self._stream.read(size)
+        if self._pushback:  # rescan any bytes pushed back after sync loss
+            data = self._pushback[:size]
+            self._pushback = self._pushback[size:]
+            if len(data) < size:
+                data += self._stream.read(size - len(data))
+        else:
+            data = self._stream.read(size)
         if len(data) == 0:  # EOF
             raise EOFError()
-        if 0 < len(data) < size:  # truncated stream
+        if 0 < len(data) < size:  # truncated stream - rescan what we have
+            self._pushback = data + self._pushback
             raise SBFStreamError(
                 "Serial stream terminated unexpectedly. "
                 f"{size} bytes requested, {len(data)} bytes returned."
@@ -315,23 +542,90 @@ class SBFReader:
 
     def _read_line(self) -> bytes:
         """
-        Read bytes until LF (0x0a) terminator.
+        Read bytes until LF (0x0a) terminator, up to a maximum of
+        'nmealimit' bytes (less the 2 byte header already read).
+
+        If no terminator is found within this limit, or the line
+        is not ASCII, the header is deemed spurious and the bytes read
+        are pushed back to be rescanned.
 
         :return: bytes
         :rtype: bytes
         :raises: SBFStreamError if stream ends prematurely
+        :raises: SBFParseError if NMEA header is spurious
         """
 
-        data = self._stream.readline()  # NMEA protocol is CRLF-terminated
+        limit = self._nmealimit - 2
+        if self._pushback:  # rescan any bytes pushed back after sync loss
+            idx = self._pushback.find(b"\x0a", 0, limit)
+            if idx >= 0:
+                data = self._pushback[: idx + 1]
+                self._pushback = self._pushback[idx + 1 :]
+            else:
+                data = self._pushback[:limit]
+                self._pushback = self._pushback[limit:]
+                if len(data) < limit:
+                    data += self._readline_bounded(limit - len(data))
+        else:
+            data = self._readline_bounded(limit)
         if len(data) == 0:
             raise EOFError()  # pragma: no cover
-        if data[-1:] != b"\x0a":  # truncated stream
-            raise SBFStreamError(
-                "Serial stream terminated unexpectedly. "
-                f"Line requested, {len(data)} bytes returned."
-            )
+        if data[-1:] != b"\x0a":
+            if len(data) < limit:  # truncated stream
+                raise SBFStreamError(
+                    "Serial stream terminated unexpectedly. "
+                    f"Line requested, {len(data)} bytes returned."
+                )
+            self._pushback = data + self._pushback
+            raise SBFParseError(f"No NMEA terminator found within {limit} bytes")
+        if not data.isascii():
+            self._pushback = data + self._pushback
+            raise SBFParseError("Non-ASCII data in NMEA sentence")
         return data
 
+    def _readline_bounded(self, limit: int) -> bytes:
+        """
+        Read bytes from stream until LF (0x0a) terminator
+        or size limit reached.
+
+        :param int limit: maximum number of bytes to read
+        :return: bytes
+        :rtype: bytes
+        """
+
+        try:
+            return self._stream.readline(limit)
+        except TypeError:  # stream readline() does not support size limit
+            data = b""
+            while len(data) < limit:
+                byte = self._stream.read(1)
+                data += byte
+                if byte in (b"", b"\x0a"):
+                    break
+            return data
+
+    @classmethod
+    def subparser(cls, name: str) -> ModuleType:
+        """
+        Get pynmeagps or pyrtcm sub-parser module, importing it on
+        first use and registering its exception types with read().
+
+        :param str name: module name
+        :return: sub-parser module
+        :rtype: ModuleType
+        """
+
+        module = SBFReader._subparsers.get(name)
+        if module is None:
+            module = import_module(name)
+            # registered on SBFReader itself, as the import is shared by
+            # all subclasses (cls._errors += ... would bind on a subclass)
+            SBFReader._errors += tuple(
+                getattr(module, err) for err in SUBPARSER_ERRORS[name]
+            )
+            SBFReader._subparsers[name] = module
+        return module
+
     def _do_error(self, err: Exception):
         """
         Handle error.
@@ -340,15 +634,48 @@ class SBFReader:
         :raises: Exception if quitonerror = ERR_RAISE (2)
         """
 
-        if self._quitonerror == ERR_RAISE:
+        self.handle_error(err, self._quitonerror, self._errorhandler, self._logger)
+
+    @staticmethod
+    def parse_errors() -> tuple:
+        """
+        Get exception types which may be raised when parsing a frame,
+        including those of any pynmeagps or pyrtcm sub-parser imported.
+
+        :return: tuple of exception types
+        :rtype: tuple
+        """
+
+        return SBFReader._errors
+
+    @staticmethod
+    def handle_error(
+        err: Exception,
+        quitonerror: int = ERR_LOG,
+        errorhandler: object = None,
+        logger: object = None,
+    ):
+        """
+        Handle parsing error according to quitonerror setting.
+
+        :param Exception err: error
+        :param int quitonerror: ERR_IGNORE (0) = ignore errors,  ERR_LOG (1) = log continue,
+            ERR_RAISE (2) = (re)raise (1)
+        :param object errorhandler: error handling object or function (None)
+        :param object logger: logger used if there is no error handler
+            (None = pysbf2.sbfreader logger)
+        :raises: Exception if quitonerror = ERR_RAISE (2)
+        """
+
+        if quitonerror == ERR_RAISE:
             raise err from err
-        if self._quitonerror == ERR_LOG:
+        if quitonerror == ERR_LOG:
             # pass to error handler if there is one
             # else just log
-            if self._errorhandler is None:
-                self._logger.error(err)
+            if errorhandler is None:
+                (logger or getLogger(__name__)).error(err)
             else:
-                self._errorhandler(err)
+                errorhandler(err)
 
     @property
     def datastream(self) -> object:
@@ -361,6 +688,64 @@ class SBFReader:
 
         return self._stream
 
+    @property
+    def parsing(self) -> bool:
+        """
+        Getter for parsing flag.
+
+        :return: True if frames are parsed, False if raw frames only
+        :rtype: bool
+        """
+
+        return self._parsing
+
+    @property
+    def buffered(self) -> int:
+        """
+        Getter for number of bytes read from stream but not yet consumed
+        (held to be rescanned after loss of sync).
+
+        :return: bytes buffered
+        :rtype: int
+        """
+
+        return len(self._pushback)
+
+    def reset(self):
+        """
+        Discard any bytes buffered for rescanning, e.g. after the
+        underlying stream has been repositioned.
+        """
+
+        self._pushback = b""
+
+    @staticmethod
+    def parse_frame(
+        message: bytes,
+        validate: int = VALCKSUM,
+        parsebitfield: bool = True,
+    ) -> object:
+        """
+        Parse a complete raw SBF, NMEA or RTCM3 frame, as returned by
+        read() with parsing=False.
+
+        :param bytes message: raw frame
+        :param int validate: VALCKSUM (1) = Validate checksum,
+            VALNONE (0) = ignore invalid checksum (1)
+        :param bool parsebitfield: 1 = parse bitfields, 0 = leave as bytes (1)
+        :return: SBFMessage, NMEAMessage or RTCMMessage object
+        :rtype: object
+        :raises: SBFMessageError, SBFParseError (or pynmeagps/pyrtcm equivalents)
+        """
+
+        if message[0:2] == SBF_HDR:
+            return SBFReader.parse(
+                message, validate=validate, parsebitfield=parsebitfield
+            )
+        return SBFReader(
+            BytesIO(message), validate=validate, quitonerror=ERR_RAISE
+        ).read()[1]
+
     @staticmethod
     def parse(
         message: bytes,
@@ -380,12 +765,12 @@ class SBFReader:
         """
 
         crc = message[2:4]
-        msg = message[4:]
-        crccheck = crc2bytes(msg)
-        if crccheck != crc and validate & VALCKSUM:
-            raise SBFMessageError(
-                f"Invalid CRC {escapeall(crc)} - should be {escapeall(crccheck)}"
-            )
+        if validate & VALCKSUM:
+            crccheck = crc2bytes(message[4:])
+            if crccheck != crc:
+                raise SBFMessageError(
+                    f"Invalid CRC {escapeall(crc)} - should be {escapeall(crccheck)}"
+                )
         msgid, revno = bytes2id(message[4:6])
         length = int.from_bytes(message[6:8], "little")
         plb = message[8:]
@@ -0,0 +1,528 @@
+"""
+sbfrelay.py
+
+TCP relay, which re-serves a single receiver's data stream to any
+number of TCP clients.
+
+The source stream is framed by an SBFFramer, so each client only ever
+receives whole frames, and clients may optionally be restricted to
+specific SBF block types (filtered on the frame header, without
+parsing). All sockets are non-blocking and serviced from a single
+selector loop. Each client has its own bounded send buffer; when a slow
+client's buffer is full, whole frames are dropped (or the client is
+disconnected) according to the relay's drop policy, so one slow client
+never stalls the others.
+
+Created on 19 Oct 2026
+
+:author: semuadmin (Steve Smith)
+:copyright: semuadmin © 2020
+:license: BSD 3-Clause
+"""
+
+# pylint: disable=too-many-positional-arguments
+
+import selectors
+import socket
+from collections import deque
+from threading import Event, Lock, Thread
+from time import monotonic
+
+from pysbf2.sbfframer import SBFFramer
+from pysbf2.sbfhelpers import msgids2nums
+from pysbf2.sbftypes_core import (
+    NMEA_PROTOCOL,
+    RTCM3_PROTOCOL,
+    SBF_HDR,
+    SBF_PROTOCOL,
+    VALCKSUM,
+)
+
+DROP_NEWEST = 0
+"""Drop frames which do not fit in a full client buffer"""
+DROP_OLDEST = 1
+"""Drop oldest unsent frames to make room in a full client buffer"""
+DROP_CLIENT = 2
+"""Disconnect client when its buffer is full"""
+
+RELAY_POLL = 0.1
+"""Interval at which relay loop checks for stop request, in seconds"""
+
+
+class SBFRelayClient:
+    """
+    Relay client connection, created by SBFRelay.add_client().
+    """
+
+    def __init__(
+        self,
+        sock: socket.socket,
+        msgfilter: object = None,
+        maxbuffer: int = 1048576,
+        policy: int = DROP_NEWEST,
+    ):
+        """
+        Constructor.
+
+        :param socket.socket sock: connected client socket
+        :param object msgfilter: collection of SBF block names or numbers
+            to be relayed; other frames (including NMEA and RTCM3) are not
+            relayed (None = relay all frames)
+        :param int maxbuffer: maximum bytes buffered for client (1048576)
+        :param int policy: DROP_NEWEST (0), DROP_OLDEST (1) or DROP_CLIENT (2)
+        :raises: ParameterError (if msgfilter is invalid)
+        """
+
+        self.sock = sock
+        self.sock.setblocking(False)
+        try:
+            self.address = sock.getpeername()
+        except OSError:
+            self.address = None
+        self._filter = None if msgfilter is None else msgids2nums(msgfilter)
+        self._maxbuffer = maxbuffer
+        self._policy = policy
+        self._frames = deque()
+        self._offset = 0  # bytes of oldest frame already sent
+        self.buffered = 0
+        """Number of bytes buffered awaiting sending"""
+        self.closed = False
+        self.sent = 0
+        """Number of frames sent"""
+        self.bytes = 0
+        """Number of bytes sent"""
+        self.dropped = 0
+        """Number of frames dropped because buffer was full"""
+
+    def __repr__(self) -> str:
+        """
+        Machine readable representation.
+
+        :return: machine readable representation
+        :rtype: str
+        """
+
+        return (
+            f"SBFRelayClient({self.address}, sent={self.sent}, bytes={self.bytes}, "
+            f"dropped={self.dropped}, buffered={self.buffered}, closed={self.closed})"
+        )
+
+    def wants(self, blocknum: int) -> bool:
+        """
+        Check if this client wants a frame.
+
+        :param int blocknum: SBF block number, or None if frame is not SBF
+        :return: True if frame passes msgfilter
+        :rtype: bool
+        """
+
+        return self._filter is None or blocknum in self._filter
+
+    def queue(self, frame: bytes) -> bool:
+        """
+        Add frame to send buffer, according to the drop policy.
+
+        :param bytes frame: raw frame
+        :return: False if client should be disconnected, otherwise True
+        :rtype: bool
+        """
+
+        if self.buffered + len(frame) > self._maxbuffer:
+            if self._policy == DROP_CLIENT:
+                self.dropped += 1
+                return False
+            if self._policy == DROP_OLDEST:
+                oldest = 1 if self._offset else 0  # never drop a partially sent frame
+                while (
+                    len(self._frames) > oldest
+                    and self.buffered + len(frame) > self._maxbuffer
+                ):
+                    self.buffered -= len(self._frames[oldest])
+                    del self._frames[oldest]
+                    self.dropped += 1
+            if self.buffered + len(frame) > self._maxbuffer:
+                self.dropped += 1
+                return True
+        self._frames.append(frame)
+        self.buffered += len(frame)
+        return True
+
+    def send(self) -> bool:
+        """
+        Send as much buffered data as the socket will accept without blocking.
+
+        :return: False if connection has failed, otherwise True
+        :rtype: bool
+        """
+
+        frames = self._frames
+        try:
+            while frames:
+                frame = frames[0]
+                n = self.sock.send(memoryview(frame)[self._offset :])
+                self.bytes += n
+                self.buffered -= n
+                self._offset += n
+                if self._offset < len(frame):
+                    break  # socket buffer full
+                frames.popleft()
+                self._offset = 0
+                self.sent += 1
+        except (BlockingIOError, InterruptedError):
+            pass
+        except OSError:
+            return False
+        return True
+
+    def close(self):
+        """
+        Close client connection.
+        """
+
+        self.closed = True
+        self._frames.clear()
+        self.buffered = 0
+        self.sock.close()
+
+
+class SBFRelay:
+    """
+    TCP relay of whole frames to many clients.
+    """
+
+    def __init__(
+        self,
+        listen: tuple = None,
+        msgfilter: object = None,
+        maxbuffer: int = 1048576,
+        policy: int = DROP_NEWEST,
+        protfilter: int = NMEA_PROTOCOL | SBF_PROTOCOL | RTCM3_PROTOCOL,
+        validate: int = VALCKSUM,
+        bufsize: int = 65536,
+    ):
+        """
+        Constructor.
+
+        :param tuple listen: (host, port) on which to accept client
+            connections (None = clients added via add_client() only)
+        :param object msgfilter: default msgfilter for accepted clients (None)
+        :param int maxbuffer: maximum bytes buffered per client (1048576)
+        :param int policy: drop policy when a client's buffer is full -
+            DROP_NEWEST (0), DROP_OLDEST (1) or DROP_CLIENT (2) (0)
+        :param int protfilter: NMEA_PROTOCOL (1), SBF_PROTOCOL (2),
+            RTCM3_PROTOCOL (4), Can be OR'd (7)
+        :param int validate: VALCKSUM (1) = Validate checksum,
+            VALNONE (0) = ignore invalid checksum (1)
+        :param int bufsize: maximum bytes read from source at a time (65536)
+        :raises: ParameterError (if msgfilter is invalid)
+        """
+        # pylint: disable=too-many-arguments
+
+        self._msgfilter = None if msgfilter is None else msgids2nums(msgfilter)
+        self._maxbuffer = maxbuffer
+        self._policy = policy
+        self._bufsize = bufsize
+        self._framer = SBFFramer(protfilter=protfilter, validate=validate)
+        self._selector = selectors.DefaultSelector()
+        self._clients = {}
+        self._lock = Lock()  # clients may be added from another thread
+        self._stop = Event()
+        self._thread = None
+        self._server = None
+        if listen is not None:
+            self._server = socket.create_server(listen)
+            self._server.setblocking(False)
+            self._selector.register(self._server, selectors.EVENT_READ)
+        self.frames = 0
+        """Number of frames relayed"""
+        self.disconnects = 0
+        """Number of clients disconnected (including slow clients)"""
+
+    def __enter__(self):
+        """
+        Context manager enter routine.
+        """
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        """
+        Context manager exit routine.
+        """
+
+        self.close()
+
+    def add_client(
+        self, sock: socket.socket, msgfilter: object = None
+    ) -> SBFRelayClient:
+        """
+        Add connected client socket.
+
+        :param socket.socket sock: connected client socket
+        :param object msgfilter: collection of SBF block names or numbers
+            to be relayed to this client (None = relay all frames)
+        :return: client
+        :rtype: SBFRelayClient
+        :raises: ParameterError (if msgfilter is invalid)
+        """
+
+        client = SBFRelayClient(sock, msgfilter, self._maxbuffer, self._policy)
+        with self._lock:
+            self._clients[sock] = client
+            self._selector.register(sock, selectors.EVENT_READ, client)
+        return client
+
+    def publish(self, frame: bytes):
+        """
+        Queue whole frame for all clients which want it, and
+        send as much as possible without blocking.
+
+        :param bytes frame: raw frame
+        """
+
+        self.frames += 1
+        blocknum = None
+        if frame[0:2] == SBF_HDR:
+            blocknum = int.from_bytes(frame[4:6], "little") & 0x1FFF
+        for client in self.clients:
+            if not client.wants(blocknum):
+                continue
+            if not (client.queue(frame) and client.send()):
+                self._disconnect(client)
+            else:
+                self._watch(client)
+
+    def feed(self, data: bytes) -> int:
+        """
+        Frame data and publish any complete frames.
+
+        :param bytes data: data from source
+        :return: number of frames published
+        :rtype: int
+        """
+
+        frames = self._framer.feed(data)
+        for frame in frames:
+            self.publish(frame)
+        return len(frames)
+
+    def poll(self, timeout: float = 0):
+        """
+        Accept new clients, send buffered data to clients whose sockets
+        are writeable and handle client disconnections.
+
+        :param float timeout: time to wait for socket events, in seconds
+        """
+
+        for key, events in self._selector.select(timeout):
+            if key.fileobj is self._server:
+                self._accept()
+            elif key.data is not None:
+                self._service(key.data, events)
+
+    def drain(self, timeout: float = None) -> bool:
+        """
+        Wait until all buffered data has been sent to clients
+        (e.g. after the source is exhausted).
+
+        :param float timeout: time to wait, in seconds (None = wait indefinitely)
+        :return: True if all buffered data was sent
+        :rtype: bool
+        """
+
+        deadline = None if timeout is None else monotonic() + timeout
+        while any(c.buffered for c in self.clients):
+            wait = RELAY_POLL if deadline is None else deadline - monotonic()
+            if wait <= 0:
+                return False
+            self.poll(min(wait, RELAY_POLL))
+        return True
+
+    def run(self, source: object, limit: int = 0) -> int:
+        """
+        Relay frames from source until it is exhausted, the limit
+        is reached or stop() is called.
+
+        :param object source: source socket or stream (any object with
+            a recv() or read() method)
+        :param int limit: stop once this many frames have been relayed - all
+            frames in the final read are relayed (0 = no limit)
+        :return: number of frames relayed
+        :rtype: int
+        """
+
+        count = self.frames
+        self._stop.clear()
+        issocket = hasattr(source, "recv")
+        if issocket:
+            self._selector.register(source, selectors.EVENT_READ)
+        try:
+            while not self._stop.is_set():
+                if issocket:
+                    ready = self._select_source(source)
+                    try:
+                        data = source.recv(self._bufsize) if ready else None
+                    except (BlockingIOError, InterruptedError):
+                        data = None
+                    except OSError:  # source connection failed
+                        break
+                else:
+                    data = source.read(self._bufsize)
+                    self.poll()
+                if data is None:
+                    continue
+                if not data:
+                    break
+                self.feed(data)
+                if limit and self.frames - count >= limit:
+                    break
+        finally:
+            if issocket:
+                self._selector.unregister(source)
+        return self.frames - count
+
+    def start(self, source: object, limit: int = 0):
+        """
+        Run relay in background thread.
+
+        :param object source: source socket or stream
+        :param int limit: as for run()
+        """
+
+        self._thread = Thread(target=self.run, args=(source, limit), daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = None):
+        """
+        Stop background relay thread.
+
+        :param float timeout: time to wait for thread to stop, in seconds
+            (None = wait indefinitely)
+        """
+
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def close(self):
+        """
+        Stop relay and close all connections.
+        """
+
+        self.stop()
+        for client in self.clients:
+            self._disconnect(client)
+        if self._server is not None:
+            self._selector.unregister(self._server)
+            self._server.close()
+            self._server = None
+        self._selector.close()
+
+    def _select_source(self, source: socket.socket) -> bool:
+        """
+        Service client sockets until source socket is readable
+        or poll interval expires.
+
+        :param socket.socket source: source socket
+        :return: True if source is readable
+        :rtype: bool
+        """
+
+        ready = False
+        for key, events in self._selector.select(RELAY_POLL):
+            if key.fileobj is source:
+                ready = True
+            elif key.fileobj is self._server:
+                self._accept()
+            elif key.data is not None:
+                self._service(key.data, events)
+        return ready
+
+    def _accept(self):
+        """
+        Accept new client connection.
+        """
+
+        try:
+            sock, _ = self._server.accept()
+        except BlockingIOError:
+            return
+        self.add_client(sock, self._msgfilter)
+
+    def _service(self, client: SBFRelayClient, events: int):
+        """
+        Handle socket events for client.
+
+        :param SBFRelayClient client: client
+        :param int events: selector events
+        """
+
+        if events & selectors.EVENT_READ:
+            try:
+                data = client.sock.recv(4096)  # client data is discarded
+            except (BlockingIOError, InterruptedError):
+                data = None
+            except OSError:
+                data = b""
+            if data == b"":
+                self._disconnect(client)
+                return
+        if events & selectors.EVENT_WRITE:
+            if not client.send():
+                self._disconnect(client)
+                return
+        self._watch(client)
+
+    def _watch(self, client: SBFRelayClient):
+        """
+        Watch client socket for writeability only while it has data pending.
+
+        :param SBFRelayClient client: client
+        """
+
+        events = selectors.EVENT_READ
+        if client.buffered:
+            events |= selectors.EVENT_WRITE
+        if self._selector.get_key(client.sock).events != events:
+            self._selector.modify(client.sock, events, client)
+
+    def _disconnect(self, client: SBFRelayClient):
+        """
+        Remove and close client connection.
+
+        :param SBFRelayClient client: client
+        """
+
+        with self._lock:
+            if self._clients.pop(client.sock, None) is None:
+                return
+            self._selector.unregister(client.sock)
+        client.close()
+        self.disconnects += 1
+
+    @property
+    def clients(self) -> list:
+        """
+        Getter for connected clients.
+
+        :return: list of clients
+        :rtype: list
+        """
+
+        with self._lock:
+            return list(self._clients.values())
+
+    @property
+    def address(self) -> tuple:
+        """
+        Getter for (host, port) on which relay is listening,
+        or None if not listening.
+
+        :return: listening address
+        :rtype: tuple
+        """
+
+        if self._server is None:
+            return None
+        return self._server.getsockname()[0:2]
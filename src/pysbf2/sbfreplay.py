@@ -0,0 +1,516 @@
+"""
+sbfreplay.py
+
+Real-time and accelerated replay of SBF logs over TCP, for load testing
+readers without receiver hardware.
+
+SBFReplayServer serves an SBF log (which may be compressed) to each TCP
+client which connects, at real time (speed 1), N times real time (speed
+N) or as fast as possible (speed 0). Pacing is taken from each SBF
+block's time stamp (WNc, TOW), so inter-epoch timing is as recorded.
+Optionally, several epochs can be held back and sent in a single burst,
+and random jitter can be added to each send.
+
+replay_harness() runs a replay server on the loopback interface and
+reads from it with SBFReader (or the asyncio SBFIngestServer), reporting
+sustained throughput, send-to-read latency and dropped frames.
+
+Also available from the command line, e.g.::
+
+    sbfreplay SBFdata.sbf --port 2101 --speed 10
+    python -m pysbf2.sbfreplay SBFdata.sbf --speed 0 --harness async
+
+Created on 19 Oct 2026
+
+:author: semuadmin (Steve Smith)
+:copyright: semuadmin © 2020
+:license: BSD 3-Clause
+"""
+
+# pylint: disable=too-many-positional-arguments
+
+import asyncio
+import json
+import socket
+from argparse import ArgumentParser
+from io import BytesIO
+from random import Random
+from threading import Event, Thread
+from time import monotonic
+
+from pysbf2.exceptions import ParameterError
+from pysbf2.sbfcompress import open_sbf
+from pysbf2.sbfdecimate import frame_time
+from pysbf2.sbflatency import SBFLatencyHistogram
+from pysbf2.sbfreader import SBFReader
+from pysbf2.sbfserver import SBFIngestServer
+from pysbf2.sbftypes_core import ERR_IGNORE
+
+REPLAY_MAXSPEED = 0
+"""Replay speed - as fast as possible"""
+REPLAY_BUFSIZE = 65536
+"""Bytes sent at a time at maximum speed"""
+HARNESS_SYNC = "sync"
+"""Harness reader - SBFReader"""
+HARNESS_ASYNC = "async"
+"""Harness reader - asyncio SBFIngestServer"""
+
+
+class SBFReplayServer:
+    """
+    TCP replay server for SBF logs.
+    """
+
+    def __init__(
+        self,
+        source: object,
+        listen: tuple = ("127.0.0.1", 0),
+        speed: float = 1,
+        burst: int = 1,
+        jitter: float = 0,
+        seed: int = 0,
+        maxclients: int = 0,
+    ):
+        """
+        Constructor.
+
+        :param object source: SBF log file path (opened with open_sbf(),
+            so may be compressed), or SBF data as bytes
+        :param tuple listen: (host, port) on which to accept client
+            connections (port 0 = any free port) (("127.0.0.1", 0))
+        :param float speed: replay speed as multiple of real time,
+            0 = as fast as possible (1)
+        :param int burst: number of epochs sent together in each send (1)
+        :param float jitter: maximum random delay added to each send,
+            in seconds (ignored at maximum speed) (0)
+        :param int seed: jitter random number seed, for repeatable tests (0)
+        :param int maxclients: stop accepting connections after this many
+            clients (0 = no limit)
+        :raises: ParameterError (if speed, burst or jitter is invalid)
+        """
+        # pylint: disable=too-many-arguments
+
+        if speed < 0:
+            raise ParameterError(f"Invalid replay speed {speed}")
+        if burst < 1:
+            raise ParameterError(f"Invalid replay burst {burst}")
+        if jitter < 0:
+            raise ParameterError(f"Invalid replay jitter {jitter}")
+        self._source = source
+        self._speed = speed
+        self._burst = burst
+        self._jitter = jitter
+        self._seed = seed
+        self._maxclients = maxclients
+        self._stop = Event()
+        self._acceptor = None
+        self._threads = []  # replay threads
+        self._server = socket.create_server(listen)
+        self._server.settimeout(0.1)  # so acceptor can check for stop
+        self._address = self._server.getsockname()[0:2]
+        self.clients = 0
+        """Number of clients served"""
+        self.frames = 0
+        """Number of frames sent"""
+        self.bytes = 0
+        """Number of bytes sent"""
+        self.sendlog = []
+        """List of (frames sent, monotonic time) for each send"""
+        self._sendtimes = {}  # {epoch: monotonic time first sent}
+
+    def __enter__(self):
+        """
+        Context manager enter routine.
+        """
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        """
+        Context manager exit routine.
+        """
+
+        self.close()
+
+    @property
+    def address(self) -> tuple:
+        """
+        Getter for (host, port) on which server is listening.
+
+        :return: listening address
+        :rtype: tuple
+        """
+
+        return self._address
+
+    def start(self):
+        """
+        Start accepting client connections in background thread.
+        """
+
+        self._acceptor = Thread(target=self._accept, daemon=True)
+        self._acceptor.start()
+
+    def wait(self, timeout: float = None) -> bool:
+        """
+        Wait for server to stop accepting client connections
+        (because it has been closed or has served maxclients).
+
+        :param float timeout: time to wait, in seconds (None = wait indefinitely)
+        :return: True if server has stopped accepting connections
+        :rtype: bool
+        """
+
+        if self._acceptor is None:
+            return True
+        self._acceptor.join(timeout)
+        return not self._acceptor.is_alive()
+
+    def _accept(self):
+        """
+        Accept client connections, replaying log to each in its own thread.
+        """
+
+        while not self._stop.is_set():
+            if self._maxclients and self.clients >= self._maxclients:
+                self._server.close()  # refuse further connections
+                break
+            try:
+                conn, _ = self._server.accept()
+            except socket.timeout:
+                continue
+            except OSError:  # server closed
+                break
+            self.clients += 1
+            thread = Thread(target=self.replay, args=(conn,), daemon=True)
+            self._threads = [t for t in self._threads if t.is_alive()]
+            self._threads.append(thread)
+            thread.start()
+
+    def _frames(self):
+        """
+        Generator of raw frames from source.
+
+        :return: generator of raw frames
+        :rtype: generator
+        """
+
+        if isinstance(self._source, (bytes, bytearray)):
+            stream = BytesIO(self._source)
+        else:
+            stream = open_sbf(self._source)
+        with stream:
+            for raw, _ in SBFReader(stream, parsing=False, quitonerror=ERR_IGNORE):
+                yield raw
+
+    def replay(self, conn: socket.socket):
+        """
+        Replay log to connected client, then close connection.
+
+        :param socket.socket conn: client connection
+        """
+
+        rng = Random(self._seed)
+        pending = bytearray()
+        stamps = set()  # epoch time stamps pending
+        count = 0  # frames pending
+        epochs = 0  # epochs pending
+        last = start = origin = None
+        due = 0
+        try:
+            for raw in self._frames():
+                msec = frame_time(raw)
+                if msec is not None and msec != last:  # new epoch
+                    if last is not None:
+                        epochs += 1
+                    if self._speed and epochs >= self._burst:
+                        self._send(conn, pending, count, due, stamps)
+                        pending, stamps, count, epochs = bytearray(), set(), 0, 0
+                    if origin is None:
+                        start, origin = monotonic(), msec
+                    if self._speed:
+                        due = start + (msec - origin) / 1000 / self._speed
+                        if self._jitter:
+                            due += rng.uniform(0, self._jitter)
+                    last = msec
+                pending += raw
+                stamps.add(last)  # frames without time stamp belong to last epoch
+                count += 1
+                if not self._speed and len(pending) >= REPLAY_BUFSIZE:
+                    self._send(conn, pending, count, due, stamps)
+                    pending, count, stamps = bytearray(), 0, set()
+                if self._stop.is_set():
+                    return
+            self._send(conn, pending, count, due, stamps)
+        except OSError:  # client disconnected
+            pass
+        finally:
+            conn.close()
+
+    def _send(
+        self, conn: socket.socket, data: bytes, count: int, due: float, stamps: set
+    ):
+        """
+        Send data when due.
+
+        :param socket.socket conn: client connection
+        :param bytes data: data to send
+        :param int count: number of frames in data
+        :param float due: monotonic time at which data is due
+        :param set stamps: epoch time stamps of frames in data
+        """
+
+        if not data:
+            return
+        delay = due - monotonic()
+        if delay > 0 and self._stop.wait(delay):
+            return
+        # logged before sending, so always logged before data is read
+        now = monotonic()
+        self.sendlog.append((self.frames + count, now))
+        for epoch in stamps:
+            self._sendtimes.setdefault(epoch, now)
+        conn.sendall(data)
+        self.frames += count
+        self.bytes += len(data)
+
+    def sendtime(self, epoch: int) -> float:
+        """
+        Get time at which epoch was first sent (to any client).
+
+        Frames without a time stamp (e.g. NMEA or RTCM3) belong to the
+        epoch of the last time-stamped SBF frame before them, or to epoch
+        None if there is no such frame.
+
+        :param int epoch: epoch time stamp, as returned by frame_time()
+        :return: monotonic time, or None if epoch has not been sent
+        :rtype: float
+        """
+
+        return self._sendtimes.get(epoch)
+
+    def join(self, timeout: float = None):
+        """
+        Wait for all replays in progress to finish.
+
+        :param float timeout: time to wait for each replay, in seconds
+            (None = wait indefinitely)
+        """
+
+        for thread in list(self._threads):
+            thread.join(timeout)
+
+    def close(self):
+        """
+        Stop all replays and close server.
+        """
+
+        self._stop.set()
+        self._server.close()
+        if self._acceptor is not None:
+            self._acceptor.join()
+        self.join()
+
+
+def replay_harness(
+    source: object,
+    speed: float = REPLAY_MAXSPEED,
+    burst: int = 1,
+    jitter: float = 0,
+    reader: str = HARNESS_SYNC,
+    parsing: bool = True,
+    idle: float = 1,
+) -> dict:
+    """
+    Replay SBF log over loopback TCP to a reader, and measure its
+    throughput, latency and dropped frames.
+
+    Latency is measured from the time each frame was sent to the time
+    it was read (and parsed, if parsing is True), correlating frames
+    read with frames sent by their epoch time stamp. Dropped frames are
+    frames sent but not read, e.g. because they could not be parsed.
+
+    :param object source: SBF log file path, or SBF data as bytes
+    :param float speed: replay speed as multiple of real time,
+        0 = as fast as possible (0)
+    :param int burst: number of epochs sent together in each send (1)
+    :param float jitter: maximum random delay added to each send, in seconds (0)
+    :param str reader: HARNESS_SYNC ("sync") = SBFReader,
+        HARNESS_ASYNC ("async") = SBFIngestServer ("sync")
+    :param bool parsing: parse frames (True)
+    :param float idle: async reader stops after this many seconds
+        without a frame once replay has finished (1)
+    :return: dict of {"frames", "read", "dropped", "bytes", "duration",
+        "framerate", "byterate", "latency"}
+    :rtype: dict
+    :raises: ParameterError (if reader is invalid)
+    """
+    # pylint: disable=too-many-arguments
+
+    if reader not in (HARNESS_SYNC, HARNESS_ASYNC):
+        raise ParameterError(f"Invalid harness reader {reader}")
+    latency = SBFLatencyHistogram()
+    with SBFReplayServer(
+        source, speed=speed, burst=burst, jitter=jitter, maxclients=1
+    ) as server:
+        server.start()
+        start = monotonic()
+        if reader == HARNESS_SYNC:
+            count, end = _read_sync(server, parsing, latency)
+        else:
+            count, end = asyncio.run(_read_async(server, parsing, idle, latency))
+        duration = max(end - start, 1e-9)
+        server.join()
+    return {
+        "frames": server.frames,
+        "read": count,
+        "dropped": server.frames - count,
+        "bytes": server.bytes,
+        "duration": duration,
+        "framerate": count / duration,
+        "byterate": server.bytes / duration,
+        "latency": latency.summary(),
+    }
+
+
+def _record_latency(
+    server: SBFReplayServer,
+    latency: SBFLatencyHistogram,
+    raw: bytes,
+    epoch: int,
+    end: float,
+) -> int:
+    """
+    Record latency of frame read, from time its epoch was sent.
+
+    :param SBFReplayServer server: replay server
+    :param SBFLatencyHistogram latency: latency histogram
+    :param bytes raw: raw frame read
+    :param int epoch: epoch of previous frame read (None if none)
+    :param float end: monotonic time frame was read
+    :return: epoch of this frame
+    :rtype: int
+    """
+
+    msec = frame_time(raw)
+    if msec is not None:
+        epoch = msec
+    sent = server.sendtime(epoch)
+    if sent is not None:
+        latency.add(end - sent)
+    return epoch
+
+
+def _read_sync(
+    server: SBFReplayServer, parsing: bool, latency: SBFLatencyHistogram
+) -> tuple:
+    """
+    Read replay with SBFReader.
+
+    :param SBFReplayServer server: replay server
+    :param bool parsing: parse frames
+    :param SBFLatencyHistogram latency: latency histogram
+    :return: tuple of (number of frames read, monotonic time of last read)
+    :rtype: tuple
+    """
+
+    count = 0
+    epoch = None
+    end = monotonic()
+    with socket.create_connection(server.address) as sock:
+        for raw, _ in SBFReader(sock, parsing=parsing, quitonerror=ERR_IGNORE):
+            count += 1
+            end = monotonic()
+            epoch = _record_latency(server, latency, raw, epoch, end)
+    return count, end
+
+
+async def _read_async(
+    server: SBFReplayServer, parsing: bool, idle: float, latency: SBFLatencyHistogram
+) -> tuple:
+    """
+    Read replay with asyncio SBFIngestServer.
+
+    :param SBFReplayServer server: replay server
+    :param bool parsing: parse frames
+    :param float idle: stop after this many seconds without a frame,
+        once replay has finished
+    :param SBFLatencyHistogram latency: latency histogram
+    :return: tuple of (number of frames read, monotonic time of last read)
+    :rtype: tuple
+    """
+
+    count = 0
+    epoch = None
+    end = monotonic()
+    ingest = SBFIngestServer(
+        {"replay": server.address}, parsing=parsing, errorhandler=lambda err: None
+    )
+    async with ingest:
+        while True:
+            try:
+                _, raw, _ = await asyncio.wait_for(ingest.read(), idle)
+            except asyncio.TimeoutError:
+                stats = ingest.stats.get("replay")
+                if stats is not None and stats.connected:
+                    continue  # replay still in progress
+                break
+            count += 1
+            end = monotonic()
+            epoch = _record_latency(server, latency, raw, epoch, end)
+    return count, end
+
+
+def main(args: list = None):
+    """
+    CLI Entry point.
+
+    :param list args: command line arguments (None = sys.argv)
+    """
+
+    parser = ArgumentParser(description="Replay SBF log over TCP.")
+    parser.add_argument("source", help="SBF file path")
+    parser.add_argument("--host", default="127.0.0.1", help="listening host")
+    parser.add_argument("--port", type=int, default=0, help="listening port")
+    parser.add_argument(
+        "--speed", type=float, default=1, help="multiple of real time, 0 = maximum"
+    )
+    parser.add_argument("--burst", type=int, default=1, help="epochs per send")
+    parser.add_argument(
+        "--jitter", type=float, default=0, help="maximum send jitter in seconds"
+    )
+    parser.add_argument(
+        "--harness",
+        choices=(HARNESS_SYNC, HARNESS_ASYNC),
+        help="run reader against replay and report results, rather than serving",
+    )
+    kwargs = parser.parse_args(args)
+
+    if kwargs.harness is not None:
+        res = replay_harness(
+            kwargs.source,
+            kwargs.speed,
+            kwargs.burst,
+            kwargs.jitter,
+            kwargs.harness,
+        )
+        print(json.dumps(res, indent=2))
+        return
+    with SBFReplayServer(
+        kwargs.source,
+        (kwargs.host, kwargs.port),
+        kwargs.speed,
+        kwargs.burst,
+        kwargs.jitter,
+    ) as server:
+        print(f"Replaying {kwargs.source} on {server.address}, press Ctrl-C to stop")
+        try:
+            server.start()
+            while not server.wait(1):  # timeout allows Ctrl-C on all platforms
+                pass
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,375 @@
+"""
+sbfscheduler.py
+
+Priority-aware decode scheduler, which sits between framing (an
+SBFReader created with parsing=False) and decoding, and assigns each
+SBF block type to a priority class:
+
+- CLASS_CRITICAL: latency-critical blocks (by default PVTGeodetic,
+  ExtEventPVTGeodetic and EndOfPVT) are decoded inline and delivered
+  immediately, ahead of any bulk blocks still being decoded.
+- CLASS_BULK: bulk blocks (by default MeasEpoch, GPSRawCA and BBSamples)
+  are decoded by a background thread or process pool.
+- CLASS_NORMAL: all other frames (including NMEA and RTCM3) are decoded
+  inline, but held back behind any earlier bulk blocks.
+
+Bulk and normal frames are delivered in stream order as their decoding
+completes. Histograms of queue latency (from framing to delivery) are
+kept for each class.
+
+Created on 19 Oct 2026
+
+:author: semuadmin (Steve Smith)
+:copyright: semuadmin © 2020
+:license: BSD 3-Clause
+"""
+
+# pylint: disable=too-many-positional-arguments
+
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from logging import getLogger
+from time import monotonic
+
+from pysbf2.exceptions import ParameterError
+from pysbf2.sbfhelpers import msgids2nums
+from pysbf2.sbflatency import LATENCY_BOUNDS, SBFLatencyHistogram
+from pysbf2.sbfmessage import SBFMessage
+from pysbf2.sbfreader import SBFReader
+from pysbf2.sbftypes_core import ERR_LOG, SBF_HDR, VALCKSUM
+
+CLASS_CRITICAL = 0
+"""Priority class - decode inline and deliver immediately"""
+CLASS_NORMAL = 1
+"""Priority class - decode inline and deliver in stream order"""
+CLASS_BULK = 2
+"""Priority class - decode in worker pool and deliver in stream order"""
+CLASS_NAMES = {CLASS_CRITICAL: "critical", CLASS_NORMAL: "normal", CLASS_BULK: "bulk"}
+"""Priority class names, as used in latency histograms"""
+
+POOL_THREAD = 0
+"""Worker pool backend - threads"""
+POOL_PROCESS = 1
+"""Worker pool backend - processes"""
+
+DEFAULT_CLASSES = {
+    "PVTGeodetic": CLASS_CRITICAL,
+    "ExtEventPVTGeodetic": CLASS_CRITICAL,
+    "EndOfPVT": CLASS_CRITICAL,
+    "MeasEpoch": CLASS_BULK,
+    "GPSRawCA": CLASS_BULK,
+    "BBSamples": CLASS_BULK,
+}
+"""Default priority classes of SBF block types"""
+
+
+class SBFDecodeScheduler:
+    """
+    Priority-aware decode scheduler.
+    """
+
+    def __init__(
+        self,
+        reader: SBFReader,
+        classes: dict = None,
+        default: int = CLASS_NORMAL,
+        backend: int = POOL_THREAD,
+        workers: int = None,
+        maxpending: int = 1000,
+        validate: int = VALCKSUM,
+        parsebitfield: bool = True,
+        bounds: tuple = LATENCY_BOUNDS,
+        quitonerror: int = ERR_LOG,
+        errorhandler: object = None,
+    ):
+        """
+        Constructor.
+
+        :param SBFReader reader: source of frames, which should be created
+            with parsing=False (decoding is done by the scheduler)
+        :param dict classes: dict of {SBF block name or number: priority class}
+            (None = DEFAULT_CLASSES)
+        :param int default: priority class of any other frame, including
+            NMEA and RTCM3 (CLASS_NORMAL)
+        :param int backend: POOL_THREAD (0) or POOL_PROCESS (1) (0)
+        :param int workers: number of pool workers (None = executor default)
+        :param int maxpending: maximum number of frames awaiting delivery
+            before reading pauses (1000)
+        :param int validate: VALCKSUM (1) = Validate checksum,
+            VALNONE (0) = ignore invalid checksum (1)
+        :param bool parsebitfield: 1 = parse bitfields, 0 = leave as bytes (1)
+        :param tuple bounds: latency histogram bin upper bounds, in seconds
+        :param int quitonerror: ERR_IGNORE (0) = ignore errors,  ERR_LOG (1) = log continue,
+            ERR_RAISE (2) = (re)raise (1)
+        :param object errorhandler: error handling object or function (None)
+        :raises: ParameterError (if reader is parsing, a class or backend
+            is invalid, or classes contains an unknown block name)
+        """
+        # pylint: disable=too-many-arguments
+
+        if reader.parsing:
+            raise ParameterError(
+                "Decode scheduler requires an SBFReader created with parsing=False"
+            )
+        self._classes = {}
+        for msgid, pclass in (DEFAULT_CLASSES if classes is None else classes).items():
+            if pclass not in CLASS_NAMES:
+                raise ParameterError(f"Invalid priority class {pclass}")
+            for num in msgids2nums([msgid]):
+                self._classes[num] = pclass
+        if default not in CLASS_NAMES:
+            raise ParameterError(f"Invalid priority class {default}")
+        if backend == POOL_THREAD:
+            self._pool = ThreadPoolExecutor(workers)
+        elif backend == POOL_PROCESS:
+            self._pool = ProcessPoolExecutor(workers)
+        else:
+            raise ParameterError(f"Invalid pool backend {backend}")
+        self._remote = backend == POOL_PROCESS
+        self._reader = reader
+        self._default = default
+        self._maxpending = maxpending
+        self._validate = validate
+        self._parsebf = parsebitfield
+        self._quitonerror = quitonerror
+        self._errorhandler = errorhandler
+        self._logger = getLogger(__name__)
+        self._pending = deque()  # (pclass, raw, future or parsed, framed time)
+        self._eof = False
+        self.latency = {
+            name: SBFLatencyHistogram(bounds) for name in CLASS_NAMES.values()
+        }
+        """dict of {class name: SBFLatencyHistogram} of framing to delivery latency"""
+
+    def __enter__(self):
+        """
+        Context manager enter routine.
+        """
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        """
+        Context manager exit routine.
+        """
+
+        self.close()
+
+    def __iter__(self):
+        """Iterator."""
+
+        return self
+
+    def __next__(self) -> tuple:
+        """
+        Return next item in iteration.
+
+        :return: tuple of (raw_data as bytes, parsed_data)
+        :rtype: tuple
+        :raises: StopIteration
+        """
+
+        raw_data, parsed_data = self.read()
+        if raw_data is None:
+            raise StopIteration
+        return (raw_data, parsed_data)
+
+    def read(self) -> tuple:
+        """
+        Read next frame due for delivery. Critical frames are returned as
+        soon as they are read; other frames are returned in stream order
+        once they (and all earlier bulk and normal frames) are decoded.
+
+        :return: tuple of (raw_data as bytes, parsed_data), or
+            (None, None) at end of stream
+        :rtype: tuple
+        """
+
+        while True:
+            if self._pending and (
+                self._eof
+                or len(self._pending) >= self._maxpending
+                or _done(self._pending[0][2])
+            ):
+                return self._deliver(*self._pending.popleft())
+            if self._eof:
+                return (None, None)
+            raw, _ = self._reader.read()
+            framed = monotonic()
+            if raw is None:
+                self._eof = True
+                continue
+            pclass = self._classify(raw)
+            if pclass == CLASS_CRITICAL:
+                return self._deliver(pclass, raw, self._decode(raw), framed)
+            if pclass == CLASS_BULK:
+                work = self._pool.submit(
+                    _decode_state if self._remote else _decode,
+                    raw,
+                    self._validate,
+                    self._parsebf,
+                )
+            elif self._pending:
+                work = self._decode(raw)
+            else:
+                return self._deliver(pclass, raw, self._decode(raw), framed)
+            self._pending.append((pclass, raw, work, framed))
+
+    def close(self):
+        """
+        Shut down worker pool, discarding any frames awaiting delivery.
+        """
+
+        for _, _, work, _ in self._pending:
+            if isinstance(work, Future):
+                work.cancel()
+        self._pending.clear()
+        self._pool.shutdown()
+
+    def summary(self) -> dict:
+        """
+        Summarise queue latency histograms.
+
+        :return: dict of {class name: summary}
+        :rtype: dict
+        """
+
+        return {name: hist.summary() for name, hist in self.latency.items()}
+
+    def _classify(self, raw: bytes) -> int:
+        """
+        Get priority class of frame.
+
+        :param bytes raw: raw frame
+        :return: priority class
+        :rtype: int
+        """
+
+        if raw[0:2] == SBF_HDR:
+            blocknum = int.from_bytes(raw[4:6], "little") & 0x1FFF
+            return self._classes.get(blocknum, self._default)
+        return self._default
+
+    def _decode(self, raw: bytes) -> object:
+        """
+        Decode frame inline, handling any error.
+
+        :param bytes raw: raw frame
+        :return: parsed message, or None if frame could not be parsed
+        :rtype: object
+        """
+
+        try:
+            return _decode(raw, self._validate, self._parsebf)
+        except SBFReader.parse_errors() as err:
+            self._do_error(err)
+            return None
+
+    def _deliver(self, pclass: int, raw: bytes, work: object, framed: float) -> tuple:
+        """
+        Complete delivery of frame, waiting for pool decoding if necessary.
+
+        :param int pclass: priority class
+        :param bytes raw: raw frame
+        :param object work: parsed message, or Future of parsed message
+        :param float framed: time frame was read
+        :return: tuple of (raw_data as bytes, parsed_data)
+        :rtype: tuple
+        """
+
+        parsed = work
+        if pclass == CLASS_BULK:
+            try:
+                parsed = work.result()
+                if self._remote:
+                    parsed = _restore(parsed)
+            except SBFReader.parse_errors() as err:
+                self._do_error(err)
+                parsed = None
+        self.latency[CLASS_NAMES[pclass]].add(monotonic() - framed)
+        return (raw, parsed)
+
+    def _do_error(self, err: Exception):
+        """
+        Handle decoding error.
+
+        :param Exception err: error
+        :raises: Exception if quitonerror = ERR_RAISE (2)
+        """
+
+        SBFReader.handle_error(err, self._quitonerror, self._errorhandler, self._logger)
+
+    @property
+    def pending(self) -> int:
+        """
+        Getter for number of frames awaiting delivery.
+
+        :return: frames awaiting delivery
+        :rtype: int
+        """
+
+        return len(self._pending)
+
+
+def _decode(raw: bytes, validate: int, parsebitfield: bool) -> object:
+    """
+    Decode frame (in a worker thread or process, or inline).
+
+    :param bytes raw: raw frame
+    :param int validate: validation flag
+    :param bool parsebitfield: parse bitfields flag
+    :return: parsed message
+    :rtype: object
+    """
+
+    return SBFReader.parse_frame(raw, validate, parsebitfield)
+
+
+def _decode_state(raw: bytes, validate: int, parsebitfield: bool) -> tuple:
+    """
+    Decode frame in worker process, returning its decoded state.
+
+    A decoded SBFMessage is returned as its attribute dict rather than
+    the message itself, whose compact pickle would be decoded again
+    when unpickled in the parent process.
+
+    :param bytes raw: raw frame
+    :param int validate: validation flag
+    :param bool parsebitfield: parse bitfields flag
+    :return: tuple of (True, SBFMessage attribute dict) or (False, parsed message)
+    :rtype: tuple
+    """
+
+    parsed = _decode(raw, validate, parsebitfield)
+    if isinstance(parsed, SBFMessage):
+        return (True, vars(parsed))
+    return (False, parsed)
+
+
+def _restore(state: tuple) -> object:
+    """
+    Restore message decoded in worker process, without decoding it again.
+
+    :param tuple state: state returned by _decode_state()
+    :return: parsed message
+    :rtype: object
+    """
+
+    issbf, parsed = state
+    if issbf:
+        attrs = parsed
+        parsed = SBFMessage.__new__(SBFMessage)
+        parsed.__dict__.update(attrs)  # bypasses immutability check
+    return parsed
+
+
+def _done(work: object) -> bool:
+    """
+    Check if pending frame has been decoded.
+
+    :param object work: parsed message, or Future of parsed message
+    :return: True if decoded
+    :rtype: bool
+    """
+
+    return not isinstance(work, Future) or work.done()
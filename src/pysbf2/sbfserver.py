@@ -0,0 +1,411 @@
+"""
+sbfserver.py
+
+Asyncio multi-receiver ingestion server.
+
+SBFIngestServer connects to (and/or accepts connections from) any number
+of receiver TCP streams on a single event loop, running an incremental
+SBFFramer per connection, and merges the resulting frames into a single
+tagged stream of (receiver_id, raw_data, parsed_data) tuples.
+
+Outbound connections are re-established automatically, with exponential
+backoff, if they fail or drop. Per-receiver throughput counters are
+maintained in SBFReceiverStats objects.
+
+Created on 19 Oct 2026
+
+:author: semuadmin (Steve Smith)
+:copyright: semuadmin © 2020
+:license: BSD 3-Clause
+"""
+
+# pylint: disable=too-many-positional-arguments
+
+import asyncio
+from logging import getLogger
+from time import monotonic
+
+from pysbf2.sbfframer import SBFFramer
+from pysbf2.sbfreader import SBFReader
+from pysbf2.sbftypes_core import (
+    NMEA_PROTOCOL,
+    RTCM3_PROTOCOL,
+    SBF_PROTOCOL,
+    VALCKSUM,
+)
+
+
+class SBFReceiverStats:
+    """
+    Connection state and throughput counters for a single receiver.
+    """
+
+    def __init__(self, receiver_id: str, framer: SBFFramer):
+        """
+        Constructor.
+
+        :param str receiver_id: receiver identifier
+        :param SBFFramer framer: framer for this receiver's data
+        """
+
+        self.receiver_id = receiver_id
+        self.framer = framer
+        self.started = monotonic()
+        self.connected = False
+        self.connects = 0
+        """Number of successful connections"""
+        self.disconnects = 0
+        """Number of connections lost or closed"""
+        self.bytes = 0
+        """Number of bytes received"""
+        self.parseerrors = 0
+        """Number of frames which could not be parsed"""
+        self.lasterror = None
+        """Most recent connection error"""
+
+    def __repr__(self) -> str:
+        """
+        Machine readable representation.
+
+        :return: machine readable representation
+        :rtype: str
+        """
+
+        return (
+            f"SBFReceiverStats({self.receiver_id!r}, connected={self.connected}, "
+            f"connects={self.connects}, disconnects={self.disconnects}, "
+            f"bytes={self.bytes}, frames={self.frames}, garbage={self.garbage}, "
+            f"errors={self.errors}, parseerrors={self.parseerrors})"
+        )
+
+    @property
+    def frames(self) -> int:
+        """
+        Getter for number of frames received.
+
+        :return: frames received
+        :rtype: int
+        """
+
+        return self.framer.frames
+
+    @property
+    def garbage(self) -> int:
+        """
+        Getter for number of bytes discarded by framer.
+
+        :return: bytes discarded
+        :rtype: int
+        """
+
+        return self.framer.garbage
+
+    @property
+    def errors(self) -> int:
+        """
+        Getter for number of frame headers rejected by framer.
+
+        :return: frame headers rejected
+        :rtype: int
+        """
+
+        return self.framer.errors
+
+    @property
+    def framerate(self) -> float:
+        """
+        Getter for mean frames per second since statistics started.
+
+        :return: frames per second
+        :rtype: float
+        """
+
+        return self.frames / max(monotonic() - self.started, 1e-9)
+
+    @property
+    def byterate(self) -> float:
+        """
+        Getter for mean bytes per second since statistics started.
+
+        :return: bytes per second
+        :rtype: float
+        """
+
+        return self.bytes / max(monotonic() - self.started, 1e-9)
+
+
+class SBFIngestServer:
+    """
+    Asyncio multi-receiver ingestion server.
+    """
+
+    def __init__(
+        self,
+        receivers: dict = None,
+        listen: tuple = None,
+        parsing: bool = False,
+        protfilter: int = NMEA_PROTOCOL | SBF_PROTOCOL | RTCM3_PROTOCOL,
+        validate: int = VALCKSUM,
+        parsebitfield: bool = True,
+        bufsize: int = 65536,
+        queuesize: int = 10000,
+        backoff: float = 0.5,
+        maxbackoff: float = 30.0,
+        timeout: float = None,
+        errorhandler: object = None,
+    ):
+        """
+        Constructor.
+
+        :param dict receivers: dict of {receiver_id: (host, port)} to connect to (None)
+        :param tuple listen: (host, port) on which to accept receiver connections;
+            accepted receivers are identified as "host:port" of peer, and their
+            statistics are discarded when the connection closes (None)
+        :param bool parsing: True = parse frames, False = raw frames only (False)
+        :param int protfilter: NMEA_PROTOCOL (1), SBF_PROTOCOL (2),
+            RTCM3_PROTOCOL (4), Can be OR'd (7)
+        :param int validate: VALCKSUM (1) = Validate checksum,
+            VALNONE (0) = ignore invalid checksum (1)
+        :param bool parsebitfield: 1 = parse bitfields, 0 = leave as bytes (1)
+        :param int bufsize: maximum bytes read from connection at a time (65536)
+        :param int queuesize: maximum frames queued for output before
+            connections are paused (10000)
+        :param float backoff: initial delay before reconnecting, in seconds (0.5)
+        :param float maxbackoff: maximum delay before reconnecting, in seconds (30.0)
+        :param float timeout: reconnect if no data received for this many
+            seconds (None = no timeout)
+        :param object errorhandler: parsing error handling object or function
+            (None = log errors)
+        """
+        # pylint: disable=too-many-arguments
+
+        self._receivers = receivers or {}
+        self._listen = listen
+        self._parsing = parsing
+        self._protfilter = protfilter
+        self._validate = validate
+        self._parsebf = parsebitfield
+        self._bufsize = bufsize
+        self._queue = asyncio.Queue(queuesize)
+        self._backoff = backoff
+        self._maxbackoff = maxbackoff
+        self._timeout = timeout
+        self._errorhandler = errorhandler
+        self._logger = getLogger(__name__)
+        self._tasks = set()
+        self._server = None
+        self._stopped = False
+        self.stats = {}
+        """dict of {receiver_id: SBFReceiverStats}"""
+
+    async def __aenter__(self):
+        """
+        Async context manager enter routine.
+        """
+
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, exc_traceback):
+        """
+        Async context manager exit routine.
+        """
+
+        await self.stop()
+
+    def __aiter__(self):
+        """Async iterator."""
+
+        return self
+
+    async def __anext__(self) -> tuple:
+        """
+        Return next item in iteration.
+
+        :return: tuple of (receiver_id, raw_data as bytes, parsed_data)
+        :rtype: tuple
+        :raises: StopAsyncIteration (when server is stopped)
+        """
+
+        if self._stopped and self._queue.empty():
+            raise StopAsyncIteration
+        item = await self._queue.get()
+        if item is None:
+            raise StopAsyncIteration
+        return item
+
+    async def start(self):
+        """
+        Start connecting to receivers and/or listening for receiver connections.
+        """
+
+        self._stopped = False
+        for rid, (host, port) in self._receivers.items():
+            self._spawn(self._connect(rid, host, port))
+        if self._listen is not None:
+            self._server = await asyncio.start_server(self._accept, *self._listen)
+
+    async def stop(self):
+        """
+        Close all connections, and end iteration once any frames
+        already queued have been consumed.
+        """
+
+        if self._server is not None:
+            self._server.close()
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._server is not None:
+            await self._server.wait_closed()
+            self._server = None
+        self._stopped = True
+        if not self._queue.full():  # wake any pending read
+            self._queue.put_nowait(None)
+
+    async def read(self) -> tuple:
+        """
+        Read next frame from any receiver.
+
+        :return: tuple of (receiver_id, raw_data as bytes, parsed_data),
+            or (None, None, None) if server has been stopped
+        :rtype: tuple
+        """
+
+        try:
+            return await anext(self)
+        except StopAsyncIteration:
+            return (None, None, None)
+
+    def _spawn(self, coro):
+        """
+        Run coroutine as tracked task.
+
+        :param coro: coroutine
+        """
+
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _get_stats(self, rid: str) -> SBFReceiverStats:
+        """
+        Get (or create) statistics for receiver.
+
+        :param str rid: receiver identifier
+        :return: receiver statistics
+        :rtype: SBFReceiverStats
+        """
+
+        if rid not in self.stats:
+            self.stats[rid] = SBFReceiverStats(
+                rid, SBFFramer(protfilter=self._protfilter, validate=self._validate)
+            )
+        return self.stats[rid]
+
+    async def _connect(self, rid: str, host: str, port: int):
+        """
+        Connect to receiver, reconnecting with exponential backoff.
+
+        :param str rid: receiver identifier
+        :param str host: receiver host
+        :param int port: receiver port
+        """
+
+        stats = self._get_stats(rid)
+        delay = self._backoff
+        while True:
+            try:
+                reader, writer = await asyncio.open_connection(host, port)
+            except OSError as err:
+                stats.lasterror = err
+            else:
+                delay = self._backoff
+                await self._pump(stats, reader, writer)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self._maxbackoff)
+
+    async def _accept(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Handle incoming receiver connection.
+
+        :param asyncio.StreamReader reader: connection reader
+        :param asyncio.StreamWriter writer: connection writer
+        """
+
+        host, port = writer.get_extra_info("peername")[0:2]
+        rid = f"{host}:{port}"
+        task = asyncio.current_task()
+        self._tasks.add(task)
+        try:
+            await self._pump(self._get_stats(rid), reader, writer)
+        finally:
+            self._tasks.discard(task)
+            self.stats.pop(rid, None)  # peer port is ephemeral
+
+    async def _pump(
+        self,
+        stats: SBFReceiverStats,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ):
+        """
+        Frame data from connection until it closes or fails.
+
+        :param SBFReceiverStats stats: receiver statistics
+        :param asyncio.StreamReader reader: connection reader
+        :param asyncio.StreamWriter writer: connection writer
+        """
+
+        stats.connects += 1
+        stats.connected = True
+        try:
+            while True:
+                data = await asyncio.wait_for(reader.read(self._bufsize), self._timeout)
+                if not data:
+                    break
+                stats.bytes += len(data)
+                for raw in stats.framer.feed(data):
+                    parsed = self._parse(stats, raw) if self._parsing else None
+                    await self._queue.put((stats.receiver_id, raw, parsed))
+        except (OSError, asyncio.TimeoutError) as err:
+            stats.lasterror = err
+        finally:
+            stats.connected = False
+            stats.disconnects += 1
+            stats.framer.flush()  # discard partial frame
+            writer.close()
+
+    def _parse(self, stats: SBFReceiverStats, raw: bytes) -> object:
+        """
+        Parse frame, handling any error.
+
+        :param SBFReceiverStats stats: receiver statistics
+        :param bytes raw: raw frame
+        :return: parsed message, or None if frame could not be parsed
+        :rtype: object
+        """
+
+        try:
+            return SBFReader.parse_frame(raw, self._validate, self._parsebf)
+        except SBFReader.parse_errors() as err:
+            stats.parseerrors += 1
+            if self._errorhandler is None:
+                self._logger.error("%s: %s", stats.receiver_id, err)
+            else:
+                self._errorhandler(err)
+            return None
+
+    @property
+    def address(self) -> tuple:
+        """
+        Getter for (host, port) on which server is listening,
+        or None if not listening.
+
+        :return: listening address
+        :rtype: tuple
+        """
+
+        if self._server is None:
+            return None
+        return self._server.sockets[0].getsockname()[0:2]
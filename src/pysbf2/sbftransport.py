@@ -0,0 +1,562 @@
+"""
+sbftransport.py
+
+Helpers for transporting raw SBF frames between processes via
+multiprocessing.shared_memory, avoiding the cost of pickling each
+frame (or parsed SBFMessage) individually through a pipe or Queue.
+
+A batch of frames is packed into a single shared memory segment as:
+
+    count (U4) | count x frame length (U4) | frames (concatenated)
+
+The producer hands the segment name to a consumer (e.g. as the argument
+to a multiprocessing.Pool task), and the consumer unpacks the batch and
+releases the segment.
+
+SBFRingBuffer and SBFRingReader implement a single producer, multiple
+consumer ring buffer of raw frames in shared memory. The producer (e.g. a
+process which owns a receiver's serial or TCP link) writes each frame
+framed by SBFReader; each consumer keeps its own read cursor, so any
+number of consumers can read the same frames at their own pace. The
+segment is laid out as:
+
+    magic (4) | pad (4) | capacity (U8) | head (U8) | tail (U8) |
+    frames written (U8) | reserved
+    followed by records of: frame length (U4) | sequence no. (U4) | frame
+
+where head and tail are the absolute (ever-increasing) byte positions of
+the end of the newest record and the start of the oldest record still
+in the buffer. Records wrap around the end of the buffer. The producer
+never waits for consumers; a consumer which falls more than a buffer's
+length behind detects the overrun, skips to the oldest available record
+and counts the frames it has missed.
+
+Created on 19 Oct 2026
+
+:author: semuadmin (Steve Smith)
+:copyright: semuadmin © 2020
+:license: BSD 3-Clause
+"""
+
+# pylint: disable=too-many-positional-arguments
+
+import struct
+import sys
+from multiprocessing import parent_process, resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from time import monotonic, sleep
+
+from pysbf2.exceptions import SBFStreamError
+from pysbf2.sbfhelpers import msgids2nums
+from pysbf2.sbfreader import SBFReader
+from pysbf2.sbftypes_core import SBF_HDR, VALCKSUM
+
+U4LEN = struct.calcsize("<I")
+
+RING_MAGIC = b"SBFR"
+"""Ring buffer segment identifier"""
+RING_HDRLEN = 64
+"""Ring buffer segment header length"""
+RING_SIZE = 1048576
+"""Default ring buffer capacity in bytes"""
+_RING_HDR = struct.Struct("<4s4xQ")  # magic, capacity
+_RING_POS = struct.Struct("<Q")  # head or tail position
+_HEAD = 16  # offset of head position in segment header
+_TAIL = 24  # offset of tail position in segment header
+_SEQ = 32  # offset of frames written in segment header
+_REC_HDR = struct.Struct("<II")  # frame length, sequence number
+_OWNED = set()  # names of ring buffer segments created by this process
+
+
+def put_frames(frames: list) -> str:
+    """
+    Pack a list of raw frames into a new shared memory segment.
+
+    Ownership of the segment passes to the consumer, which must call
+    get_frames() to unpack and release it.
+
+    :param list frames: list of raw frames as bytes (or objects with a
+        serialize() method, e.g. SBFMessage)
+    :return: shared memory segment name
+    :rtype: str
+    """
+
+    frames = [f if isinstance(f, (bytes, bytearray)) else f.serialize() for f in frames]
+    count = len(frames)
+    hdrlen = U4LEN * (count + 1)
+    shm = SharedMemory(create=True, size=hdrlen + sum(len(f) for f in frames))
+    try:
+        struct.pack_into(f"<{count + 1}I", shm.buf, 0, count, *map(len, frames))
+        offset = hdrlen
+        for frame in frames:
+            shm.buf[offset : offset + len(frame)] = frame
+            offset += len(frame)
+        return shm.name
+    finally:
+        shm.close()
+
+
+def get_frames(
+    name: str,
+    parsing: bool = False,
+    validate: int = VALCKSUM,
+    parsebitfield: bool = True,
+) -> list:
+    """
+    Unpack a list of raw frames from a shared memory segment created
+    by put_frames(), optionally parsing them, and release the segment.
+
+    :param str name: shared memory segment name
+    :param bool parsing: False = return raw frames, True = return parsed
+        SBFMessage objects (False)
+    :param int validate: VALCKSUM (1) = Validate checksum,
+        VALNONE (0) = ignore invalid checksum (1)
+    :param bool parsebitfield: 1 = parse bitfields, 0 = leave as bytes (1)
+    :return: list of raw frames or parsed messages
+    :rtype: list
+    :raises: SBFStreamError (if segment is not a valid frame batch)
+    """
+
+    shm = SharedMemory(name=name)
+    try:
+        buf = shm.buf
+        (count,) = struct.unpack_from("<I", buf, 0)
+        offset = U4LEN * (count + 1)
+        if offset > len(buf):
+            raise SBFStreamError(f"Invalid frame batch in shared memory {name}")
+        frames = []
+        for length in struct.unpack_from(f"<{count}I", buf, U4LEN):
+            if offset + length > len(buf):
+                raise SBFStreamError(f"Invalid frame batch in shared memory {name}")
+            frames.append(bytes(buf[offset : offset + length]))
+            offset += length
+    finally:
+        shm.close()
+        shm.unlink()
+
+    if parsing:
+        return [SBFReader.parse_frame(f, validate, parsebitfield) for f in frames]
+    return frames
+
+
+class SBFRingBuffer:
+    """
+    Producer side of shared memory ring buffer of raw frames.
+    """
+
+    def __init__(self, name: str = None, size: int = RING_SIZE):
+        """
+        Constructor. Creates a new shared memory segment.
+
+        :param str name: shared memory segment name (None = generate unique name)
+        :param int size: ring buffer capacity in bytes (1048576)
+        """
+
+        self._shm = SharedMemory(name=name, create=True, size=RING_HDRLEN + size)
+        _OWNED.add(self._shm.name)
+        self._buf = self._shm.buf
+        self._capacity = size
+        self._head = 0
+        self._tail = 0
+        self._seq = 0
+        _RING_HDR.pack_into(self._buf, 0, RING_MAGIC, size)
+        _RING_POS.pack_into(self._buf, _HEAD, 0)
+        _RING_POS.pack_into(self._buf, _TAIL, 0)
+        _RING_POS.pack_into(self._buf, _SEQ, 0)
+
+    def __enter__(self):
+        """
+        Context manager enter routine.
+        """
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        """
+        Context manager exit routine. Closes and releases the segment.
+        """
+
+        self.close()
+        self.unlink()
+
+    def write(self, frame: bytes):
+        """
+        Write raw frame to ring buffer, discarding the oldest
+        records if necessary to make room.
+
+        :param bytes frame: raw frame
+        :raises: SBFStreamError (if frame is larger than ring buffer)
+        """
+
+        reclen = _REC_HDR.size + len(frame)
+        if reclen > self._capacity:
+            raise SBFStreamError(
+                f"Frame length {len(frame)} exceeds ring buffer capacity {self._capacity}"
+            )
+        if self._head + reclen - self._tail > self._capacity:
+            while self._head + reclen - self._tail > self._capacity:
+                length, _ = _REC_HDR.unpack(
+                    _ring_get(self._buf, self._capacity, self._tail, _REC_HDR.size)
+                )
+                self._tail += _REC_HDR.size + length
+            # publish new tail before overwriting, so consumers can detect overrun
+            _RING_POS.pack_into(self._buf, _TAIL, self._tail)
+        _ring_put(
+            self._buf, self._capacity, self._head, _REC_HDR.pack(len(frame), self._seq)
+        )
+        _ring_put(self._buf, self._capacity, self._head + _REC_HDR.size, frame)
+        self._head += reclen
+        self._seq = (self._seq + 1) & 0xFFFFFFFF
+        _RING_POS.pack_into(self._buf, _HEAD, self._head)
+        _RING_POS.pack_into(self._buf, _SEQ, self._seq)
+
+    def feed(self, reader: SBFReader, limit: int = 0) -> int:
+        """
+        Write raw frames from SBFReader to ring buffer until the
+        stream is exhausted (or limit reached). The reader is best
+        created with parsing=False, as parsed data is discarded.
+
+        :param SBFReader reader: SBFReader instance
+        :param int limit: maximum number of frames to write (0 = no limit)
+        :return: number of frames written
+        :rtype: int
+        """
+
+        count = 0
+        for raw, _ in reader:
+            self.write(raw)
+            count += 1
+            if count == limit:
+                break
+        return count
+
+    def close(self):
+        """
+        Close producer's access to segment.
+        """
+
+        self._buf = None
+        self._shm.close()
+
+    def unlink(self):
+        """
+        Release segment. Consumers which are already attached
+        can continue to read any unread frames.
+        """
+
+        _OWNED.discard(self._shm.name)
+        try:
+            self._shm.unlink()
+        except FileNotFoundError:  # pragma: no cover
+            pass
+
+    @property
+    def name(self) -> str:
+        """
+        Getter for segment name, to be passed to consumers.
+
+        :return: shared memory segment name
+        :rtype: str
+        """
+
+        return self._shm.name
+
+    @property
+    def frames(self) -> int:
+        """
+        Getter for number of frames written (modulo 2**32).
+
+        :return: number of frames written
+        :rtype: int
+        """
+
+        return self._seq
+
+
+class SBFRingReader:
+    """
+    Consumer side of shared memory ring buffer of raw frames.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        msgfilter: object = None,
+        parsing: bool = False,
+        validate: int = VALCKSUM,
+        parsebitfield: bool = True,
+        fromstart: bool = False,
+        timeout: float = None,
+        pollinterval: float = 0.001,
+    ):
+        """
+        Constructor. Attaches to existing shared memory segment.
+
+        :param str name: shared memory segment name
+        :param object msgfilter: collection of SBF block names (e.g. "PVTGeodetic")
+            or numbers to be returned; other frames (including NMEA and
+            RTCM3) are skipped without being copied (None = return all frames)
+        :param bool parsing: True = parse frames, False = return raw frames only (False)
+        :param int validate: VALCKSUM (1) = Validate checksum,
+            VALNONE (0) = ignore invalid checksum (1)
+        :param bool parsebitfield: 1 = parse bitfields, 0 = leave as bytes (1)
+        :param bool fromstart: True = start at oldest frame in buffer,
+            False = start at next frame written (False)
+        :param float timeout: time to wait for next frame when iterating,
+            in seconds (None = wait indefinitely)
+        :param float pollinterval: polling interval while waiting, in seconds (0.001)
+        :raises: ParameterError (if msgfilter is invalid),
+            SBFStreamError (if segment is not a ring buffer)
+        """
+        # pylint: disable=too-many-arguments
+
+        self._filter = None if msgfilter is None else msgids2nums(msgfilter)
+        self._shm = _ring_attach(name)
+        self._buf = self._shm.buf
+        magic = None
+        if len(self._buf) >= RING_HDRLEN:
+            magic, self._capacity = _RING_HDR.unpack_from(self._buf, 0)
+        if magic != RING_MAGIC:
+            self.close()
+            raise SBFStreamError(f"Shared memory {name} is not an SBF ring buffer")
+        self._parsing = parsing
+        self._validate = validate
+        self._parsebf = parsebitfield
+        self._timeout = timeout
+        self._pollinterval = pollinterval
+        self._cursor, self._seq = self._start(fromstart)
+        self.frames = 0
+        """Number of frames returned"""
+        self.filtered = 0
+        """Number of frames skipped by msgfilter"""
+        self.overruns = 0
+        """Number of times the producer has overtaken this consumer"""
+        self.dropped = 0
+        """Number of frames missed due to overruns"""
+
+    def __iter__(self):
+        """Iterator."""
+
+        return self
+
+    def __next__(self) -> tuple:
+        """
+        Return next item in iteration, waiting up to 'timeout' seconds.
+
+        :return: tuple of (raw_data as bytes, parsed_data)
+        :rtype: tuple
+        :raises: StopIteration (if no frame received within timeout)
+        """
+
+        raw_data, parsed_data = self.read(self._timeout)
+        if raw_data is None:
+            raise StopIteration
+        return (raw_data, parsed_data)
+
+    def __enter__(self):
+        """
+        Context manager enter routine.
+        """
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        """
+        Context manager exit routine.
+        """
+
+        self.close()
+
+    def read(self, timeout: float = 0) -> tuple:
+        """
+        Read next frame from ring buffer.
+
+        :param float timeout: time to wait for next frame, in seconds
+            (0 = don't wait, None = wait indefinitely) (0)
+        :return: tuple of (raw_data as bytes, parsed_data), or
+            (None, None) if no frame is available
+        :rtype: tuple
+        """
+
+        deadline = None if timeout is None else monotonic() + timeout
+        while True:
+            raw = self._next()
+            if raw is not None:
+                return (
+                    raw,
+                    (
+                        SBFReader.parse_frame(raw, self._validate, self._parsebf)
+                        if self._parsing
+                        else None
+                    ),
+                )
+            if deadline is not None and monotonic() >= deadline:
+                return (None, None)
+            sleep(self._pollinterval)
+
+    def _position(self, offset: int) -> int:
+        """
+        Get head or tail position from segment header.
+
+        :param int offset: _HEAD or _TAIL
+        :return: absolute byte position
+        :rtype: int
+        """
+
+        return _RING_POS.unpack_from(self._buf, offset)[0]
+
+    def _start(self, fromstart: bool) -> tuple:
+        """
+        Get starting cursor position and the sequence number of
+        the frame expected there.
+
+        :param bool fromstart: start at oldest frame in buffer
+        :return: tuple of (cursor position, next expected sequence number)
+        :rtype: tuple
+        """
+
+        while True:
+            seq = self._position(_SEQ)
+            head = self._position(_HEAD)
+            if seq != self._position(_SEQ):  # pragma: no cover
+                continue  # frame written while reading, try again
+            tail = self._position(_TAIL)
+            if not fromstart or tail == head:
+                return head, seq
+            _, seq = _REC_HDR.unpack(
+                _ring_get(self._buf, self._capacity, tail, _REC_HDR.size)
+            )
+            if tail == self._position(_TAIL):
+                return tail, seq
+
+    def _next(self) -> bytes:
+        """
+        Get next wanted frame from ring buffer, if any, handling overruns.
+
+        :return: raw frame, or None if no frame is available
+        :rtype: bytes
+        """
+
+        buf = self._buf
+        cap = self._capacity
+        while self._cursor < self._position(_HEAD):
+            if self._cursor < self._position(_TAIL):  # overtaken by producer
+                self._cursor = self._position(_TAIL)
+                self.overruns += 1
+                continue
+            length, seq = _REC_HDR.unpack(
+                _ring_get(buf, cap, self._cursor, _REC_HDR.size)
+            )
+            start = self._cursor + _REC_HDR.size
+            if self._filter is None:
+                raw = _ring_get(buf, cap, start, length)
+            elif length >= 8 and self._wanted(_ring_get(buf, cap, start, 6)):
+                raw = _ring_get(buf, cap, start, length)
+            else:
+                raw = None
+            if self._cursor < self._position(_TAIL):  # overwritten while reading
+                continue
+            self.dropped += (seq - self._seq) & 0xFFFFFFFF
+            self._seq = (seq + 1) & 0xFFFFFFFF
+            self._cursor = start + length
+            if raw is None:
+                self.filtered += 1
+                continue
+            self.frames += 1
+            return raw
+        return None
+
+    def _wanted(self, hdr: bytes) -> bool:
+        """
+        Check if frame passes msgfilter, from its first 6 bytes.
+
+        :param bytes hdr: first 6 bytes of frame
+        :return: True if frame is an SBF block in msgfilter
+        :rtype: bool
+        """
+
+        return (
+            hdr[0:2] == SBF_HDR
+            and (int.from_bytes(hdr[4:6], "little") & 0x1FFF) in self._filter
+        )
+
+    def close(self):
+        """
+        Close consumer's access to segment.
+        """
+
+        self._buf = None
+        self._shm.close()
+
+    @property
+    def lag(self) -> int:
+        """
+        Getter for number of bytes written but not yet read by this
+        consumer (a value greater than the ring buffer capacity
+        signifies an imminent overrun).
+
+        :return: lag in bytes
+        :rtype: int
+        """
+
+        return self._position(_HEAD) - self._cursor
+
+
+def _ring_attach(name: str) -> SharedMemory:
+    """
+    Attach to existing ring buffer segment without taking
+    ownership of it.
+
+    :param str name: shared memory segment name
+    :return: shared memory segment
+    :rtype: SharedMemory
+    """
+
+    if sys.version_info >= (3, 13):  # pragma: no cover
+        # pylint: disable=unexpected-keyword-arg
+        return SharedMemory(name=name, track=False)
+    shm = SharedMemory(name=name)
+    # prevent an unrelated process's resource tracker from
+    # releasing the segment when the consumer exits
+    if name not in _OWNED and parent_process() is None:
+        resource_tracker.unregister(
+            shm._name, "shared_memory"  # pylint: disable=protected-access
+        )
+    return shm
+
+
+def _ring_put(buf: memoryview, cap: int, pos: int, data: bytes):
+    """
+    Write data to ring buffer at absolute position, wrapping if necessary.
+
+    :param memoryview buf: segment buffer
+    :param int cap: ring buffer capacity
+    :param int pos: absolute byte position
+    :param bytes data: data
+    """
+
+    off = pos % cap
+    first = min(len(data), cap - off)
+    buf[RING_HDRLEN + off : RING_HDRLEN + off + first] = data[:first]
+    if first < len(data):
+        buf[RING_HDRLEN : RING_HDRLEN + len(data) - first] = data[first:]
+
+
+def _ring_get(buf: memoryview, cap: int, pos: int, length: int) -> bytes:
+    """
+    Read data from ring buffer at absolute position, wrapping if necessary.
+
+    :param memoryview buf: segment buffer
+    :param int cap: ring buffer capacity
+    :param int pos: absolute byte position
+    :param int length: length of data in bytes
+    :return: data
+    :rtype: bytes
+    """
+
+    off = pos % cap
+    first = min(length, cap - off)
+    data = bytes(buf[RING_HDRLEN + off : RING_HDRLEN + off + first])
+    if first < length:
+        data += bytes(buf[RING_HDRLEN : RING_HDRLEN + length - first])
+    return data
@@ -14,6 +14,12 @@ Info sourced from mosaic-X5 Reference Guide v4.14.10 © 2000-2024 Septentrio NV/
 
 SBF_HDR = b"\x24\x40"  # "$@'
 """SBF message header"""
+SBF_MINLEN = 16
+"""Minimum SBF block length (8 byte header + TOW/WNc, padded)"""
+SBF_MAXLEN = 65532
+"""Maximum SBF block length (largest multiple of 4 in 16 bits)"""
+NMEA_MAXLEN = 82
+"""Maximum NMEA sentence length, including header and CRLF terminator"""
 
 ERR_RAISE = 2
 """Raise error and quit"""
@@ -0,0 +1,236 @@
+"""
+sbfview.py
+
+Flyweight view over a raw SBF block, used by SBFReader.dispatch().
+
+The fixed-layout leading attributes of each block type (all attributes
+up to the first repeating group or variable length attribute, which for
+blocks such as PVTGeodetic or AttEuler is the entire block) are compiled
+once into a single struct.Struct. An SBFView is bound to each frame in
+turn; its attributes are unpacked from the frame buffer in one call on
+first access, and the same view object is reused for every frame of
+that block type, so no per-frame SBFMessage (with its hundreds of
+attributes) is created. Attributes outside the compiled layout fall
+back to a full SBFMessage parse of the current frame.
+
+Created on 19 Oct 2026
+
+:author: semuadmin (Steve Smith)
+:copyright: semuadmin © 2020
+:license: BSD 3-Clause
+"""
+
+import struct
+
+from pysbf2.sbflayouts import block_fields
+from pysbf2.sbfmessage import SBFMessage
+from pysbf2.sbftypes_core import SBF_MSGIDS, SCALROUND
+
+_COMPILED = {}
+
+
+def compile_fields(msgid: str, parsebitfield: bool = True) -> tuple:
+    """
+    Compile the fixed-layout leading attributes of an SBF block type.
+
+    The field layouts are compiled along with the other block layouts
+    (and cached on disk) by sbflayouts; this adds the struct.Struct.
+
+    :param str msgid: block name e.g. "PVTGeodetic"
+    :param bool parsebitfield: 1 = bitfields as individual flags,
+        0 = bitfields as bytes (1)
+    :return: tuple of (attribute names, struct.Struct of payload,
+        decoding steps, payload end offset of each decoding step)
+    :rtype: tuple
+    """
+
+    key = (msgid, parsebitfield)
+    if key not in _COMPILED:
+        names, fmt, steps, ends = block_fields(msgid, parsebitfield)
+        _COMPILED[key] = (names, struct.Struct(fmt), steps, ends)
+    return _COMPILED[key]
+
+
+class SBFView:
+    """
+    Reusable flyweight view over a raw SBF block.
+    """
+
+    __slots__ = (
+        "_msgid",
+        "_parsebf",
+        "_names",
+        "_index",
+        "_struct",
+        "_steps",
+        "_ends",
+        "_raw",
+        "_values",
+        "_message",
+    )
+
+    def __init__(self, msgid: object, parsebitfield: bool = True):
+        """
+        Constructor.
+
+        :param object msgid: block name e.g. "PVTGeodetic" or number e.g. 4007
+        :param bool parsebitfield: 1 = parse bitfields, 0 = leave as bytes (1)
+        :raises: KeyError (if block number is unknown)
+        """
+
+        if isinstance(msgid, int):
+            msgid = SBF_MSGIDS[msgid][0]
+        self._msgid = msgid
+        self._parsebf = parsebitfield
+        self._names, self._struct, self._steps, self._ends = compile_fields(
+            msgid, parsebitfield
+        )
+        self._index = {name: i for i, name in enumerate(self._names)}
+        self._raw = None
+        self._values = None
+        self._message = None
+
+    def __getattr__(self, name: str) -> object:
+        """
+        Get attribute value from current frame.
+
+        :param str name: attribute name
+        :return: attribute value
+        :rtype: object
+        :raises: AttributeError
+        """
+
+        index = self._index.get(name)
+        if index is None:
+            if name[0:1] == "_":
+                raise AttributeError(name)
+            return getattr(self.message, name)
+        return self.values()[index]
+
+    def __repr__(self) -> str:
+        """
+        Human readable representation.
+
+        :return: human readable representation
+        :rtype: str
+        """
+
+        if self._raw is None:
+            return f"<SBFView({self._msgid}, unbound)>"
+        fields = ", ".join(f"{n}={v}" for n, v in zip(self._names, self.values()))
+        return f"<SBFView({self._msgid}, {fields})>"
+
+    def bind(self, raw: bytes):
+        """
+        Bind view to raw frame. The previous frame's values are discarded.
+
+        :param bytes raw: raw SBF frame, including header
+        """
+
+        self._raw = raw
+        self._values = None
+        self._message = None
+
+    def values(self) -> tuple:
+        """
+        Get values of compiled attributes for current frame, in the
+        same order as 'fields'. Attributes absent from the frame (e.g.
+        those added in a later block revision) are None.
+
+        :return: tuple of attribute values
+        :rtype: tuple
+        """
+
+        if self._values is not None:
+            return self._values
+        raw = self._raw
+        short = len(raw) - 8 < self._struct.size
+        if short:
+            raw = raw + bytes(self._struct.size - len(raw) + 8)
+        vals = []
+        for val, (kind, arg), end in zip(
+            self._struct.unpack_from(raw, 8), self._steps, self._ends
+        ):
+            missing = short and end > len(self._raw) - 8
+            if kind == "bits":
+                if isinstance(val, bytes):
+                    val = int.from_bytes(val, "little")
+                vals.extend(
+                    None if missing else (val >> off) & mask for off, mask in arg
+                )
+                continue
+            if missing:
+                val = None
+            elif kind == "scale":
+                val = round(val * arg, SCALROUND)
+            elif kind == "int":
+                val = int.from_bytes(val, "little", signed=arg)
+            vals.append(val)
+        self._values = tuple(vals)
+        return self._values
+
+    @property
+    def identity(self) -> str:
+        """
+        Getter for block name.
+
+        :return: block name e.g. "PVTGeodetic"
+        :rtype: str
+        """
+
+        return self._msgid
+
+    @property
+    def fields(self) -> tuple:
+        """
+        Getter for names of compiled attributes.
+
+        :return: tuple of attribute names
+        :rtype: tuple
+        """
+
+        return self._names
+
+    @property
+    def raw(self) -> bytes:
+        """
+        Getter for current raw frame.
+
+        :return: raw frame
+        :rtype: bytes
+        """
+
+        return self._raw
+
+    @property
+    def revno(self) -> int:
+        """
+        Getter for block revision number of current frame.
+
+        :return: revision number
+        :rtype: int
+        """
+
+        return self._raw[5] >> 5
+
+    @property
+    def message(self) -> SBFMessage:
+        """
+        Getter for current frame as fully parsed SBFMessage (parsed on
+        first access for each frame).
+
+        :return: parsed message
+        :rtype: SBFMessage
+        """
+
+        if self._message is None:
+            raw = self._raw
+            self._message = SBFMessage(
+                self._msgid,
+                self.revno,
+                raw[2:4],
+                int.from_bytes(raw[6:8], "little"),
+                payload=raw[8:],
+                parsebitfield=self._parsebf,
+            )
+        return self._message
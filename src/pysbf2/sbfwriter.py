@@ -0,0 +1,324 @@
+"""
+sbfwriter.py
+
+Buffered SBF log file writer with rotation and index generation.
+
+SBFWriter accepts raw frames or SBFMessage (or other serializable
+message) objects and accumulates them in a large userspace buffer,
+which is written to the (unbuffered) file in a single write() (repeated
+for any remainder if the write is short) when it is full or the flush
+interval has elapsed, optionally followed by an fsync. This is much
+cheaper than a write() per frame on slow storage such as SD cards or NFS.
+
+Files can be rotated by size, by age, and/or on each change of GPS hour
+(taken from the WNc and TOW in each SBF block header), with file names
+generated from a template. A time index sidecar file ('<file>.idx', see
+SBFIndex) can be written alongside each file, and is appended to as
+each buffer is written.
+
+Created on 19 Oct 2026
+
+:author: semuadmin (Steve Smith)
+:copyright: semuadmin © 2020
+:license: BSD 3-Clause
+"""
+
+# pylint: disable=too-many-positional-arguments
+
+import os
+from string import Formatter
+from time import monotonic
+
+from pysbf2.exceptions import ParameterError
+from pysbf2.sbfdecimate import WEEK_MS, frame_time
+from pysbf2.sbfindex import INDEX_MAGIC, INDEX_RECORD, SBFIndex, index_path
+
+WRITE_BUFSIZE = 1048576
+"""Default write buffer size in bytes"""
+FSYNC_NONE = 0
+"""Never fsync"""
+FSYNC_CLOSE = 1
+"""fsync each file when it is closed or rotated"""
+FSYNC_FLUSH = 2
+"""fsync each time the buffer is written"""
+HOUR_MS = 3600000
+"""Milliseconds per hour"""
+
+
+class SBFWriter:
+    """
+    Buffered SBF log file writer.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        bufsize: int = WRITE_BUFSIZE,
+        flushinterval: float = None,
+        fsync: int = FSYNC_CLOSE,
+        maxbytes: int = None,
+        maxage: float = None,
+        gpshour: bool = False,
+        index: bool = False,
+    ):
+        """
+        Constructor.
+
+        The file path is a str.format() template, which may include the
+        fields {seq} (file sequence number, from 0), {wnc} (GPS week) and
+        {hour} (GPS hour of week, 0-167), taken from the first SBF block with
+        a valid time stamp in the file. The first file is not opened until
+        such a block is written (or the buffer is written, in which case
+        GPS week and hour are 0). Size or age rotation requires {seq}, and
+        GPS hour rotation {seq} or {hour}. If a template would still generate
+        the name of a file already written (e.g. if time goes backwards), a
+        suffix "_1", "_2" etc. is added to the new file name.
+
+        :param str path: file path template e.g. "rx1_{wnc}_{hour:03d}.sbf"
+        :param int bufsize: write buffer size in bytes (1048576)
+        :param float flushinterval: write buffer when this many seconds have
+            elapsed since it was last written, checked as each frame is
+            written (None = only when full)
+        :param int fsync: FSYNC_NONE (0), FSYNC_CLOSE (1) or FSYNC_FLUSH (2) (1)
+        :param int maxbytes: rotate file before it would exceed this size in
+            bytes (None = no size limit)
+        :param float maxage: rotate file when it has been open for this
+            many seconds (None = no age limit)
+        :param bool gpshour: rotate file on each change of GPS hour (False)
+        :param bool index: write index sidecar file alongside each file (False)
+        :raises: ParameterError (if arguments are invalid)
+        """
+        # pylint: disable=too-many-arguments
+
+        if fsync not in (FSYNC_NONE, FSYNC_CLOSE, FSYNC_FLUSH):
+            raise ParameterError(f"Invalid fsync policy {fsync}")
+        if bufsize < 1:
+            raise ParameterError(f"Invalid buffer size {bufsize}")
+        fields = {field for _, field, _, _ in Formatter().parse(path) if field}
+        if (maxbytes is not None or maxage is not None) and "seq" not in fields:
+            raise ParameterError(
+                f"Path {path} must include {{seq}} if rotating by size or age"
+            )
+        if gpshour and not fields & {"seq", "hour"}:
+            raise ParameterError(
+                f"Path {path} must include {{seq}} or {{hour}} if rotating by GPS hour"
+            )
+        self._path = path
+        self._bufsize = bufsize
+        self._flushinterval = flushinterval
+        self._fsync = fsync
+        self._maxbytes = maxbytes
+        self._maxage = maxage
+        self._gpshour = gpshour
+        self._index = index
+        self._buf = bytearray()
+        self._file = None
+        self._idxfile = None
+        self._opened = 0  # monotonic time current file opened
+        self._flushed = 0  # monotonic time buffer last written
+        self._size = 0  # bytes written to current file, including buffer
+        self._hour = None  # GPS hour of current file
+        self._msec = None  # latest block time
+        self._indexed = 0  # index records written
+        self.index = SBFIndex() if index else None
+        """SBFIndex of current file (if index is True)"""
+        self.files = []
+        """List of file paths written"""
+        self.frames = 0
+        """Number of frames written"""
+        self.bytes = 0
+        """Number of bytes written"""
+        self.flushes = 0
+        """Number of buffer writes"""
+
+    def __enter__(self):
+        """
+        Context manager enter routine.
+        """
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        """
+        Context manager exit routine.
+        """
+
+        self.close()
+
+    @property
+    def path(self) -> str:
+        """
+        Getter for path of current (or last) file.
+
+        :return: file path, or None if no file has been opened
+        :rtype: str
+        """
+
+        return self.files[-1] if self.files else None
+
+    def write(self, frame: object) -> int:
+        """
+        Write frame, rotating file first if required.
+
+        :param object frame: raw frame as bytes, or SBFMessage (or any
+            other message with a serialize() method)
+        :return: number of bytes written
+        :rtype: int
+        """
+
+        raw = frame if isinstance(frame, (bytes, bytearray)) else frame.serialize()
+        msec = frame_time(raw)
+        if msec is not None:
+            self._msec = msec
+            if self._hour is None:  # first timed block in file
+                self._hour = msec // HOUR_MS
+        if self._file is not None:
+            if self._rotate_due(len(raw), msec):
+                self._close_file()
+        # new file is opened when time of first block is known
+        if self._file is None and self._msec is not None:
+            self._open_file()
+        if self._index and msec is not None:
+            self.index.add(msec, self._size)
+        self._buf += raw
+        self._size += len(raw)
+        self.frames += 1
+        self.bytes += len(raw)
+        if len(self._buf) >= self._bufsize or (
+            self._flushinterval is not None
+            and monotonic() - self._flushed >= self._flushinterval
+        ):
+            self.flush()
+        return len(raw)
+
+    def _rotate_due(self, size: int, msec: int) -> bool:
+        """
+        Check if current file is due to be rotated before writing a frame.
+
+        :param int size: frame size in bytes
+        :param int msec: frame time (see frame_time()), or None if not timed
+        :return: True if file size, age or GPS hour limit is reached
+        :rtype: bool
+        """
+
+        if self._maxbytes is not None and self._size + size > self._maxbytes:
+            return True
+        if self._maxage is not None and monotonic() - self._opened >= self._maxage:
+            return True
+        return bool(self._gpshour and msec is not None and msec // HOUR_MS != self._hour)
+
+    def _open_file(self):
+        """
+        Open next file, named from path template.
+        """
+
+        msec = 0 if self._msec is None else self._msec
+        self._hour = None if self._msec is None else msec // HOUR_MS
+        path = self._path.format(
+            seq=len(self.files),
+            wnc=msec // WEEK_MS,
+            hour=msec % WEEK_MS // HOUR_MS,
+        )
+        root, ext = os.path.splitext(path)
+        suffix = 0
+        while path in self.files:  # never overwrite a file already written
+            suffix += 1
+            path = f"{root}_{suffix}{ext}"
+        # unbuffered, as this writer does its own buffering
+        # pylint: disable=consider-using-with
+        self._file = open(path, "wb", buffering=0)
+        self._opened = self._flushed = monotonic()
+        if self._index:
+            self.index = SBFIndex()
+            self._indexed = 0
+            self._idxfile = open(index_path(path), "wb", buffering=0)
+            _write_all(self._idxfile, INDEX_MAGIC)
+        self.files.append(path)
+
+    def flush(self):
+        """
+        Write buffer (and any new index records) to file, and fsync if
+        fsync policy is FSYNC_FLUSH.
+        """
+
+        if self._file is None:
+            if not self._buf:
+                return
+            self._open_file()  # no timed blocks yet
+        if self._buf:
+            _write_all(self._file, self._buf)
+            self._buf.clear()
+            self.flushes += 1
+        if self._index:
+            index = self.index
+            _write_all(
+                self._idxfile,
+                b"".join(
+                    INDEX_RECORD.pack(t, o)
+                    for t, o in zip(
+                        index.times[self._indexed :], index.offsets[self._indexed :]
+                    )
+                ),
+            )
+            self._indexed = len(index)
+        if self._fsync == FSYNC_FLUSH:
+            self._sync()
+        self._flushed = monotonic()
+
+    def _sync(self):
+        """
+        fsync file (and index file).
+        """
+
+        os.fsync(self._file.fileno())
+        if self._idxfile is not None:
+            os.fsync(self._idxfile.fileno())
+
+    def _close_file(self):
+        """
+        Flush and close current file (and index file).
+        """
+
+        self.flush()
+        if self._fsync == FSYNC_CLOSE:
+            self._sync()
+        self._file.close()
+        self._file = None
+        self._size = 0
+        if self._idxfile is not None:
+            self._idxfile.close()
+            self._idxfile = None
+
+    def rotate(self):
+        """
+        Close current file; the next frame written is written to a new
+        file (with a suffix added if the path template generates the same
+        name).
+        """
+
+        if self._file is None:
+            self.flush()  # opens file if any frames are buffered
+        if self._file is not None:
+            self._close_file()
+
+    def close(self):
+        """
+        Flush and close current file.
+        """
+
+        self.rotate()
+
+
+def _write_all(file: object, data: bytes):
+    """
+    Write all data to unbuffered file, which may write fewer bytes
+    than requested in any one call.
+
+    :param object file: unbuffered (raw) binary file
+    :param bytes data: data to write
+    """
+
+    with memoryview(data) as view:
+        written = 0
+        while written < len(view):
+            written += file.write(view[written:])
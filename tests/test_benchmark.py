@@ -0,0 +1,292 @@
+"""
+Benchmark suite tests for pysbf2
+
+Created on 19 Oct 2026
+
+*** NB: must be saved in UTF-8 format ***
+
+@author: semuadmin
+"""
+
+# pylint: disable=line-too-long, invalid-name, missing-docstring, no-member
+
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+
+from pysbf2 import (
+    BENCH_MODES,
+    MEMORY_BLOCKS,
+    ParameterError,
+    SBFCorpus,
+    compare_baseline,
+    sbf_benchmark,
+    sbf_memory_benchmark,
+)
+from pysbf2.sbfbenchmark import main
+
+PROFILE = "pvt-10Hz"
+SIZE = 20000
+
+
+class BenchmarkTest(unittest.TestCase):
+    def setUp(self):
+        self.maxDiff = None
+        self.data = SBFCorpus(PROFILE).generate(SIZE)
+
+    def tearDown(self):
+        pass
+
+    def testSuite(self):
+        res = sbf_benchmark(
+            self.data, blocks=None, backends=("inline", "thread"), repeat=1
+        )
+        self.assertEqual(res["meta"]["bytes"], len(self.data))
+        self.assertIsNone(res["meta"]["profile"])
+        results = res["results"]
+        for block in ("DOP", "PVTGeodetic", "PosCovGeodetic"):
+            for parsing, parsebf, validate in BENCH_MODES:
+                name = f"block/{block}/parsing={int(parsing)}/parsebitfield={int(parsebf)}/validate={validate}"
+                self.assertGreater(results[name]["frames"], 0)
+        pvt = results["block/PVTGeodetic/parsing=1/parsebitfield=1/validate=1"]
+        self.assertEqual(pvt["bytes"], pvt["frames"] * 96)
+        self.assertAlmostEqual(pvt["framerate"], pvt["frames"] / pvt["seconds"])
+        self.assertAlmostEqual(pvt["byterate"], pvt["bytes"] / pvt["seconds"])
+        frames = results["source/memory/parsing=1"]["frames"]
+        for source in ("memory", "file", "mmap", "socket"):
+            for parsing in (0, 1):
+                res = results[f"source/{source}/parsing={parsing}"]
+                self.assertEqual(res["frames"], frames)
+                self.assertEqual(res["bytes"], len(self.data))
+        for backend in ("inline", "thread"):
+            self.assertEqual(results[f"backend/{backend}"]["frames"], frames)
+        self.assertNotIn("backend/process", results)
+        json.dumps(res)  # serializable
+
+    def testProcess(self):
+        res = sbf_benchmark(
+            profile=PROFILE,
+            size=SIZE,
+            blocks=(),
+            sources=(),
+            backends=("process",),
+            workers=2,
+            repeat=1,
+        )
+        self.assertEqual(res["meta"]["profile"], PROFILE)
+        self.assertEqual(list(res["results"]), ["backend/process"])
+        self.assertGreater(res["results"]["backend/process"]["frames"], 0)
+
+    def testCompare(self):
+        def res(**rates):
+            return {"results": {k: {"framerate": v} for k, v in rates.items()}}
+
+        cmp = compare_baseline(
+            res(a=85, b=95, c=200, d=10), res(a=100, b=100, c=100, e=10, f=0), 0.1
+        )
+        self.assertEqual(list(cmp), ["a", "b", "c"])
+        self.assertEqual(cmp["a"]["baseline"], 100)
+        self.assertEqual(cmp["a"]["current"], 85)
+        self.assertAlmostEqual(cmp["a"]["change"], -0.15)
+        self.assertTrue(cmp["a"]["regression"])
+        self.assertFalse(cmp["b"]["regression"])
+        self.assertAlmostEqual(cmp["c"]["change"], 1.0)
+        self.assertFalse(cmp["c"]["regression"])
+
+    def testInvalid(self):
+        with self.assertRaisesRegex(ParameterError, "Invalid benchmark source xxx"):
+            sbf_benchmark(self.data, sources=("xxx",))
+        with self.assertRaisesRegex(ParameterError, "Invalid benchmark backend xxx"):
+            sbf_benchmark(self.data, backends=("xxx",))
+
+    def testMain(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "data.sbf")
+            base = os.path.join(tmpdir, "baseline.json")
+            with open(path, "wb") as stream:
+                stream.write(self.data)
+            args = [
+                "--input",
+                path,
+                "--blocks",
+                "PVTGeodetic",
+                "--sources",
+                "memory",
+                "--backends",
+                "inline",
+                "--repeat",
+                "1",
+            ]
+            out = StringIO()
+            with redirect_stdout(out):
+                self.assertEqual(main(args + ["--output", base]), 0)
+            self.assertIn(
+                "block/PVTGeodetic/parsing=1/parsebitfield=1/validate=1", out.getvalue()
+            )
+            with open(base, "r", encoding="utf-8") as stream:
+                baseline = json.load(stream)
+            self.assertIn("source/memory/parsing=0", baseline["results"])
+            out = StringIO()
+            with redirect_stdout(out):
+                self.assertEqual(
+                    main(args + ["--baseline", base, "--tolerance", "100"]), 0
+                )
+            self.assertIn("change", out.getvalue())
+            self.assertNotIn("REGRESSION", out.getvalue())
+            for res in baseline["results"].values():
+                res["framerate"] *= 1000
+            with open(base, "w", encoding="utf-8") as stream:
+                json.dump(baseline, stream)
+            out = StringIO()
+            with redirect_stdout(out):
+                self.assertEqual(
+                    main(args + ["--baseline", base, "--format", "json"]), 1
+                )
+            res = json.loads(out.getvalue())
+            self.assertTrue(
+                all(cmp["regression"] for cmp in res["comparison"].values())
+            )
+            out = StringIO()
+            with redirect_stdout(out):
+                self.assertEqual(
+                    main(
+                        [
+                            "--profile",
+                            PROFILE,
+                            "--size",
+                            str(SIZE),
+                            "--blocks",
+                            "PVTGeodetic",
+                            "--sources",
+                            "--backends",
+                            "--repeat",
+                            "1",
+                            "--baseline",
+                            base,
+                        ]
+                    ),
+                    1,
+                )
+            self.assertIn("REGRESSION", out.getvalue())
+
+    def testMemoryBlocks(self):
+        res = sbf_memory_benchmark(frames=4, duration=0)
+        self.assertEqual(res["meta"]["profile"], "mosaic-X5-20Hz")
+        self.assertIsNone(res["stream"])
+        self.assertEqual(tuple(res["blocks"]), MEMORY_BLOCKS)
+        for name in MEMORY_BLOCKS:
+            blk = res["blocks"][name]
+            self.assertEqual(blk["frames"], 4)
+            for key in ("retained", "allocated", "objects", "tracked"):
+                self.assertGreater(blk[key], 0)
+            self.assertGreaterEqual(blk["collections"], 0)
+        meas, pvt = res["blocks"]["MeasEpoch"], res["blocks"]["PVTGeodetic"]
+        self.assertEqual(pvt["size"], 96)
+        self.assertGreater(meas["size"], pvt["size"])
+        self.assertGreater(meas["retained"], pvt["retained"])
+        self.assertGreater(meas["objects"], pvt["objects"])
+        json.dumps(res)  # serializable
+        with self.assertRaisesRegex(
+            ParameterError, "Invalid block type MeasEpoch for profile"
+        ):
+            sbf_memory_benchmark("pvt-10Hz", blocks=("PVTGeodetic", "DOP", "MeasEpoch"))
+
+    def testMemoryStream(self):
+        res = sbf_memory_benchmark(
+            PROFILE, blocks=None, frames=2, duration=60, sample=20000
+        )
+        self.assertEqual(list(res["blocks"]), ["PVTGeodetic", "PosCovGeodetic", "DOP"])
+        stream = res["stream"]
+        self.assertEqual(stream["duration"], 60)
+        self.assertEqual(stream["frames"], 600 * 2 + 60)  # 10 Hz + 10 Hz + 1 Hz
+        self.assertEqual(stream["bytes"], 600 * (96 + 56) + 60 * 32)
+        self.assertEqual(
+            [smp[0] for smp in stream["samples"]], [20024, 40048, 60016, 80040, 93120]
+        )
+        self.assertEqual(stream["rss"], stream["samples"][-1][1])
+        self.assertGreaterEqual(stream["peakrss"], stream["rss"])
+        self.assertLess(stream["growth"], 2**20)
+        res = sbf_memory_benchmark(
+            PROFILE, blocks=(), size=10000, parsing=False, sample=10**9
+        )
+        self.assertEqual(res["blocks"], {})
+        stream = res["stream"]
+        self.assertGreaterEqual(stream["bytes"], 10000)
+        self.assertLess(stream["bytes"], 10500)  # whole epochs
+        self.assertEqual(len(stream["samples"]), 1)
+        self.assertEqual(stream["growth"], 0)
+
+    @unittest.skipUnless(os.environ.get("PYSBF2_LONGRUN"), "PYSBF2_LONGRUN not set")
+    def testMemoryLongRun(self):
+        # RSS stays flat over 10 GB stream
+        res = sbf_memory_benchmark(blocks=(), size=10**10, parsing=False, sample=10**9)
+        stream = res["stream"]
+        self.assertGreaterEqual(stream["bytes"], 10**10)
+        self.assertEqual(len(stream["samples"]), 11)
+        self.assertLess(stream["growth"], 16 * 2**20)
+
+    def testMemoryMain(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "memory.json")
+            args = [
+                "--memory",
+                "--profile",
+                PROFILE,
+                "--blocks",
+                "PVTGeodetic",
+                "--frames",
+                "2",
+            ]
+            out = StringIO()
+            with redirect_stdout(out):
+                self.assertEqual(
+                    main(
+                        args
+                        + ["--duration", "10", "--sample", "5000", "--output", path]
+                    ),
+                    0,
+                )
+            self.assertIn("PVTGeodetic", out.getvalue())
+            self.assertIn("stream 10 s, 210 frames, 15,520 bytes", out.getvalue())
+            with open(path, "r", encoding="utf-8") as stream:
+                res = json.load(stream)
+            self.assertEqual(list(res["blocks"]), ["PVTGeodetic"])
+            self.assertEqual(len(res["stream"]["samples"]), 4)
+            out = StringIO()
+            with redirect_stdout(out):
+                self.assertEqual(
+                    main(
+                        args + ["--streamsize", "5000", "--noparse", "--format", "json"]
+                    ),
+                    0,
+                )
+            res = json.loads(out.getvalue())
+            self.assertFalse(res["meta"]["parsing"])
+            self.assertGreaterEqual(res["stream"]["bytes"], 5000)
+            out = StringIO()
+            with redirect_stdout(out):
+                self.assertEqual(
+                    main(
+                        [
+                            "--memory",
+                            "--profile",
+                            PROFILE,
+                            "--blocks",
+                            "--frames",
+                            "1",
+                            "--duration",
+                            "0",
+                        ]
+                    ),
+                    0,
+                )
+            self.assertIn("DOP", out.getvalue())
+            self.assertNotIn("stream", out.getvalue())
+
+
+if __name__ == "__main__":
+    # import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
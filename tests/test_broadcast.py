@@ -0,0 +1,143 @@
+"""
+Broadcast hub tests for pysbf2
+
+Created on 19 Oct 2026
+
+*** NB: must be saved in UTF-8 format ***
+
+@author: semuadmin
+"""
+
+# pylint: disable=line-too-long, invalid-name, missing-docstring, no-member
+
+import os
+import unittest
+from io import BytesIO
+from time import sleep
+from unittest.mock import patch
+
+from pysbf2 import (
+    ERR_IGNORE,
+    ERR_RAISE,
+    ParameterError,
+    SBFBroadcaster,
+    SBFMessageError,
+    SBFReader,
+)
+
+DIRNAME = os.path.dirname(__file__)
+
+
+class BroadcastTest(unittest.TestCase):
+    def setUp(self):
+        self.maxDiff = None
+        with open(
+            os.path.join(DIRNAME, "pygpsdata_x5_measurements.log"), "rb"
+        ) as stream:
+            self.sbf = stream.read()
+        with open(os.path.join(DIRNAME, "pygpsdata_mixed.log"), "rb") as stream:
+            self.mixed = stream.read()
+
+    def tearDown(self):
+        pass
+
+    def testBroadcast(self):
+        hub = SBFBroadcaster(SBFReader(BytesIO(self.sbf + self.mixed), parsing=False))
+        logger = hub.subscribe()
+        monitor = hub.subscribe(msgfilter=["MeasEpoch", 5922], parsing=True)
+        qc = hub.subscribe(msgfilter=["MeasEpoch"], parsing=True)
+        count = hub.run()
+        self.assertEqual(count, hub.frames)
+        self.assertEqual(logger.qsize, count)
+        raws = [raw for raw, _ in logger]
+        self.assertEqual(b"".join(raws), self.sbf + self.mixed)
+        self.assertEqual(logger.get(0.01), (None, None))
+        res = list(monitor)
+        self.assertEqual([p.identity for _, p in res], ["MeasEpoch", "EndOfMeas"])
+        res2 = list(qc)
+        self.assertIs(res2[0][0], raws[0])  # frames shared, not copied
+        self.assertIs(res2[0][1], res[0][1])  # parsed once, shared
+        self.assertEqual(hub.parsed, 2)  # MeasExtra and NMEA/RTCM never parsed
+        self.assertEqual(monitor.delivered, 2)
+
+    def testParseOnlyIfWanted(self):
+        hub = SBFBroadcaster(SBFReader(BytesIO(self.sbf), parsing=False))
+        sub = hub.subscribe(msgfilter=["PVTGeodetic"], parsing=True)
+        with patch.object(SBFReader, "parse_frame") as parse:
+            hub.run()
+        parse.assert_not_called()
+        self.assertEqual(list(sub), [])
+
+    def testNonSBFParsed(self):
+        hub = SBFBroadcaster(SBFReader(BytesIO(self.mixed), parsing=False))
+        sub = hub.subscribe(parsing=True)
+        hub.run()
+        self.assertIn("GNGLL", [p.identity for _, p in sub])
+
+    def testDropPolicy(self):
+        hub = SBFBroadcaster(SBFReader(BytesIO(self.sbf * 10), parsing=False))
+        slow = hub.subscribe(maxsize=5)
+        fast = hub.subscribe(maxsize=0)
+        hub.run()
+        self.assertEqual((slow.delivered, slow.dropped), (5, 25))
+        self.assertEqual(len(list(slow)), 5)
+        self.assertEqual((fast.delivered, fast.dropped), (30, 0))
+
+    def testBlockingThread(self):
+        hub = SBFBroadcaster(SBFReader(BytesIO(self.sbf * 20), parsing=False))
+        sub = hub.subscribe(maxsize=2, block=True, parsing=True)
+        other = hub.subscribe()
+        hub.unsubscribe(other)
+        self.assertEqual(hub.subscribers, (sub,))
+        hub.start()
+        res = [p.identity for _, p in sub]
+        hub.stop()
+        self.assertEqual(len(res), 60)
+        self.assertEqual(sub.dropped, 0)
+        self.assertEqual(other.delivered, 0)
+
+    def testStop(self):
+        hub = SBFBroadcaster(SBFReader(BytesIO(self.sbf * 100), parsing=False))
+        sub = hub.subscribe(maxsize=1, block=True)
+        hub.start()
+        self.assertIsNotNone(sub.get())
+        while sub.qsize == 0:  # wait until hub is blocked on full queue
+            sleep(0.01)
+        hub.stop()  # does not wait for queue to be drained
+        self.assertLessEqual(sub.dropped, 1)
+        self.assertLessEqual(len(list(sub)), 1)
+        self.assertLess(hub.frames, 300)
+        hub.unsubscribe(sub)
+        self.assertEqual(hub.run(limit=2), 2)  # restarts after stop
+
+    def testErrors(self):
+        bad = bytearray(self.sbf)
+        bad[100] ^= 0xFF  # corrupt MeasEpoch payload
+        errors = []
+        hub = SBFBroadcaster(
+            SBFReader(BytesIO(bytes(bad)), parsing=False, validate=0),
+            errorhandler=errors.append,
+        )
+        sub = hub.subscribe(parsing=True)
+        hub.run()
+        self.assertIsInstance(errors[0], SBFMessageError)
+        res = list(sub)
+        self.assertEqual(res[0][1], None)
+        self.assertEqual(res[1][1].identity, "MeasExtra")
+        hub = SBFBroadcaster(
+            SBFReader(BytesIO(bytes(bad)), parsing=False, validate=0),
+            quitonerror=ERR_IGNORE,
+        )
+        hub.subscribe(parsing=True)
+        self.assertEqual(hub.run(), 3)
+        hub = SBFBroadcaster(
+            SBFReader(BytesIO(bytes(bad)), parsing=False, validate=0),
+            quitonerror=ERR_RAISE,
+        )
+        hub.subscribe(parsing=True)
+        with self.assertRaises(SBFMessageError):
+            hub.run()
+        with self.assertRaises(ParameterError):
+            hub.subscribe(msgfilter=["Nonsense"])
+        with self.assertRaisesRegex(ParameterError, "requires an SBFReader created"):
+            SBFBroadcaster(SBFReader(BytesIO(self.sbf)))
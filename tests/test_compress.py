@@ -0,0 +1,198 @@
+"""
+Compressed log tests for pysbf2
+
+Created on 19 Oct 2026
+
+*** NB: must be saved in UTF-8 format ***
+
+@author: semuadmin
+"""
+
+# pylint: disable=line-too-long, invalid-name, missing-docstring, no-member
+
+import gzip
+import os
+import tempfile
+import unittest
+from io import BytesIO
+
+from pysbf2 import (
+    CODEC_ZSTD,
+    ZSTD_MAGIC,
+    ParameterError,
+    SBFChunkReader,
+    SBFChunkWriter,
+    SBFDecompressor,
+    SBFMessage,
+    SBFReader,
+    SBFStreamError,
+    compress_sbf,
+    crc2bytes,
+    open_sbf,
+)
+
+DIRNAME = os.path.dirname(__file__)
+try:
+    from compression import zstd  # Python 3.14+
+except ImportError:
+    try:
+        import zstandard as zstd
+    except ImportError:
+        zstd = None
+
+
+def _load(*names) -> bytes:
+    data = b""
+    for name in names:
+        with open(os.path.join(DIRNAME, name), "rb") as stream:
+            data += stream.read()
+    return data
+
+
+def _epochs(start: int, step: int, count: int) -> bytes:
+    raw = bytearray(SBFMessage("PVTGeodetic", revno=2, TOW=0, WNc=2300).serialize())
+    data = bytearray()
+    for i in range(count):
+        raw[8:12] = (start + i * step).to_bytes(4, "little")
+        raw[2:4] = crc2bytes(raw[4:])
+        data += raw
+    return bytes(data)
+
+
+class CompressTest(unittest.TestCase):
+    def setUp(self):
+        self.maxDiff = None
+        self.data = _load(
+            "pygpsdata_mixed.log",
+            "pygpsdata_x5_measurements.log",
+            "pygpsdata_x5_status.log",
+        )
+        self.expected = list(SBFReader(BytesIO(self.data * 20), parsing=False))
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.tmpdir.name, name)
+
+    def _write(self, name: str, data: bytes) -> str:
+        path = self._path(name)
+        with open(path, "wb") as stream:
+            stream.write(data)
+        return path
+
+    def testPlain(self):
+        path = self._write("test.sbf", self.data * 20)
+        with open_sbf(path) as stream:
+            self.assertNotIsInstance(stream, (SBFDecompressor, SBFChunkReader))
+            self.assertEqual(list(SBFReader(stream, parsing=False)), self.expected)
+
+    def testGzip(self):
+        # concatenated gzip members, as produced by appending logger
+        data = b"".join(gzip.compress(self.data * 10) for _ in range(2))
+        path = self._write("test.sbf.gz", data)
+        with open_sbf(path, bufsize=1000, maxchunks=2) as stream:
+            self.assertIsInstance(stream, SBFDecompressor)
+            self.assertTrue(stream.readable())
+            self.assertFalse(stream.seekable())
+            self.assertEqual(list(SBFReader(stream, parsing=False)), self.expected)
+            self.assertEqual(stream.read(10), b"")
+        with open_sbf(path) as stream:
+            self.assertEqual(stream.readline(5), self.data[0:5])
+            self.assertEqual(
+                stream.readline(), self.data[5 : self.data.find(b"\n") + 1]
+            )
+            self.assertEqual(
+                len(stream.read()), len(self.data) * 20 - self.data.find(b"\n") - 1
+            )
+            self.assertEqual(stream.readline(), b"")
+
+    def testGzipCorrupt(self):
+        data = bytearray(gzip.compress(self.data * 10))
+        data[100:110] = bytes(10)
+        path = self._write("test.sbf.gz", bytes(data))
+        with open_sbf(path) as stream:
+            with self.assertRaisesRegex(SBFStreamError, "Decompression failed"):
+                stream.read()
+            self.assertEqual(stream.read(), b"")
+
+    def testClose(self):
+        path = self._write("test.sbf.gz", gzip.compress(self.data * 100))
+        stream = open_sbf(path, bufsize=100, maxchunks=1)
+        self.assertEqual(stream.read(10), self.data[0:10])
+        stream.close()  # background thread blocked on full queue
+
+    def testChunked(self):
+        path = self._write("test.sbf", self.data * 20)
+        size = compress_sbf(path, self._path("test.sbfz"), chunksize=1000)
+        self.assertEqual(size, len(self.data) * 20)
+        with open_sbf(self._path("test.sbfz")) as stream:
+            self.assertIsInstance(stream, SBFChunkReader)
+            self.assertTrue(stream.readable())
+            self.assertTrue(stream.seekable())
+            self.assertEqual(stream.chunks, size // 1000 + 1)
+            self.assertEqual(stream.name, self._path("test.sbfz"))
+            self.assertEqual(list(SBFReader(stream, parsing=False)), self.expected)
+            self.assertEqual(stream.decompressed, stream.chunks)
+            self.assertEqual(stream.tell(), size)
+            self.assertEqual(stream.seek(-10, 1), size - 10)
+            self.assertEqual(stream.read(), (self.data * 20)[-10:])
+            self.assertEqual(stream.seek(5), 5)
+            self.assertEqual(
+                stream.readline(), self.data[5 : self.data.find(b"\n") + 1]
+            )
+            stream.seek(995)
+            self.assertEqual(
+                stream.read(10), (self.data * 20)[995:1005]
+            )  # across chunks
+            self.assertEqual(stream.seek(10, 2), size)
+        # from gzip source
+        gzpath = self._write("test.sbf.gz", gzip.compress(self.data * 20))
+        compress_sbf(gzpath, self._path("test2.sbfz"))
+        with open_sbf(self._path("test2.sbfz")) as stream:
+            self.assertEqual(stream.chunks, 1)
+            self.assertEqual(stream.read(), self.data * 20)
+
+    def testChunkedSeek(self):
+        data = _epochs(0, 50, 72000)  # 1 hour at 20 Hz
+        buf = BytesIO()
+        with SBFChunkWriter(buf, chunksize=65536) as writer:
+            for i in range(0, len(data), 10000):
+                writer.write(data[i : i + 10000])
+        buf.seek(0)
+        stream = SBFChunkReader(buf)
+        rdr = SBFReader(stream)
+        rdr.seek_time(2300, 1800000, end=(2300, 1800100))
+        self.assertEqual([p.TOW for _, p in rdr], [1800000, 1800050, 1800100])
+        self.assertEqual(stream.chunks, len(data) // 65536 + 1)
+        self.assertLess(stream.decompressed, 20)  # not full decompression
+        stream.close()
+
+    def testInvalid(self):
+        with self.assertRaisesRegex(ParameterError, "Invalid compression codec 2"):
+            SBFChunkWriter(BytesIO(), codec=2)
+        for data in (
+            b"SBFZ\x01\x00\x00\x00",
+            b"SBFZ\x01\x00\x00\x00" + bytes(24) + b"SBFX",
+        ):
+            with self.assertRaisesRegex(SBFStreamError, "Invalid chunked SBF file"):
+                SBFChunkReader(BytesIO(data))
+
+    @unittest.skipIf(zstd is not None, "zstandard available")
+    def testZstdUnavailable(self):
+        path = self._write("test.sbf.zst", ZSTD_MAGIC + bytes(20))
+        with self.assertRaisesRegex(SBFStreamError, "requires Python 3.14"):
+            open_sbf(path)
+        with self.assertRaisesRegex(SBFStreamError, "requires Python 3.14"):
+            with SBFChunkWriter(BytesIO(), codec=CODEC_ZSTD) as writer:
+                writer.write(b"data")
+
+    @unittest.skipIf(zstd is None, "zstandard not available")
+    def testZstd(self):
+        path = self._write("test.sbf.zst", zstd.compress(self.data * 20))
+        with open_sbf(path) as stream:
+            self.assertEqual(list(SBFReader(stream, parsing=False)), self.expected)
+        compress_sbf(path, self._path("test.sbfz"), chunksize=1000, codec=CODEC_ZSTD)
+        with open_sbf(self._path("test.sbfz")) as stream:
+            self.assertEqual(list(SBFReader(stream, parsing=False)), self.expected)
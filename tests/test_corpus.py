@@ -0,0 +1,157 @@
+"""
+Synthetic corpus generator tests for pysbf2
+
+Created on 19 Oct 2026
+
+*** NB: must be saved in UTF-8 format ***
+
+@author: semuadmin
+"""
+
+# pylint: disable=line-too-long, invalid-name, missing-docstring, no-member
+
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import BytesIO, StringIO
+
+from pysbf2 import (
+    CORPUS_ALL,
+    ParameterError,
+    SBFCorpus,
+    SBFReader,
+    bytes2id,
+    frame_time,
+)
+from pysbf2.sbfcorpus import main
+from pysbf2.sbftypes_blocks import SBF_BLOCKS
+from pysbf2.sbftypes_core import PAD, SBF_MSGIDS
+
+
+class CorpusTest(unittest.TestCase):
+    def setUp(self):
+        self.maxDiff = None
+
+    def tearDown(self):
+        pass
+
+    def testAllBlocks(self):
+        # every defined block type, in every revision, parses and reserializes
+        corpus = SBFCorpus(CORPUS_ALL, variants=4, revisions=(0, 1, 2))
+        data = b"".join(b"".join(epoch) for epoch in corpus.epochs(2))
+        res = list(SBFReader(BytesIO(data)))
+        self.assertEqual(len(res), 2 * len([p for p in SBF_BLOCKS.values() if p]))
+        for raw, parsed in res:
+            self.assertEqual(raw, parsed.serialize())
+        self.assertEqual(
+            {bytes2id(t[4:6])[1] for t in corpus.templates["PVTGeodetic"]}, {0, 1, 2}
+        )
+        # block definitions unchanged by parsing
+        self.assertEqual(SBF_BLOCKS["ChannelStatus"]["group"][1][PAD], "SB1Length")
+        # every optionmode branch
+        modes = {
+            parsed.Mode
+            for _, parsed in SBFReader(
+                BytesIO(b"".join(corpus.templates["DiffCorrIn"]))
+            )
+        }
+        self.assertEqual(modes, {0, 1, 2, 3})
+
+    def testProfile(self):
+        corpus = SBFCorpus("mosaic-X5-20Hz", variants=2)
+        self.assertEqual(corpus.interval, 50)
+        epochs = list(corpus.epochs(21))
+        self.assertEqual(len(epochs[0]), 13)  # all blocks in first epoch
+        self.assertEqual(len(epochs[1]), 5)  # 20 Hz blocks only
+        self.assertEqual(len(epochs[20]), 11)  # 1 Hz and 20 Hz blocks
+        self.assertEqual(frame_time(epochs[20][0]) - frame_time(epochs[0][0]), 1000)
+        for raw, parsed in SBFReader(BytesIO(b"".join(epochs[0]))):
+            if parsed.identity == "MeasEpoch":
+                self.assertTrue(30 <= parsed.N1 <= 60)
+                self.assertTrue(
+                    all(
+                        0 <= getattr(parsed, f"N2_{i:02d}") <= 3
+                        for i in range(1, parsed.N1 + 1)
+                    )
+                )
+        corpus = SBFCorpus(
+            {"PVTGeodetic": (50, {}), "ChannelStatus": (2, {"N": (5, 5)})},
+            start=(2300, 604799980),
+        )
+        epochs = list(corpus.epochs(3))
+        self.assertEqual([len(e) for e in epochs], [1, 2, 1])
+        self.assertEqual(
+            [SBF_MSGIDS[bytes2id(e[-1][4:6])[0]][0] for e in epochs],
+            ["PVTGeodetic", "ChannelStatus", "PVTGeodetic"],
+        )
+        self.assertEqual(
+            epochs[1][0][8:14], (0).to_bytes(4, "little") + (2301).to_bytes(2, "little")
+        )
+
+    def testDeterministic(self):
+        data = SBFCorpus("pvt-10Hz", seed=1).generate(100000)
+        self.assertGreaterEqual(len(data), 100000)
+        self.assertEqual(SBFCorpus("pvt-10Hz", seed=1).generate(100000), data)
+        self.assertNotEqual(SBFCorpus("pvt-10Hz", seed=2).generate(100000), data)
+        frames = list(SBFCorpus("pvt-10Hz", seed=1).frames(50))
+        self.assertEqual(b"".join(frames), data[0 : len(b"".join(frames))])
+        self.assertEqual(len(frames), 50)
+
+    def testWrite(self):
+        corpus = SBFCorpus("pvt-10Hz")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "corpus.sbf")
+            written = corpus.write(path, 300000, bufsize=65536)
+            self.assertEqual(os.path.getsize(path), written)
+            with open(path, "rb") as stream:
+                data = stream.read()
+            self.assertEqual(data, corpus.generate(300000))
+            out = StringIO()
+            with redirect_stdout(out):
+                main(
+                    [
+                        path,
+                        "--size",
+                        "1000",
+                        "--profile",
+                        "pvt-10Hz",
+                        "--revisions",
+                        "0",
+                        "1",
+                    ]
+                )
+            self.assertIn(f"bytes written to {path}", out.getvalue())
+            with open(path, "rb") as stream:
+                res = list(SBFReader(stream))
+            self.assertGreaterEqual(os.path.getsize(path), 1000)
+            self.assertEqual(res[-1][1].TOW, res[-2][1].TOW)  # whole epochs
+            self.assertEqual({r[5] >> 5 for r, _ in res}, {0, 1})  # revisions
+
+    def testLarge(self):
+        # group sizes reduced if block would exceed maximum length
+        corpus = SBFCorpus(
+            {"MeasEpoch": (1, {"N1": (255, 255), "N2": (255, 255)})}, variants=1
+        )
+        raw = corpus.templates["MeasEpoch"][0]
+        self.assertLessEqual(len(raw), 65532)
+        self.assertEqual(int.from_bytes(raw[6:8], "little"), len(raw))
+        self.assertEqual(len(list(SBFReader(BytesIO(raw), parsing=False))), 1)
+
+    def testInvalid(self):
+        with self.assertRaisesRegex(ParameterError, "Unknown corpus profile xxx"):
+            SBFCorpus("xxx")
+        with self.assertRaisesRegex(ParameterError, "Undefined block type Meas3Ranges"):
+            SBFCorpus({"Meas3Ranges": (1, {})})
+        with self.assertRaisesRegex(ParameterError, "Invalid rate 3 for PVTGeodetic"):
+            SBFCorpus({"PVTGeodetic": (3, {})})
+        with self.assertRaisesRegex(ParameterError, "Invalid rate 0 for PVTGeodetic"):
+            SBFCorpus({"PVTGeodetic": (0, {})})
+        with self.assertRaisesRegex(ParameterError, "Invalid number of variants 0"):
+            SBFCorpus(variants=0)
+        with self.assertRaisesRegex(ParameterError, "Empty corpus profile"):
+            SBFCorpus({})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+"""
+Time-based decimation tests for pysbf2
+
+Created on 19 Oct 2026
+
+*** NB: must be saved in UTF-8 format ***
+
+@author: semuadmin
+"""
+
+# pylint: disable=line-too-long, invalid-name, missing-docstring, no-member
+
+import os
+import unittest
+from io import BytesIO
+from unittest.mock import patch
+
+from pysbf2 import (
+    WEEK_MS,
+    ParameterError,
+    SBFDecimator,
+    SBFMessage,
+    SBFReader,
+    crc2bytes,
+    frame_time,
+)
+
+DIRNAME = os.path.dirname(__file__)
+
+
+def _frames(msgid: str, start: int, step: int, count: int, wnc: int = 2300) -> list:
+    return [
+        SBFMessage(msgid, TOW=start + i * step, WNc=wnc).serialize()
+        for i in range(count)
+    ]
+
+
+class DecimateTest(unittest.TestCase):
+    def setUp(self):
+        self.maxDiff = None
+        # 3 seconds of 100 Hz PVTGeodetic, starting 50 ms before a whole second,
+        # interleaved with ReceiverTime at 10 Hz
+        pvt = _frames("PVTGeodetic", 999950, 10, 300)
+        rtm = _frames("ReceiverTime", 999950, 100, 30)
+        self.frames = []
+        for i, raw in enumerate(pvt):
+            self.frames.append(raw)
+            if not i % 10:
+                self.frames.append(rtm[i // 10])
+
+    def tearDown(self):
+        pass
+
+    def testFrameTime(self):
+        self.assertEqual(frame_time(self.frames[0]), 2300 * WEEK_MS + 999950)
+        self.assertIsNone(frame_time(b"$GNGLL,,,,,,V,N*7A\r\n"))
+        self.assertIsNone(frame_time(_frames("PVTGeodetic", 4294967295, 0, 1)[0]))
+        self.assertIsNone(frame_time(_frames("PVTGeodetic", 1000, 0, 1, 65535)[0]))
+
+    def testAligned(self):
+        dec = SBFDecimator({"PVTGeodetic": 1})
+        kept = [raw for raw in self.frames if dec.keep(raw)]
+        tows = [SBFReader.parse(raw).TOW for raw in kept if raw[4] == 0xA7]
+        self.assertEqual(tows, [999950, 1000000, 1001000, 1002000])
+        self.assertEqual(dec.kept, {4007: 4})
+        self.assertEqual(dec.dropped, {4007: 296})
+        self.assertEqual(len(kept), 34)  # all ReceiverTime frames kept
+
+    def testUnaligned(self):
+        dec = SBFDecimator({"PVTGeodetic": 1, "ReceiverTime": 0.5}, align=False)
+        kept = [SBFReader.parse(raw) for raw in self.frames if dec.keep(raw)]
+        tows = [msg.TOW for msg in kept if msg.identity == "PVTGeodetic"]
+        self.assertEqual(tows, [999950, 1000950, 1001950])
+        self.assertEqual(dec.kept, {4007: 3, 5914: 6})
+        self.assertEqual(dec.dropped, {4007: 297, 5914: 24})
+        dec.reset()
+        self.assertEqual(dec.kept, {})
+        self.assertTrue(dec.keep(self.frames[5]))
+
+    def testTimeReset(self):
+        dec = SBFDecimator({"PVTGeodetic": 60})
+        frames = self.frames + self.frames  # e.g. replayed file
+        kept = [raw for raw in frames if dec.keep(raw) and raw[4] == 0xA7]
+        self.assertEqual(len(kept), 2)  # first frame of each replay
+        dnu = _frames("PVTGeodetic", 4294967295, 0, 3)
+        self.assertTrue(all(dec.keep(raw) for raw in dnu))
+
+    def testReader(self):
+        data = b"".join(self.frames)
+        dec = SBFDecimator({"PVTGeodetic": 1, 5914: 1})
+        with patch("pysbf2.sbfreader.SBFReader.parse") as mock_parse:
+            res = list(SBFReader(BytesIO(data), decimate=dec))
+            self.assertEqual(len(res), 8)
+            self.assertEqual(mock_parse.call_count, 8)  # dropped frames never parsed
+        res = list(SBFReader(BytesIO(data), decimate=SBFDecimator({"PVTGeodetic": 1})))
+        self.assertEqual(len(res), 34)
+        self.assertEqual(res[1][1].identity, "ReceiverTime")
+        with open(os.path.join(DIRNAME, "pygpsdata_mixed.log"), "rb") as stream:
+            res = list(SBFReader(stream, decimate=SBFDecimator({"PVTGeodetic": 60})))
+        self.assertEqual(len(res), 6)
+
+    def testReaderCRCOnce(self):
+        data = b"".join(self.frames)
+        with patch("pysbf2.sbfreader.crc2bytes", wraps=crc2bytes) as mock_crc:
+            res = list(
+                SBFReader(BytesIO(data), decimate=SBFDecimator({"PVTGeodetic": 1}))
+            )
+        self.assertEqual(len(res), 34)
+        self.assertEqual(mock_crc.call_count, len(self.frames))  # once per frame
+
+    def testReaderBadCRC(self):
+        raw = bytearray(self.frames[0])
+        raw[20] ^= 0xFF
+        errs = []
+        dec = SBFDecimator({"PVTGeodetic": 1})
+        res = list(
+            SBFReader(
+                BytesIO(bytes(raw) + self.frames[2]),
+                decimate=dec,
+                parsing=False,
+                errorhandler=errs.append,
+            )
+        )
+        self.assertEqual(len(res), 1)  # corrupt frame does not start decimation
+        self.assertEqual(len(errs), 1)
+        self.assertEqual(dec.kept, {4007: 1})
+
+    def testInvalid(self):
+        with self.assertRaisesRegex(ParameterError, "Invalid decimation interval 0"):
+            SBFDecimator({"PVTGeodetic": 0})
+        with self.assertRaisesRegex(ParameterError, "Unknown SBF block 'Nope'"):
+            SBFDecimator({"Nope": 1})
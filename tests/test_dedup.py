@@ -0,0 +1,107 @@
+"""
+Duplicate frame elimination tests for pysbf2
+
+Created on 19 Oct 2026
+
+*** NB: must be saved in UTF-8 format ***
+
+@author: semuadmin
+"""
+
+# pylint: disable=line-too-long, invalid-name, missing-docstring, no-member
+
+import os
+import unittest
+from io import BytesIO
+
+from pysbf2 import (
+    ParameterError,
+    SBFDeduplicator,
+    SBFMerger,
+    SBFMessage,
+    SBFReader,
+    crc2bytes,
+)
+
+DIRNAME = os.path.dirname(__file__)
+NMEA = b"$GNGLL,5327.04319,S,16239.22700,E,181128.00,A,A*6D\r\n"
+
+
+def _epochs(start: int, step: int, count: int) -> bytes:
+    # PVTGeodetic and ReceiverTime per epoch, with an NMEA sentence
+    templates = [
+        bytearray(SBFMessage("PVTGeodetic", revno=2, TOW=0, WNc=2300).serialize()),
+        bytearray(SBFMessage("ReceiverTime", TOW=0, WNc=2300).serialize()),
+    ]
+    data = bytearray()
+    for i in range(count):
+        for raw in templates:
+            raw[8:12] = (start + i * step).to_bytes(4, "little")
+            raw[2:4] = crc2bytes(raw[4:])
+            data += raw
+        data += NMEA
+    return bytes(data)
+
+
+class DedupTest(unittest.TestCase):
+    def setUp(self):
+        self.maxDiff = None
+
+    def tearDown(self):
+        pass
+
+    def testKeep(self):
+        frames = [raw for raw, _ in SBFReader(BytesIO(_epochs(0, 1000, 10)))]
+        dedup = SBFDeduplicator(window=5)
+        self.assertEqual([dedup.keep(raw, "tcp") for raw in frames], [True] * 30)
+        self.assertEqual(len(dedup), 12)  # 6 epochs within window
+        res = [dedup.keep(raw, "log") for raw in frames]
+        self.assertEqual(res[0:12], [True] * 12)  # outside window
+        self.assertEqual(res[12:], [False, False, True] * 6)  # NMEA always kept
+        self.assertEqual(dedup.unique, 28)  # SBF blocks only
+        self.assertEqual(dedup.duplicates, {"log": 12})
+        dedup = SBFDeduplicator(maxkeys=4)
+        for raw in frames:
+            dedup.keep(raw)
+        self.assertEqual(len(dedup), 4)
+        self.assertEqual([dedup.keep(raw) for raw in frames[-3:]], [False] * 2 + [True])
+        self.assertEqual(dedup.duplicates, {None: 2})
+        dedup.reset()
+        self.assertEqual((len(dedup), dedup.unique, dedup.duplicates), (0, 0, {}))
+        self.assertTrue(dedup.keep(frames[0]))
+
+    def testDistinct(self):
+        raw = bytearray(
+            SBFMessage("PVTGeodetic", revno=2, TOW=1000, WNc=2300).serialize()
+        )
+        dedup = SBFDeduplicator()
+        self.assertTrue(dedup.keep(bytes(raw)))
+        raw[20] ^= 0xFF  # same time, different content
+        raw[2:4] = crc2bytes(raw[4:])
+        self.assertTrue(dedup.keep(bytes(raw)))
+        raw[12:14] = (2301).to_bytes(2, "little")  # different week
+        self.assertTrue(dedup.keep(bytes(raw)))
+        self.assertFalse(dedup.keep(bytes(raw)))
+        dnu = SBFMessage("PVTGeodetic", revno=2, TOW=4294967295, WNc=2300).serialize()
+        self.assertTrue(dedup.keep(dnu))
+        self.assertTrue(dedup.keep(dnu))
+
+    def testMerge(self):
+        # internal log and TCP capture overlapping by 20 epochs
+        log = _epochs(0, 100, 60)
+        tcp = _epochs(4000, 100, 60)
+        dedup = SBFDeduplicator(window=1)
+        mrg = SBFMerger({"log": BytesIO(log), "tcp": BytesIO(tcp)}, dedup=dedup)
+        res = list(mrg)
+        expected = list(SBFReader(BytesIO(_epochs(0, 100, 100)), parsing=False))
+        sbf = [raw for _, raw, _ in res if raw[0:2] == b"$@"]
+        self.assertEqual(sbf, [raw for raw, _ in expected if raw[0:2] == b"$@"])
+        self.assertEqual(dedup.duplicates, {"tcp": 40})
+        self.assertEqual(mrg.counts, {"log": 180, "tcp": 140})  # NMEA kept
+        self.assertEqual(len(res), 320)
+
+    def testInvalid(self):
+        with self.assertRaisesRegex(ParameterError, "Invalid deduplication window 0"):
+            SBFDeduplicator(window=0)
+        with self.assertRaisesRegex(ParameterError, "Invalid deduplication maxkeys 0"):
+            SBFDeduplicator(maxkeys=0)
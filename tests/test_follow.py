@@ -0,0 +1,198 @@
+"""
+Tail-follow reader tests for pysbf2
+
+Created on 19 Oct 2026
+
+*** NB: must be saved in UTF-8 format ***
+
+@author: semuadmin
+"""
+
+# pylint: disable=line-too-long, invalid-name, missing-docstring, no-member
+
+import json
+import os
+import tempfile
+import unittest
+from threading import Timer
+from time import monotonic
+
+from pysbf2 import SBFFollower, SBFFollowStream, SBFMessage, crc2bytes
+
+NMEA = b"$GNGLL,5327.04319,S,16239.22700,E,181128.00,A,A*6D\r\n"
+
+
+def _epochs(start: int, count: int) -> bytes:
+    # PVTGeodetic (96 bytes) per epoch, with an NMEA sentence every 5 epochs
+    raw = bytearray(SBFMessage("PVTGeodetic", revno=2, TOW=0, WNc=2300).serialize())
+    data = bytearray()
+    for i in range(count):
+        raw[8:12] = (start + i * 1000).to_bytes(4, "little")
+        raw[2:4] = crc2bytes(raw[4:])
+        data += raw
+        if not (i + 1) % 5:
+            data += NMEA
+    return bytes(data)
+
+
+class FollowTest(unittest.TestCase):
+    def setUp(self):
+        self.maxDiff = None
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "log.sbf")
+        self.state = os.path.join(self.tmpdir.name, "log.state")
+        self.data = _epochs(0, 20)
+        self.errs = []
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _write(self, data: bytes, mode: str = "ab", path: str = None):
+        with open(path or self.path, mode) as stream:
+            stream.write(data)
+
+    def _follower(self, **kwargs) -> SBFFollower:
+        return SBFFollower(
+            self.path,
+            poll=0.01,
+            timeout=kwargs.pop("timeout", 0.2),
+            parsing=False,
+            errorhandler=self.errs.append,
+            **kwargs,
+        )
+
+    def testPartial(self):
+        # frames and NMEA sentences split across writes
+        self._write(self.data[0:150], "wb")
+        Timer(0.05, self._write, (self.data[150:500],)).start()
+        Timer(0.1, self._write, (self.data[500:],)).start()
+        with self._follower(timeout=0.5) as flw:
+            res = [raw for raw, _ in flw]
+            self.assertEqual(b"".join(res), self.data)
+            self.assertEqual(len(res), 24)
+            self.assertEqual(flw.offset, len(self.data))
+            self.assertEqual(flw.stream.offset, len(self.data))
+        self.assertEqual(self.errs, [])
+
+    def testTimeout(self):
+        self._write(self.data[0:150], "wb")
+        flw = self._follower(timeout=0.05)
+        self.assertEqual(len(list(flw)), 1)  # partial 2nd frame rewound
+        self.assertEqual((flw.offset, flw.stream.offset), (96, 96))
+        self._write(self.data[150:])
+        self.assertEqual(b"".join(raw for raw, _ in flw), self.data[96:])
+        flw.close()
+        self.assertEqual(self.errs, [])
+        with SBFFollowStream(
+            self.path, offset=len(self.data) - 10, timeout=0
+        ) as stream:
+            self.assertEqual(stream.read(20), b"")
+            self.assertEqual(stream.offset, len(self.data) - 10)
+            self.assertEqual(stream.readline(), NMEA[-10:])
+            self.assertEqual(stream.read(), b"")
+            self.assertEqual(stream.readline(), b"")
+            self._write(NMEA[0:10])
+            self.assertEqual(stream.readline(), b"")  # unterminated
+            self.assertEqual(stream.readline(5), NMEA[0:5])
+            self.assertEqual(stream.read(), NMEA[5:10])
+
+    def testResume(self):
+        self._write(self.data, "wb")
+        with self._follower(statefile=self.state) as flw:
+            self.assertIsNone(flw.committed)
+            for _ in range(7):
+                flw.read()
+            flw.commit()
+            self.assertEqual(flw.committed, 6 * 96 + len(NMEA))
+            flw.read()  # read but not committed
+        with open(self.state, encoding="utf-8") as stream:
+            state = json.load(stream)
+        self.assertEqual((state["path"], state["offset"]), (self.path, flw.committed))
+        with self._follower(statefile=self.state) as flw:
+            self.assertEqual(flw.committed, 6 * 96 + len(NMEA))
+            res = b"".join(raw for raw, _ in flw)
+            self.assertEqual(res, self.data[flw.committed :])
+            flw.commit()
+        with self._follower(statefile=self.state) as flw:  # nothing more
+            self.assertEqual(list(flw), [])
+        self._write(self.data[0:200], "wb")  # truncated since commit
+        with self._follower(statefile=self.state) as flw:
+            self.assertEqual(len(list(flw)), 2)
+        with self._follower(fromend=True) as flw:  # no state
+            self.assertEqual(flw.offset, 200)
+        flw = SBFFollower(self.path, timeout=0)  # commit without state file
+        flw.commit()
+        self.assertEqual(flw.committed, 0)
+        flw.close()
+
+    def testRotation(self):
+        self._write(self.data[0:300], "wb")
+        new = _epochs(100000, 3)
+
+        def rotate():
+            self._write(self.data[300:])  # written before rotation
+            os.rename(self.path, self.path + ".1")
+            Timer(0.05, self._write, (new, "wb")).start()
+
+        Timer(0.05, rotate).start()
+        with self._follower(statefile=self.state, timeout=0.5) as flw:
+            res = [raw for raw, _ in flw]
+            self.assertEqual(b"".join(res), self.data + new)
+            self.assertEqual((flw.stream.rotations, flw.offset), (1, len(new)))
+            flw.commit()
+        with open(self.state, encoding="utf-8") as stream:
+            self.assertEqual(json.load(stream)["offset"], len(new))
+        self.assertEqual(self.errs, [])
+
+    def testRotationPartial(self):
+        # old file ends mid frame, rotated while waiting
+        self._write(self.data[0:150], "wb")
+        new = _epochs(100000, 2)
+
+        def rotate():
+            os.rename(self.path, self.path + ".1")
+            self._write(new, "wb")
+
+        Timer(0.05, rotate).start()
+        with self._follower(timeout=0.3) as flw:
+            res = [raw for raw, _ in flw]
+            self.assertEqual(res[0], self.data[0:96])
+            self.assertEqual(res[-2:], [new[0:96], new[96:]])
+            self.assertEqual(flw.stream.generation, 1)
+        self.assertEqual(len(self.errs), 1)  # old file truncated mid frame
+        flw = self._follower(timeout=0.05)
+        self.assertEqual(len(list(flw)), 2)
+        os.rename(self.path, self.path + ".2")
+        self._write(new[0:50], "wb")
+        self.assertEqual(flw.read(), (None, None))  # partial in new file
+        self.assertEqual(flw.offset, 0)
+        flw.close()
+
+    def testStreamRotation(self):
+        self._write(NMEA[0:10], "wb")
+        with SBFFollowStream(self.path, poll=0.01, timeout=0.3) as stream:
+            Timer(0.05, os.rename, (self.path, self.path + ".1")).start()
+            Timer(0.1, self._write, (NMEA, "wb")).start()
+            self.assertEqual(stream.readline(), NMEA[0:10])  # old file ended mid line
+            self.assertEqual(stream.readline(), NMEA)
+            self.assertEqual(stream.rotations, 1)
+
+    def testTruncation(self):
+        self._write(self.data, "wb")
+        new = _epochs(100000, 2)
+        with self._follower(timeout=0.3) as flw:
+            res = [flw.read()[0] for _ in range(24)]
+            Timer(0.05, self._write, (new, "wb")).start()
+            res += [raw for raw, _ in flw]
+            self.assertEqual(b"".join(res), self.data + new)
+            self.assertEqual(flw.stream.truncations, 1)
+            self.assertEqual(flw.offset, len(new))
+
+    def testStop(self):
+        self._write(self.data, "wb")
+        flw = self._follower(timeout=None)
+        Timer(0.1, flw.stop).start()
+        start = monotonic()
+        self.assertEqual(len(list(flw)), 24)
+        self.assertLess(monotonic() - start, 2)
+        flw.close()
@@ -0,0 +1,185 @@
+"""
+Scanning, indexing and time seek tests for pysbf2
+
+Created on 19 Oct 2026
+
+*** NB: must be saved in UTF-8 format ***
+
+@author: semuadmin
+"""
+
+# pylint: disable=line-too-long, invalid-name, missing-docstring, no-member
+
+import os
+import tempfile
+import unittest
+from io import BytesIO
+
+from pysbf2 import (
+    WEEK_MS,
+    SBFIndex,
+    SBFMessage,
+    SBFReader,
+    SBFScanner,
+    SBFStreamError,
+    bisect_time,
+    crc2bytes,
+    index_path,
+)
+
+DIRNAME = os.path.dirname(__file__)
+NMEA = b"$GNGLL,5327.04319,S,16239.22700,E,181128.00,A,A*6D\r\n"
+
+
+def _epochs(wnc: int, start: int, step: int, count: int) -> bytes:
+    # PVTGeodetic and ReceiverTime per epoch, with an NMEA sentence every 10 epochs
+    templates = [
+        bytearray(SBFMessage("PVTGeodetic", revno=2, TOW=0).serialize()),
+        bytearray(SBFMessage("ReceiverTime", TOW=0).serialize()),
+    ]
+    data = bytearray()
+    for i in range(count):
+        for raw in templates:
+            raw[8:12] = (start + i * step).to_bytes(4, "little")
+            raw[12:14] = wnc.to_bytes(2, "little")
+            raw[2:4] = crc2bytes(raw[4:])
+            data += raw
+        if not i % 10:
+            data += NMEA
+    return bytes(data)
+
+
+class CountingStream(BytesIO):  # counts bytes read
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self.bytesread = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.bytesread += len(data)
+        return data
+
+
+class NoSeek:  # non-seekable stream
+    def read(self, size):
+        return b""
+
+
+class IndexTest(unittest.TestCase):
+    def setUp(self):
+        self.maxDiff = None
+        # 1 hour at 20 Hz
+        self.data = _epochs(2300, 3600000, 50, 72000)
+
+    def tearDown(self):
+        pass
+
+    def _times(self, rdr: SBFReader) -> list:
+        return [p.TOW for _, p in rdr if p.identity == "PVTGeodetic"]
+
+    def testScanner(self):
+        with open(os.path.join(DIRNAME, "pygpsdata_mixed.log"), "rb") as stream:
+            data = stream.read()
+        scanner = SBFScanner(BytesIO(data), bufsize=16)
+        frames = list(scanner)
+        self.assertEqual(len(frames), 2)
+        self.assertEqual(
+            frames,
+            [
+                (data.find(raw), raw)
+                for raw, _ in SBFReader(BytesIO(data))
+                if raw[0:2] == b"$@"
+            ],
+        )
+        self.assertEqual(scanner.garbage, len(data) - sum(len(r) for _, r in frames))
+        bad = bytearray(data)
+        bad[frames[0][0] + 20] ^= 0xFF
+        bad[frames[1][0] + 6] ^= 0xFF  # corrupt length
+        scanner = SBFScanner(BytesIO(bytes(bad) + b"$@\x00\x00\xa7\x0f`\x00\x00"))
+        self.assertEqual(list(scanner), [])
+        self.assertEqual(scanner.crcerrors, 1)
+        self.assertEqual(scanner.errors, 2)  # bad length, truncated
+        self.assertEqual(scanner.garbage, len(bad) + 9)
+        stream = BytesIO(data)
+        stream.seek(frames[1][0] - 3)
+        self.assertEqual(next(SBFScanner(stream))[0], 3)  # relative to current position
+        self.assertIsNone(SBFScanner(BytesIO(NMEA)).next_timed())
+
+    def testIndex(self):
+        index = SBFIndex.build(BytesIO(self.data))
+        self.assertEqual(len(index), 72000)
+        self.assertEqual(index.times[0], 2300 * WEEK_MS + 3600000)
+        self.assertEqual(index.offsets[0:3], [0, 172, 292])  # 2 blocks, + NMEA every 10
+        self.assertEqual(index.find(2300 * WEEK_MS + 3600025), 172)
+        self.assertIsNone(index.find(2301 * WEEK_MS))
+        with tempfile.TemporaryDirectory() as tmpdir:
+            idx = os.path.join(tmpdir, "test.idx")
+            index.save(idx)
+            self.assertEqual(os.path.getsize(idx), 8 + 72000 * 16)
+            loaded = SBFIndex.load(idx)
+            self.assertEqual(loaded.times, index.times)
+            self.assertEqual(loaded.offsets, index.offsets)
+            with open(idx, "ab") as stream:
+                stream.write(b"\x00")
+            with self.assertRaisesRegex(SBFStreamError, "Invalid SBF index file"):
+                SBFIndex.load(idx)
+
+    def testBisect(self):
+        stream = CountingStream(self.data)
+        rdr = SBFReader(stream)
+        offset = rdr.seek_time(2300, 5400000, end=(2300, 5460000))
+        self.assertEqual(
+            offset, bisect_time(BytesIO(self.data), 2300 * WEEK_MS + 5400000)
+        )
+        self.assertLess(stream.bytesread, len(self.data) // 100)  # no linear scan
+        tows = self._times(rdr)
+        self.assertEqual(len(tows), 1201)  # 1 minute at 20 Hz, inclusive
+        self.assertEqual((tows[0], tows[-1]), (5400000, 5460000))
+        self.assertEqual(rdr.read(), (None, None))
+        rdr.seek_time(2300, 7000010)  # between epochs
+        self.assertEqual(rdr.read()[1].TOW, 7000050)
+        self.assertEqual(len(self._times(rdr)), 3998)  # to end of file
+        self.assertEqual(rdr.seek_time(2300, 0), 0)
+        self.assertEqual(rdr.seek_time(2301, 0), len(self.data))
+        self.assertEqual(rdr.read(), (None, None))
+
+    def testSidecar(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            sbf = os.path.join(tmpdir, "test.sbf")
+            with open(sbf, "wb") as stream:
+                stream.write(self.data)
+            index = SBFIndex.build(BytesIO(self.data))
+            with open(sbf, "rb") as stream:
+                rdr = SBFReader(stream)
+                offset = rdr.seek_time(2300, 5400000, end=(2300, 5400100), index=index)
+                self.assertEqual(len(self._times(rdr)), 3)
+            index.offsets = [
+                o + 1 for o in index.offsets
+            ]  # distinguishable from bisection
+            index.save(index_path(sbf))
+            with open(sbf, "rb") as stream:
+                rdr = SBFReader(stream)
+                self.assertEqual(rdr.seek_time(2300, 5400000), offset + 1)
+                parsed = rdr.read()[1]  # resynchronised after PVTGeodetic
+                self.assertEqual(
+                    (parsed.identity, parsed.TOW), ("ReceiverTime", 5400000)
+                )
+                self.assertEqual(rdr.seek_time(2301, 0), len(self.data))
+
+    def testWindowEndCRC(self):
+        data = bytearray(_epochs(2300, 1000, 1000, 3))
+        data[172 + 20] ^= 0xFF  # corrupt second epoch PVTGeodetic
+        errs = []
+        rdr = SBFReader(BytesIO(bytes(data)), errorhandler=errs.append)
+        rdr.seek_time(2300, 0, end=(2300, 1000))
+        res = list(rdr)
+        self.assertEqual(
+            [p.identity for _, p in res], ["PVTGeodetic", "ReceiverTime", "GNGLL"]
+        )
+        self.assertEqual(len(errs), 1)  # corrupt block does not end window
+
+    def testNotSeekable(self):
+        with self.assertRaisesRegex(
+            SBFStreamError, "seek_time requires a seekable stream, not NoSeek"
+        ):
+            SBFReader(NoSeek()).seek_time(2300, 0)
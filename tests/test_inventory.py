@@ -0,0 +1,158 @@
+"""
+Inventory scan tests for pysbf2
+
+Created on 19 Oct 2026
+
+*** NB: must be saved in UTF-8 format ***
+
+@author: semuadmin
+"""
+
+# pylint: disable=line-too-long, invalid-name, missing-docstring, no-member
+
+import gzip
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+
+from pysbf2 import SBFMessage, crc2bytes, sbf_inventory
+from pysbf2.sbfinventory import main
+
+DIRNAME = os.path.dirname(__file__)
+NMEA = b"$GNGLL,5327.04319,S,16239.22700,E,181128.00,A,A*6D\r\n"
+DNU = SBFMessage("PVTGeodetic", revno=2, TOW=4294967295, WNc=2300).serialize()
+
+
+def _epochs(start: int, count: int) -> bytes:
+    # PVTGeodetic at 10 Hz, ReceiverTime at 1 Hz, NMEA at 1 Hz
+    pvt = bytearray(SBFMessage("PVTGeodetic", revno=2, TOW=0, WNc=2300).serialize())
+    rxt = bytearray(SBFMessage("ReceiverTime", TOW=0, WNc=2300).serialize())
+    data = bytearray()
+    for i in range(count):
+        tow = start + i * 100
+        for raw in (pvt, rxt) if not tow % 1000 else (pvt,):
+            raw[8:12] = tow.to_bytes(4, "little")
+            raw[2:4] = crc2bytes(raw[4:])
+            data += raw
+        if not tow % 1000:
+            data += NMEA
+    return bytes(data)
+
+
+class InventoryTest(unittest.TestCase):
+    def setUp(self):
+        self.maxDiff = None
+        self.tmpdir = tempfile.TemporaryDirectory()
+        # 60 s at 10 Hz, 5 s gap, 30 s at 10 Hz
+        self.data = bytearray(_epochs(1000000, 600) + _epochs(1065000, 300))
+        self.data[96 * 5 + 20] ^= 0xFF  # CRC failure in 6th PVTGeodetic
+        self.path = os.path.join(self.tmpdir.name, "test.sbf")
+        with open(self.path, "wb") as stream:
+            stream.write(self.data)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def testInventory(self):
+        inv = sbf_inventory(self.path, bufsize=1000)
+        self.assertEqual(inv["bytes"], len(self.data))
+        self.assertEqual(inv["frames"], 899 + 90)
+        self.assertEqual(inv["first"], (2300, 1000000))
+        self.assertEqual(inv["last"], (2300, 1094900))
+        self.assertEqual(inv["duration"], 94.9)
+        self.assertEqual(inv["rate"], 10)
+        self.assertEqual(
+            inv["blocks"],
+            {
+                "PVTGeodetic": {
+                    "number": 4007,
+                    "count": 899,
+                    "first": (2300, 1000000),
+                    "last": (2300, 1094900),
+                    "rate": 10,
+                },
+                "ReceiverTime": {
+                    "number": 5914,
+                    "count": 90,
+                    "first": (2300, 1000000),
+                    "last": (2300, 1094000),
+                    "rate": 1,
+                },
+            },
+        )
+        self.assertEqual(
+            inv["gaps"],
+            [{"start": (2300, 1059900), "end": (2300, 1065000), "duration": 5.1}],
+        )
+        self.assertEqual(inv["crcerrors"], 1)
+        self.assertEqual(inv["errors"], 0)
+        self.assertEqual(inv["garbage"], 96 + 90 * len(NMEA))
+        inv = sbf_inventory(self.path, gap=10, validate=0)
+        self.assertEqual((inv["frames"], inv["gaps"], inv["crcerrors"]), (990, [], 0))
+
+    def testUntimed(self):
+        gzpath = os.path.join(self.tmpdir.name, "test.sbf.gz")
+        with open(gzpath, "wb") as stream:
+            stream.write(gzip.compress(NMEA + DNU))
+        inv = sbf_inventory(gzpath)
+        self.assertEqual(
+            inv,
+            {
+                "path": gzpath,
+                "bytes": len(NMEA) + 96,
+                "frames": 1,
+                "first": None,
+                "last": None,
+                "duration": None,
+                "rate": None,
+                "blocks": {
+                    "PVTGeodetic": {
+                        "number": 4007,
+                        "count": 1,
+                        "first": None,
+                        "last": None,
+                        "rate": None,
+                    }
+                },
+                "gaps": [],
+                "crcerrors": 0,
+                "errors": 0,
+                "garbage": len(NMEA),
+            },
+        )
+
+    def testCLI(self):
+        out = StringIO()
+        with redirect_stdout(out):
+            main([self.path, os.path.join(DIRNAME, "pygpsdata_mixed.log")])
+        lines = out.getvalue().splitlines()
+        self.assertEqual(
+            lines[0], f"{self.path}: {len(self.data):,} bytes, 989 SBF blocks"
+        )
+        self.assertEqual(
+            lines[1],
+            "  time 2300:1000.000 to 2300:1094.900 (94.900 s), epoch rate 10 Hz",
+        )
+        self.assertEqual(
+            lines[2], "  PVTGeodetic (4007): 899, 2300:1000.000 to 2300:1094.900, 10 Hz"
+        )
+        self.assertEqual(
+            lines[4:6], ["  gaps: 1", "    2300:1059.900 to 2300:1065.000 (5.100 s)"]
+        )
+        self.assertEqual(
+            lines[6],
+            f"  CRC failures: 1, length errors: 0, garbage: {96 + 90 * len(NMEA):,} bytes",
+        )
+        self.assertEqual(
+            lines[8],
+            "  time 2367:482847.000 to 2367:482847.000 (0.000 s), epoch rate -",
+        )
+        out = StringIO()
+        with redirect_stdout(out):
+            main([self.path, "--format", "json", "--gap", "10", "--novalidate"])
+        inv = json.loads(out.getvalue())
+        self.assertEqual(len(inv), 1)
+        self.assertEqual((inv[0]["frames"], inv[0]["first"]), (990, [2300, 1000000]))
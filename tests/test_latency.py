@@ -0,0 +1,163 @@
+"""
+Low-latency reader tests for pysbf2
+
+Created on 19 Oct 2026
+
+*** NB: must be saved in UTF-8 format ***
+
+@author: semuadmin
+"""
+
+# pylint: disable=line-too-long, invalid-name, missing-docstring, no-member
+
+import os
+import socket
+import unittest
+from io import BytesIO
+from threading import Timer
+from time import monotonic
+
+from pysbf2 import (
+    ERR_RAISE,
+    SBFLatencyHistogram,
+    SBFLatencyReader,
+    SBFParseError,
+)
+
+DIRNAME = os.path.dirname(__file__)
+BADNMEA = b"$GNGLL,3203.94995,N,03446.42914,E,084158.00,A,D*78\r\n"
+
+
+def _load(*names) -> bytes:
+    data = b""
+    for name in names:
+        with open(os.path.join(DIRNAME, name), "rb") as stream:
+            data += stream.read()
+    return data
+
+
+class DummySerial:  # minimal serial port stand-in
+    def __init__(self, data: bytes):
+        self._stream = BytesIO(data)
+        self.reads = []
+
+    @property
+    def in_waiting(self) -> int:
+        return len(self._stream.getbuffer()) - self._stream.tell()
+
+    def read(self, size: int) -> bytes:
+        self.reads.append(size)
+        return self._stream.read(size)
+
+
+class LatencyTest(unittest.TestCase):
+    def setUp(self):
+        self.maxDiff = None
+        self.data = _load("pygpsdata_x5_pvtgeod.log", "pygpsdata_x5_attitude.log")
+
+    def tearDown(self):
+        pass
+
+    def testHistogram(self):
+        hist = SBFLatencyHistogram((0.001, 0.01))
+        self.assertIsNone(hist.percentile(50))
+        self.assertIsNone(hist.mean)
+        for val in (0.0005, 0.0005, 0.002, 0.005, 0.5):
+            hist.add(val)
+        self.assertEqual(hist.bins, [(0.001, 2), (0.01, 2), (None, 1)])
+        self.assertEqual(hist.percentile(40), 0.001)
+        self.assertEqual(hist.percentile(50), 0.01)
+        self.assertEqual(hist.percentile(99), 0.5)
+        self.assertAlmostEqual(hist.mean, 0.1016)
+        self.assertEqual(
+            hist.summary(),
+            {
+                "count": 5,
+                "mean": hist.mean,
+                "min": 0.0005,
+                "max": 0.5,
+                "p50": 0.01,
+                "p99": 0.5,
+            },
+        )
+        self.assertIn("SBFLatencyHistogram({'count': 5,", repr(hist))
+
+    def testDispatch(self):
+        res = []
+        callbacks = {
+            "PVTGeodetic": lambda *args: res.append(args),
+            5938: lambda *args: res.append(args),
+        }
+        rdr = SBFLatencyReader(BytesIO(self.data * 2), callbacks=callbacks)
+        self.assertEqual(rdr.run(), 4)
+        self.assertEqual(
+            [p.identity for _, p, _ in res], ["PVTGeodetic", "AttEuler"] * 2
+        )
+        self.assertLessEqual(res[0][2], monotonic())
+        self.assertEqual(
+            sorted(rdr.latency), ["AttEuler", "PVTGeodetic"]
+        )  # others not parsed
+        self.assertEqual(rdr.latency["PVTGeodetic"].count, 2)
+        self.assertAlmostEqual(rdr.rxlatency["PVTGeodetic"].min, 0.0055)
+        summary = rdr.summary()
+        self.assertEqual(summary["PVTGeodetic"]["receiver"]["p50"], 0.01)
+        self.assertIsNone(summary["AttEuler"]["receiver"])
+        rdr = SBFLatencyReader(
+            BytesIO(self.data), callbacks=callbacks, default=lambda *args: None
+        )
+        self.assertEqual(rdr.run(limit=6), 6)
+        self.assertEqual(rdr.run(), 2)
+
+    def testIterator(self):
+        rdr = SBFLatencyReader(
+            BytesIO(_load("pygpsdata_x5pvt.log", "pygpsdata_mixed.log"))
+        )
+        ids = [p.identity for _, p, _ in rdr]
+        self.assertEqual(len(ids), 70)
+        self.assertEqual(rdr.rxlatency["PVTCartesian"].count, 16)
+        self.assertEqual(rdr.rxlatency["PVTGeodetic"].count, 1)
+        self.assertEqual(rdr.latency["NMEA"].count, 2)
+        self.assertEqual(rdr.latency["RTCM3"].count, 2)
+        rdr = SBFLatencyReader(BytesIO(self.data), parsing=False)
+        self.assertEqual([p for _, p, _ in rdr], [None] * 8)
+        self.assertEqual(rdr.rxlatency, {})
+
+    def testSocket(self):  # frame is stamped when its last byte arrives
+        rxend, txend = socket.socketpair()
+        try:
+            rdr = SBFLatencyReader(rxend)
+            txend.sendall(self.data[0:50])
+            timer = Timer(0.05, txend.sendall, (self.data[50:],))
+            start = monotonic()
+            timer.start()
+            raw, parsed, arrival = rdr.read()
+            self.assertGreaterEqual(arrival - start, 0.04)
+            self.assertEqual(parsed.identity, "PVTGeodetic")
+            rxend.settimeout(0.01)
+            self.assertEqual(len([rdr.read() for _ in range(7)]), 7)
+            Timer(0.05, rdr.stop).start()
+            self.assertEqual(rdr.read(), (None, None, None))  # timed out and stopped
+        finally:
+            rxend.close()
+            txend.close()
+
+    def testSerial(self):
+        serial = DummySerial(self.data)
+        rdr = SBFLatencyReader(serial, parsing=False)
+        rdr.stop()  # stop when port next times out
+        self.assertEqual(len(list(rdr)), 8)
+        self.assertEqual(serial.reads[0], len(self.data))
+
+    def testErrors(self):
+        errors = []
+        rdr = SBFLatencyReader(BytesIO(BADNMEA + self.data), errorhandler=errors.append)
+        self.assertIsNone(rdr.read()[1])
+        self.assertEqual(len(errors), 1)
+        rdr = SBFLatencyReader(BytesIO(BADNMEA))
+        with self.assertLogs("pysbf2.sbflatency", "ERROR"):
+            rdr.read()
+        rdr = SBFLatencyReader(BytesIO(BADNMEA), quitonerror=0)
+        self.assertEqual(rdr.read()[0], BADNMEA)
+        rdr = SBFLatencyReader(BytesIO(BADNMEA), quitonerror=ERR_RAISE)
+        with self.assertRaises(Exception):
+            rdr.read()
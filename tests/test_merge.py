@@ -0,0 +1,123 @@
+"""
+Streaming time merge tests for pysbf2
+
+Created on 19 Oct 2026
+
+*** NB: must be saved in UTF-8 format ***
+
+@author: semuadmin
+"""
+
+# pylint: disable=line-too-long, invalid-name, missing-docstring, no-member
+
+import gzip
+import os
+import tempfile
+import unittest
+from io import BytesIO
+
+from pysbf2 import (
+    ERR_RAISE,
+    SBFMerger,
+    SBFMessage,
+    SBFMessageError,
+    SBFReader,
+    crc2bytes,
+    frame_time,
+)
+
+DIRNAME = os.path.dirname(__file__)
+NMEA = b"$GNGLL,5327.04319,S,16239.22700,E,181128.00,A,A*6D\r\n"
+
+
+def _epochs(start: int, step: int, count: int, nmea: bool = False) -> bytes:
+    raw = bytearray(SBFMessage("PVTGeodetic", revno=2, TOW=0, WNc=2300).serialize())
+    data = bytearray()
+    for i in range(count):
+        raw[8:12] = (start + i * step).to_bytes(4, "little")
+        raw[2:4] = crc2bytes(raw[4:])
+        data += raw
+        if nmea:
+            data += NMEA
+    return bytes(data)
+
+
+class MergeTest(unittest.TestCase):
+    def setUp(self):
+        self.maxDiff = None
+
+    def tearDown(self):
+        pass
+
+    def testMerge(self):
+        sources = {
+            "rx1": BytesIO(_epochs(1000, 1000, 10)),  # 1 Hz
+            "rx2": BytesIO(_epochs(1500, 500, 20, True)),  # 2 Hz, with NMEA
+            "rx3": BytesIO(b""),
+        }
+        with SBFMerger(sources) as mrg:
+            res = list(mrg)
+        self.assertEqual(len(res), 50)
+        self.assertEqual(mrg.counts, {"rx1": 10, "rx2": 40, "rx3": 0})
+        times = [frame_time(raw) for _, raw, _ in res if raw[0:2] == b"$@"]
+        self.assertEqual(times, sorted(times))
+        # NMEA stays with preceding block from same source
+        for i, (src, raw, parsed) in enumerate(res):
+            self.assertIsNone(parsed)
+            if raw == NMEA:
+                self.assertEqual(src, "rx2")
+                self.assertEqual(res[i - 1][0], "rx2")
+        # equal times in source order
+        self.assertEqual(
+            [s for s, _, _ in res[0:5]], ["rx1", "rx2", "rx2", "rx1", "rx2"]
+        )
+        self.assertEqual(frame_time(res[3][1]), frame_time(res[4][1]))
+
+    def testOverlap(self):
+        # consecutive files which overlap, from paths and readers
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path1 = os.path.join(tmpdir, "hour1.sbf")
+            path2 = os.path.join(tmpdir, "hour2.sbf.gz")
+            with open(path1, "wb") as stream:
+                stream.write(_epochs(0, 100, 60))
+            with open(path2, "wb") as stream:
+                stream.write(gzip.compress(_epochs(5000, 100, 60)))
+            rdr = SBFReader(BytesIO(_epochs(50, 100, 3)), parsing=False)
+            with SBFMerger([path1, path2, rdr], parsing=True) as mrg:
+                res = list(mrg)
+        self.assertEqual(mrg.counts, {0: 60, 1: 60, 2: 3})
+        tows = [p.TOW for _, _, p in res]
+        self.assertEqual(tows, sorted(tows))
+        self.assertEqual(tows[0:6], [0, 50, 100, 150, 200, 250])
+        self.assertEqual([s for s, _, _ in res[53:55]], [0, 1])  # both at 5000
+        self.assertEqual(mrg.read(), (None, None, None))
+
+    def testParseErrors(self):
+        with open(os.path.join(DIRNAME, "pygpsdata_x5_pvtgeod.log"), "rb") as stream:
+            data = stream.read()
+        errs = []
+        mrg = SBFMerger(
+            [BytesIO(data), BytesIO(_epochs(0, 1000, 2))],
+            parsing=True,
+            errorhandler=errs.append,
+        )
+        res = list(mrg)
+        self.assertEqual(len(res), 7)
+        self.assertEqual([s for s, _, _ in res[0:2]], [1, 1])  # earlier WNc
+        self.assertTrue(all(p is not None for _, _, p in res))
+        bad = bytearray(_epochs(0, 1000, 2))
+        bad[20] ^= 0xFF
+
+        def rdr():  # invalid frames passed by source reader, rejected by parser
+            return SBFReader(BytesIO(bytes(bad)), parsing=False, validate=0)
+
+        mrg = SBFMerger([rdr()], parsing=True, errorhandler=errs.append)
+        res = list(mrg)
+        self.assertIsNone(res[0][2])
+        self.assertEqual(len(errs), 1)
+        mrg = SBFMerger([rdr()], parsing=True, quitonerror=ERR_RAISE)
+        with self.assertRaisesRegex(SBFMessageError, "Invalid CRC"):
+            mrg.read()
+        mrg = SBFMerger([rdr()], parsing=True)
+        with self.assertLogs(level="ERROR"):
+            mrg.read()
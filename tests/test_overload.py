@@ -0,0 +1,179 @@
+"""
+Load-shedding overload policy tests for pysbf2
+
+Created on 19 Oct 2026
+
+*** NB: must be saved in UTF-8 format ***
+
+@author: semuadmin
+"""
+
+# pylint: disable=line-too-long, invalid-name, missing-docstring, no-member
+
+import fcntl
+import os
+import socket
+import termios
+import unittest
+from io import BytesIO
+
+from pysbf2 import (
+    DECODE,
+    LOWPRIORITY_BLOCKS,
+    OVERLOAD_DECIMATE,
+    PRIORITY_BLOCKS,
+    SHED_DROP,
+    SHED_UNDECODED,
+    ParameterError,
+    SBFOverloadPolicy,
+    SBFReader,
+)
+
+DIRNAME = os.path.dirname(__file__)
+
+
+def _load(*names) -> bytes:
+    data = b""
+    for name in names:
+        with open(os.path.join(DIRNAME, name), "rb") as stream:
+            data += stream.read()
+    return data
+
+
+class DummySerial(BytesIO):  # serial port stand-in with in_waiting attribute
+    @property
+    def in_waiting(self) -> int:
+        return len(self.getbuffer()) - self.tell()
+
+
+class OverloadTest(unittest.TestCase):
+    def setUp(self):
+        self.maxDiff = None
+        self.data = _load(
+            "pygpsdata_x5_pvtgeod.log",
+            "pygpsdata_x5_attitude.log",
+            "pygpsdata_x5_status.log",
+            "pygpsdata_x5_rawnav.log",
+            "pygpsdata_mixed.log",
+        )
+        self.backlog = 0
+
+    def tearDown(self):
+        pass
+
+    def testDefaults(self):
+        self.assertEqual(len(PRIORITY_BLOCKS), 10)
+        self.assertIn(4007, PRIORITY_BLOCKS)  # PVTGeodetic
+        self.assertIn(5938, PRIORITY_BLOCKS)  # AttEuler
+        self.assertNotIn(5939, PRIORITY_BLOCKS)  # AttCovEuler
+        self.assertIn(4013, LOWPRIORITY_BLOCKS)  # ChannelStatus
+        self.assertIn(4017, LOWPRIORITY_BLOCKS)  # GPSRawCA
+
+    def testHysteresis(self):
+        policy = SBFOverloadPolicy(1000, backlog=lambda: self.backlog)
+        for backlog, overloaded in (
+            (500, False),
+            (1001, True),
+            (600, True),
+            (500, False),
+            (900, False),
+            (2000, True),
+        ):
+            self.backlog = backlog
+            action = policy.action(4013)
+            self.assertEqual(policy.overloaded, overloaded)
+            self.assertEqual(action, SHED_UNDECODED if overloaded else DECODE)
+            self.assertEqual(policy.action(4007), DECODE)
+        self.assertEqual(policy.overloads, 2)
+        self.assertEqual(policy.undecoded, 3)
+        self.assertEqual(policy.shed, {4013: 3})
+
+    def testPassthrough(self):
+        self.backlog = 2000
+        policy = SBFOverloadPolicy(1000, backlog=lambda: self.backlog)
+        res = list(SBFReader(BytesIO(self.data), overload=policy))
+        self.assertEqual(len(res), 35)
+        decoded = [p.identity for _, p in res if p is not None]
+        self.assertEqual(decoded, ["PVTGeodetic", "AttEuler", "PVTGeodetic"])
+        self.assertEqual(policy.undecoded, 32)
+        self.assertEqual(policy.shed[None], 4)  # NMEA and RTCM3
+        self.assertEqual(policy.dropped, 0)
+        self.backlog = 0
+        res = list(SBFReader(BytesIO(self.data), overload=policy))
+        self.assertTrue(all(p is not None for _, p in res))
+        self.assertEqual(policy.undecoded, 32)
+
+    def testDecimate(self):
+        self.backlog = 2000
+        policy = SBFOverloadPolicy(
+            1000, mode=OVERLOAD_DECIMATE, decimation=3, backlog=lambda: self.backlog
+        )
+        res = list(SBFReader(BytesIO(self.data * 3), overload=policy))
+        ids = [p.identity for _, p in res]
+        self.assertEqual(ids.count("ChannelStatus"), 1)
+        self.assertEqual(ids.count("GPSRawCA"), 1)
+        self.assertEqual(ids.count("PVTGeodetic"), 6)
+        self.assertEqual(ids.count("InputLink"), 3)
+        self.assertEqual(ids.count("GNGLL"), 3)
+        self.assertEqual(policy.dropped, 20)
+        self.assertEqual(policy.shed[4013], 2)
+        self.assertEqual(policy.action(4013), DECODE)  # one in three
+        self.assertEqual(policy.action(4013), SHED_DROP)
+        policy = SBFOverloadPolicy(
+            1000,
+            mode=OVERLOAD_DECIMATE,
+            priority=["ChannelStatus"],
+            lowpriority=["PVTGeodetic"],
+            backlog=lambda: self.backlog,
+        )
+        res = list(SBFReader(BytesIO(self.data * 3), overload=policy))
+        ids = [p.identity for _, p in res]
+        self.assertEqual(ids.count("ChannelStatus"), 3)
+        self.assertEqual(ids.count("PVTGeodetic"), 1)
+
+    def testBacklog(self):
+        stream = DummySerial(self.data)
+        policy = SBFOverloadPolicy(len(self.data) - 200)
+        res = list(SBFReader(stream, overload=policy))
+        self.assertIsNone(res[2][1])  # overloaded until backlog below low watermark
+        self.assertIsNotNone(res[-1][1])
+        self.assertEqual(policy.overloads, 1)
+
+    def testBacklogSocket(self):
+        def queued() -> int:  # bytes queued on socket, not yet read
+            return int.from_bytes(
+                fcntl.ioctl(rxend, termios.FIONREAD, bytes(4)), "little"
+            )
+
+        rxend, txend = socket.socketpair()
+        try:
+            txend.sendall(self.data * 20)  # more than SocketWrapper buffers
+            with self.assertRaisesRegex(
+                ParameterError, "requires a backlog function for socket streams"
+            ):  # consumes first copy of data
+                SBFReader(
+                    rxend, overload=SBFOverloadPolicy(100), bufsize=len(self.data)
+                )
+            policy = SBFOverloadPolicy(len(self.data) * 10, backlog=queued)
+            rdr = SBFReader(rxend, overload=policy, bufsize=len(self.data))
+            self.assertIsNotNone(rdr.read()[1])  # PVTGeodetic is priority
+            self.assertIsNone(rdr.read()[1])  # overloaded
+            self.assertEqual(policy.overloads, 1)
+            txend.close()
+            res = list(rdr)
+            self.assertIsNotNone(res[-1][1])  # backlog cleared
+        finally:
+            rxend.close()
+            txend.close()
+
+    def testInvalid(self):
+        with self.assertRaisesRegex(
+            ParameterError, "requires a backlog function for stream BytesIO"
+        ):
+            SBFReader(BytesIO(self.data), overload=SBFOverloadPolicy(1000))
+        with self.assertRaisesRegex(ParameterError, "Invalid overload mode 3"):
+            SBFOverloadPolicy(1000, mode=3)
+        with self.assertRaisesRegex(ParameterError, "Invalid decimation 0"):
+            SBFOverloadPolicy(1000, decimation=0)
+        with self.assertRaisesRegex(ParameterError, "Unknown SBF block 'Nope'"):
+            SBFOverloadPolicy(1000, priority=["Nope"])
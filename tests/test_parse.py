@@ -11,9 +11,13 @@ Created on 19 May 2025
 # pylint: disable=line-too-long, invalid-name, missing-docstring, no-member
 
 import os
+import pickle
 import unittest
 from io import BytesIO
 
+from pynmeagps import NMEAParseError
+from pyrtcm import RTCMParseError, calc_crc24q
+
 from pysbf2 import (
     ERR_RAISE,
     SBFMessage,
@@ -22,6 +26,7 @@ from pysbf2 import (
     SBFTypeError,
     escapeall,
 )
+from pysbf2.sbflazy import LazyNMEAMessage, LazyRTCMMessage
 
 DIRNAME = os.path.dirname(__file__)
 
@@ -335,3 +340,54 @@ class ParseTest(unittest.TestCase):
                 NrSV=4,
             )
             res.NrSV = 6
+
+    def testLazyNMEAProprietary(self):
+        msg = LazyNMEAMessage(
+            b"$PUBX,00,103607.00,5327.03942,N,00214.42462,W,104.461,G3,29,31,0.085,39.63,-0.007,,0.92,1.19,0.77,9,0,0*63\r\n"
+        )
+        self.assertEqual(msg.talker, "P")
+        self.assertEqual(msg.msgID, "UBX")
+        self.assertEqual(msg.identity, "PUBX00")  # requires full parse
+        with self.assertRaises(AttributeError):
+            msg._nonexistent
+
+    def testLazyRTCM(self):
+        # MSM and proprietary SSR headers, no station ID for ephemerides
+        msg = LazyRTCMMessage(b"\xd3\x00\x08\x43\x50\x7b" + b"\x00" * 8, validate=0)
+        self.assertEqual((msg.identity, msg.stationid, msg.length), ("1077", 123, 8))
+        msg = LazyRTCMMessage(b"\xd3\x00\x08\xfe\xc0\x2a" + b"\x00" * 8, validate=0)
+        self.assertEqual((msg.identity, msg.stationid), ("4076_021", None))
+        msg = LazyRTCMMessage(b"\xd3\x00\x08\x3f\xb0\x00" + b"\x00" * 8, validate=0)
+        self.assertEqual((msg.identity, msg.stationid), ("1019", None))
+        with self.assertRaises(AttributeError):
+            msg._nonexistent
+
+    def testLazyChecksum(self):  # checksums validated eagerly, not on first access
+        nmea = b"$GNGLL,5327.04319,S,16239.22700,E,181128.00,A,A*6E\r\n"
+        with self.assertRaisesRegex(
+            NMEAParseError, "Message GNGLL invalid checksum 6E - should be 6D."
+        ):
+            LazyNMEAMessage(nmea)
+        self.assertEqual(LazyNMEAMessage(nmea, validate=0).lon, 162.6537833333)
+        rtcm = b"\xd3\x00\x08\x43\x50\x7b" + b"\x00" * 8
+        with self.assertRaisesRegex(RTCMParseError, "failed CRC"):
+            LazyRTCMMessage(rtcm)
+        rtcm = rtcm[:-3] + calc_crc24q(rtcm[:-3]).to_bytes(3, "big")
+        self.assertEqual(LazyRTCMMessage(rtcm).identity, "1077")
+
+    def testPickle(self):
+        with open(
+            os.path.join(DIRNAME, "pygpsdata_x5_measurements.log"), "rb"
+        ) as stream:
+            msgs = [parsed for _, parsed in SBFReader(stream)]
+        for parsebf in (True, False):
+            for msg in msgs:
+                msg = SBFReader.parse(msg.serialize(), parsebitfield=parsebf)
+                pkl = pickle.dumps(msg)
+                self.assertLess(len(pkl), len(msg.payload) + 200)  # no attribute dict
+                msg2 = pickle.loads(pkl)
+                self.assertEqual(str(msg2), str(msg))
+                self.assertEqual(msg2.serialize(), msg.serialize())
+                self.assertEqual(msg2.__getstate__()[1:], msg.__getstate__()[1:])
+        msg = SBFMessage("PVTCartesian", TOW=123000, WNc=2345)  # constructed
+        self.assertEqual(str(pickle.loads(pickle.dumps(msg))), str(msg))
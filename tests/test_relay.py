@@ -0,0 +1,225 @@
+"""
+TCP relay tests for pysbf2
+
+Created on 19 Oct 2026
+
+*** NB: must be saved in UTF-8 format ***
+
+@author: semuadmin
+"""
+
+# pylint: disable=line-too-long, invalid-name, missing-docstring, no-member
+
+import os
+import socket
+import unittest
+from io import BytesIO
+from threading import Thread
+from time import sleep
+
+from pysbf2 import (
+    DROP_CLIENT,
+    DROP_OLDEST,
+    SBFReader,
+    SBFRelay,
+)
+
+DIRNAME = os.path.dirname(__file__)
+
+
+def _recvall(sock: socket.socket, wait: float = 0.2) -> bytes:
+    data = b""
+    sock.settimeout(wait)
+    try:
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            data += chunk
+    except socket.timeout:
+        pass
+    return data
+
+
+def _identities(data: bytes) -> list:
+    return [p.identity for _, p in SBFReader(BytesIO(data), quitonerror=2)]
+
+
+class RelayTest(unittest.TestCase):
+    def setUp(self):
+        self.maxDiff = None
+        with open(
+            os.path.join(DIRNAME, "pygpsdata_x5_measurements.log"), "rb"
+        ) as stream:
+            self.data = stream.read()
+        with open(os.path.join(DIRNAME, "pygpsdata_mixed.log"), "rb") as stream:
+            self.mixed = stream.read()
+        self.socks = []
+
+    def tearDown(self):
+        for sock in self.socks:
+            sock.close()
+
+    def _pair(self, bufsize: int = 0) -> tuple:
+        relayend, clientend = socket.socketpair()
+        if bufsize:
+            relayend.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, bufsize)
+            clientend.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, bufsize)
+        self.socks.append(clientend)
+        return relayend, clientend
+
+    def testRelayFilter(self):
+        with SBFRelay() as relay:
+            self.assertIsNone(relay.address)
+            r1, c1 = self._pair()
+            r2, c2 = self._pair()
+            all_ = relay.add_client(r1)
+            eom = relay.add_client(r2, msgfilter=["EndOfMeas", "PVTGeodetic"])
+            for i in range(0, len(self.data), 100):  # partial frames are never sent
+                relay.feed(self.data[i : i + 100])
+                self.assertEqual(all_.buffered, 0)
+            relay.feed(self.mixed)
+            self.assertTrue(relay.drain(1))
+            self.assertEqual(relay.frames, 9)
+            self.assertEqual(_recvall(c1), self.data + self.mixed)
+            self.assertEqual(_identities(_recvall(c2)), ["EndOfMeas", "PVTGeodetic"])
+            self.assertEqual(all_.sent, 9)
+            self.assertEqual(eom.sent, 2)
+            self.assertEqual(eom.dropped, 0)
+            self.assertIn("sent=2, bytes=112, dropped=0", repr(eom))
+            self.assertEqual(len(relay.clients), 2)
+
+    def testSlowClient(self):
+        frames = [raw for raw, _ in SBFReader(BytesIO(self.data))] * 500
+        for policy in (0, DROP_OLDEST):
+            with SBFRelay(maxbuffer=20000, policy=policy) as relay:
+                r1, c1 = self._pair()
+                r2, c2 = self._pair(4096)
+                fast = relay.add_client(r1)
+                slow = relay.add_client(r2)
+                for frame in frames:
+                    relay.publish(frame)
+                    c1.setblocking(False)
+                    try:
+                        while c1.recv(65536):
+                            pass
+                    except BlockingIOError:
+                        pass
+                self.assertEqual(fast.dropped, 0)
+                self.assertEqual(fast.sent, 1500)
+                self.assertGreater(slow.dropped, 0)
+                self.assertLessEqual(slow.buffered, 20000)
+                data = b""
+                while slow.buffered:  # drain slow client
+                    relay.poll(0.01)
+                    data += _recvall(c2, 0.01)
+                received = _identities(data + _recvall(c2))  # whole, valid frames only
+                self.assertEqual(len(received) + slow.dropped, 1500)
+                self.assertEqual(slow.sent, len(received))
+                if policy == DROP_OLDEST:  # most recent frames retained
+                    self.assertEqual(
+                        received[-3:], ["MeasEpoch", "MeasExtra", "EndOfMeas"]
+                    )
+
+    def testDropClient(self):
+        with SBFRelay(maxbuffer=5000, policy=DROP_CLIENT) as relay:
+            r1, _ = self._pair(4096)
+            slow = relay.add_client(r1)
+            while not slow.closed:
+                relay.feed(self.data)
+            self.assertEqual(relay.disconnects, 1)
+            self.assertEqual(relay.clients, [])
+            self.assertEqual(slow.dropped, 1)
+
+    def testDisconnect(self):
+        with SBFRelay() as relay:
+            r1, c1 = self._pair()
+            r2, c2 = self._pair()
+            relay.add_client(r1)
+            client2 = relay.add_client(r2)
+            c1.sendall(b"ignored")
+            c2.close()
+            relay.poll(0.1)
+            self.assertEqual(relay.clients, [relay.clients[0]])
+            self.assertTrue(client2.closed)
+            c1.close()
+            relay.feed(self.data)  # send fails
+            relay.feed(self.data)
+            self.assertEqual(relay.clients, [])
+            self.assertEqual(relay.disconnects, 2)
+
+    def testListen(self):
+        with SBFRelay(listen=("127.0.0.1", 0), msgfilter=["MeasExtra"]) as relay:
+            client = socket.create_connection(relay.address)
+            self.socks.append(client)
+            while not relay.clients:
+                relay.poll(0.1)
+            self.assertEqual(relay.run(BytesIO(self.data * 2)), 6)
+            self.assertTrue(relay.drain())
+            self.assertEqual(_identities(_recvall(client)), ["MeasExtra", "MeasExtra"])
+            self.assertEqual(relay.run(BytesIO(self.data), limit=1), 3)
+
+    def testRunSocket(self):
+        source, feed = socket.socketpair()
+        self.socks += [source, feed]
+        with SBFRelay() as relay:
+            r1, c1 = self._pair()
+            relay.add_client(r1)
+            relay.start(source)
+            feed.sendall(self.data)
+            received = b""
+            while len(received) < len(self.data):
+                received += c1.recv(65536)
+            relay.stop()
+            self.assertEqual(received, self.data)
+            relay.start(source, limit=3)
+            feed.sendall(self.data)
+            feed.close()
+            sleep(0.3)
+            self.assertEqual(relay.frames, 6)
+            self.assertEqual(relay.run(source), 0)  # source closed
+
+    def testRunSocketReset(self):
+        with socket.create_server(("127.0.0.1", 0)) as server:
+            feed = socket.create_connection(server.getsockname()[0:2])
+            source, _ = server.accept()
+        self.socks.append(source)
+        feed.sendall(self.data)
+        feed.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, b"\x01\x00\x00\x00" * 2)
+        with SBFRelay() as relay:
+            r1, c1 = self._pair()
+            relay.add_client(r1)
+            self.assertEqual(relay.run(source, limit=1), 3)
+            feed.close()  # connection reset
+            self.assertEqual(relay.run(source), 0)
+            self.assertTrue(relay.drain(1))
+            self.assertEqual(_recvall(c1), self.data)
+
+    def testAddClientThread(self):
+        source, feed = socket.socketpair()
+        self.socks += [source, feed]
+        with SBFRelay() as relay:
+            relay.start(source)
+            pairs = [self._pair() for _ in range(20)]
+            adder = Thread(target=lambda: [relay.add_client(r) for r, _ in pairs])
+            adder.start()
+            while adder.is_alive():  # publish while clients are added
+                feed.sendall(self.data)
+                sleep(0.001)
+            adder.join()
+            feed.sendall(self.data)
+            while not all(c.sent for c in relay.clients):
+                sleep(0.01)
+            self.assertEqual(len(relay.clients), 20)
+            relay.stop()
+
+    def testDrain(self):
+        with SBFRelay() as relay:
+            r1, c1 = self._pair(4096)
+            client = relay.add_client(r1)
+            relay.feed(self.data * 20)
+            self.assertGreater(client.buffered, 0)
+            self.assertFalse(relay.drain(0.05))  # client not reading
+            c1.close()
+            self.assertTrue(relay.drain())
+            self.assertTrue(client.closed)
@@ -0,0 +1,187 @@
+"""
+Replay server and harness tests for pysbf2
+
+Created on 19 Oct 2026
+
+*** NB: must be saved in UTF-8 format ***
+
+@author: semuadmin
+"""
+
+# pylint: disable=line-too-long, invalid-name, missing-docstring, no-member
+
+import gzip
+import json
+import os
+import socket
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from threading import Timer
+from time import monotonic
+from unittest.mock import patch
+
+from pysbf2 import (
+    ParameterError,
+    SBFMessage,
+    SBFReader,
+    SBFReplayServer,
+    crc2bytes,
+    replay_harness,
+)
+from pysbf2.sbfreplay import main
+
+NMEA = b"$GNGLL,5327.04319,S,16239.22700,E,181128.00,A,A*6D\r\n"
+
+
+def _epochs(count: int, step: int = 100) -> bytes:
+    # PVTGeodetic (96 bytes) per epoch, preceded by NMEA sentence
+    raw = bytearray(SBFMessage("PVTGeodetic", revno=2, TOW=0, WNc=2300).serialize())
+    data = bytearray(NMEA)
+    for i in range(count):
+        raw[8:12] = (i * step).to_bytes(4, "little")
+        raw[2:4] = crc2bytes(raw[4:])
+        data += raw
+    return bytes(data)
+
+
+class ReplayTest(unittest.TestCase):
+    def setUp(self):
+        self.maxDiff = None
+        self.data = _epochs(20)
+
+    def tearDown(self):
+        pass
+
+    def _receive(self, server: SBFReplayServer) -> tuple:
+        with socket.create_connection(server.address) as sock:
+            start = monotonic()
+            res = [raw for raw, _ in SBFReader(sock, parsing=False)]
+            return b"".join(res), monotonic() - start
+
+    def testMaxSpeed(self):
+        with SBFReplayServer(self.data, speed=0) as server:
+            server.start()
+            data, _ = self._receive(server)
+            self.assertEqual(data, self.data)
+            data, _ = self._receive(server)  # replayed from start per client
+            self.assertEqual(data, self.data)
+            server.join()
+            self.assertEqual((server.clients, server.frames), (2, 42))
+            self.assertEqual(server.bytes, 2 * len(self.data))
+            sent = server.sendlog[0][1]
+            self.assertEqual(server.sendtime(None), sent)  # leading NMEA
+            self.assertEqual(server.sendtime(2300 * 604800000 + 1900), sent)
+            self.assertIsNone(server.sendtime(2300 * 604800000 + 2000))
+
+    def testPacing(self):
+        # 20 epochs at 100ms = 1.9s, replayed at 10x = 0.19s
+        with SBFReplayServer(self.data, speed=10) as server:
+            server.start()
+            data, elapsed = self._receive(server)
+        self.assertEqual(data, self.data)
+        self.assertGreater(elapsed, 0.18)
+        self.assertLess(elapsed, 1)
+        self.assertEqual(len(server.sendlog), 20)  # one send per epoch
+        with SBFReplayServer(self.data, speed=10, burst=5, jitter=0.01) as server:
+            server.start()
+            data, elapsed = self._receive(server)
+        self.assertEqual(data, self.data)
+        self.assertEqual([n for n, _ in server.sendlog], [6, 11, 16, 21])
+        self.assertGreater(elapsed, 0.15)
+
+    def testFile(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "log.sbf.gz")
+            with gzip.open(path, "wb") as stream:
+                stream.write(self.data)
+            with SBFReplayServer(path, speed=0, maxclients=1) as server:
+                self.assertTrue(server.wait())  # not started
+                server.start()
+                self.assertFalse(server.wait(0.01))
+                self.assertEqual(self._receive(server)[0], self.data)
+                self.assertTrue(server.wait(5))
+                server.join()
+                with self.assertRaises(OSError):  # no more clients accepted
+                    self._receive(server)
+
+    def testStop(self):
+        server = SBFReplayServer(_epochs(100, 1000), speed=1)
+        server.start()
+        Timer(0.2, server.close).start()
+        data, elapsed = self._receive(server)
+        self.assertLess(elapsed, 1)
+        self.assertLess(server.frames, 3)
+        self.assertEqual(len(data), server.bytes)
+
+    def testHarness(self):
+        for reader in ("sync", "async"):
+            res = replay_harness(self.data, reader=reader, idle=0.2)
+            self.assertEqual(
+                (res["frames"], res["read"], res["dropped"], res["bytes"]),
+                (21, 21, 0, len(self.data)),
+            )
+            self.assertEqual(res["latency"]["count"], 21)
+            self.assertGreater(res["framerate"], 0)
+        res = replay_harness(self.data, speed=20, burst=2, parsing=False)
+        self.assertGreater(res["duration"], 0.09)
+        self.assertLess(res["latency"]["max"], 0.5)
+        with self.assertRaisesRegex(ParameterError, "Invalid harness reader xxx"):
+            replay_harness(self.data, reader="xxx")
+
+    def testHarnessDropped(self):
+        # latency correlated by epoch, not by order, so dropped frames don't skew it
+        data = bytearray(self.data)
+        data[len(NMEA) + 5 * 96 + 20] ^= 0xFF  # corrupt 6th epoch
+        for reader in ("sync", "async"):
+            res = replay_harness(bytes(data), speed=10, reader=reader, idle=0.2)
+            self.assertEqual((res["frames"], res["read"], res["dropped"]), (21, 20, 1))
+            self.assertEqual(res["latency"]["count"], 20)
+            self.assertLess(res["latency"]["max"], 0.05)
+
+    def testThreadsPruned(self):
+        with SBFReplayServer(self.data, speed=0) as server:
+            server.start()
+            for _ in range(3):
+                self._receive(server)
+                server.join()
+            self.assertEqual(server.clients, 3)
+            self.assertLessEqual(len(server._threads), 1)
+
+    def testInvalid(self):
+        with self.assertRaisesRegex(ParameterError, "Invalid replay speed -1"):
+            SBFReplayServer(self.data, speed=-1)
+        with self.assertRaisesRegex(ParameterError, "Invalid replay burst 0"):
+            SBFReplayServer(self.data, burst=0)
+        with self.assertRaisesRegex(ParameterError, "Invalid replay jitter -0.1"):
+            SBFReplayServer(self.data, jitter=-0.1)
+
+    def testCLI(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "log.sbf")
+            with open(path, "wb") as stream:
+                stream.write(self.data)
+            out = StringIO()
+            with redirect_stdout(out):
+                main([path, "--speed", "0", "--harness", "sync"])
+            self.assertEqual(json.loads(out.getvalue())["read"], 21)
+            out = StringIO()
+            with (
+                redirect_stdout(out),
+                patch.object(SBFReplayServer, "start", side_effect=KeyboardInterrupt),
+            ):
+                main([path, "--port", "0"])
+            self.assertIn(f"Replaying {path} on ", out.getvalue())
+            with (
+                redirect_stdout(out),
+                patch.object(
+                    SBFReplayServer, "wait", side_effect=[False, KeyboardInterrupt]
+                ) as wait,
+            ):
+                main([path, "--port", "0"])
+            self.assertEqual(wait.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,175 @@
+"""
+Priority-aware decode scheduler tests for pysbf2
+
+Created on 19 Oct 2026
+
+*** NB: must be saved in UTF-8 format ***
+
+@author: semuadmin
+"""
+
+# pylint: disable=line-too-long, invalid-name, missing-docstring, no-member
+
+import os
+import unittest
+from io import BytesIO
+from unittest.mock import patch
+
+from pysbf2 import (
+    CLASS_BULK,
+    CLASS_CRITICAL,
+    CLASS_NORMAL,
+    ERR_IGNORE,
+    ERR_RAISE,
+    POOL_PROCESS,
+    ParameterError,
+    SBFDecodeScheduler,
+    SBFMessage,
+    SBFMessageError,
+    SBFReader,
+)
+
+DIRNAME = os.path.dirname(__file__)
+BADNMEA = b"$GNGLL,3203.94995,N,03446.42914,E,084158.00,A,D*78\r\n"
+
+
+def _load(*names) -> bytes:
+    data = b""
+    for name in names:
+        with open(os.path.join(DIRNAME, name), "rb") as stream:
+            data += stream.read()
+    return data
+
+
+class SchedulerTest(unittest.TestCase):
+    def setUp(self):
+        self.maxDiff = None
+        self.data = _load(
+            "pygpsdata_x5_measurements.log",
+            "pygpsdata_x5_pvtgeod.log",
+            "pygpsdata_x5_rawnav.log",
+            "pygpsdata_mixed.log",
+        )
+        self.expected = [
+            p.identity for _, p in SBFReader(BytesIO(self.data * 3), parsebitfield=0)
+        ]
+
+    def tearDown(self):
+        pass
+
+    def _check(self, sched: SBFDecodeScheduler):
+        ids = [p.identity for _, p in sched]
+        self.assertEqual(sorted(ids), sorted(self.expected))
+        # all but critical frames are delivered in stream order
+        self.assertEqual(
+            [i for i in ids if i != "PVTGeodetic"],
+            [i for i in self.expected if i != "PVTGeodetic"],
+        )
+        self.assertEqual(sched.latency["critical"].count, 6)
+        self.assertEqual(sched.latency["bulk"].count, 6)  # MeasEpoch, GPSRawCA
+        self.assertEqual(sched.latency["normal"].count, len(self.expected) - 12)
+        self.assertEqual(sched.pending, 0)
+
+    def testThreadPool(self):
+        with SBFDecodeScheduler(
+            SBFReader(BytesIO(self.data * 3), parsing=False), parsebitfield=0
+        ) as sched:
+            self._check(sched)
+            self.assertEqual(sched.read(), (None, None))
+            summary = sched.summary()
+        self.assertEqual(list(summary), ["critical", "normal", "bulk"])
+        self.assertEqual(summary["bulk"]["count"], 6)
+
+    def testProcessPool(self):
+        with SBFDecodeScheduler(
+            SBFReader(BytesIO(self.data * 3), parsing=False),
+            backend=POOL_PROCESS,
+            workers=2,
+            parsebitfield=0,
+        ) as sched:
+            self._check(sched)
+
+    def testProcessPoolNoParentDecode(self):  # decoded in worker process only
+        expected = [str(p) for _, p in SBFReader(BytesIO(self.data))]
+        decode = SBFMessage._do_attributes
+        with patch.object(
+            SBFMessage, "_do_attributes", autospec=True, side_effect=decode
+        ) as decode:
+            with SBFDecodeScheduler(
+                SBFReader(BytesIO(self.data), parsing=False),
+                classes={},
+                default=CLASS_BULK,
+                backend=POOL_PROCESS,
+                workers=2,
+            ) as sched:
+                decode.reset_mock()  # in case workers forked with mock
+                res = [str(p) for _, p in sched]
+            self.assertEqual(decode.call_count, 0)
+        self.assertEqual(res, expected)
+
+    def testMaxPending(self):
+        with SBFDecodeScheduler(
+            SBFReader(BytesIO(self.data * 3), parsing=False),
+            maxpending=1,
+            parsebitfield=0,
+        ) as sched:
+            ids = [p.identity for _, p in sched]
+        self.assertEqual(ids, self.expected)  # each bulk frame awaited in turn
+
+    def testClasses(self):
+        with SBFDecodeScheduler(
+            SBFReader(BytesIO(self.data), parsing=False),
+            classes={"GPSRawCA": CLASS_CRITICAL, 4027: CLASS_BULK},
+            default=CLASS_BULK,
+        ) as sched:
+            res = list(sched)
+        self.assertEqual(len(res), 22)
+        self.assertEqual(sched.latency["critical"].count, 1)
+        self.assertEqual(sched.latency["bulk"].count, 21)
+        self.assertEqual(sched.latency["normal"].count, 0)
+
+    def testErrors(self):
+        data = bytearray(_load("pygpsdata_x5_measurements.log"))
+        data[20] ^= 0xFF  # corrupt MeasEpoch payload
+        data = bytes(data) + BADNMEA
+        errs = []
+        with SBFDecodeScheduler(
+            SBFReader(BytesIO(data), parsing=False), errorhandler=errs.append
+        ) as sched:
+            res = list(sched)
+        self.assertEqual(len(res), 4)
+        self.assertIsNone(res[0][1])
+        self.assertIsNone(res[3][1])
+        self.assertEqual(len(errs), 2)
+        self.assertIsInstance(errs[0], SBFMessageError)  # invalid CRC
+        with SBFDecodeScheduler(
+            SBFReader(BytesIO(data), parsing=False), quitonerror=ERR_IGNORE
+        ) as sched:
+            self.assertEqual(len(list(sched)), 4)
+        with SBFDecodeScheduler(
+            SBFReader(BytesIO(data), parsing=False), quitonerror=ERR_RAISE
+        ) as sched:
+            with self.assertRaises(SBFMessageError):
+                sched.read()
+
+    def testClose(self):
+        sched = SBFDecodeScheduler(
+            SBFReader(BytesIO(self.data), parsing=False), maxpending=100
+        )
+        while sched.read()[1].identity != "PVTGeodetic":
+            pass
+        sched.close()
+        self.assertEqual(sched.pending, 0)
+
+    def testInvalid(self):
+        rdr = SBFReader(BytesIO(self.data), parsing=False)
+        with self.assertRaisesRegex(ParameterError, "Invalid priority class 3"):
+            SBFDecodeScheduler(rdr, classes={"MeasEpoch": 3})
+        with self.assertRaisesRegex(ParameterError, "Invalid priority class 4"):
+            SBFDecodeScheduler(rdr, default=4)
+        with self.assertRaisesRegex(ParameterError, "Invalid pool backend 2"):
+            SBFDecodeScheduler(rdr, backend=2)
+        with self.assertRaisesRegex(ParameterError, "Unknown SBF block 'Nope'"):
+            SBFDecodeScheduler(rdr, classes={"Nope": CLASS_NORMAL})
+        with self.assertRaisesRegex(ParameterError, "requires an SBFReader created"):
+            SBFDecodeScheduler(SBFReader(BytesIO(self.data)))
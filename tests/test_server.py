@@ -0,0 +1,211 @@
+"""
+Asyncio ingestion server and framer tests for pysbf2
+
+Created on 19 Oct 2026
+
+*** NB: must be saved in UTF-8 format ***
+
+@author: semuadmin
+"""
+
+# pylint: disable=line-too-long, invalid-name, missing-docstring, no-member
+
+import asyncio
+import os
+import unittest
+
+from pysbf2 import (
+    NMEA_PROTOCOL,
+    SBF_PROTOCOL,
+    SBFFramer,
+    SBFIngestServer,
+    SBFReader,
+)
+
+DIRNAME = os.path.dirname(__file__)
+
+
+def _load(name: str) -> bytes:
+    with open(os.path.join(DIRNAME, name), "rb") as stream:
+        return stream.read()
+
+
+class FramerTest(unittest.TestCase):
+    def setUp(self):
+        self.maxDiff = None
+
+    def tearDown(self):
+        pass
+
+    def testFramerChunked(self):  # same frames as SBFReader, however data arrives
+        for log in ("pygpsdata_mixed.log", "pygpsdata_x5_measurements.log"):
+            data = _load(log)
+            with open(os.path.join(DIRNAME, log), "rb") as stream:
+                expected = [raw for raw, _ in SBFReader(stream, parsing=False)]
+            for chunk in (1, 7, 4096):
+                framer = SBFFramer()
+                frames = []
+                for i in range(0, len(data), chunk):
+                    frames += framer.feed(data[i : i + chunk])
+                self.assertEqual(frames, expected)
+                self.assertEqual(framer.frames, len(expected))
+                self.assertEqual(framer.buffered, 0)
+
+    def testFramerCorrupt(self):
+        data = bytearray(_load("pygpsdata_x5_measurements.log"))
+        data[100] ^= 0xFF  # corrupt MeasEpoch
+        mixed = bytearray(_load("pygpsdata_mixed.log"))
+        rtcm = mixed.index(b"\xd3\x00\x13")
+        mixed[rtcm + 10] ^= 0xFF  # corrupt RTCM3 1005
+        framer = SBFFramer()
+        frames = framer.feed(
+            b"$@\x00\x00\xa6\x0f\xff\xff"  # implausible length
+            + b"$GNGLL,"
+            + b"\x00" * 100  # spurious NMEA header
+            + b"$GNRMC,\xff\xfe\r\n"  # non-ASCII NMEA
+            + b"\xd3\xff\xff"  # invalid RTCM3 header
+            + bytes(data)
+            + bytes(mixed)
+        )
+        ids = [SBFReader.parse_frame(f).identity for f in frames if f[0:2] == b"$@"]
+        self.assertEqual(ids, ["MeasExtra", "EndOfMeas", "PVTGeodetic", "PosLocal"])
+        self.assertEqual(len([f for f in frames if f[0] == 0xD3]), 1)
+        self.assertEqual(framer.errors, 3)
+        self.assertEqual(framer.feed(b"$@"), [])
+        self.assertEqual(framer.buffered, 2)
+        self.assertEqual(framer.flush(), 2)
+        framer = SBFFramer(validate=0)
+        self.assertEqual(len(framer.feed(bytes(data))), 3)
+
+    def testFramerProtfilter(self):
+        data = _load("pygpsdata_mixed.log")
+        framer = SBFFramer(protfilter=NMEA_PROTOCOL)
+        frames = framer.feed(data)
+        self.assertTrue(all(f[0:1] == b"$" for f in frames))
+        self.assertEqual(framer.garbage + sum(len(f) for f in frames), len(data))
+        framer = SBFFramer(protfilter=SBF_PROTOCOL)
+        self.assertEqual(len(framer.feed(data)), 2)
+
+
+class IngestServerTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.maxDiff = None
+        self.sbf = _load("pygpsdata_x5_measurements.log")
+        self.mixed = _load("pygpsdata_mixed.log")
+
+    async def _receiver(self, data: bytes, chunk: int = 100) -> asyncio.AbstractServer:
+        # loopback stand-in for receiver, which sends data then disconnects
+        async def handler(reader, writer):
+            for i in range(0, len(data), chunk):
+                writer.write(data[i : i + chunk])
+                await writer.drain()
+            writer.close()
+
+        return await asyncio.start_server(handler, "127.0.0.1", 0)
+
+    async def _collect(self, server: SBFIngestServer, count: int) -> list:
+        return [await asyncio.wait_for(server.read(), 5) for _ in range(count)]
+
+    async def testConnect(self):
+        rx1 = await self._receiver(self.sbf)
+        rx2 = await self._receiver(self.mixed, 7)
+        receivers = {
+            "rx1": rx1.sockets[0].getsockname()[0:2],
+            "rx2": rx2.sockets[0].getsockname()[0:2],
+        }
+        async with SBFIngestServer(receivers, parsing=True, backoff=0.01) as server:
+            self.assertIsNone(server.address)
+            res = await self._collect(server, 20)
+            while server.stats["rx1"].connects < 2:  # reconnects after disconnect
+                await asyncio.sleep(0.01)
+        self.assertEqual({rid for rid, _, _ in res}, {"rx1", "rx2"})
+        rx1frames = [(raw, parsed.identity) for rid, raw, parsed in res if rid == "rx1"]
+        self.assertEqual(rx1frames[0][1], "MeasEpoch")
+        self.assertEqual(b"".join(raw for raw, _ in rx1frames[0:3]), self.sbf)
+        self.assertIn("GNGLL", [p.identity for rid, _, p in res if rid == "rx2"])
+        stats = server.stats["rx1"]
+        self.assertGreaterEqual(stats.disconnects, 1)
+        self.assertGreaterEqual(stats.bytes, len(self.sbf))
+        self.assertGreaterEqual(stats.frames, 3)
+        self.assertGreater(stats.framerate, 0)
+        self.assertGreater(stats.byterate, 0)
+        self.assertEqual(stats.errors, 0)
+        self.assertIn("SBFReceiverStats('rx1', connected=False", repr(stats))
+        rx1.close()
+        rx2.close()
+
+    async def testListen(self):
+        async with SBFIngestServer(listen=("127.0.0.1", 0)) as server:
+            host, port = server.address
+            _, writer = await asyncio.open_connection(host, port)
+            writer.write(self.sbf)
+            await writer.drain()
+            res = await self._collect(server, 3)
+            rid = res[0][0]
+            self.assertEqual(b"".join(raw for _, raw, _ in res), self.sbf)
+            self.assertIsNone(res[0][2])
+            self.assertTrue(server.stats[rid].connected)
+            writer.close()
+            while rid in server.stats:  # discarded on disconnect
+                await asyncio.sleep(0.01)
+        self.assertEqual([item async for item in server], [])
+
+    async def testStopQueueFull(self):
+        rx = await self._receiver(self.sbf)
+        receivers = {"rx": rx.sockets[0].getsockname()[0:2]}
+        server = SBFIngestServer(receivers, queuesize=1)
+        await server.start()
+        while server.stats.get("rx") is None or server.stats["rx"].frames < 2:
+            await asyncio.sleep(0.01)  # queue full, connection paused
+        await asyncio.wait_for(server.stop(), 5)
+        res = [item async for item in server]
+        self.assertEqual(len(res), 1)
+        self.assertEqual(res[0][1], self.sbf[0 : len(res[0][1])])
+        self.assertEqual(await server.read(), (None, None, None))
+        rx.close()
+
+    async def testBackoff(self):
+        rx = await self._receiver(b"")
+        addr = rx.sockets[0].getsockname()[0:2]
+        rx.close()
+        await rx.wait_closed()  # nothing listening
+        async with SBFIngestServer(
+            {"rx": addr}, backoff=0.01, maxbackoff=0.02
+        ) as server:
+            await asyncio.sleep(0.1)
+            stats = server.stats["rx"]
+            self.assertEqual(stats.connects, 0)
+            self.assertIsInstance(stats.lasterror, OSError)
+        self.assertEqual(await server.read(), (None, None, None))
+
+    async def testTimeout(self):
+        async def silent(reader, writer):
+            await asyncio.sleep(1)
+
+        rx = await asyncio.start_server(silent, "127.0.0.1", 0)
+        addr = rx.sockets[0].getsockname()[0:2]
+        async with SBFIngestServer({"rx": addr}, timeout=0.02, backoff=0.01) as server:
+            while server.stats.get("rx") is None or server.stats["rx"].disconnects < 1:
+                await asyncio.sleep(0.01)
+            self.assertIsInstance(server.stats["rx"].lasterror, asyncio.TimeoutError)
+        rx.close()
+
+    async def testParseErrors(self):
+        badnmea = b"$GNGLL,3203.94995,N,03446.42914,E,084158.00,A,D*78\r\n"
+        rx = await self._receiver(badnmea + self.sbf)
+        errors = []
+        receivers = {"rx": rx.sockets[0].getsockname()[0:2]}
+        async with SBFIngestServer(
+            receivers, parsing=True, errorhandler=errors.append
+        ) as server:
+            res = await self._collect(server, 4)
+        self.assertEqual(res[0][1], badnmea)
+        self.assertIsNone(res[0][2])
+        self.assertEqual(res[1][2].identity, "MeasEpoch")
+        self.assertEqual(server.stats["rx"].parseerrors, 1)
+        self.assertEqual(len(errors), 1)
+        async with SBFIngestServer(receivers, parsing=True) as server:
+            with self.assertLogs("pysbf2.sbfserver", "ERROR") as logs:
+                await self._collect(server, 1)
+        self.assertIn("invalid checksum", logs.output[0])
+        rx.close()
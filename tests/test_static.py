@@ -11,30 +11,44 @@ Created on 19 May 2025
 # pylint: disable=line-too-long, invalid-name, missing-docstring, no-member
 
 import os
+import subprocess
+import sys
 import unittest
 from datetime import datetime
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
 
 from pysbf2 import (
     F4,
     F8,
     I4,
+    SBF_BLOCKS,
+    SBF_MSGIDS,
     U2,
     X2,
-    SBF_MSGIDS,
-    SBF_BLOCKS,
+    ParameterError,
     SBFMessageError,
     SBFTypeError,
     attsiz,
     atttyp,
     bytes2val,
+    calc_crc,
     escapeall,
     getpadding,
     itow2utc,
     msgid2bytes,
+    msgids2nums,
     nomval,
     utc2itow,
     val2bytes,
 )
+from pysbf2.sbflayouts import (
+    _LAYOUTS,
+    CACHE_ENV,
+    cache_path,
+    compile_layouts,
+    load_layouts,
+)
 
 DIRNAME = os.path.dirname(__file__)
 
@@ -107,7 +121,7 @@ class StaticTest(unittest.TestCase):
             b"testing123",
         ]
         for i, inp in enumerate(INPUTS):
-            (val, att) = inp
+            val, att = inp
             res = val2bytes(val, att)
             self.assertEqual(res, EXPECTED_RESULTS[i])
         with self.assertRaisesRegex(
@@ -139,7 +153,7 @@ class StaticTest(unittest.TestCase):
             b"testing123",
         ]
         for i, inp in enumerate(INPUTS):
-            (valb, att) = inp
+            valb, att = inp
             res = bytes2val(valb, att)
             if att == F4:
                 self.assertAlmostEqual(res, EXPECTED_RESULTS[i], 6)
@@ -178,7 +192,115 @@ class StaticTest(unittest.TestCase):
     def testmsgid2bytes(self):
         self.assertEqual(msgid2bytes("PVTCartesian"), b"\xa6\x0f")
         self.assertEqual(msgid2bytes("AuxAntPositions"), b"\x36\x17")
+        self.assertEqual(msgid2bytes("MeasEpoch", 1), b"\xbb\x2f")
         with self.assertRaisesRegex(
             SBFMessageError, "No SBF ID found for message NotExist"
         ):
             msgid2bytes("NotExist")
+
+    def testcalccrc(self):  # CRC-CCITT check value
+        self.assertEqual(calc_crc(b"123456789"), 0x31C3)
+        self.assertEqual(calc_crc(b""), 0)
+
+    def testmsgids2nums(self):
+        self.assertEqual(
+            msgids2nums(["PVTGeodetic", 5922, "AttEuler"]), {4007, 5922, 5938}
+        )
+        with self.assertRaisesRegex(ParameterError, "Unknown SBF block 'NotExist'"):
+            msgids2nums(["NotExist"])
+
+    def testlayoutcache(self):
+        with TemporaryDirectory() as tmpdir:
+            with patch.dict(os.environ, {CACHE_ENV: tmpdir}):
+                _LAYOUTS.clear()
+                path = cache_path()
+                self.assertTrue(path.startswith(tmpdir))
+                self.assertFalse(os.path.exists(path))
+                layouts = load_layouts()
+                self.assertTrue(os.path.exists(path))  # cache written
+                self.assertEqual(layouts, compile_layouts())
+                _LAYOUTS.clear()
+                self.assertEqual(load_layouts(), layouts)  # cache reloaded
+                with open(path, "w", encoding="utf-8") as cache:
+                    cache.write('{"fields": [1, 2')
+                _LAYOUTS.clear()
+                self.assertEqual(load_layouts(), layouts)  # corrupt cache replaced
+                _LAYOUTS.clear()
+                self.assertEqual(load_layouts(), layouts)
+            with patch.dict(os.environ, {CACHE_ENV: ""}):
+                self.assertEqual(cache_path(), "")
+                _LAYOUTS.clear()
+                self.assertEqual(load_layouts(), layouts)  # cache disabled
+        _LAYOUTS.clear()
+
+    def testimporttime(
+        self,
+    ):  # sub-parsers and block definitions (with warm cache) not imported
+        script = (
+            "import sys\n"
+            "from io import BytesIO\n"
+            "import pysbf2\n"
+            "pysbf2.compile_fields('PVTGeodetic')\n"
+            "raw, _ = pysbf2.SBFReader(BytesIO(bytes.fromhex('"
+            "2440b759a60f6000589b730c3f0904001d0e5817fc044d41e6e48be6ea2902c1"
+            "981928b218755341a6dd414251900138b486713ac09385bbf90295d0e3afe66e"
+            "4b6cde3f03e0563e000010408f028f020d093250000000002b007a0088000001"
+            "')), parsing=False).read()\n"
+            "print(raw is not None, sorted(m for m in sys.modules if m.startswith"
+            "(('pynmeagps', 'pyrtcm', 'pysbf2.sbftypes_blocks'))))\n"
+        )
+        with TemporaryDirectory() as tmpdir:
+            env = {**os.environ, CACHE_ENV: tmpdir}
+            for i in range(2):  # cold then warm cache
+                res = subprocess.run(
+                    [sys.executable, "-X", "importtime", "-c", script],
+                    capture_output=True,
+                    env=env,
+                    text=True,
+                    check=True,
+                )
+                importtime = {
+                    line.split("|")[-1].strip(): int(line.split("|")[1])
+                    for line in res.stderr.splitlines()
+                    if line.startswith("import time:")
+                    and "|" in line
+                    and line.split("|")[1].strip().isdigit()
+                }
+                self.assertNotIn("pynmeagps", importtime)
+                self.assertNotIn("pyrtcm", importtime)
+                # nor heavyweight modules used only by optional features
+                for module in ("asyncio", "tracemalloc", "multiprocessing"):
+                    self.assertNotIn(module, importtime)
+                if i:
+                    self.assertEqual(res.stdout.strip(), "True []")
+                    self.assertNotIn("pysbf2.sbftypes_blocks", importtime)
+                else:
+                    self.assertIn("pysbf2.sbftypes_blocks", importtime)
+
+    def testlazyimports(self):  # every lazy name resolves and is star-exported
+        import pysbf2
+        from pysbf2 import sbftypes_blocks
+
+        blocks = [name for name in dir(sbftypes_blocks) if name.startswith("SBF_")]
+        self.assertIn("SBF_SBAS_L1_DECODED_MESSAGE_BLOCKS", blocks)
+        for name in blocks:
+            self.assertIs(getattr(pysbf2, name), getattr(sbftypes_blocks, name))
+        for name in pysbf2._LAZY_IMPORTS:
+            self.assertIsNotNone(getattr(pysbf2, name))
+            self.assertIn(name, pysbf2.__all__)
+            self.assertIn(name, dir(pysbf2))
+        self.assertIn("SBFReader", pysbf2.__all__)
+        self.assertNotIn("import_module", pysbf2.__all__)
+        with self.assertRaisesRegex(AttributeError, "has no attribute 'NotExist'"):
+            getattr(pysbf2, "NotExist")
+        namespace = {}
+        exec("from pysbf2 import *", namespace)  # pylint: disable=exec-used
+        for name in (
+            "SBF_BLOCKS",
+            "SBF_SBAS_L1_DECODED_MESSAGE_BLOCKS",
+            "SocketWrapper",
+            "haversine",
+            "SBFDecodeScheduler",
+            "SBFReader",
+        ):
+            self.assertIs(namespace[name], getattr(pysbf2, name))
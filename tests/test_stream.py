@@ -14,8 +14,9 @@ import logging
 import os
 import sys
 import unittest
-from io import BufferedReader
+from io import BufferedReader, BytesIO
 from math import degrees
+from unittest.mock import patch
 
 from pyrtcm import RTCMReader
 
@@ -26,14 +27,19 @@ from pysbf2 import (
     NMEA_PROTOCOL,
     RTCM3_PROTOCOL,
     SBF_PROTOCOL,
+    SBFFramer,
+    SBFMessageError,
     SBFParseError,
     SBFReader,
     SBFStreamError,
+    crc2bytes,
     ecef2llh,
 )
 
 DIRNAME = os.path.dirname(__file__)
 
+PVTCART = b"$@\xb7Y\xa6\x0f`\x00X\x9bs\x0c?\t\x04\x00\x1d\x0eX\x17\xfc\x04MA\xe6\xe4\x8b\xe6\xea)\x02\xc1\x98\x19(\xb2\x18uSA\xa6\xddABQ\x90\x018\xb4\x86q:\xc0\x93\x85\xbb\xf9\x02\x95\xd0\xe3\xaf\xe6nKl\xde?\x03\xe0V>\x00\x00\x10@\x8f\x02\x8f\x02\r\t2P\x00\x00\x00\x00+\x00z\x00\x88\x00\x00\x01"
+
 
 class StreamTest(unittest.TestCase):
     def setUp(self):
@@ -481,3 +487,270 @@ class StreamTest(unittest.TestCase):
                 )
                 for raw, parsed in sbr:
                     pass
+
+    def testsubparsererrorssubclass(
+        self,
+    ):  # sub-parser errors registered on SBFReader when subclass imports sub-parser
+        class SubReader(SBFReader):
+            pass
+
+        good = b"$GNGLL,5327.04319,S,16239.22700,E,181128.00,A,A*6D\r\n"
+        bad = b"$GNGLL,5327.04319,S,16239.22700,E,181128.00,A,A*6E\r\n"
+        with (
+            patch.object(SBFReader, "_subparsers", {}),
+            patch.object(SBFReader, "_errors", SBFReader._errors[0:4]),
+        ):
+            rdr = SubReader(BytesIO(good), protfilter=NMEA_PROTOCOL)
+            self.assertEqual(rdr.read()[0], good)  # first import of pynmeagps
+            self.assertNotIn("_errors", SubReader.__dict__)
+            errors = []
+            rdr = SBFReader(
+                BytesIO(bad + good),
+                protfilter=NMEA_PROTOCOL,
+                quitonerror=ERR_LOG,
+                errorhandler=errors.append,
+            )
+            self.assertEqual(rdr.read()[0], good)
+            self.assertEqual(
+                [str(err) for err in errors],
+                ["Message GNGLL invalid checksum 6E - should be 6D."],
+            )
+            self.assertIs(SBFReader.parse_errors(), SBFReader._errors)
+
+    def testhandleerror(self):  # shared error policy for frame parsers
+        err = SBFParseError("test error")
+        errors = []
+        SBFReader.handle_error(err, ERR_IGNORE, errors.append)
+        SBFReader.handle_error(err, ERR_LOG, errors.append)
+        self.assertEqual(errors, [err])
+        with self.assertLogs("pysbf2.sbfreader", "ERROR") as logs:
+            SBFReader.handle_error(err)
+        self.assertIn("test error", logs.output[0])
+        logger = logging.getLogger("pysbf2.test")
+        with self.assertLogs("pysbf2.test", "ERROR"):
+            SBFReader.handle_error(err, logger=logger)
+        with self.assertRaisesRegex(SBFParseError, "test error"):
+            SBFReader.handle_error(err, ERR_RAISE, errors.append)
+
+    def testbufferedreset(self):  # bytes held for rescan can be inspected and discarded
+        stream = BytesIO(b"$@\x00\x00\xa6\x0f\xff\xff" + PVTCART)
+        sbr = SBFReader(stream, quitonerror=ERR_RAISE)
+        with self.assertRaisesRegex(SBFParseError, "Invalid length 65535"):
+            sbr.read()
+        self.assertEqual(sbr.buffered, 6)
+        sbr.reset()
+        self.assertEqual(sbr.buffered, 0)
+        self.assertEqual(sbr.read()[0], PVTCART)
+
+    def testresyncbadlength(
+        self,
+    ):  # test implausible length is rejected without reading payload
+        errors = []
+        # bogus header claiming 65535 byte PVTCartesian, followed by good block
+        stream = BytesIO(b"$@\x00\x00\xa6\x0f\xff\xff" + PVTCART)
+        sbr = SBFReader(stream, quitonerror=ERR_LOG, errorhandler=errors.append)
+        raw, parsed = sbr.read()
+        self.assertEqual(raw, PVTCART)
+        self.assertEqual(parsed.identity, "PVTCartesian")
+        self.assertEqual(
+            str(errors[0]),
+            "Invalid length 65535 for SBF block 4006 - should be multiple of 4 in range 16 to 65532",
+        )
+        self.assertEqual(sbr.read(), (None, None))
+
+    def testrevisionlength(
+        self,
+    ):  # test older (shorter) and newer (longer) block revisions are accepted
+        def revision(revno: int, length: int) -> bytes:
+            raw = bytearray(PVTCART[:length]) + bytes(max(length - len(PVTCART), 0))
+            raw[4:6] = ((revno << 13) | 4006).to_bytes(2, "little")
+            raw[6:8] = length.to_bytes(2, "little")
+            raw[2:4] = crc2bytes(raw[4:])
+            return bytes(raw)
+
+        frames = [revision(0, 84), revision(3, 104), PVTCART]
+        errors = []
+        sbr = SBFReader(
+            BytesIO(b"".join(frames)), quitonerror=ERR_LOG, errorhandler=errors.append
+        )
+        read = [(raw, parsed.TOW) for raw, parsed in sbr]
+        self.assertEqual(errors, [])
+        self.assertEqual(read, [(frame, 208903000) for frame in frames])
+        self.assertEqual(SBFFramer().feed(b"".join(frames)), frames)
+
+    def testresyncbadlengthraise(
+        self,
+    ):  # test implausible length for unknown block, raise error
+        stream = BytesIO(b"$@\x00\x00\xff\x1f\x0a\x00" + PVTCART)
+        sbr = SBFReader(stream, quitonerror=ERR_RAISE)
+        with self.assertRaisesRegex(
+            SBFParseError,
+            "Invalid length 10 for SBF block 8191 - should be multiple of 4 in range 16 to 65532",
+        ):
+            sbr.read()
+        raw, parsed = sbr.read()  # resumes after bad sync word
+        self.assertEqual(raw, PVTCART)
+
+    def testresyncbadcrc(
+        self,
+    ):  # test rescan after CRC failure recovers embedded good blocks
+        errors = []
+        # plausible header whose 'payload' swallows the start of a good block
+        stream = BytesIO(b"$@\x00\x00\xa6\x0f`\x00" + PVTCART + PVTCART)
+        sbr = SBFReader(stream, quitonerror=ERR_LOG, errorhandler=errors.append)
+        i = 0
+        for raw, parsed in sbr:
+            self.assertEqual(raw, PVTCART)
+            i += 1
+        self.assertEqual(i, 2)
+        self.assertEqual(len(errors), 1)
+        self.assertIsInstance(errors[0], SBFMessageError)
+        self.assertIn("Invalid CRC b'\\x00\\x00'", str(errors[0]))
+
+    def testnmeaspurious(
+        self,
+    ):  # test spurious NMEA header in binary data doesn't swallow SBF blocks
+        errors = []
+        stream = BytesIO(b"$GP\x00\x01\x02" + PVTCART + PVTCART)
+        sbr = SBFReader(
+            stream,
+            protfilter=SBF_PROTOCOL,
+            quitonerror=ERR_LOG,
+            errorhandler=errors.append,
+        )
+        i = 0
+        for raw, parsed in sbr:
+            self.assertEqual(raw, PVTCART)
+            i += 1
+        self.assertEqual(i, 2)
+        self.assertEqual(
+            [str(err) for err in errors],
+            ["No NMEA terminator found within 80 bytes"],
+        )
+
+    def testnmeanonascii(
+        self,
+    ):  # test spurious NMEA header followed by binary data and LF
+        stream = BytesIO(b"$GP\xff\x0a" + PVTCART)
+        sbr = SBFReader(stream, quitonerror=ERR_RAISE)
+        with self.assertRaisesRegex(SBFParseError, "Non-ASCII data in NMEA sentence"):
+            sbr.read()
+        raw, parsed = sbr.read()  # resumes after spurious header
+        self.assertEqual(raw, PVTCART)
+
+    def testnmealimit(
+        self,
+    ):  # test configurable NMEA sentence length limit
+        NMEA = b"$GNTXT,01,01,02,AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA*53\r\n"
+        sbr = SBFReader(BytesIO(NMEA), quitonerror=ERR_RAISE)
+        with self.assertRaisesRegex(
+            SBFParseError, "No NMEA terminator found within 80 bytes"
+        ):
+            sbr.read()
+        sbr = SBFReader(BytesIO(NMEA), quitonerror=ERR_RAISE, nmealimit=120)
+        raw, parsed = sbr.read()
+        self.assertEqual(raw, NMEA)
+        self.assertEqual(parsed.msgID, "TXT")
+
+    def testnmeaunboundedreadline(
+        self,
+    ):  # test stream whose readline() doesn't support a size limit
+        class LineStream:
+            def __init__(self, data):
+                self._stream = BytesIO(data)
+
+            def read(self, size):
+                return self._stream.read(size)
+
+            def readline(self):
+                return self._stream.readline()
+
+        NMEA = b"$GNGLL,5327.04319,S,00214.41396,E,223232.00,A,A*68\r\n"
+        errors = []
+        stream = LineStream(b"$GP\x00\x01\x02" + PVTCART + NMEA)
+        sbr = SBFReader(stream, quitonerror=ERR_LOG, errorhandler=errors.append)
+        res = [raw for raw, _ in sbr]
+        self.assertEqual(res, [PVTCART, NMEA])
+        self.assertEqual(len(errors), 1)
+
+    def testnmeatruncated(
+        self,
+    ):  # test NMEA sentence truncated by end of stream
+        sbr = SBFReader(BytesIO(b"$GNGLL,5327"), quitonerror=ERR_RAISE)
+        with self.assertRaisesRegex(
+            SBFStreamError,
+            "Serial stream terminated unexpectedly. Line requested, 9 bytes returned.",
+        ):
+            sbr.read()
+
+    def testnmearescan(
+        self,
+    ):  # test NMEA sentences recovered from rescanned data after CRC failure
+        NMEA = b"$GNGLL,5327.04319,S,00214.41396,E,223232.00,A,A*68\r\n"
+        errors = []
+        # corrupt unknown block 'payload' contains complete NMEA sentence
+        stream1 = b"$@\x00\x00\xff\x1f\x3c\x00" + NMEA + PVTCART
+        # corrupt unknown block 'payload' contains partial NMEA sentence
+        stream2 = b"$@\x00\x00\xff\x1f\x10\x00" + NMEA + PVTCART
+        for data in (stream1, stream2):
+            sbr = SBFReader(
+                BytesIO(data), quitonerror=ERR_LOG, errorhandler=errors.append
+            )
+            res = [raw for raw, _ in sbr]
+            self.assertEqual(res, [NMEA, PVTCART])
+        self.assertEqual(len(errors), 2)
+
+    def testlazyparse(
+        self,
+    ):  # test lazily-parsed NMEA and RTCM3 messages
+        EXPECTED_RESULTS = (
+            ("GNGLL", "GN", "GLL", None, None),
+            ("1005", None, None, 19, 0),
+            ("1230", None, None, 4, 0),
+            ("GNRMC", "GN", "RMC", None, None),
+        )
+        i = 0
+        with open(os.path.join(DIRNAME, "pygpsdata_mixed.log"), "rb") as stream:
+            sbr = SBFReader(
+                stream,
+                protfilter=NMEA_PROTOCOL | RTCM3_PROTOCOL,
+                quitonerror=ERR_RAISE,
+                lazyparse=True,
+            )
+            for raw, parsed in sbr:
+                identity, talker, msgid, length, stnid = EXPECTED_RESULTS[i]
+                self.assertEqual(parsed.identity, identity)
+                self.assertEqual(parsed._parsed, None)  # not yet parsed
+                if talker is None:
+                    self.assertEqual(parsed.msgtype, int(identity))
+                    self.assertEqual(parsed.length, length)
+                    self.assertEqual(parsed.stationid, stnid)
+                    self.assertEqual(parsed.DF002, int(identity))  # full parse
+                    self.assertEqual(str(parsed), str(RTCMReader.parse(raw)))
+                else:
+                    self.assertEqual(parsed.talker, talker)
+                    self.assertEqual(parsed.msgID, msgid)
+                    self.assertEqual(parsed.msgmode, 0)  # triggers full parse
+                    self.assertEqual(str(parsed), str(parsed.parsed))
+                self.assertIsNotNone(parsed._parsed)
+                self.assertEqual(repr(parsed), repr(parsed.parsed))
+                self.assertEqual(parsed.serialize(), raw)
+                i += 1
+        self.assertEqual(i, 4)
+
+    def testlazyparsechecksum(self):  # invalid checksums reported by read()
+        with open(os.path.join(DIRNAME, "pygpsdata_mixed.log"), "rb") as stream:
+            data = bytearray(stream.read())
+        data[data.index(b"*") + 1] ^= 0x01  # corrupt NMEA checksum
+        data[data.index(b"\xd3\x00\x13") + 10] ^= 0xFF  # corrupt RTCM3 1005
+        errors = []
+        sbr = SBFReader(
+            BytesIO(bytes(data)),
+            protfilter=NMEA_PROTOCOL | RTCM3_PROTOCOL,
+            quitonerror=ERR_LOG,
+            errorhandler=errors.append,
+            lazyparse=True,
+        )
+        self.assertEqual([p.identity for _, p in sbr], ["1230", "GNRMC"])
+        self.assertIn("invalid checksum", str(errors[0]))
+        self.assertIn("failed CRC", str(errors[1]))
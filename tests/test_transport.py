@@ -0,0 +1,182 @@
+"""
+Shared memory transport tests for pysbf2
+
+Created on 19 Oct 2026
+
+*** NB: must be saved in UTF-8 format ***
+
+@author: semuadmin
+"""
+
+# pylint: disable=line-too-long, invalid-name, missing-docstring, no-member
+
+import os
+import struct
+import unittest
+from io import BytesIO
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+
+from pysbf2 import ParameterError, SBFMessage, SBFReader, SBFStreamError
+from pysbf2.sbftransport import (
+    SBFRingBuffer,
+    SBFRingReader,
+    get_frames,
+    put_frames,
+)
+
+DIRNAME = os.path.dirname(__file__)
+
+
+def _identities(name: str) -> list:
+    return [msg.identity for msg in get_frames(name, parsing=True)]
+
+
+def _ringidentities(name: str) -> list:
+    with SBFRingReader(name, parsing=True, fromstart=True, timeout=0.1) as ring:
+        return [parsed.identity for _, parsed in ring]
+
+
+class TransportTest(unittest.TestCase):
+    def setUp(self):
+        self.maxDiff = None
+        with open(
+            os.path.join(DIRNAME, "pygpsdata_x5_measurements.log"), "rb"
+        ) as stream:
+            self.msgs = [(raw, parsed) for raw, parsed in SBFReader(stream)]
+
+    def tearDown(self):
+        pass
+
+    def testRoundTrip(self):
+        raws = [raw for raw, _ in self.msgs]
+        self.assertEqual(get_frames(put_frames(raws)), raws)
+        self.assertEqual(get_frames(put_frames([])), [])
+
+    def testParsed(self):
+        msgs = [parsed for _, parsed in self.msgs]
+        res = get_frames(put_frames(msgs), parsing=True, parsebitfield=False)
+        self.assertEqual([m.serialize() for m in res], [m.serialize() for m in msgs])
+        self.assertIsInstance(res[0], SBFMessage)
+
+    def testReleased(self):
+        name = put_frames([raw for raw, _ in self.msgs])
+        get_frames(name)
+        with self.assertRaises(FileNotFoundError):
+            SharedMemory(name=name)
+
+    def testInvalid(self):
+        for hdr in (struct.pack("<I", 1000), struct.pack("<II", 1, 1000)):
+            shm = SharedMemory(create=True, size=len(hdr))
+            shm.buf[: len(hdr)] = hdr
+            name = shm.name
+            shm.close()
+            with self.assertRaisesRegex(SBFStreamError, "Invalid frame batch"):
+                get_frames(name)
+
+    def testProcessPool(self):
+        names = [put_frames([raw for raw, _ in self.msgs]) for _ in range(3)]
+        with get_context("spawn").Pool(2) as pool:
+            res = pool.map(_identities, names)
+        self.assertEqual(res, [[p.identity for _, p in self.msgs]] * 3)
+
+    def testRing(self):
+        with SBFRingBuffer(size=8192) as ring:
+            cons1 = SBFRingReader(ring.name)
+            cons2 = SBFRingReader(ring.name, parsing=True)
+            with open(
+                os.path.join(DIRNAME, "pygpsdata_x5_measurements.log"), "rb"
+            ) as stream:
+                self.assertEqual(ring.feed(SBFReader(stream, parsing=False)), 3)
+            self.assertEqual(ring.frames, 3)
+            self.assertEqual(cons1.lag, 3208 + 3 * 8)
+            for raw, parsed in self.msgs:
+                self.assertEqual(cons1.read(), (raw, None))
+                raw2, parsed2 = cons2.read()
+                self.assertEqual(raw2, raw)
+                self.assertEqual(str(parsed2), str(parsed))
+            self.assertEqual(cons1.read(), (None, None))
+            self.assertEqual(cons1.read(0.01), (None, None))
+            self.assertEqual((cons1.frames, cons1.lag), (3, 0))
+            cons3 = SBFRingReader(ring.name)  # joins after frames written
+            self.assertEqual(cons3.read(), (None, None))
+            cons1.close()
+            cons2.close()
+            cons3.close()
+
+    def testRingWrap(self):  # consumer keeping up, records wrap around buffer end
+        raws = [raw for raw, _ in self.msgs]
+        with SBFRingBuffer(size=5001) as ring:
+            with SBFRingReader(ring.name, timeout=0) as cons:
+                for i in range(50):
+                    ring.feed(SBFReader(BytesIO(b"".join(raws)), parsing=False), 2)
+                    self.assertEqual([raw for raw, _ in cons], raws[:2])
+                self.assertEqual(
+                    (cons.frames, cons.overruns, cons.dropped), (100, 0, 0)
+                )
+
+    def testRingOverrun(self):
+        raws = [raw for raw, _ in self.msgs]
+        with SBFRingBuffer(size=5001) as ring:
+            with SBFRingReader(
+                ring.name, fromstart=True, parsing=True, timeout=0
+            ) as cons:
+                for i in range(10):
+                    for raw in raws:
+                        ring.write(raw)
+                self.assertGreater(cons.lag, 5001)
+                res = [parsed.identity for _, parsed in cons]
+                self.assertEqual(
+                    res,
+                    ["MeasExtra", "EndOfMeas", "MeasEpoch", "MeasExtra", "EndOfMeas"],
+                )
+                self.assertEqual((cons.overruns, cons.dropped), (1, 25))
+                ring.write(raws[0])  # caught up
+                self.assertEqual(cons.read()[0], raws[0])
+                self.assertEqual((cons.overruns, cons.dropped), (1, 25))
+                with SBFRingReader(ring.name, timeout=0) as cons2:  # joins at head
+                    for i in range(2):
+                        for raw in raws:
+                            ring.write(raw)
+                    self.assertEqual(len(list(cons2)), 5)
+                    self.assertEqual((cons2.overruns, cons2.dropped), (1, 1))
+
+    def testRingFilter(self):
+        with open(os.path.join(DIRNAME, "pygpsdata_mixed.log"), "rb") as stream:
+            mixed = list(SBFReader(stream, parsing=False))
+        with SBFRingBuffer() as ring:
+            for raw, _ in self.msgs + mixed:
+                ring.write(raw)
+            with SBFRingReader(
+                ring.name, fromstart=True, parsing=True, timeout=0
+            ) as cons:
+                res = [parsed.identity for _, parsed in cons]
+            self.assertEqual(res[:3], ["MeasEpoch", "MeasExtra", "EndOfMeas"])
+            self.assertEqual(len(res), 3 + len(mixed))
+            self.assertIn("GNGLL", res)
+            self.assertIn("1005", res)
+            with SBFRingReader(
+                ring.name, msgfilter=("MeasEpoch", 5922), fromstart=True, timeout=0
+            ) as cons:
+                res = [raw for raw, _ in cons]
+                self.assertEqual(res, [self.msgs[0][0], self.msgs[2][0]])
+                self.assertEqual(cons.filtered, 1 + len(mixed))
+
+    def testRingInvalid(self):
+        with SBFRingBuffer(size=1000) as ring:
+            with self.assertRaisesRegex(SBFStreamError, "exceeds ring buffer capacity"):
+                ring.write(self.msgs[0][0])
+            with self.assertRaisesRegex(ParameterError, "Unknown SBF block 'Nonsense'"):
+                SBFRingReader(ring.name, msgfilter=["Nonsense"])
+        name = put_frames([])
+        with self.assertRaisesRegex(SBFStreamError, "is not an SBF ring buffer"):
+            SBFRingReader(name)
+        get_frames(name)
+
+    def testRingProcess(self):
+        with SBFRingBuffer() as ring:
+            for raw, _ in self.msgs:
+                ring.write(raw)
+            with get_context("spawn").Pool(1) as pool:
+                res = pool.map(_ringidentities, [ring.name] * 2)
+        self.assertEqual(res, [[p.identity for _, p in self.msgs]] * 2)
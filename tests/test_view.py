@@ -0,0 +1,171 @@
+"""
+Flyweight view and SBFReader.dispatch() tests for pysbf2
+
+Created on 19 Oct 2026
+
+*** NB: must be saved in UTF-8 format ***
+
+@author: semuadmin
+"""
+
+# pylint: disable=line-too-long, invalid-name, missing-docstring, no-member
+
+import os
+import unittest
+from glob import glob
+from io import BytesIO
+
+from pysbf2 import (
+    ERR_RAISE,
+    ParameterError,
+    SBFMessageError,
+    SBFReader,
+    SBFView,
+    compile_fields,
+)
+
+DIRNAME = os.path.dirname(__file__)
+
+
+def _load(*names) -> bytes:
+    data = b""
+    for name in names:
+        with open(os.path.join(DIRNAME, name), "rb") as stream:
+            data += stream.read()
+    return data
+
+
+class ViewTest(unittest.TestCase):
+    def setUp(self):
+        self.maxDiff = None
+        self.data = _load("pygpsdata_x5_pvtgeod.log", "pygpsdata_x5_attitude.log")
+
+    def tearDown(self):
+        pass
+
+    def testViewMatchesMessage(self):  # every compiled field of every test block
+        for path in glob(os.path.join(DIRNAME, "*.log")):
+            with open(path, "rb") as stream:
+                for raw, msg in SBFReader(stream, protfilter=2, quitonerror=0):
+                    if msg is None:
+                        continue
+                    for parsebf in (True, False):
+                        if not parsebf:
+                            msg = SBFReader.parse(raw, parsebitfield=False)
+                        view = SBFView(msg.identity, parsebf)
+                        view.bind(raw)
+                        for name, val in zip(view.fields, view.values()):
+                            self.assertEqual(
+                                getattr(msg, name), val, (msg.identity, name)
+                            )
+
+    def testView(self):
+        raw = next(iter(SBFReader(BytesIO(self.data), parsing=False)))[0]
+        view = SBFView(4007)
+        self.assertEqual(repr(view), "<SBFView(PVTGeodetic, unbound)>")
+        view.bind(raw)
+        self.assertEqual(view.identity, "PVTGeodetic")
+        self.assertEqual(view.revno, 2)
+        self.assertIs(view.raw, raw)
+        self.assertEqual(view.Latency, 55)
+        self.assertEqual(view.fields[0:4], ("TOW", "WNc", "Type", "Reserved1"))
+        self.assertIs(view.values(), view.values())  # decoded once per frame
+        self.assertIn("<SBFView(PVTGeodetic, TOW=", repr(view))
+        msg = view.message
+        self.assertEqual(msg.identity, "PVTGeodetic")
+        self.assertIs(view.message, msg)
+        with self.assertRaises(AttributeError):
+            view._nonexistent  # pylint: disable=pointless-statement, protected-access
+
+    def testViewGroups(self):  # attributes beyond fixed layout come from full parse
+        raw = next(
+            iter(
+                SBFReader(
+                    BytesIO(_load("pygpsdata_x5_measurements.log")), parsing=False
+                )
+            )
+        )[0]
+        view = SBFView("MeasEpoch")
+        view.bind(raw)
+        self.assertEqual(
+            view.fields[0:5], ("TOW", "WNc", "N1", "SB1Length", "SB2Length")
+        )
+        self.assertEqual(view.fields[-1], "Reserved2")
+        self.assertEqual(view.SVID_01, view.message.SVID_01)
+
+    def testViewShort(self):  # fields missing from an earlier block revision
+        raw = next(iter(SBFReader(BytesIO(self.data), parsing=False)))[0]
+        view = SBFView("PVTGeodetic")
+        view.bind(raw[0:6] + (84).to_bytes(2, "little") + raw[8:84])
+        self.assertIsNone(view.Latency)
+        self.assertEqual(view.TOW, 482847000)
+        view = SBFView("PVTGeodetic", False)
+        view.bind(raw[0:20])
+        self.assertIsNone(view.WACorrInfo)
+        self.assertIsNone(view.Latency)
+        self.assertEqual(view.Mode, raw[14:15])
+
+    def testCompileFields(self):
+        names, layout, _, ends = compile_fields("AttEuler")
+        self.assertEqual(
+            names,
+            (
+                "TOW",
+                "WNc",
+                "NrSV",
+                "Error",
+                "Mode",
+                "Reserved",
+                "Heading",
+                "Pitch",
+                "Roll",
+                "PitchDot",
+                "RollDot",
+                "HeadingDot",
+            ),
+        )
+        self.assertEqual(layout.format, "<IHBBHHffffff")
+        self.assertEqual(ends[-1], 36)
+        self.assertIs(compile_fields("AttEuler")[1], layout)
+        self.assertEqual(compile_fields("ReceiverSetup")[1].format[0:7], "<IHH60s")
+        self.assertEqual(compile_fields("NotExist")[1].size, 0)
+
+    def testDispatch(self):
+        res = []
+        rdr = SBFReader(BytesIO(self.data * 3))
+        count = rdr.dispatch(
+            {
+                "PVTGeodetic": lambda v: res.append((v.identity, v.TOW, v.Latency)),
+                5938: lambda v: res.append((v.identity, v.TOW, round(v.Heading, 3))),
+            }
+        )
+        self.assertEqual(count, 6)
+        self.assertEqual(
+            res[0:2],
+            [("PVTGeodetic", 482847000, 55), ("AttEuler", 483013000, -20000000000.0)],
+        )
+        self.assertEqual(res[0:2] * 3, res)
+        rdr = SBFReader(BytesIO(_load("pygpsdata_mixed.log") + self.data))
+        self.assertEqual(rdr.dispatch({"PVTGeodetic": res.append}, limit=2), 2)
+        self.assertEqual(rdr.dispatch({"PVTGeodetic": res.append}, limit=2), 0)
+        self.assertTrue(rdr._parsing)  # pylint: disable=protected-access
+        with self.assertRaisesRegex(ParameterError, "Unknown SBF block 'Nope'"):
+            rdr.dispatch({"Nope": res.append})
+
+    def testDispatchCRC(self):
+        data = bytearray(self.data)
+        data[30] ^= 0xFF  # corrupt PVTGeodetic
+        res = []
+        errors = []
+        rdr = SBFReader(BytesIO(bytes(data)), errorhandler=errors.append)
+        self.assertEqual(
+            rdr.dispatch({"PVTGeodetic": res.append, "AttEuler": res.append}), 1
+        )
+        self.assertIn("Invalid CRC", str(errors[0]))
+        rdr = SBFReader(BytesIO(bytes(data)), quitonerror=0)
+        self.assertEqual(
+            rdr.dispatch({"PVTGeodetic": res.append, "AttEuler": res.append}), 1
+        )
+        rdr = SBFReader(BytesIO(bytes(data)), quitonerror=ERR_RAISE)
+        with self.assertRaisesRegex(SBFMessageError, "Invalid CRC"):
+            rdr.dispatch({"PVTGeodetic": res.append})
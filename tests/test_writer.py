@@ -0,0 +1,225 @@
+"""
+Buffered writer tests for pysbf2
+
+Created on 19 Oct 2026
+
+*** NB: must be saved in UTF-8 format ***
+
+@author: semuadmin
+"""
+
+# pylint: disable=line-too-long, invalid-name, missing-docstring, no-member
+
+import os
+import tempfile
+import unittest
+from io import BytesIO
+from time import sleep
+from unittest.mock import patch
+
+from pysbf2 import (
+    FSYNC_FLUSH,
+    FSYNC_NONE,
+    ParameterError,
+    SBFIndex,
+    SBFMessage,
+    SBFReader,
+    SBFWriter,
+    crc2bytes,
+    index_path,
+)
+
+NMEA = b"$GNGLL,5327.04319,S,16239.22700,E,181128.00,A,A*6D\r\n"
+
+
+def _frames(start: int, step: int, count: int) -> list:
+    # PVTGeodetic (96 bytes) per epoch, with an NMEA sentence every 10 epochs
+    raw = bytearray(SBFMessage("PVTGeodetic", revno=2, TOW=0, WNc=2300).serialize())
+    frames = []
+    for i in range(count):
+        if not i % 10:
+            frames.append(NMEA)
+        raw[8:12] = (start + i * step).to_bytes(4, "little")
+        raw[2:4] = crc2bytes(raw[4:])
+        frames.append(bytes(raw))
+    return frames
+
+
+class ShortWriter:  # raw file which writes at most 100 bytes per call
+    def __init__(self, path, mode, buffering):
+        self._file = open(path, mode, buffering=buffering)
+
+    def write(self, data) -> int:
+        return self._file.write(data[:100])
+
+    def __getattr__(self, name):
+        return getattr(self._file, name)
+
+
+class WriterTest(unittest.TestCase):
+    def setUp(self):
+        self.maxDiff = None
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.frames = _frames(0, 100, 100)
+        self.data = b"".join(self.frames)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.tmpdir.name, name)
+
+    def _read(self, path: str) -> bytes:
+        with open(path, "rb") as stream:
+            return stream.read()
+
+    def testBuffered(self):
+        path = self._path("test.sbf")
+        writer = SBFWriter(path, bufsize=4096)
+        self.assertIsNone(writer.path)
+        writer.flush()  # no file yet
+        for frame in self.frames:
+            writer.write(frame)
+        self.assertEqual(writer.path, path)
+        self.assertEqual(writer.flushes, len(self.data) // 4096)
+        size = os.path.getsize(path)
+        self.assertGreaterEqual(size, writer.flushes * 4096)
+        self.assertLess(size, len(self.data))  # remainder still buffered
+        writer.close()
+        self.assertEqual(self._read(path), self.data)
+        self.assertEqual((writer.frames, writer.bytes), (110, len(self.data)))
+        self.assertEqual(writer.files, [path])
+
+    def testShortWrites(self):
+        path = self._path("test.sbf")
+        with patch("pysbf2.sbfwriter.open", ShortWriter, create=True):
+            with SBFWriter(path, bufsize=4096, index=True) as writer:
+                for frame in self.frames:
+                    writer.write(frame)
+                writer.flush()
+                self.assertEqual(os.path.getsize(path), len(self.data))
+        self.assertEqual(self._read(path), self.data)
+        self.assertEqual(len(SBFIndex.load(index_path(path))), 100)
+
+    def testMessages(self):
+        msgs = [
+            SBFMessage("PVTGeodetic", revno=2, TOW=1000 * i, WNc=2300, Latitude=0.1)
+            for i in range(5)
+        ]
+        path = self._path("test.sbf")
+        with SBFWriter(path, flushinterval=0, fsync=FSYNC_FLUSH) as writer:
+            for msg in msgs:
+                self.assertEqual(writer.write(msg), 96)
+                self.assertEqual(os.path.getsize(path), writer.bytes)  # flushed
+        with open(path, "rb") as stream:
+            res = [parsed for _, parsed in SBFReader(stream)]
+        self.assertEqual([p.TOW for p in res], [0, 1000, 2000, 3000, 4000])
+        self.assertEqual(res[0].Latitude, 0.1)
+
+    def testRotateSize(self):
+        with SBFWriter(self._path("test_{seq:03d}.sbf"), maxbytes=1000) as writer:
+            for frame in self.frames:
+                writer.write(frame)
+            writer.rotate()
+            writer.rotate()  # no file open
+        self.assertEqual(len(writer.files), 11)
+        self.assertEqual(writer.files[1], self._path("test_001.sbf"))
+        self.assertTrue(all(os.path.getsize(f) <= 1000 for f in writer.files))
+        self.assertEqual(b"".join(self._read(f) for f in writer.files), self.data)
+
+    def testRotateHour(self):
+        frames = [NMEA] + _frames(2 * 604800000 + 3598000, 500, 10)
+        with SBFWriter(
+            self._path("rx_{wnc}_{hour:03d}.sbf"), gpshour=True, fsync=FSYNC_NONE
+        ) as writer:
+            for frame in frames:
+                writer.write(frame)
+        # frames in week 2302 (TOW wraps), NMEA stays in first file
+        self.assertEqual(
+            writer.files,
+            [self._path("rx_2302_000.sbf"), self._path("rx_2302_001.sbf")],
+        )
+        first = list(SBFReader(BytesIO(self._read(writer.files[0])), parsing=False))
+        self.assertEqual([r for r, _ in first], frames[0:6])
+        self.assertEqual(self._read(writer.files[1]), b"".join(frames[6:]))
+        with SBFWriter(self._path("rx_{wnc}_{hour:03d}.sbf"), gpshour=True) as writer:
+            writer.write(NMEA)  # no timed blocks
+        self.assertEqual(writer.files, [self._path("rx_0_000.sbf")])
+
+    def testRotateAge(self):
+        with SBFWriter(self._path("test_{seq}.sbf"), maxage=0.05) as writer:
+            writer.write(self.frames[0])
+            writer.write(self.frames[1])
+            sleep(0.1)
+            writer.write(self.frames[2])
+        self.assertEqual(len(writer.files), 2)
+        self.assertEqual(self._read(writer.files[1]), self.frames[2])
+
+    def testIndex(self):
+        path = self._path("test_{seq}.sbf")
+        with SBFWriter(path, bufsize=2000, index=True, maxbytes=5000) as writer:
+            for frame in self.frames[0:50]:
+                writer.write(frame)
+            # index written as buffer written
+            partial = SBFIndex.load(index_path(writer.path))
+            self.assertEqual(len(partial), writer.flushes * 2000 // 96 - 1)
+            for frame in self.frames[50:]:
+                writer.write(frame)
+        self.assertEqual(len(writer.files), 3)
+        for file in writer.files:
+            built = SBFIndex.build(BytesIO(self._read(file)))
+            loaded = SBFIndex.load(index_path(file))
+            self.assertEqual(
+                (loaded.times, loaded.offsets), (built.times, built.offsets)
+            )
+        self.assertEqual(writer.index.times, loaded.times)
+        with open(writer.files[1], "rb") as stream:
+            rdr = SBFReader(stream)
+            rdr.seek_time(2300, 5000)
+            self.assertEqual(rdr.read()[1].TOW, 5000)
+
+    def testInvalid(self):
+        with self.assertRaisesRegex(ParameterError, "Invalid fsync policy 3"):
+            SBFWriter(self._path("test.sbf"), fsync=3)
+        with self.assertRaisesRegex(ParameterError, "Invalid buffer size 0"):
+            SBFWriter(self._path("test.sbf"), bufsize=0)
+        with self.assertRaisesRegex(
+            ParameterError, "must include {seq} or {hour} if rotating by GPS hour"
+        ):
+            SBFWriter(self._path("rx_{wnc}.sbf"), gpshour=True)
+        for kwargs in ({"maxbytes": 1000}, {"maxage": 60}):
+            with self.assertRaisesRegex(
+                ParameterError, "must include {seq} if rotating by size or age"
+            ):
+                SBFWriter(self._path("rx_{wnc}_{hour}.sbf"), **kwargs)
+
+    def testRotateCollision(self):
+        # GPS hour goes backwards, and manual rotation with fixed name
+        frames = _frames(3598000, 1000, 4) + _frames(3598000, 1000, 4)
+        with SBFWriter(self._path("rx_{hour:03d}.sbf"), gpshour=True) as writer:
+            for frame in frames:
+                writer.write(frame)
+            writer.rotate()
+            writer.write(frames[1])
+        self.assertEqual(
+            writer.files,
+            [
+                self._path("rx_000.sbf"),
+                self._path("rx_001.sbf"),
+                self._path("rx_000_1.sbf"),
+                self._path("rx_001_1.sbf"),
+                self._path("rx_000_2.sbf"),
+            ],
+        )
+        self.assertEqual(
+            b"".join(self._read(f) for f in writer.files),
+            b"".join(frames) + frames[1],
+        )
+        with SBFWriter(self._path("test.sbf")) as writer:
+            writer.write(frames[1])
+            writer.rotate()
+            writer.write(frames[2])
+        self.assertEqual(
+            writer.files, [self._path("test.sbf"), self._path("test_1.sbf")]
+        )
+        self.assertEqual(self._read(writer.files[0]), frames[1])